@@ -64,9 +64,17 @@ class EncodedSumFactory(factory.UnweightedAggregationFactory):
   used together with a `GatherEncoder` of which the entire decode logic commutes
   with sum, as per its `fully_commutes_with_sum` property. Contributions
   welcome.
+
+  Optionally, all tensors of the same dtype can be fused into a single rank-1
+  tensor before encoding, and split back into their original shapes after
+  decoding. This is useful for values with many small tensors, such as the
+  variables of a large model, where encoding and aggregating each tensor
+  separately has a significant per-tensor overhead.
   """
 
-  def __init__(self, encoder_fn: _EncoderConstructor):
+  def __init__(self,
+               encoder_fn: _EncoderConstructor,
+               fuse_tensors: bool = False):
     """Initializes `EncodedSumFactory`.
 
     This class is initialized with an `encoder_fn` function, which given a
@@ -80,17 +88,27 @@ class EncodedSumFactory(factory.UnweightedAggregationFactory):
     only relatively small gain in terms of compression.
 
     The `encoder_fn` will be used during the call to `create` of the factory,
-    and applied based on the provided `value_type`.
+    and applied based on the provided `value_type`. If `fuse_tensors` is
+    `True`, it is applied to the specs of the fused rank-1 tensors instead of
+    the specs of the tensors in `value_type`.
 
     Args:
       encoder_fn: A one-arg callable, mapping a `tf.TensorSpec`, to a
         `GatherEncoder`.
+      fuse_tensors: Whether to concatenate all tensors of the same dtype into a
+        single rank-1 tensor, which is encoded by a single `GatherEncoder`.
+        Requires all tensors in the `value_type` to have fully defined shapes.
     """
     py_typecheck.check_callable(encoder_fn)
+    py_typecheck.check_type(fuse_tensors, bool)
     self._encoder_fn = encoder_fn
+    self._fuse_tensors = fuse_tensors
 
   @classmethod
-  def quantize_above_threshold(cls, quantization_bits=8, threshold=20000):
+  def quantize_above_threshold(cls,
+                               quantization_bits=8,
+                               threshold=20000,
+                               fuse_tensors=False):
     """Quantization of values with at least `threshold` elements.
 
     Given a `value_type` in the `create` method, this classmethod configures the
@@ -104,10 +122,17 @@ class EncodedSumFactory(factory.UnweightedAggregationFactory):
     If a type does not have more than `threshold` elements, it is summed
     directly without being modified.
 
+    If `fuse_tensors` is `True`, the tensors of each dtype are first fused into
+    a single rank-1 tensor, and the threshold applies to the fused tensors.
+    Note that the fused tensor is then quantized with a single range, which is
+    less accurate than quantizing tensors of different magnitude separately.
+
     Args:
       quantization_bits: A integer specifying the quantization bitwidth.
       threshold: A non-negative integer. Only tensors with more than this number
         of elements are quantized.
+      fuse_tensors: Whether to concatenate all tensors of the same dtype into a
+        single rank-1 tensor before encoding.
 
     Returns:
       An `EncodedSumFactory`.
@@ -121,23 +146,73 @@ class EncodedSumFactory(factory.UnweightedAggregationFactory):
             te.encoders.uniform_quantization(quantization_bits), value_spec)
       return te.encoders.as_gather_encoder(te.encoders.identity(), value_spec)
 
-    return cls(encoder_fn)
+    return cls(encoder_fn, fuse_tensors=fuse_tensors)
 
   def create(
       self,
       value_type: factory.ValueType) -> aggregation_process.AggregationProcess:
     type_args = typing.get_args(factory.ValueType)
     py_typecheck.check_type(value_type, type_args)
-    encoders = self._encoders_for_value_type(value_type)
+    value_specs = type_conversions.type_to_tf_tensor_specs(value_type)
+    if self._fuse_tensors:
+      fuser = _TensorFuser(value_specs)
+      encoders = tf.nest.map_structure(self._encoder_fn, fuser.fused_specs)
+    else:
+      fuser = None
+      encoders = tf.nest.map_structure(self._encoder_fn, value_specs)
     init_fn = _encoded_init_fn(encoders)
     next_fn = _encoded_next_fn(init_fn.type_signature.result, value_type,
-                               encoders)
+                               encoders, fuser)
     return aggregation_process.AggregationProcess(init_fn, next_fn)
 
-  def _encoders_for_value_type(self, value_type):
-    value_specs = type_conversions.type_to_tf_tensor_specs(value_type)
-    encoders = tf.nest.map_structure(self._encoder_fn, value_specs)
-    return encoders
+
+class _TensorFuser(object):
+  """Fuses a structure of tensors into one rank-1 tensor per dtype.
+
+  The fused tensors are a list, ordered by the first occurrence of each dtype
+  in the flattened structure. Within a fused tensor, the flattened tensors are
+  concatenated in the order of the flattened structure.
+  """
+
+  def __init__(self, value_specs):
+    self._value_specs = value_specs
+    self._flat_specs = tf.nest.flatten(value_specs)
+    for spec in self._flat_specs:
+      if not spec.shape.is_fully_defined():
+        raise ValueError('Fusing tensors requires all tensors to have fully '
+                         f'defined shapes. Found tensor spec: {spec}.')
+    dtypes = list(collections.OrderedDict.fromkeys(
+        spec.dtype for spec in self._flat_specs))
+    self._buffer_indices = [
+        dtypes.index(spec.dtype) for spec in self._flat_specs
+    ]
+    self._buffer_sizes = [[] for _ in dtypes]
+    for spec, buffer_index in zip(self._flat_specs, self._buffer_indices):
+      self._buffer_sizes[buffer_index].append(spec.shape.num_elements())
+    self.fused_specs = [
+        tf.TensorSpec([sum(sizes)], dtype)
+        for dtype, sizes in zip(dtypes, self._buffer_sizes)
+    ]
+
+  def fuse(self, value):
+    """Concatenates the tensors of `value` into a list of rank-1 tensors."""
+    buffers = [[] for _ in self.fused_specs]
+    for tensor, buffer_index in zip(
+        tf.nest.flatten(value), self._buffer_indices):
+      buffers[buffer_index].append(tf.reshape(tensor, [-1]))
+    return [tf.concat(tensors, axis=0) for tensors in buffers]
+
+  def split(self, fused_value):
+    """Splits rank-1 tensors created by `fuse` into the original structure."""
+    split_buffers = [
+        iter(tf.split(buffer, sizes))
+        for buffer, sizes in zip(fused_value, self._buffer_sizes)
+    ]
+    tensors = [
+        tf.reshape(next(split_buffers[buffer_index]), spec.shape)
+        for spec, buffer_index in zip(self._flat_specs, self._buffer_indices)
+    ]
+    return tf.nest.pack_sequence_as(self._value_specs, tensors)
 
 
 def _encoded_init_fn(encoders):
@@ -159,7 +234,7 @@ def _encoded_init_fn(encoders):
   return init_fn
 
 
-def _encoded_next_fn(server_state_type, value_type, encoders):
+def _encoded_next_fn(server_state_type, value_type, encoders, fuser=None):
   """Creates `next_fn` for the process returned by `EncodedSumFactory`.
 
   The structure of the implementation is roughly as follows:
@@ -174,6 +249,9 @@ def _encoded_next_fn(server_state_type, value_type, encoders):
     server_state_type: A `tff.Type` of the expected state placed at server.
     value_type: An unplaced `tff.Type` of the value to be aggregated.
     encoders: A collection of `GatherEncoder` objects.
+    fuser: An optional `_TensorFuser`. If provided, values are fused before
+      encoding and split after decoding, and `encoders` must match the
+      structure of the fused values.
 
   Returns:
     A `tff.Computation` for `EncodedSumFactory`, with the type signature of
@@ -203,6 +281,8 @@ def _encoded_next_fn(server_state_type, value_type, encoders):
   @computations.tf_computation(value_type, encode_params_type,
                                decode_before_sum_params_type)
   def encode_fn(x, encode_params, decode_before_sum_params):
+    if fuser is not None:
+      x = fuser.fuse(x)
     encoded_structure = tree.map_structure_up_to(
         encoders, lambda e, *args: e.encode(*args), encoders, x, encode_params)
     encoded_x = _slice(encoders, encoded_structure, 0)
@@ -233,10 +313,13 @@ def _encoded_next_fn(server_state_type, value_type, encoders):
                                decode_after_sum_params_type)
   def decode_after_sum_fn(summed_values, decode_after_sum_params):
     part_decoded_aggregated_x, num_summands = summed_values
-    return tree.map_structure_up_to(
+    decoded_x = tree.map_structure_up_to(
         encoders,
         lambda e, x, params: e.decode_after_sum(x, params, num_summands),
         encoders, part_decoded_aggregated_x, decode_after_sum_params)
+    if fuser is not None:
+      decoded_x = fuser.split(decoded_x)
+    return decoded_x
 
   @computations.tf_computation(server_state_type.member,
                                state_update_tensors_type)
@@ -97,6 +97,35 @@ class EncodedSumFactoryComputationTest(tf.test.TestCase,
     self.assertTrue(
         process.next.type_signature.is_equivalent_to(expected_next_type))
 
+  @parameterized.named_parameters(
+      ('identity_from_encoder_fn', _identity_encoder_fn),
+      ('uniform_from_encoder_fn', _uniform_encoder_fn),
+      ('state_update_from_encoder_fn', _state_update_encoder_fn),
+  )
+  def test_type_properties_with_fused_tensors(self, encoder_fn):
+    encoded_f = encoded.EncodedSumFactory(encoder_fn, fuse_tensors=True)
+    process = encoded_f.create(_test_struct_type)
+
+    server_state_type = process.initialize.type_signature.result
+    # All tensors have the same dtype, and are fused into a single tensor.
+    self.assertLen(server_state_type.member, 1)
+    expected_next_type = computation_types.FunctionType(
+        parameter=collections.OrderedDict(
+            state=server_state_type,
+            value=computation_types.at_clients(_test_struct_type)),
+        result=measured_process.MeasuredProcessOutput(
+            state=server_state_type,
+            result=computation_types.at_server(_test_struct_type),
+            measurements=computation_types.at_server(())))
+    self.assertTrue(
+        process.next.type_signature.is_equivalent_to(expected_next_type))
+
+  def test_fuse_tensors_with_undefined_shape_raises(self):
+    encoded_f = encoded.EncodedSumFactory(
+        _identity_encoder_fn, fuse_tensors=True)
+    with self.assertRaises(ValueError):
+      encoded_f.create(computation_types.TensorType(tf.float32, [None]))
+
   def test_encoder_fn_not_callable_raises(self):
     encoder = te.encoders.as_gather_encoder(te.encoders.identity(),
                                             tf.TensorSpec((), tf.float32))
@@ -153,6 +182,44 @@ class EncodedSumFactoryExecutionTest(tf.test.TestCase):
       self.assertEqual((), output.measurements)
       state = output.state
 
+  def test_structure_sum_with_fused_tensors(self):
+    encoded_f = encoded.EncodedSumFactory(
+        _identity_encoder_fn, fuse_tensors=True)
+    process = encoded_f.create(
+        computation_types.to_type(
+            ((tf.float32, (2,)), tf.int32, (tf.float32, (2, 2)))))
+
+    state = process.initialize()
+    # One state for the fused `tf.float32` and one for the `tf.int32` tensors.
+    self.assertLen(state, 2)
+
+    client_data = [
+        [[1.0, -1.0], 2, [[1.0, 2.0], [3.0, 4.0]]],
+        [[2.0, 4.0], 3, [[0.0, 1.0], [0.0, 1.0]]],
+        [[3.0, 5.0], 5, [[1.0, 0.0], [1.0, 0.0]]],
+    ]
+    for _ in range(3):
+      output = process.next(state, client_data)
+      self.assertAllClose([6.0, 8.0], output.result[0])
+      self.assertEqual(10, output.result[1])
+      self.assertAllClose([[2.0, 3.0], [4.0, 5.0]], output.result[2])
+      state = output.state
+
+  def test_quantize_above_threshold_with_fused_tensors(self):
+    encoded_f = encoded.EncodedSumFactory.quantize_above_threshold(
+        quantization_bits=1, threshold=4, fuse_tensors=True)
+    test_type = computation_types.to_type([(tf.float32, (3,)),
+                                           (tf.float32, (2,))])
+    process = encoded_f.create(test_type)
+
+    single_client_data = [[[0.0, 1.0, 2.0], [3.0, 5.0]]]
+    state = process.initialize()
+    output = process.next(state, single_client_data)
+    # The threshold applies to the fused tensor, which is quantized to its
+    # overall min and max.
+    self.assertContainsSubset(set(output.result[0]), set([0.0, 5.0]))
+    self.assertContainsSubset(set(output.result[1]), set([0.0, 5.0]))
+
   def test_quantize_above_threshold_zero(self):
     encoded_f = encoded.EncodedSumFactory.quantize_above_threshold(
         quantization_bits=1, threshold=0)
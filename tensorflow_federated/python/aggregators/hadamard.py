@@ -19,20 +19,76 @@
 """TensorFlow utility for fast Walsh-Hadamard transform."""
 
 import math
+
+import numpy as np
 import tensorflow as tf
 
+# The transform is applied in passes, each of which multiplies blocks of
+# `2**_MAX_BLOCK_LOG2` or fewer coordinates by a dense Hadamard matrix. Larger
+# blocks need fewer passes over the data, but more arithmetic per pass.
+_MAX_BLOCK_LOG2 = 6
+
 
 class TensorShapeError(ValueError):
   pass
 
 
+def _hadamard_matrix(log2_dim, dtype):
+  """Returns the unnormalized `2**log2_dim` Hadamard matrix of Sylvester type."""
+  h = np.ones([1, 1])
+  for _ in range(log2_dim):
+    h = np.block([[h, h], [h, -h]])
+  return tf.constant(h, dtype=dtype)
+
+
+def _block_log2s(log2):
+  """Splits `log2` bits into as few, evenly sized, blocks as possible."""
+  num_passes = -(-log2 // _MAX_BLOCK_LOG2)
+  if not num_passes:
+    return []
+  block_log2, remainder = divmod(log2, num_passes)
+  return [block_log2 + 1] * remainder + [block_log2] * (num_passes - remainder)
+
+
+def _hadamard_pass(x, dim, block, h_block):
+  """Transforms the lowest `log2(block)` bits of the index of `x`.
+
+  The Hadamard matrix of size `dim` is the Kronecker product of Hadamard
+  matrices over the bits of the coordinate index. This multiplies the `block`
+  coordinates sharing all but the lowest bits by the Hadamard matrix `h_block`,
+  and then rotates these bits to become the highest bits, so that the next pass
+  transforms the following bits. After passes over all bits, the coordinates
+  are back in their original order.
+
+  Args:
+    x: A tensor of shape `[a, dim]`.
+    dim: The size of the second dimension of `x`.
+    block: The number of coordinates transformed together.
+    h_block: The unnormalized `block` x `block` Hadamard matrix.
+
+  Returns:
+    A tensor of shape `[a, dim]`.
+  """
+  x_shape = x.shape
+  x = tf.reshape(x, [-1, block])
+  x = tf.matmul(x, h_block)
+  x = tf.reshape(x, [-1, dim // block, block])
+  x = tf.transpose(x, perm=[0, 2, 1])
+  x = tf.reshape(x, [-1, dim])
+  x.set_shape(x_shape)  # Failed shape inference in tf.while_loop.
+  return x
+
+
 def fast_walsh_hadamard_transform(x):
   """Applies the fast Walsh-Hadamard transform.
 
   See https://en.wikipedia.org/wiki/Fast_Walsh%E2%80%93Hadamard_transform.
 
   This method uses a composition of existing TensorFlow operations to implement
-  the transform.
+  the transform. Rather than the `log2(b)` butterfly steps of the textbook
+  algorithm, each of which permutes the whole input, the transform is
+  factorized into a few passes, each of which multiplies blocks of up to
+  `2**_MAX_BLOCK_LOG2` coordinates by a dense Hadamard matrix.
 
   The input must be a rank-2 tensor with shape `[a, b]`, where `b` must be a
   power of two, not required to be statically known. The transform will be
@@ -76,6 +132,20 @@ def fast_walsh_hadamard_transform(x):
             'Provided dimension is: %s' % dim)
     ]):
       x = tf.identity(x)
+
+    # The top left `2**k` x `2**k` block of a Hadamard matrix of Sylvester type
+    # is the Hadamard matrix of size `2**k`, so a pass over fewer bits slices
+    # the largest Hadamard matrix.
+    h_max = _hadamard_matrix(_MAX_BLOCK_LOG2, x.dtype)
+
+    def body(remaining_log2, x):
+      block = tf.bitwise.left_shift(
+          1, tf.math.minimum(remaining_log2, _MAX_BLOCK_LOG2))
+      x = _hadamard_pass(x, dim, block, h_max[:block, :block])
+      return remaining_log2 - _MAX_BLOCK_LOG2, x
+
+    _, x = tf.while_loop(lambda remaining_log2, x: remaining_log2 > 0, body,
+                         [log2, x])
   else:  # dim is statically known.
     if not (dim and (dim & (dim - 1)) == 0):
       raise TensorShapeError('The dimension of x must be a power of two. '
@@ -83,32 +153,10 @@ def fast_walsh_hadamard_transform(x):
     log2 = int(math.ceil(math.log2(dim)))
     if dim == 1:  # Equivalent to identity.
       return tf.identity(x)
+    for block_log2 in _block_log2s(log2):
+      x = _hadamard_pass(x, dim, 2**block_log2,
+                         _hadamard_matrix(block_log2, x.dtype))
 
-  h_2x2 = tf.constant([[1., 1.], [1., -1.]], dtype=x.dtype)
-  permutation = tf.constant([0, 2, 1])
-
-  def _hadamard_step(x, dim):
-    """A single step in the fast Walsh-Hadamard transform."""
-    x_shape = x.shape.as_list()
-    x = tf.reshape(x, [-1, 2])
-    x = tf.matmul(x, h_2x2)
-    x = tf.reshape(x, [-1, dim // 2, 2])
-    x = tf.transpose(x, perm=permutation)
-    x.set_shape(x_shape)  # Failed shape inference in tf.while_loop.
-    return x
-
-  def _fwht(x, dim, log2):
-    x = tf.reshape(x, [-1, 2, dim // 2])
-    index = tf.constant(0)
-    cond = lambda i, x: tf.less(i, log2)
-    body = lambda i, x: [i + 1, _hadamard_step(x, dim)]
-    index, x = tf.while_loop(cond, body, [index, x])
-    return x
-
-  x = tf.cond(
-      tf.equal(dim, 1), lambda: tf.identity(x), lambda: _fwht(x, dim, log2))
-
-  x = tf.reshape(x, [-1, dim])
   x /= tf.sqrt(tf.cast(dim, x.dtype))  # Normalize.
   x.set_shape(original_x_shape)  # Failed shape inference after tf.while_loop.
   return x
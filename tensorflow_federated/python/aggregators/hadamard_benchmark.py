@@ -0,0 +1,83 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `fast_walsh_hadamard_transform`.
+
+Measures the throughput of the transform of vectors with between `2**20` and
+`2**26` coordinates, for both statically and dynamically known dimensions, and
+of the randomized Hadamard transform applied by `HadamardTransformFactory`.
+
+Run with:
+
+```
+bazel run :hadamard_benchmark -- --benchmarks=.
+```
+"""
+
+import time
+
+import tensorflow as tf
+
+from tensorflow_federated.python.aggregators import hadamard
+from tensorflow_federated.python.aggregators import rotation
+
+_LOG2_DIMS = range(20, 27, 2)
+_NUM_ITERS = 5
+
+
+def _report_throughput(benchmark, name, fn, x):
+  # Trace the function outside of the measurements.
+  fn(x)
+  start_time = time.time()
+  for _ in range(_NUM_ITERS):
+    fn(x)
+  wall_time = (time.time() - start_time) / _NUM_ITERS
+  dim = x.shape[-1]
+  benchmark.report_benchmark(
+      name='{}_dim_2^{}'.format(name, dim.bit_length() - 1),
+      iters=_NUM_ITERS,
+      wall_time=wall_time,
+      extras={'coordinates_per_second': dim / wall_time})
+
+
+class FastWalshHadamardTransformBenchmark(tf.test.Benchmark):
+
+  def benchmark_static_dim(self):
+    for log2_dim in _LOG2_DIMS:
+      x = tf.random.normal([1, 2**log2_dim])
+      fn = tf.function(hadamard.fast_walsh_hadamard_transform)
+      _report_throughput(self, 'static_dim', fn, x)
+
+  def benchmark_dynamic_dim(self):
+    for log2_dim in _LOG2_DIMS:
+      x = tf.random.normal([1, 2**log2_dim])
+      fn = tf.function(
+          hadamard.fast_walsh_hadamard_transform,
+          input_signature=[tf.TensorSpec([1, None], tf.float32)])
+      _report_throughput(self, 'dynamic_dim', fn, x)
+
+  def benchmark_randomized_transform(self):
+    for log2_dim in _LOG2_DIMS:
+      x = tf.random.normal([2**log2_dim])
+
+      @tf.function
+      def randomized_transform(x):
+        x *= rotation.sample_rademacher(tf.shape(x), x.dtype, seed=[1, 2])
+        x = hadamard.fast_walsh_hadamard_transform(tf.expand_dims(x, axis=0))
+        return tf.squeeze(x, axis=0)
+
+      _report_throughput(self, 'randomized_transform', randomized_transform, x)
+
+
+if __name__ == '__main__':
+  tf.test.main()
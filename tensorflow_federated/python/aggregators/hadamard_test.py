@@ -19,6 +19,13 @@ import tensorflow as tf
 from tensorflow_federated.python.aggregators import hadamard
 
 
+def _hadamard_matrix(dim):
+  h = np.ones([1, 1])
+  while h.shape[0] < dim:
+    h = np.block([[h, h], [h, -h]])
+  return h / np.sqrt(dim)
+
+
 class FastWalshHadamardTransformTests(tf.test.TestCase, parameterized.TestCase):
   """Tests for `fast_walsh_hadamard_transform` method."""
 
@@ -31,6 +38,27 @@ class FastWalshHadamardTransformTests(tf.test.TestCase, parameterized.TestCase):
     self.assertGreater(np.linalg.norm(x - hx), 1e-3)
     self.assertAllClose(np.linalg.norm(x), np.linalg.norm(hx))
 
+  @parameterized.named_parameters(('1', 1), ('2', 2), ('64', 64), ('128', 128),
+                                  ('1024', 1024), ('2048', 2048))
+  def test_matches_hadamard_matrix(self, dim):
+    """Tests the transform is the product with the normalized Hadamard matrix."""
+    x = tf.random.normal([3, dim])
+    hx = hadamard.fast_walsh_hadamard_transform(x)
+    self.assertAllClose(
+        np.matmul(x, _hadamard_matrix(dim)), hx, atol=1e-5, rtol=1e-5)
+
+  @parameterized.named_parameters(('1', 1), ('2', 2), ('64', 64), ('128', 128),
+                                  ('1024', 1024), ('2048', 2048))
+  def test_dynamic_dim_matches_hadamard_matrix(self, dim):
+    """Tests the transform of an input of statically unknown dimension."""
+    transform = tf.function(
+        hadamard.fast_walsh_hadamard_transform,
+        input_signature=[tf.TensorSpec([3, None], tf.float32)])
+    x = tf.random.normal([3, dim])
+    hx = transform(x)
+    self.assertAllClose(
+        np.matmul(x, _hadamard_matrix(dim)), hx, atol=1e-5, rtol=1e-5)
+
   @parameterized.named_parameters(('1', 1), ('2', 2), ('5', 5), ('11', 11))
   def test_apply_twice_equals_identity(self, first_dim):
     """Tests applying the transform twice is equal to identity."""
@@ -428,6 +428,12 @@ def _flatten_and_pad_zeros_even(struct):
 
 def _pad_zeros_pow2(x):
   """Pads a rank-1 tensor with zeros to the next power of two dimensions."""
+  static_size = x.shape.num_elements()
+  if static_size is not None:
+    # Padding to a statically known size lets the fast Walsh-Hadamard transform
+    # be constructed for a static dimension, which avoids a `tf.while_loop`.
+    pad_size = 1 << (static_size - 1).bit_length() if static_size else 0
+    return tf.concat([x, tf.zeros([pad_size - static_size], x.dtype)], axis=0)
   size = tf.size(x)
   log2_size = tf.math.log(tf.cast(size, tf.float32)) / math.log(2.0)
   # NOTE: We perform `pow` in float32 to avoid the integer TF `pow` op,
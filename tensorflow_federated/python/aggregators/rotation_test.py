@@ -342,6 +342,10 @@ class PaddingUtilsTest(tf.test.TestCase, parameterized.TestCase):
     padded = rotation._pad_zeros_pow2(tf.convert_to_tensor(value))
     self.assertAllEqual(expected_padded, padded)
 
+  def test_pad_pow2_has_static_shape(self):
+    padded = rotation._pad_zeros_pow2(tf.ones([5]))
+    self.assertEqual([8], padded.shape.as_list())
+
   @parameterized.named_parameters(
       ('1', [1], [1, 0]),
       ('2', [1, 1], [1, 1]),
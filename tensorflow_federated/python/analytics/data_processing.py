@@ -57,19 +57,28 @@ def get_all_elements(dataset: tf.data.Dataset,
     raise ValueError('`max_string_length` must be at least 1 when it is not'
                      ' None.')
 
-  initial_list = tf.constant([], dtype=tf.string)
-
-  def add_element(element_list, element_batch):
+  # The batches are concatenated once at the end, rather than one at a time,
+  # which would copy all previous elements for each batch. The array starts
+  # with an empty batch, since an empty `tf.TensorArray` of batches of unknown
+  # size cannot be concatenated.
+  initial_array = tf.TensorArray(
+      dtype=tf.string,
+      size=1,
+      dynamic_size=True,
+      infer_shape=False,
+      element_shape=tf.TensorShape([None]))
+  initial_array = initial_array.write(0, tf.constant([], dtype=tf.string))
+
+  def add_element(element_array, element_batch):
     if max_string_length is not None:
       element_batch = tf.strings.substr(
           element_batch, 0, max_string_length, unit='BYTE')
-    element_list = tf.concat([element_list, element_batch], axis=0)
-    return element_list
+    return element_array.write(element_array.size(), element_batch)
 
-  all_element_list = dataset.reduce(
-      initial_state=initial_list, reduce_func=add_element)
+  element_array = dataset.reduce(
+      initial_state=initial_array, reduce_func=add_element)
 
-  return all_element_list
+  return element_array.concat()
 
 
 def _get_capped_dataset(dataset: tf.data.Dataset,
@@ -268,8 +277,6 @@ def get_unique_elements(dataset: tf.data.Dataset,
   return unique_element_list
 
 
-# TODO(b/192336690): Improve the efficiency of get_unique_elements_with_counts.
-# The current implementation iterates `dataset` twice, which is not optimal.
 def get_unique_elements_with_counts(
     dataset: tf.data.Dataset,
     max_string_length: Optional[int] = None) -> Tuple[tf.Tensor, tf.Tensor]:
@@ -316,19 +323,80 @@ def get_unique_elements_with_counts(
                     f' element type {dataset.element_spec.dtype}')
 
   all_elements = get_all_elements(dataset, max_string_length)
+  elements, _, counts = tf.unique_with_counts(all_elements, out_idx=tf.int64)
+  return elements, counts
 
-  elements, indices = tf.unique(all_elements)
 
-  def accumulate_counts(counts, item):
-    item_one_hot = tf.one_hot(item, tf.shape(elements)[0], dtype=tf.int64)
-    return counts + item_one_hot
+@tf.function
+def get_unique_elements_with_counts_streaming(
+    dataset: tf.data.Dataset,
+    max_string_length: Optional[int] = None) -> Tuple[tf.Tensor, tf.Tensor]:
+  """Gets unique elements and their counts from the input `dataset`.
 
-  counts = tf.foldl(
-      accumulate_counts,
-      indices,
-      initializer=tf.zeros_like(elements, dtype=tf.int64))
+  Returns the same `elements` and `counts` as
+  `get_unique_elements_with_counts`, but merges the counts of each batch of
+  `dataset` into the counts of the previous batches, instead of first reading
+  all the elements of `dataset`. Memory is therefore proportional to the number
+  of unique elements rather than to the number of elements, at the cost of
+  merging the unique elements seen so far for every batch. Prefer this function
+  for large datasets with few unique elements and large batches.
 
-  return elements, counts
+  The input `dataset` must yield batched rank-1 tensors. This function reads
+  each coordinate of the tensor as an individual element.
+
+  Args:
+    dataset: A `tf.data.Dataset` to elements from. Element type must be
+      `tf.string`.
+    max_string_length: The maximum lenghth (in bytes) of strings in the dataset.
+      Strings longer than `max_string_length` will be truncated. Defaults to
+      `None`, which means there is no limit of the string length.
+
+  Returns:
+    elements: A rank-1 Tensor containing all the unique elements of the input
+    `dataset`, in the order of their first appearance.
+    counts: A rank-1 Tensor containing the counts for each of the elements in
+      `elements`.
+  Raises:
+    ValueError:
+      -- If the shape of elements in `dataset` is not rank 1
+      -- If `max_string_length` is not `None` and is less than 1.
+    TypeError: If `dataset.element_spec.dtype` must be `tf.string` is not
+      `tf.string`.
+  """
+  if dataset.element_spec.shape.rank != 1:
+    raise ValueError('The shape of elements in `dataset` must be of rank 1, '
+                     f' found rank = {dataset.element_spec.shape.rank}'
+                     ' instead.')
+
+  if max_string_length is not None and max_string_length < 1:
+    raise ValueError('`max_string_length` must be at least 1 when it is not'
+                     ' None.')
+
+  if dataset.element_spec.dtype != tf.string:
+    raise TypeError('`dataset.element_spec.dtype` must be `tf.string`, found'
+                    f' element type {dataset.element_spec.dtype}')
+
+  initial_state = (tf.constant([], dtype=tf.string),
+                   tf.constant([], dtype=tf.int64))
+
+  def accumulate_counts(state, element_batch):
+    elements, counts = state
+    if max_string_length is not None:
+      element_batch = tf.strings.substr(
+          element_batch, 0, max_string_length, unit='BYTE')
+    batch_elements, _, batch_counts = tf.unique_with_counts(
+        element_batch, out_idx=tf.int64)
+    # The previous elements come first, so that `tf.unique` keeps them at the
+    # same positions and appends the new elements in order of appearance.
+    elements, indices = tf.unique(
+        tf.concat([elements, batch_elements], axis=0), out_idx=tf.int64)
+    counts = tf.math.unsorted_segment_sum(
+        tf.concat([counts, batch_counts], axis=0), indices,
+        tf.size(elements, out_type=tf.int64))
+    return elements, counts
+
+  return dataset.reduce(
+      initial_state=initial_state, reduce_func=accumulate_counts)
 
 
 @tf.function
@@ -506,27 +574,32 @@ def to_stacked_tensor(ds: tf.data.Dataset) -> tf.Tensor:
   """
   py_typecheck.check_type(ds, tf.data.Dataset)
 
-  def expanded_empty_tensor(tensor_spec: tf.TensorSpec) -> tf.Tensor:
+  def empty_tensor_array(tensor_spec: tf.TensorSpec) -> tf.TensorArray:
     if not tensor_spec.shape.is_fully_defined():
       raise _TensorShapeNotFullyDefinedError()
-    return tf.zeros(shape=[0] + tensor_spec.shape, dtype=tensor_spec.dtype)
+    return tf.TensorArray(
+        dtype=tensor_spec.dtype,
+        size=0,
+        dynamic_size=True,
+        element_shape=tensor_spec.shape)
 
   with tf.name_scope('to_stacked_tensor'):
     try:
-      initial_state = tf.nest.map_structure(expanded_empty_tensor,
+      initial_state = tf.nest.map_structure(empty_tensor_array,
                                             ds.element_spec)
     except _TensorShapeNotFullyDefinedError as shape_not_defined_error:
       raise ValueError('Dataset elements must have fully-defined shapes. '
                        f'Found: {ds.element_spec}') from shape_not_defined_error
 
-  @tf.function
-  def append_tensor(stacked: tf.Tensor, tensor: tf.Tensor) -> tf.Tensor:
-    expanded_tensor = tf.expand_dims(tensor, axis=0)
-    return tf.concat((stacked, expanded_tensor), axis=0)
+  # Writing each element to a `tf.TensorArray` and stacking them once at the end
+  # copies each element a constant number of times, whereas concatenating the
+  # elements one at a time copies all previous elements for each new element.
+  def append_tensor(tensor_array: tf.TensorArray,
+                    tensor: tf.Tensor) -> tf.TensorArray:
+    return tensor_array.write(tensor_array.size(), tensor)
 
-  @tf.function
   def reduce_func(old_state, input_element):
-    tf.nest.assert_same_structure(old_state, input_element)
     return tf.nest.map_structure(append_tensor, old_state, input_element)
 
-  return ds.reduce(initial_state, reduce_func)
+  tensor_arrays = ds.reduce(initial_state, reduce_func)
+  return tf.nest.map_structure(lambda x: x.stack(), tensor_arrays)
@@ -0,0 +1,90 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `data_processing`.
+
+Measures how the latency of `to_stacked_tensor` and of counting unique string
+elements scales with the number of elements of the dataset. The latency is
+expected to grow linearly, i.e. the reported time per element should stay
+roughly constant across sizes.
+
+Run with:
+
+```
+bazel run :data_processing_benchmark -- --benchmarks=.
+```
+"""
+
+import collections
+import time
+
+import tensorflow as tf
+
+from tensorflow_federated.python.analytics import data_processing
+
+_DATASET_SIZES = (1000, 4000, 16000, 64000)
+_NUM_ITERS = 3
+_NUM_UNIQUE_ELEMENTS = 1000
+_BATCH_SIZE = 64
+
+
+def _create_dataset(num_elements):
+
+  def to_element(x):
+    return collections.OrderedDict(
+        value=tf.fill([4], x), key=tf.strings.as_string(x))
+
+  return tf.data.Dataset.range(num_elements).map(to_element)
+
+
+def _create_string_dataset(num_elements):
+  return tf.data.Dataset.range(num_elements).map(
+      lambda x: tf.strings.as_string(x % _NUM_UNIQUE_ELEMENTS)).batch(
+          _BATCH_SIZE)
+
+
+def _report_latency(benchmark, fn, ds, num_elements):
+  # Trace the function outside of the measurements.
+  fn(ds)
+  start_time = time.time()
+  for _ in range(_NUM_ITERS):
+    fn(ds)
+  wall_time = (time.time() - start_time) / _NUM_ITERS
+  benchmark.report_benchmark(
+      name='{}_{}_elements'.format(fn.__name__, num_elements),
+      iters=_NUM_ITERS,
+      wall_time=wall_time,
+      extras={'time_per_element_in_seconds': wall_time / num_elements})
+
+
+class DataProcessingBenchmark(tf.test.Benchmark):
+
+  def benchmark_to_stacked_tensor(self):
+    for num_elements in _DATASET_SIZES:
+      _report_latency(self, data_processing.to_stacked_tensor,
+                      _create_dataset(num_elements), num_elements)
+
+  def benchmark_get_unique_elements_with_counts(self):
+    for num_elements in _DATASET_SIZES:
+      _report_latency(self, data_processing.get_unique_elements_with_counts,
+                      _create_string_dataset(num_elements), num_elements)
+
+  def benchmark_get_unique_elements_with_counts_streaming(self):
+    for num_elements in _DATASET_SIZES:
+      _report_latency(
+          self, data_processing.get_unique_elements_with_counts_streaming,
+          _create_string_dataset(num_elements), num_elements)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -375,6 +375,53 @@ class DataProcessingTest(parameterized.TestCase,
     self.assert_histograms_all_close(unique_elements, counts, expected_elements,
                                      expected_counts)
 
+  @parameterized.named_parameters(
+      ('empty_dataset', tf.constant([], dtype=tf.string), 3, None, [], []),
+      ('string_dataset_batch_size_1', ['a', 'b', 'a', 'c', 'b', 'c', 'c'
+                                      ], 1, None, [b'a', b'b', b'c'], [2, 2, 3]),
+      ('string_dataset_batch_size_3', ['a', 'b', 'a', 'c', 'b', 'c', 'c'
+                                      ], 3, None, [b'a', b'b', b'c'], [2, 2, 3]),
+      ('string_dataset_max_len', ['abcd', 'abcde', 'bcd', 'bcdef', 'def'
+                                 ], 2, 3, [b'abc', b'bcd', b'def'], [2, 2, 1]),
+  )
+  def test_unique_elements_with_counts_streaming_returns_expected_values(
+      self, input_data, batch_size, max_string_length, expected_elements,
+      expected_counts):
+    ds = tf.data.Dataset.from_tensor_slices(input_data).batch(batch_size)
+
+    (unique_elements,
+     counts) = data_processing.get_unique_elements_with_counts_streaming(
+         ds, max_string_length=max_string_length)
+
+    self.assertAllEqual(unique_elements, expected_elements)
+    self.assertAllEqual(counts, expected_counts)
+
+  def test_unique_elements_with_counts_streaming_matches_non_streaming(self):
+    input_data = [str(i % 37) for i in range(1000)]
+    ds = tf.data.Dataset.from_tensor_slices(input_data).batch(64)
+
+    streaming_elements, streaming_counts = (
+        data_processing.get_unique_elements_with_counts_streaming(ds))
+    elements, counts = data_processing.get_unique_elements_with_counts(ds)
+
+    self.assertAllEqual(streaming_elements, elements)
+    self.assertAllEqual(streaming_counts, counts)
+
+  @parameterized.named_parameters(
+      ('rank_0', None, ValueError),
+      ('rank_2', [['a']], ValueError),
+      ('int_dataset', [1, 2], TypeError),
+  )
+  def test_unique_elements_with_counts_streaming_raises(self, input_data,
+                                                         expected_error):
+    if input_data is None:
+      ds = tf.data.Dataset.from_tensor_slices(['a', 'b'])
+    else:
+      ds = tf.data.Dataset.from_tensor_slices(input_data).batch(1)
+
+    with self.assertRaises(expected_error):
+      data_processing.get_unique_elements_with_counts_streaming(ds)
+
   @parameterized.named_parameters(
       ('rank_0', None),
       ('rank_2', 2),
@@ -665,6 +712,32 @@ class ToStackedTensorTest(tf.test.TestCase):
 
     self.assertAllEqual(list(ds), list(roundtripped))
 
+  def test_structured_elements(self):
+
+    def to_structure(x):
+      return x, collections.OrderedDict(
+          y=tf.fill([2], x), z=tf.strings.as_string(x))
+
+    ds = tf.data.Dataset.range(1000).map(to_structure)
+
+    encoded = data_processing.to_stacked_tensor(ds)
+
+    x, nested = encoded
+    self.assertAllEqual(x, list(range(1000)))
+    self.assertAllEqual(nested['y'], [[i, i] for i in range(1000)])
+    self.assertAllEqual(nested['z'], [str(i).encode() for i in range(1000)])
+
+  def test_empty_dataset_with_structured_elements(self):
+    ds = tf.data.Dataset.from_tensor_slices(
+        collections.OrderedDict(
+            x=tf.zeros([0], tf.int32), y=tf.zeros([0, 3], tf.float32)))
+
+    encoded = data_processing.to_stacked_tensor(ds)
+
+    self.assertEqual(encoded['x'].shape, [0])
+    self.assertEqual(encoded['y'].shape, [0, 3])
+    self.assertEqual(encoded['y'].dtype, tf.float32)
+
   def test_validates_input(self):
     not_a_dataset = [tf.constant(42)]
 
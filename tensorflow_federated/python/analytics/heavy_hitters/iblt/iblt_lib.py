@@ -178,6 +178,47 @@ def _inverse_mod(x, p, dtype=tf.int64):
   return x0 % p
 
 
+def _inverse_mod_vectorized(x, p, dtype=tf.int64):
+  """Calculates the multiplicative inverses of the elements of `x` modulo `p`.
+
+  Performs the extended euclidean algorithm of `_inverse_mod` on all elements
+  of `x` at once, until it terminates for every element.
+
+  Args:
+    x: A 1-D `tf.Tensor` of elements coprime with `p`.
+    p: A scalar `tf.Tensor`.
+    dtype: Data type to perform operations in. `x` and `p` are casted to this
+      dtype.
+
+  Returns:
+    A `tf.Tensor` `y` of the shape of `x` such that `x * y modulo p = 1`.
+
+  Raises:
+    tf.errors.InvalidArgumentError: if an element of `x` and `p` are not
+      coprime.
+  """
+  a = tf.cast(x, dtype=dtype)
+  p = tf.cast(p, dtype=dtype)
+  b = tf.fill(tf.shape(a), p)
+  x0, x1 = tf.zeros_like(a), tf.ones_like(a)
+
+  def cond(a, b, x0, x1):
+    del b, x0, x1
+    return tf.reduce_any(tf.math.not_equal(a, 0))
+
+  def body(a, b, x0, x1):
+    active = tf.math.not_equal(a, 0)
+    safe_a = tf.where(active, a, tf.ones_like(a))
+    q = tf.math.floordiv(b, safe_a)
+    a, b = tf.where(active, b % safe_a, a), tf.where(active, a, b)
+    x0, x1 = tf.where(active, x1, x0), tf.where(active, x0 - q * x1, x1)
+    return a, b, x0, x1
+
+  _, gcd, x0, _ = tf.while_loop(cond, body, loop_vars=(a, b, x0, x1))
+  tf.debugging.assert_equal(gcd, tf.ones_like(gcd), "gcd(x, p) != 1")
+  return x0 % p
+
+
 def _get_hash_check_salt(seed: int) -> str:
   return "hash_check_" + str(seed)
 
@@ -208,6 +249,7 @@ class IbltDecoder:
       hash_family: Optional[str] = None,
       hash_family_params: Optional[Dict[str, Union[int, float]]] = None,
       field_size: int = DEFAULT_FIELD_SIZE,
+      peel_in_batches: bool = True,
   ):
     """Initializes the IBLT Decoder.
 
@@ -236,8 +278,13 @@ class IbltDecoder:
       hash_family_params: An optional `dict` of parameters that the hash family
         hasher expects. Defaults are chosen based on capacity.
       field_size: The field size for all values in IBLT. Defaults to 2**31 - 1.
+      peel_in_batches: A boolean indicating whether to decode all the peelable
+        locations of the IBLT at once, in rounds until no location is
+        peelable, instead of one location at a time. Both decode the same
+        strings and counts, possibly in a different order. Defaults to `True`.
     """
     self._dtype = tf.int64
+    self.peel_in_batches = peel_in_batches
     self.iblt = iblt
     self.table_size, self.hash_family, self.hash_family_params = _internal_parameters(
         capacity, repetitions, hash_family, hash_family_params)
@@ -394,6 +441,192 @@ class IbltDecoder:
                                   count)
     return iblt, hash_indices, data_string, count
 
+  def _get_num_not_decoded(self, iblt):
+    """Returns the count of entries that could not be decoded."""
+    num_not_decoded = tf.reduce_sum(iblt[:, :, self.count]) / self.repetitions
+    return tf.cast(num_not_decoded, dtype=self._dtype)
+
+  def _decode_locations(self, locations):
+    """Tries to recover strings and counts from a batch of IBLT locations.
+
+    Vectorized version of `_decode`.
+
+    Args:
+      locations: A `tf.Tensor` of shape `(n, num_chunks + 2)` containing the
+        values of `n` IBLT locations with nonzero counts.
+
+    Returns:
+      (data_strings, counts, chunk_encodings, hash_checks, is_peelable) where
+      the i-th element of data_strings, counts and chunk_encodings are the
+      string, count and chunks decoded from the i-th location, hash_checks are
+      the hash checks of data_strings, and is_peelable is `True` for the
+      locations from which a string was decoded.
+    """
+    counts = locations[:, self.count]
+    inverse_counts = _inverse_mod_vectorized(
+        counts, self.field_size, dtype=self._dtype)
+    chunks = (locations[:, 0:self.num_chunks] *
+              tf.expand_dims(inverse_counts, axis=1)) % self.field_size
+    data_strings = self.chunker.decode_tensorflow(chunks)
+    hash_checks = tf.reshape(self._get_hash_check(data_strings), [-1])
+    is_peelable = tf.math.logical_and(
+        tf.strings.length(data_strings) > 0,
+        tf.math.equal(locations[:, self.check],
+                      counts * hash_checks % self.field_size))
+    return data_strings, counts, chunks, hash_checks, is_peelable
+
+  def _subtract_at_locations(self, iblt, indices, values):
+    """Subtracts `values` from the IBLT locations `indices`, modulo field size.
+
+    Several values may be subtracted from the same location. They are
+    subtracted one at a time, each followed by a reduction modulo the field
+    size, so that intermediate results cannot overflow even for field sizes
+    close to the maximum of `self._dtype`.
+
+    Args:
+      iblt: The IBLT data structure.
+      indices: A `tf.Tensor` of shape `(n, 2)` containing the repetition and
+        index of each location to subtract from.
+      values: A `tf.Tensor` of shape `(n, num_chunks + 2)` containing the
+        values to subtract, reduced modulo the field size.
+
+    Returns:
+      The IBLT data structure with `values` subtracted.
+    """
+
+    def cond(iblt, indices, values):
+      del iblt, values
+      return tf.size(indices) > 0
+
+    def body(iblt, indices, values):
+      # Subtract the first value of each distinct location, then the others.
+      location_ids = indices[:, 0] * self.table_size + indices[:, 1]
+      unique_ids, unique_indices = tf.unique(location_ids)
+      first_indices = tf.math.unsorted_segment_min(
+          tf.range(tf.size(location_ids)), unique_indices, tf.size(unique_ids))
+      iblt = tf.math.floormod(
+          tf.tensor_scatter_nd_sub(iblt, tf.gather(indices, first_indices),
+                                   tf.gather(values, first_indices)),
+          self.field_size)
+      remaining = tf.tensor_scatter_nd_update(
+          tf.ones([tf.size(location_ids)], dtype=tf.bool),
+          tf.expand_dims(first_indices, axis=1),
+          tf.zeros([tf.size(first_indices)], dtype=tf.bool))
+      return (iblt, tf.boolean_mask(indices, remaining),
+              tf.boolean_mask(values, remaining))
+
+    iblt, _, _ = tf.while_loop(
+        cond,
+        body,
+        loop_vars=(iblt, indices, values),
+        shape_invariants=(iblt.shape, tf.TensorShape([None, 2]),
+                          tf.TensorShape([None, self.num_chunks + 2])))
+    return iblt
+
+  def _peel_batches(self, iblt, iblt_values):
+    """Decodes and removes all peelable locations of the IBLT, in rounds.
+
+    In each round, all the locations of the IBLT are tested at once, the
+    distinct strings decoded from the peelable ones are all removed from the
+    IBLT, and the next round tests the resulting IBLT. Since the IBLT is
+    linear, this is equivalent to peeling the strings one at a time. Rounds
+    stop once no location is peelable.
+
+    Args:
+      iblt: The IBLT data structure, of shape `iblt_shape`.
+      iblt_values: A tensor of shape `(repetitions, table_size, ...)`, whose
+        value at each decoded location is also decoded and removed from the
+        locations of the decoded string.
+
+    Returns:
+      (iblt, iblt_values, out_strings, out_counts, out_values) where iblt and
+      iblt_values are what remains after peeling, and the i-th element of
+      out_strings, out_counts and out_values is the i-th decoded string, its
+      count and its value in iblt_values.
+    """
+    num_locations = self.repetitions * self.table_size
+    value_shape = tf.shape(iblt_values)[2:]
+    element_shape = tf.TensorShape([None])
+    out_strings = tf.TensorArray(
+        tf.string,
+        size=0,
+        dynamic_size=True,
+        infer_shape=False,
+        element_shape=element_shape)
+    out_counts = tf.TensorArray(
+        self._dtype,
+        size=0,
+        dynamic_size=True,
+        infer_shape=False,
+        element_shape=element_shape)
+    out_values = tf.TensorArray(
+        iblt_values.dtype,
+        size=0,
+        dynamic_size=True,
+        infer_shape=False,
+        element_shape=element_shape.concatenate(iblt_values.shape[2:]))
+
+    def cond(iblt, iblt_values, out_strings, out_counts, out_values,
+             num_peeled):
+      del iblt, iblt_values, out_strings, out_counts, out_values
+      return num_peeled > 0
+
+    def body(iblt, iblt_values, out_strings, out_counts, out_values,
+             num_peeled):
+      del num_peeled
+      locations = tf.reshape(iblt, [num_locations, self.num_chunks + 2])
+      values = tf.reshape(
+          iblt_values, tf.concat([[num_locations], value_shape], axis=0))
+      candidates = tf.reshape(
+          tf.where(tf.math.not_equal(locations[:, self.count], 0)), [-1])
+      (data_strings, counts, chunks, hash_checks,
+       is_peelable) = self._decode_locations(
+           tf.gather(locations, candidates))
+      candidates = tf.boolean_mask(candidates, is_peelable)
+      data_strings = tf.boolean_mask(data_strings, is_peelable)
+
+      # A string may be peelable from several locations. Keep its first one.
+      unique_strings, unique_indices = tf.unique(data_strings)
+      num_peeled = tf.size(unique_strings)
+      first_indices = tf.math.unsorted_segment_min(
+          tf.range(tf.size(data_strings)), unique_indices, num_peeled)
+      peeled = tf.gather(tf.where(is_peelable)[:, 0], first_indices)
+      counts = tf.gather(counts, peeled)
+      chunks = tf.gather(chunks, peeled)
+      hash_checks = tf.gather(hash_checks, peeled)
+      peeled_values = tf.gather(values, tf.gather(candidates, first_indices))
+
+      # Subtract each peeled string from its location in every repetition.
+      hash_indices = self.hyperedge_hasher.get_hash_indices_tf(unique_strings)
+      hash_indices = tf.reshape(
+          tf.cast(hash_indices[:, :, 1:], dtype=self._dtype), [-1, 2])
+      removed = tf.concat([
+          chunks * tf.expand_dims(counts, axis=1),
+          tf.expand_dims(counts, axis=1),
+          tf.expand_dims(counts * hash_checks, axis=1),
+      ],
+                          axis=1) % self.field_size
+      removed = tf.repeat(removed, self.repetitions, axis=0)
+      iblt = self._subtract_at_locations(iblt, hash_indices, removed)
+      removed_values = tf.repeat(peeled_values, self.repetitions, axis=0)
+      # Values removed from the same location are accumulated.
+      iblt_values = tf.tensor_scatter_nd_sub(iblt_values, hash_indices,
+                                             removed_values)
+
+      index = out_strings.size()
+      out_strings = out_strings.write(index, unique_strings)
+      out_counts = out_counts.write(index, counts)
+      out_values = out_values.write(index, peeled_values)
+      return iblt, iblt_values, out_strings, out_counts, out_values, num_peeled
+
+    iblt, iblt_values, out_strings, out_counts, out_values, _ = tf.while_loop(
+        cond,
+        body,
+        loop_vars=(iblt, iblt_values, out_strings, out_counts, out_values,
+                   tf.constant(1)))
+    return (iblt, iblt_values, out_strings.concat(), out_counts.concat(),
+            out_values.concat())
+
   @tf.function
   def get_freq_estimates_tf(self) -> Tuple[tf.Tensor, tf.Tensor, tf.Tensor]:
     """Decodes key-value pairs from an IBLT.
@@ -408,6 +641,11 @@ class IbltDecoder:
         tf.cast(self.iblt, dtype=self._dtype),
         tf.constant(self.field_size, dtype=self._dtype))
 
+    if self.peel_in_batches:
+      iblt, _, out_strings, out_counts, _ = self._peel_batches(
+          iblt, tf.zeros([self.repetitions, self.table_size, 0]))
+      return out_strings, out_counts, self._get_num_not_decoded(iblt)
+
     # Initialize queue with all locations that can be decoded:
     for repetition in tf.range(self.repetitions, dtype=self._dtype):
       for index in tf.range(self.table_size, dtype=self._dtype):
@@ -444,11 +682,8 @@ class IbltDecoder:
         loop_vars=(iblt, out_strings, out_counts),
         parallel_iterations=1)
 
-    # Count of entries that could not be decoded:
-    num_not_decoded = tf.reduce_sum(iblt[:, :, self.count]) / self.repetitions
-    num_not_decoded = tf.cast(num_not_decoded, dtype=self._dtype)
-
-    return out_strings.stack(), out_counts.stack(), num_not_decoded
+    return (out_strings.stack(), out_counts.stack(),
+            self._get_num_not_decoded(iblt))
 
   def get_freq_estimates(self):
     """Decodes key-value pairs from an IBLT.
@@ -746,6 +981,7 @@ def decode_iblt_tf(
     hash_family: Optional[str] = None,
     hash_family_params: Optional[Dict[str, Union[int, float]]] = None,
     field_size: int = DEFAULT_FIELD_SIZE,
+    peel_in_batches: bool = True,
 ) -> Tuple[tf.Tensor, tf.Tensor, tf.Tensor]:
   """Decode a IBLT sketch.
 
@@ -764,6 +1000,9 @@ def decode_iblt_tf(
     hash_family_params: An optional `dict` of parameters that the hash family
       hasher expects. Defaults are chosen based on capacity.
     field_size: The field size for all values in IBLT. Defaults to 2**31 - 1.
+    peel_in_batches: A boolean indicating whether to decode all the peelable
+      locations of the IBLT at once, in rounds. See `IbltDecoder`. Defaults to
+      `True`.
 
   Returns:
     `(out_strings, out_counts, num_not_decoded)` where `out_strings` is
@@ -779,5 +1018,6 @@ def decode_iblt_tf(
       repetitions=repetitions,
       hash_family=hash_family,
       hash_family_params=hash_family_params,
-      field_size=field_size)
+      field_size=field_size,
+      peel_in_batches=peel_in_batches)
   return iblt_decoder.get_freq_estimates_tf()
@@ -48,6 +48,7 @@ class IbltTest(tf.test.TestCase, parameterized.TestCase):
       hash_family: Optional[str] = None,
       hash_family_params: Optional[Dict[str, Union[int, float]]] = None,
       field_size: int = iblt_lib.DEFAULT_FIELD_SIZE,
+      peel_in_batches: bool = True,
   ) -> Dict[str, int]:
     iblt_decoder = iblt_lib.IbltDecoder(
         iblt=iblt_table,
@@ -58,6 +59,7 @@ class IbltTest(tf.test.TestCase, parameterized.TestCase):
         hash_family=hash_family,
         hash_family_params=hash_family_params,
         field_size=field_size,
+        peel_in_batches=peel_in_batches,
     )
 
     decoding_graph = iblt_decoder.get_freq_estimates_tf()
@@ -124,8 +126,35 @@ class IbltTest(tf.test.TestCase, parameterized.TestCase):
         field_size=field_size)
     self.assertAllClose(counter, counter_by_get_freq_estimates_tf)
 
+    # Peeling one location at a time decodes the same strings and counts.
+    counter_by_peeling_sequentially = self._get_decoded_results_by_get_freq_estimates_tf(
+        iblt_table=iblt_table,
+        capacity=capacity,
+        string_max_length=string_max_length,
+        seed=seed,
+        repetitions=repetitions,
+        hash_family=hash_family,
+        hash_family_params=hash_family_params,
+        field_size=field_size,
+        peel_in_batches=False)
+    self.assertAllClose(counter, counter_by_peeling_sequentially)
+
     return counter
 
+  @parameterized.named_parameters(
+      ('default_field_size', iblt_lib.DEFAULT_FIELD_SIZE),
+      ('large_field_size', 2**62 - 57),
+  )
+  def test_inverse_mod_vectorized(self, field_size):
+    x = tf.constant([1, 2, 3, 12345, field_size - 1], dtype=tf.int64)
+
+    inverses = iblt_lib._inverse_mod_vectorized(x, field_size)
+
+    expected_inverses = [
+        iblt_lib._inverse_mod(element, field_size) for element in x
+    ]
+    self.assertAllEqual(inverses, expected_inverses)
+
   @_graph_and_eager_test
   def test_decode_string_from_chunks(self):
     capacity = 10
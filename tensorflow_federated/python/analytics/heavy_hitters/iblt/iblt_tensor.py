@@ -150,6 +150,14 @@ class IbltTensorDecoder(iblt_lib.IbltDecoder):
 
     iblt_values = self.iblt_values
 
+    if self.peel_in_batches:
+      iblt, _, out_strings, out_counts, out_tensor_values = self._peel_batches(
+          iblt, tf.convert_to_tensor(iblt_values))
+      out_tensor_values = tf.reshape(out_tensor_values,
+                                     (-1,) + tuple(self.value_shape))
+      return (out_strings, out_counts, out_tensor_values,
+              self._get_num_not_decoded(iblt))
+
     # Initialize queue with all locations that can be decoded:
     for repetition in tf.range(self.repetitions, dtype=self._dtype):
       for index in tf.range(self.table_size, dtype=self._dtype):
@@ -172,12 +180,8 @@ class IbltTensorDecoder(iblt_lib.IbltDecoder):
                    out_tensor_values),
         parallel_iterations=1)
 
-    # Count of entries that could not be decoded:
-    num_not_decoded = tf.reduce_sum(iblt[:, :, self.count]) / self.repetitions
-    num_not_decoded = tf.cast(num_not_decoded, dtype=self._dtype)
-
-    return out_strings.stack(), out_counts.stack(), out_tensor_values.stack(
-    ), num_not_decoded
+    return (out_strings.stack(), out_counts.stack(), out_tensor_values.stack(),
+            self._get_num_not_decoded(iblt))
 
   def get_freq_estimates(
       self) -> Tuple[Dict[Optional[str], int], Dict[Optional[str], np.ndarray]]:
@@ -341,6 +345,7 @@ def decode_iblt_tensor_tf(
     hash_family: Optional[str] = None,
     hash_family_params: Optional[Dict[str, Union[int, float]]] = None,
     field_size: int = iblt_lib.DEFAULT_FIELD_SIZE,
+    peel_in_batches: bool = True,
 ) -> Tuple[tf.Tensor, tf.Tensor, tf.Tensor, tf.Tensor]:
   """Decode a IBLT sketch.
 
@@ -362,6 +367,9 @@ def decode_iblt_tensor_tf(
     hash_family_params: An optional `dict` of parameters that the hash family
       hasher expects. Defaults are chosen based on capacity.
     field_size: The field size for all values in IBLT. Defaults to 2**31 - 1.
+    peel_in_batches: A boolean indicating whether to decode all the peelable
+      locations of the IBLT at once, in rounds. See `IbltDecoder`. Defaults to
+      `True`.
 
   Returns:
     `(out_strings, out_counts, out_tensor_counts num_not_decoded)` where
@@ -381,5 +389,6 @@ def decode_iblt_tensor_tf(
       repetitions=repetitions,
       hash_family=hash_family,
       hash_family_params=hash_family_params,
-      field_size=field_size)
+      field_size=field_size,
+      peel_in_batches=peel_in_batches)
   return iblt_decoder.get_freq_estimates_tf()
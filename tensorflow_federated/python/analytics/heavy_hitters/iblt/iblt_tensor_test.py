@@ -49,6 +49,7 @@ class IbltTensorTest(tf.test.TestCase, parameterized.TestCase):
       hash_family: Optional[str] = None,
       hash_family_params: Optional[Dict[str, Union[int, float]]] = None,
       field_size: int = iblt_lib.DEFAULT_FIELD_SIZE,
+      peel_in_batches: bool = True,
   ) -> Tuple[Dict[Optional[str], int], Dict[Optional[str], Sequence[Any]]]:
     iblt_decoder = iblt_tensor.IbltTensorDecoder(
         iblt=iblt,
@@ -60,7 +61,8 @@ class IbltTensorTest(tf.test.TestCase, parameterized.TestCase):
         repetitions=repetitions,
         hash_family=hash_family,
         hash_family_params=hash_family_params,
-        field_size=field_size)
+        field_size=field_size,
+        peel_in_batches=peel_in_batches)
 
     if tf.executing_eagerly():
       # `get_freq_estimates` only works in eager mode.
@@ -130,6 +132,24 @@ class IbltTensorTest(tf.test.TestCase, parameterized.TestCase):
     self.assertAllClose(string_counts, counts_by_get_freq_estimates_tf)
     self.assertAllClose(string_tensor_values,
                         tensor_value_by_get_freq_estimates_tf)
+
+    # Peeling one location at a time decodes the same strings and values.
+    (counts_by_peeling_sequentially, tensor_value_by_peeling_sequentially
+    ) = self._get_decoded_results_by_get_freq_estimates_tf(
+        iblt=iblt,
+        iblt_values=iblt_values,
+        capacity=capacity,
+        string_max_length=string_max_length,
+        value_shape=value_shape,
+        seed=seed,
+        repetitions=repetitions,
+        hash_family=hash_family,
+        hash_family_params=hash_family_params,
+        field_size=field_size,
+        peel_in_batches=False)
+    self.assertAllClose(string_counts, counts_by_peeling_sequentially)
+    self.assertAllClose(string_tensor_values,
+                        tensor_value_by_peeling_sequentially)
     return string_counts, string_tensor_values
 
   @parameterized.named_parameters(
@@ -13,14 +13,12 @@
 # limitations under the License.
 """Decoder class for hierarchical histograms."""
 
-import math
-from typing import Tuple
+from typing import List, Sequence, Tuple
 
 import numpy as np
 
 import tensorflow as tf
 
-from tensorflow_federated.python.analytics.hierarchical_histogram import build_tree_from_leaf
 
 # TODO(b/194028367): Re-organize the below class into several functions.
 
@@ -48,6 +46,60 @@ def _check_hierarchical_histogram_shape(hierarchical_histogram):
       raise ValueError('Input hierarchical histogram is invalid.')
 
 
+def _children_sums(layer: np.ndarray, arity: int) -> np.ndarray:
+  """Returns the sums of the children of each node in the layer above."""
+  return np.reshape(layer, (-1, arity)).sum(axis=1)
+
+
+def _tree_from_leaves(leaves: np.ndarray, arity: int) -> List[np.ndarray]:
+  """Returns the consistent hierarchical histogram with the given leaves."""
+  layers = [leaves]
+  while len(layers[0]) > 1:
+    layers.insert(0, _children_sums(layers[0], arity))
+  return layers
+
+
+def _least_squares_consistent_leaves(layers: Sequence[np.ndarray],
+                                     arity: int) -> np.ndarray:
+  """Returns the leaves of the least-squares consistent hierarchical histogram.
+
+  Implements the two-pass algorithm of Theorem 3 in "Boosting the Accuracy of
+  Differentially Private Histograms Through Consistency. Michael Hay, Vibhor
+  Rastogi, Gerome Miklau, Dan Suciu", which computes, in time linear in the
+  number of nodes, the consistent tree closest to `layers` in L2 distance.
+
+  Args:
+    layers: The layers of a complete `arity`-ary hierarchical histogram, from
+      the root to the leaves.
+    arity: The branching factor of the hierarchical histogram.
+
+  Returns:
+    The leaves of the consistent hierarchical histogram.
+  """
+  num_layers = len(layers)
+  # Bottom-up pass: `estimates[layer]` is the weighted combination of the
+  # value of each node and of the estimates of its children. A node of height
+  # `height` has `arity**(height - 1)` leaves in its subtree.
+  estimates = [None] * num_layers
+  estimates[-1] = layers[-1]
+  for layer in range(num_layers - 2, -1, -1):
+    height = num_layers - layer
+    denominator = float(arity)**height - 1
+    node_weight = (float(arity)**height - float(arity)**(height - 1)) / (
+        denominator)
+    children_weight = (float(arity)**(height - 1) - 1) / denominator
+    estimates[layer] = (
+        node_weight * layers[layer] +
+        children_weight * _children_sums(estimates[layer + 1], arity))
+  # Top-down pass: spreads the difference between each consistent parent and
+  # the sum of the estimates of its children evenly across the children.
+  consistent = estimates[0]
+  for layer in range(1, num_layers):
+    residuals = consistent - _children_sums(estimates[layer], arity)
+    consistent = estimates[layer] + np.repeat(residuals / arity, arity)
+  return consistent
+
+
 class HierarchicalHistogramDecoder():
   """Hierarchical histogram decoder.
 
@@ -85,7 +137,12 @@ class HierarchicalHistogramDecoder():
         aggregation algorithm.
     """
 
-    self._hierarchical_histogram = hierarchical_histogram.to_list()
+    # Splits the flat values at the row boundaries, which is much faster than
+    # converting the hierarchical histogram to nested Python lists.
+    row_splits = hierarchical_histogram.row_splits.numpy()
+    self._hierarchical_histogram = np.split(
+        hierarchical_histogram.flat_values.numpy().astype(np.float64),
+        row_splits[1:-1])
     self._lower_bound = lower_bound
     self._upper_bound = upper_bound
     _check_hierarchical_histogram_shape(self._hierarchical_histogram)
@@ -95,9 +152,13 @@ class HierarchicalHistogramDecoder():
       self._arity = int(
           len(self._hierarchical_histogram[1]) /
           len(self._hierarchical_histogram[0]))
-    self._size = len(hierarchical_histogram[-1])
-    self._num_layers = math.ceil(math.log(self._size, self._arity)) + 1
+    self._size = len(self._hierarchical_histogram[-1])
+    self._num_layers = len(self._hierarchical_histogram)
     self._use_efficient = use_efficient
+    # The node estimates answering queries and their per-layer prefix sums,
+    # computed on the first query.
+    self._node_estimates = None
+    self._prefix_sums = None
 
   def _right_most_leaf(self, layer: int, index: int) -> int:
     """Returns the rightmost leaf from a node.
@@ -116,60 +177,13 @@ class HierarchicalHistogramDecoder():
     right_most_child = int((index + 1) * (self._arity**reverse_depth) - 1)
     return right_most_child
 
-  def _left_right_most_leaf(self, layer: int, index: int) -> Tuple[int, int]:
-    """Returns the leftmost and rightmost leaves from a node.
-
-    Returns a tuple of the leftmost and rightmost leaves within the subtree of
-    the node indexed by (layer, index).
-
-    Args:
-      layer: An `int` for the cross-layer index of a node (i.e. which layer the
-        node is in).
-      index: An `int` for the inner-layer index of a node (i.e. index^th node in
-        the layer).
-
-    Returns:
-      A tuple of two integers, representing the leftmost and rightmost leaves,
-      respectively.
-    """
-    reverse_depth = self._num_layers - 1 - layer
-    left_most_child = int(index * (self._arity**reverse_depth))
-    right_most_child = int((index + 1) * (self._arity**reverse_depth) - 1)
-    return left_most_child, right_most_child
-
-  def _flatten_hierarhical_hist(self):
-    """Flattens the hierarchical histogram."""
-    flattened_hh = []
-    for layer in range(self._num_layers):
-      flattened_hh.extend(self._hierarchical_histogram[layer])
-    return np.array(flattened_hh)
-
-  def _construct_matrix(self):
-    """Constructs the matrix for the least square optimization."""
-    row_size = (self._arity**self._num_layers - 1) // (self._arity - 1)
-    col_size = self._arity**(self._num_layers - 1)
-    matrix = np.zeros([row_size, col_size])
-
-    row_index = 0
-    for layer in range(self._num_layers):
-      node_num = self._arity**layer
-      for index in range(0, node_num):
-        left, right = self._left_right_most_leaf(layer, index)
-        for col_index in range(left, right + 1):
-          matrix[row_index][col_index] = 1
-        row_index += 1
-    return matrix
-
   def _check_consistency(self) -> bool:
     """Checks whether the hierarchical histogram is consistent."""
     for layer in range(self._num_layers - 1):
-      for index in range(self._arity**layer):
-        parent = self._hierarchical_histogram[layer][index]
-        children_sum = 0.
-        for child in range(index * self._arity, (index + 1) * self._arity):
-          children_sum += self._hierarchical_histogram[layer + 1][child]
-        if not np.isclose(parent, children_sum):
-          return False
+      children_sums = _children_sums(self._hierarchical_histogram[layer + 1],
+                                     self._arity)
+      if not np.allclose(self._hierarchical_histogram[layer], children_sums):
+        return False
     return True
 
   def enforce_consistency(self):
@@ -180,21 +194,27 @@ class HierarchicalHistogramDecoder():
     accuracy of range queries. When this function is invoked, `use_efficient`
     will be automatically set to `False` because using both optimizations does
     not further improve the accuracy.
+
+    The least square solution is computed in time linear in the number of nodes
+    with the two-pass algorithm of 'Boosting the Accuracy of Differentially
+    Private Histograms Through Consistency. Michael Hay, Vibhor Rastogi, Gerome
+    Miklau, Dan Suciu'.
     """
 
     # As consistency enforcement and Honaker trick together does not further
     # improve the query accuracy. Honaker trick will be automatically disabled
     # if this function is called.
     self._use_efficient = False
+    self._node_estimates = None
+    self._prefix_sums = None
 
     if self._check_consistency():
       return
 
-    ls_matrix = self._construct_matrix()
-    ls_rhs = self._flatten_hierarhical_hist()
-    consistent_hist = np.linalg.lstsq(ls_matrix, ls_rhs, rcond=None)[0]
-    self._hierarchical_histogram = build_tree_from_leaf.create_hierarchical_histogram(
-        consistent_hist, self._arity)
+    consistent_leaves = _least_squares_consistent_leaves(
+        self._hierarchical_histogram, self._arity)
+    self._hierarchical_histogram = _tree_from_leaves(consistent_leaves,
+                                                     self._arity)
 
   def _check_index(self, layer: int, index: int):
     """Checks whether a node index is legal.
@@ -215,63 +235,77 @@ class HierarchicalHistogramDecoder():
       raise ValueError(f'Inner-layer index {index} is out of valid range. '
                        f'Expected to be within [0, {self._arity**layer}).')
 
-  def _from_below(self, layer: int, index: int) -> float:
-    """Returns an estimate of a node value from its subtree.
-
-    Returns a more accurate estimation of a node using information from its
-    subtree. Used if `use_efficient=True`. See "'Efficient Use of
-    Differentially Private Binary Trees'. James Honaker". for more details.
+  def _efficient_node_estimates(self) -> List[np.ndarray]:
+    """Returns the estimates of all nodes with the Honaker trick.
 
-    Args:
-      layer: An `int` for the cross-layer index of a node (i.e. which layer the
-        node is in).
-      index: An `int` for the inner-layer index of a node (i.e. index^th node in
-        the layer).
+    Computes a more accurate estimation of each node using information from its
+    subtree and from the nodes not in its subtree. Used if
+    `use_efficient=True`. See "'Efficient Use of Differentially Private Binary
+    Trees'. James Honaker". for more details. The estimates of all nodes are
+    computed with one pass from the leaves to the root and one pass from the
+    root to the leaves.
 
     Returns:
-      A `float` representing the estimation of the value of the bin indexed by
-      (layer, index) using information from its subtree.
+      A list of `np.ndarray`s with the estimates of the nodes of each layer.
     """
-    if layer == self._num_layers - 1:
-      return self._hierarchical_histogram[layer][index]
-    else:
-      node_value = self._hierarchical_histogram[layer][index]
-      below_value = 0
-      for child_index in range(index * self._arity, (index + 1) * self._arity):
-        below_value += self._from_below(layer + 1, child_index)
-      weight = self._arity / (self._arity + 1)
-      return weight * node_value + (1 - weight) * below_value
-
-  def _from_above(self, layer: int, index: int) -> float:
-    """Returns an estimate of a node value from nodes not in its subtree.
-
-    Returns a more accurate estimation of a node using information from the
-    nodes not in its subtree. Used if `use_efficient=True`.  See "'Efficient Use
-    of Differentially Private Binary Trees'. James Honaker". for more details.
-
-    Args:
-      layer: An `int` for the cross-layer index of a node (i.e. which layer the
-        node is in).
-      index: An `int` for the inner-layer index of a node (i.e. index^th node in
-        the layer).
-
-    Returns:
-      A `float` representing the estimation of the value of the bin indexed by
-      (layer, index) using information from the nodes not in its subtree.
-    """
-    if layer == 0:
-      return self._hierarchical_histogram[layer][index]
-    else:
-      node_value = self._hierarchical_histogram[layer][index]
-      parent_index = index // self._arity
-      above_value = self._from_above(layer - 1, parent_index)
-      for sibling_index in range(parent_index * self._arity,
-                                 (parent_index + 1) * self._arity):
-        if sibling_index != index:
-          above_value -= self._from_below(layer, sibling_index)
-
-      weight = 1 / (3 - math.pow(self._arity, layer - self._num_layers + 1))
-      return weight * node_value + (1 - weight) * above_value
+    arity = self._arity
+    num_layers = self._num_layers
+    layers = self._hierarchical_histogram
+
+    # `from_below[layer]` estimates each node using information from its
+    # subtree.
+    from_below = [None] * num_layers
+    from_below[-1] = layers[-1]
+    below_weight = arity / (arity + 1)
+    for layer in range(num_layers - 2, -1, -1):
+      from_below[layer] = below_weight * layers[layer] + (
+          1 - below_weight) * _children_sums(from_below[layer + 1], arity)
+
+    def siblings_from_below(layer):
+      # The sum of the estimates from below of the siblings of each node.
+      return np.repeat(
+          _children_sums(from_below[layer], arity), arity) - from_below[layer]
+
+    # `from_above[layer]` estimates each node using information from the nodes
+    # not in its subtree.
+    from_above = [None] * num_layers
+    from_above[0] = layers[0]
+    for layer in range(1, num_layers):
+      above_weight = 1 / (3 - float(arity)**(layer - num_layers + 1))
+      above_value = np.repeat(from_above[layer - 1],
+                              arity) - siblings_from_below(layer)
+      from_above[layer] = above_weight * layers[layer] + (
+          1 - above_weight) * above_value
+
+    estimates = [from_below[0]]
+    for layer in range(1, num_layers):
+      above_value = np.repeat(from_above[layer - 1],
+                              arity) - siblings_from_below(layer)
+      below_variance = 1 / (2 - float(arity)**(layer - num_layers + 1))
+      above_variance = 1 / (3 - float(arity)**(layer - num_layers + 1))
+      weight = (1 / below_variance) / ((1 / below_variance) +
+                                       (1 / (below_variance + above_variance)))
+      estimates.append(weight * from_below[layer] +
+                       (1 - weight) * above_value)
+    return estimates
+
+  def _get_node_estimates(self) -> List[np.ndarray]:
+    """Returns the estimates of the nodes answering queries, per layer."""
+    if self._node_estimates is None:
+      if self._use_efficient:
+        self._node_estimates = self._efficient_node_estimates()
+      else:
+        self._node_estimates = self._hierarchical_histogram
+    return self._node_estimates
+
+  def _get_prefix_sums(self) -> List[np.ndarray]:
+    """Returns the prefix sums of the node estimates of each layer."""
+    if self._prefix_sums is None:
+      self._prefix_sums = [
+          np.concatenate([[0.], np.cumsum(layer)])
+          for layer in self._get_node_estimates()
+      ]
+    return self._prefix_sums
 
   def node_query(self, layer: int, index: int) -> float:
     """Queries the value of a bin in the hierarchical histogram.
@@ -291,59 +325,7 @@ class HierarchicalHistogramDecoder():
     """
 
     self._check_index(layer, index)
-
-    if not self._use_efficient:
-      return self._hierarchical_histogram[layer][index]
-    else:
-      below_value = self._from_below(layer, index)
-      if layer == 0:
-        return below_value
-      parent_index = index // self._arity
-      above_value = self._from_above(layer - 1, parent_index)
-      for sibling_index in range(parent_index * self._arity,
-                                 (parent_index + 1) * self._arity):
-        if sibling_index != index:
-          above_value -= self._from_below(layer, sibling_index)
-      below_variance = 1 / (2 - (self._arity**(layer - self._num_layers + 1)))
-      above_variance = 1 / (3 - (self._arity**(layer - self._num_layers + 1)))
-      weight = (1 / below_variance) / ((1 / below_variance) +
-                                       (1 / (below_variance + above_variance)))
-      return weight * below_value + (1 - weight) * above_value
-
-  def _range_query(self, left: int, right: int, layer: int,
-                   index: int) -> float:
-    """Recursively query the cumulative value within a range [left, right].
-
-    Args:
-      left: An `int` representing the inclusive left end of the range query.
-      right: An `int` representing the inclusive right end of the range query.
-      layer: An `int` for the cross-layer index of a node (i.e. which layer the
-        node is in).
-      index: An `int` for the inner-layer index of a node (i.e. index^th node in
-        the layer).
-
-    Returns:
-      A `float` representing the sum of the bins within the range of [left,
-      right] in the subtree of bin (layer, index).
-    """
-    left_most_leaf, right_most_leaf = self._left_right_most_leaf(layer, index)
-
-    if left > right_most_leaf or right < left_most_leaf or left > right:
-      return 0
-
-    elif left <= left_most_leaf and right >= right_most_leaf:
-      return self.node_query(layer, index)
-
-    else:
-      range_sum = 0
-      for child_index in range(index * self._arity, (index + 1) * self._arity):
-        interval_left, interval_right = self._left_right_most_leaf(
-            layer + 1, child_index)
-        interval_left = max(left, interval_left)
-        interval_right = min(right, interval_right)
-        range_sum += self._range_query(interval_left, interval_right, layer + 1,
-                                       child_index)
-      return range_sum
+    return float(self._get_node_estimates()[layer][index])
 
   def range_query(self, left: int, right: int) -> float:
     """Returns a range query of a hierarchical historgram.
@@ -365,7 +347,67 @@ class HierarchicalHistogramDecoder():
       raise ValueError(f'left {left} is expected to be less than or equal to '
                        f'right {right}.')
 
-    return self._range_query(left, right, 0, 0)
+    return float(self.range_queries([left], [right])[0])
+
+  def range_queries(self, lefts: Sequence[int],
+                    rights: Sequence[int]) -> np.ndarray:
+    """Returns a batch of range queries of a hierarchical historgram.
+
+    Each range is decomposed into the fewest nodes whose subtrees exactly cover
+    it, as for `range_query`. The nodes of each layer covered by a range are
+    contiguous, so their sum is computed from the prefix sums of the layer, and
+    all ranges are answered with a constant number of vectorized operations
+    per layer.
+
+    Args:
+      lefts: A sequence of `int`s representing the inclusive left ends of the
+        range queries.
+      rights: A sequence of `int`s of the same length as `lefts`, representing
+        the inclusive right ends of the range queries.
+
+    Returns:
+      A 1-D `np.ndarray` of `float`s representing the sum of the bins within
+      the range of [lefts[i], rights[i]], for each i.
+
+    Raises:
+      `ValueError` if `lefts` and `rights` have different shapes, or if a range
+      is outside the valid range or has its left end larger than its right end.
+    """
+    lefts = np.asarray(lefts, dtype=np.int64).reshape(-1)
+    rights = np.asarray(rights, dtype=np.int64).reshape(-1)
+    if lefts.shape != rights.shape:
+      raise ValueError(f'Expected the same number of left ends and right ends, '
+                       f'found {lefts.size} and {rights.size}.')
+    invalid = (lefts < 0) | (rights >= self._size)
+    if np.any(invalid):
+      i = np.argmax(invalid)
+      raise ValueError(f'[{lefts[i]}, {rights[i]}] is outside the valid range '
+                       f'[0, {self._size}).')
+    invalid = lefts > rights
+    if np.any(invalid):
+      i = np.argmax(invalid)
+      raise ValueError(f'left {lefts[i]} is expected to be less than or equal '
+                       f'to right {rights[i]}.')
+
+    arity = self._arity
+    prefix_sums = self._get_prefix_sums()
+    range_sums = np.zeros(lefts.shape, dtype=np.float64)
+    # `[lo, hi)` is the range of nodes of the current layer still to cover.
+    lo = lefts
+    hi = rights + 1
+    for layer in range(self._num_layers - 1, 0, -1):
+      # The nodes outside of `[aligned_lo, aligned_hi)` do not share their
+      # parent only with nodes in the range, so they are part of the
+      # decomposition; the nodes inside are covered by their parents.
+      aligned_lo = np.minimum(-(-lo // arity) * arity, hi)
+      aligned_hi = np.maximum(hi // arity * arity, aligned_lo)
+      layer_sums = prefix_sums[layer]
+      range_sums += layer_sums[aligned_lo] - layer_sums[lo]
+      range_sums += layer_sums[hi] - layer_sums[aligned_hi]
+      lo = aligned_lo // arity
+      hi = aligned_hi // arity
+    range_sums += prefix_sums[0][hi] - prefix_sums[0][lo]
+    return range_sums
 
   def _quantile_query(self, expected_weight: float, layer: int,
                       index: int) -> int:
@@ -0,0 +1,93 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `HierarchicalHistogramDecoder`.
+
+Measures the latency of enforcing the consistency of a noisy binary
+hierarchical histogram, and of answering a batch of random range queries, for
+2^10 to 2^20 leaves.
+
+Run with:
+
+```
+bazel run :hierarchical_histogram_decoder_benchmark -- --benchmarks=.
+```
+"""
+
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.analytics.hierarchical_histogram import build_tree_from_leaf
+from tensorflow_federated.python.analytics.hierarchical_histogram import hierarchical_histogram_decoder
+
+_ARITY = 2
+_LOG_NUM_LEAVES = (10, 12, 14, 16, 18, 20)
+_NUM_RANGE_QUERIES = 10000
+
+
+def _create_noisy_hierarchical_histogram(num_leaves):
+  random_state = np.random.RandomState(seed=0)
+  histogram = random_state.randint(0, 100, size=num_leaves)
+  layers = build_tree_from_leaf.create_hierarchical_histogram(
+      histogram, _ARITY)
+  noisy_values = np.concatenate(layers) + random_state.normal(
+      size=sum(len(layer) for layer in layers))
+  return tf.RaggedTensor.from_row_lengths(
+      noisy_values, [len(layer) for layer in layers])
+
+
+class HierarchicalHistogramDecoderBenchmark(tf.test.Benchmark):
+
+  def benchmark_enforce_consistency(self):
+    for log_num_leaves in _LOG_NUM_LEAVES:
+      hierarchical_histogram = _create_noisy_hierarchical_histogram(
+          2**log_num_leaves)
+      decoder = hierarchical_histogram_decoder.HierarchicalHistogramDecoder(
+          hierarchical_histogram, 0, 1)
+      start_time = time.time()
+      decoder.enforce_consistency()
+      self.report_benchmark(
+          name='enforce_consistency_2^{}_leaves'.format(log_num_leaves),
+          iters=1,
+          wall_time=time.time() - start_time)
+
+  def _benchmark_range_queries(self, use_efficient):
+    for log_num_leaves in _LOG_NUM_LEAVES:
+      num_leaves = 2**log_num_leaves
+      hierarchical_histogram = _create_noisy_hierarchical_histogram(num_leaves)
+      decoder = hierarchical_histogram_decoder.HierarchicalHistogramDecoder(
+          hierarchical_histogram, 0, 1, use_efficient=use_efficient)
+      random_state = np.random.RandomState(seed=1)
+      ends = random_state.randint(0, num_leaves, size=(2, _NUM_RANGE_QUERIES))
+      lefts, rights = np.min(ends, axis=0), np.max(ends, axis=0)
+      start_time = time.time()
+      decoder.range_queries(lefts, rights)
+      wall_time = time.time() - start_time
+      self.report_benchmark(
+          name='range_queries_{}_2^{}_leaves'.format(
+              'efficient' if use_efficient else 'raw', log_num_leaves),
+          iters=1,
+          wall_time=wall_time,
+          extras={'time_per_query_in_seconds': wall_time / _NUM_RANGE_QUERIES})
+
+  def benchmark_range_queries(self):
+    self._benchmark_range_queries(use_efficient=False)
+
+  def benchmark_range_queries_efficient(self):
+    self._benchmark_range_queries(use_efficient=True)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -91,6 +91,36 @@ class HierarchicalHistogramDecoderTest(tf.test.TestCase,
 
     self.assertTrue(decoder._check_consistency())
 
+  @parameterized.named_parameters([
+      ('binary_1_layer', 2, 1),
+      ('binary_5_layer', 2, 5),
+      ('ternary_4_layer', 3, 4),
+      ('quaternary_3_layer', 4, 3),
+  ])
+  def test_enforce_consistency_returns_least_squares_solution(
+      self, arity, depth):
+    noisy_hierarchical_histogram = _create_noisy_hierarchical_histogram(
+        arity, depth)
+    decoder = hierarchical_histogram_decoder.HierarchicalHistogramDecoder(
+        noisy_hierarchical_histogram, 0, arity**(depth - 1))
+    decoder.enforce_consistency()
+
+    # Each row of `matrix` sums the leaves in the subtree of a node.
+    num_leaves = arity**(depth - 1)
+    rows = []
+    for layer in range(depth):
+      subtree_size = arity**(depth - 1 - layer)
+      for index in range(arity**layer):
+        row = np.zeros([num_leaves])
+        row[index * subtree_size:(index + 1) * subtree_size] = 1
+        rows.append(row)
+    matrix = np.stack(rows)
+    expected_leaves = np.linalg.lstsq(
+        matrix, noisy_hierarchical_histogram.flat_values.numpy(),
+        rcond=None)[0]
+    leaves = [decoder.node_query(depth - 1, i) for i in range(num_leaves)]
+    self.assertAllClose(leaves, expected_leaves)
+
   @parameterized.named_parameters(
       ('test_1', tf.ragged.constant([[0., 0.]])),
       ('test_2', tf.ragged.constant([[0., 0.], [0., 0., 0., 0.]])),
@@ -187,6 +217,54 @@ class HierarchicalHistogramDecoderTest(tf.test.TestCase,
     with self.assertRaises(ValueError):
       decoder.range_query(left, right)
 
+  @parameterized.named_parameters(
+      ('binary_ne', 2, 5, False),
+      ('binary_e', 2, 5, True),
+      ('ternary_ne', 3, 4, False),
+      ('ternary_e', 3, 4, True),
+  )
+  def test_range_queries_match_range_query(self, arity, depth, use_efficient):
+    hierarchical_histogram = _create_noisy_hierarchical_histogram(arity, depth)
+    decoder = hierarchical_histogram_decoder.HierarchicalHistogramDecoder(
+        hierarchical_histogram,
+        0,
+        arity**(depth - 1),
+        use_efficient=use_efficient)
+    size = arity**(depth - 1)
+    lefts, rights = zip(*[(left, right)
+                          for left in range(size)
+                          for right in range(left, size)])
+
+    range_sums = decoder.range_queries(lefts, rights)
+
+    expected_range_sums = [
+        decoder.range_query(left, right)
+        for left, right in zip(lefts, rights)
+    ]
+    self.assertAllClose(range_sums, expected_range_sums)
+
+  def test_range_queries_on_consistent_histogram(self):
+    hierarchical_histogram = _create_hierarchical_histogram(arity=2, depth=4)
+    decoder = hierarchical_histogram_decoder.HierarchicalHistogramDecoder(
+        hierarchical_histogram, 0, 8)
+
+    range_sums = decoder.range_queries([0, 1, 3, 7], [7, 6, 3, 7])
+
+    self.assertAllClose(range_sums, [28, 21, 3, 7])
+
+  @parameterized.named_parameters(
+      ('outside_left', [-1, 0], [0, 1]),
+      ('outside_right', [0, 0], [1, 2]),
+      ('left_larger_than_right', [0, 1], [1, 0]),
+      ('mismatched_lengths', [0, 1], [1]),
+  )
+  def test_range_queries_raises(self, lefts, rights):
+    hierarchical_histogram = _create_hierarchical_histogram(arity=2, depth=2)
+    decoder = hierarchical_histogram_decoder.HierarchicalHistogramDecoder(
+        hierarchical_histogram, 0, 2)
+    with self.assertRaises(ValueError):
+      decoder.range_queries(lefts, rights)
+
   @parameterized.named_parameters(
       ('binary_0', 2, 0.0, (0, 1)),
       ('binary_0_25', 2, 0.25, (4, 5)),
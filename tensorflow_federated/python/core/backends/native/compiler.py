@@ -21,9 +21,10 @@ import tensorflow as tf
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.backends.mapreduce import transformations as mapreduce_transformations
 from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import compiled_computation_transforms
 from tensorflow_federated.python.core.impl.compiler import intrinsic_reductions
+from tensorflow_federated.python.core.impl.compiler import pass_manager
 from tensorflow_federated.python.core.impl.compiler import transformations
-from tensorflow_federated.python.core.impl.compiler import tree_transformations
 from tensorflow_federated.python.core.impl.computation import computation_impl
 
 
@@ -54,39 +55,35 @@ def transform_to_native_form(
   proto = computation_impl.ConcreteComputation.get_proto(comp)
   computation_building_block = building_blocks.ComputationBuildingBlock.from_proto(
       proto)
+
+  def _to_call_dominant(building_block):
+    return transformations.to_call_dominant(building_block), True
+
+  def _compile_local_subcomputations_to_tensorflow(building_block):
+    return mapreduce_transformations.compile_local_subcomputations_to_tensorflow(
+        building_block), True
+
+  passes = pass_manager.PassManager()
+  passes.add_global_pass('to_call_dominant', _to_call_dominant)
+  if transform_math_to_tf:
+    passes.add_global_pass('compile_local_subcomputations_to_tensorflow',
+                           _compile_local_subcomputations_to_tensorflow)
+  # The remaining passes only rewrite TensorFlow subcomputations, so they are
+  # fused into a single traversal.
+  if grappler_config is not None:
+    passes.add_local_pass(
+        'optimize_tf_graphs',
+        compiled_computation_transforms.TensorFlowOptimizer(grappler_config))
+  passes.add_local_pass('transform_tf_call_ops_disable_grappler',
+                        compiled_computation_transforms.DisableCallOpGrappler())
+  passes.add_local_pass('transform_tf_add_ids',
+                        compiled_computation_transforms.AddUniqueIDs())
   try:
     logging.debug('Compiling TFF computation to CDF.')
-    with tracing.span(
-        'transform_to_native_form', 'to_call_dominant', span=True):
-      call_dominant_form = transformations.to_call_dominant(
-          computation_building_block)
+    with tracing.span('transform_to_native_form', 'run_passes', span=True):
+      form_with_ids, _ = passes.run(computation_building_block)
     logging.debug('Computation compiled to:')
-    logging.debug(call_dominant_form.formatted_representation())
-    if transform_math_to_tf:
-      logging.debug('Compiling local computations to TensorFlow.')
-      with tracing.span(
-          'transform_to_native_form',
-          'compile_local_subcomputations_to_tensorflow',
-          span=True):
-        call_dominant_form = mapreduce_transformations.compile_local_subcomputations_to_tensorflow(
-            call_dominant_form)
-      logging.debug('Computation compiled to:')
-      logging.debug(call_dominant_form.formatted_representation())
-    if grappler_config is not None:
-      with tracing.span(
-          'transform_to_native_form', 'optimize_tf_graphs', span=True):
-        call_dominant_form, _ = transformations.optimize_tensorflow_graphs(
-            call_dominant_form, grappler_config)
-    with tracing.span(
-        'transform_to_native_form',
-        'transform_tf_call_ops_disable_grappler',
-        span=True):
-      disabled_grapler_form, _ = tree_transformations.transform_tf_call_ops_to_disable_grappler(
-          call_dominant_form)
-    with tracing.span(
-        'transform_to_native_form', 'transform_tf_add_ids', span=True):
-      form_with_ids, _ = tree_transformations.transform_tf_add_ids(
-          disabled_grapler_form)
+    logging.debug(form_with_ids.formatted_representation())
     return computation_impl.ConcreteComputation.from_building_block(
         form_with_ids)
   except ValueError as e:
@@ -22,22 +22,37 @@ from tensorflow_federated.python.core.backends.native import compiler
 from tensorflow_federated.python.core.backends.native import mergeable_comp_compiler
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.execution_contexts import async_execution_context
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.execution_contexts import mergeable_comp_execution_context
 from tensorflow_federated.python.core.impl.execution_contexts import sync_execution_context
 from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 
 
-def _make_basic_python_execution_context(*, executor_fn, compiler_fn,
-                                         asynchronous):
+def _make_basic_python_execution_context(*,
+                                         executor_fn,
+                                         compiler_fn,
+                                         asynchronous,
+                                         compilation_cache=None,
+                                         compiler_options=None,
+                                         max_concurrent_cardinalities=1,
+                                         max_concurrent_clients=None):
   """Wires executor function and compiler into sync or async context."""
 
   if not asynchronous:
     context = sync_execution_context.ExecutionContext(
-        executor_fn=executor_fn, compiler_fn=compiler_fn)
+        executor_fn=executor_fn,
+        compiler_fn=compiler_fn,
+        compilation_cache=compilation_cache,
+        compiler_options=compiler_options)
   else:
     context = async_execution_context.AsyncExecutionContext(
-        executor_fn=executor_fn, compiler_fn=compiler_fn)
+        executor_fn=executor_fn,
+        compiler_fn=compiler_fn,
+        compilation_cache=compilation_cache,
+        compiler_options=compiler_options,
+        max_concurrent_cardinalities=max_concurrent_cardinalities,
+        max_concurrent_clients=max_concurrent_clients)
 
   return context
 
@@ -48,7 +63,9 @@ def create_local_python_execution_context(
     clients_per_thread: int = 1,
     server_tf_device=None,
     client_tf_devices=tuple(),
-    reference_resolving_clients=False
+    reference_resolving_clients=False,
+    compilation_cache: Optional[
+        compilation_cache_lib.PersistentCompilationCache] = None
 ) -> sync_execution_context.ExecutionContext:
   """Creates an execution context that executes computations locally."""
   factory = executor_stacks.local_executor_factory(
@@ -65,7 +82,13 @@ def create_local_python_execution_context(
     return native_form
 
   return _make_basic_python_execution_context(
-      executor_fn=factory, compiler_fn=_compiler, asynchronous=False)
+      executor_fn=factory,
+      compiler_fn=_compiler,
+      asynchronous=False,
+      compilation_cache=compilation_cache,
+      compiler_options={
+          'transform_math_to_tf': not reference_resolving_clients,
+      })
 
 
 def set_local_python_execution_context(default_num_clients: int = 0,
@@ -73,7 +96,8 @@ def set_local_python_execution_context(default_num_clients: int = 0,
                                        clients_per_thread: int = 1,
                                        server_tf_device=None,
                                        client_tf_devices=tuple(),
-                                       reference_resolving_clients=False):
+                                       reference_resolving_clients=False,
+                                       compilation_cache=None):
   """Sets an execution context that executes computations locally."""
   context = create_local_python_execution_context(
       default_num_clients=default_num_clients,
@@ -82,6 +106,7 @@ def set_local_python_execution_context(default_num_clients: int = 0,
       server_tf_device=server_tf_device,
       client_tf_devices=client_tf_devices,
       reference_resolving_clients=reference_resolving_clients,
+      compilation_cache=compilation_cache,
   )
   context_stack_impl.context_stack.set_default_context(context)
 
@@ -92,9 +117,21 @@ def create_local_async_python_execution_context(
     clients_per_thread: int = 1,
     server_tf_device=None,
     client_tf_devices=tuple(),
-    reference_resolving_clients: bool = False
+    reference_resolving_clients: bool = False,
+    compilation_cache: Optional[
+        compilation_cache_lib.PersistentCompilationCache] = None,
+    max_concurrent_cardinalities: int = 1,
+    max_concurrent_clients: Optional[int] = None
 ) -> async_execution_context.AsyncExecutionContext:
-  """Creates a context that executes computations locally as coro functions."""
+  """Creates a context that executes computations locally as coro functions.
+
+  The local executor factory holds an executor per cardinalities, so up to
+  `max_concurrent_cardinalities` computations of distinct cardinalities can
+  run at once, with at most `max_concurrent_clients` clients across them. The
+  factory caches a bounded number of executors; an executor evicted from its
+  cache while a computation runs in it is released only once the computation
+  finishes, so `max_concurrent_cardinalities` should stay small.
+  """
   factory = executor_stacks.local_executor_factory(
       default_num_clients=default_num_clients,
       max_fanout=max_fanout,
@@ -109,7 +146,15 @@ def create_local_async_python_execution_context(
     return native_form
 
   return _make_basic_python_execution_context(
-      executor_fn=factory, compiler_fn=_compiler, asynchronous=True)
+      executor_fn=factory,
+      compiler_fn=_compiler,
+      asynchronous=True,
+      compilation_cache=compilation_cache,
+      compiler_options={
+          'transform_math_to_tf': not reference_resolving_clients,
+      },
+      max_concurrent_cardinalities=max_concurrent_cardinalities,
+      max_concurrent_clients=max_concurrent_clients)
 
 
 def set_local_async_python_execution_context(
@@ -118,7 +163,11 @@ def set_local_async_python_execution_context(
     clients_per_thread: int = 1,
     server_tf_device=None,
     client_tf_devices=tuple(),
-    reference_resolving_clients: bool = False):
+    reference_resolving_clients: bool = False,
+    compilation_cache: Optional[
+        compilation_cache_lib.PersistentCompilationCache] = None,
+    max_concurrent_cardinalities: int = 1,
+    max_concurrent_clients: Optional[int] = None):
   """Sets a context that executes computations locally as coro functions."""
   context = create_local_async_python_execution_context(
       default_num_clients=default_num_clients,
@@ -126,7 +175,10 @@ def set_local_async_python_execution_context(
       clients_per_thread=clients_per_thread,
       server_tf_device=server_tf_device,
       client_tf_devices=client_tf_devices,
-      reference_resolving_clients=reference_resolving_clients)
+      reference_resolving_clients=reference_resolving_clients,
+      compilation_cache=compilation_cache,
+      max_concurrent_cardinalities=max_concurrent_cardinalities,
+      max_concurrent_clients=max_concurrent_clients)
   context_stack_impl.context_stack.set_default_context(context)
 
 
@@ -213,7 +265,12 @@ def create_remote_async_python_execution_context(
     max_fanout: int = 100,
     default_num_clients: int = 0
 ) -> async_execution_context.AsyncExecutionContext:
-  """Creates context executing computations async via workers on `channels`."""
+  """Creates context executing computations async via workers on `channels`.
+
+  The remote executor factory reconstructs its executor whenever the
+  cardinalities of a computation change, so computations of distinct
+  cardinalities are run one at a time.
+  """
   factory = executor_stacks.remote_executor_factory(
       channels=channels,
       thread_pool_executor=thread_pool_executor,
@@ -22,6 +22,8 @@ import tensorflow as tf
 
 from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.backends.native import execution_contexts
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.tensorflow_libs import tensorflow_test_utils
 
 
@@ -174,6 +176,21 @@ class AsyncLocalExecutionContextTest(absltest.TestCase):
     result = asyncio.run(await_comps())
     self.assertEqual(result, [1, 2])
 
+  def test_asyncio_gather_different_cardinalities(self):
+    execution_contexts.set_local_async_python_execution_context(
+        max_concurrent_cardinalities=2, max_concurrent_clients=3)
+
+    @computations.federated_computation(
+        computation_types.at_clients(tf.int32))
+    def sum_at_clients(x):
+      return intrinsics.federated_sum(x)
+
+    async def await_comps():
+      return await asyncio.gather(sum_at_clients([1]), sum_at_clients([1, 2]))
+
+    result = asyncio.run(await_comps())
+    self.assertEqual(result, [1, 3])
+
 
 if __name__ == '__main__':
   absltest.main()
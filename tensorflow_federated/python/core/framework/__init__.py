@@ -23,10 +23,16 @@ from tensorflow_federated.python.core.impl.context_stack.context_base import Con
 from tensorflow_federated.python.core.impl.context_stack.context_stack_base import ContextStack
 from tensorflow_federated.python.core.impl.context_stack.get_context_stack import get_context_stack
 from tensorflow_federated.python.core.impl.context_stack.set_default_context import set_default_context
+from tensorflow_federated.python.core.impl.execution_contexts.compilation_cache import CompilationCacheStats
+from tensorflow_federated.python.core.impl.execution_contexts.compilation_cache import PersistentCompilationCache
 from tensorflow_federated.python.core.impl.execution_contexts.sync_execution_context import ExecutionContext
 from tensorflow_federated.python.core.impl.executors import executors_errors
 from tensorflow_federated.python.core.impl.executors.cardinalities_utils import merge_cardinalities
 from tensorflow_federated.python.core.impl.executors.cardinality_carrying_base import CardinalityCarrying
+from tensorflow_federated.python.core.impl.executors.client_placement import ClientPlacementPolicy
+from tensorflow_federated.python.core.impl.executors.client_placement import EvenClientPlacementPolicy
+from tensorflow_federated.python.core.impl.executors.client_placement import LatencyAdaptiveClientPlacementPolicy
+from tensorflow_federated.python.core.impl.executors.client_placement import WeightedClientPlacementPolicy
 from tensorflow_federated.python.core.impl.executors.data_backend_base import DataBackend
 from tensorflow_federated.python.core.impl.executors.data_descriptor import CardinalityFreeDataDescriptor
 from tensorflow_federated.python.core.impl.executors.data_descriptor import DataDescriptor
@@ -55,6 +61,7 @@ from tensorflow_federated.python.core.impl.executors.federated_resolving_strateg
 from tensorflow_federated.python.core.impl.executors.federating_executor import FederatingExecutor
 from tensorflow_federated.python.core.impl.executors.federating_executor import FederatingStrategy
 from tensorflow_federated.python.core.impl.executors.ingestable_base import Ingestable
+from tensorflow_federated.python.core.impl.executors.multiprocess_executor_factory import MultiprocessExecutorFactory
 from tensorflow_federated.python.core.impl.executors.reference_resolving_executor import ReferenceResolvingExecutor
 from tensorflow_federated.python.core.impl.executors.remote_executor import RemoteExecutor
 from tensorflow_federated.python.core.impl.executors.remote_executor_stub import RemoteExecutorStub
@@ -0,0 +1,237 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A pass manager running sequences of transformations of ASTs."""
+
+import time
+from typing import Callable, List, Optional, Union
+
+from absl import logging
+import attr
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import transformation_utils
+from tensorflow_federated.python.core.impl.compiler import tree_transformations
+
+TransformFnType = Callable[[building_blocks.ComputationBuildingBlock],
+                           transformation_utils.TransformReturnType]
+
+
+@attr.s(eq=False)
+class PassStats(object):
+  """Statistics of a pass run by a `PassManager`.
+
+  Attributes:
+    name: The name of the pass.
+    wall_time_seconds: The time spent in the pass. For local passes, this is
+      the time spent in the pass's `transform` during the fused traversal.
+    modified: Whether the pass modified the computation.
+    num_nodes_visited: The number of building blocks visited by the traversal
+      applying a local pass, which is shared by the fused local passes, or
+      `None` for global passes.
+    num_nodes_modified: The number of building blocks modified by a local
+      pass, or `None` for global passes.
+  """
+  name = attr.ib(type=str)
+  wall_time_seconds = attr.ib(type=float, default=0.0)
+  modified = attr.ib(type=bool, default=False)
+  num_nodes_visited = attr.ib(type=Optional[int], default=None)
+  num_nodes_modified = attr.ib(type=Optional[int], default=None)
+
+
+@attr.s(eq=False, frozen=True)
+class _GlobalPass(object):
+  name = attr.ib(type=str)
+  transform_fn = attr.ib(type=TransformFnType)
+
+
+@attr.s(eq=False, frozen=True)
+class _LocalPass(object):
+  name = attr.ib(type=str)
+  transform_spec = attr.ib(type=transformation_utils.TransformSpec)
+
+
+class _NodeCountingTransformSpec(transformation_utils.TransformSpec):
+  """Counts the building blocks visited by a traversal, leaving them as is."""
+
+  def __init__(self):
+    super().__init__()
+    self.num_nodes_visited = 0
+
+  def should_transform(self, comp):
+    return False
+
+  def transform(self, comp):
+    self.num_nodes_visited += 1
+    return comp, False
+
+
+class _InstrumentedTransformSpec(transformation_utils.TransformSpec):
+  """Applies the `TransformSpec` of a local pass, recording its `PassStats`."""
+
+  def __init__(self, transform_spec: transformation_utils.TransformSpec,
+               stats: PassStats):
+    super().__init__()
+    self._transform_spec = transform_spec
+    self._stats = stats
+
+  def should_transform(self, comp):
+    return self._transform_spec.should_transform(comp)
+
+  def transform(self, comp):
+    start_time = time.perf_counter()
+    comp, modified = self._transform_spec.transform(comp)
+    self._stats.wall_time_seconds += time.perf_counter() - start_time
+    if modified:
+      self._stats.num_nodes_modified += 1
+    return comp, modified
+
+
+class PassManager(object):
+  """Runs a sequence of passes over an AST, fusing adjacent local passes.
+
+  A pass is either global, a function transforming a whole computation, or
+  local, a `transformation_utils.TransformSpec` rewriting individual building
+  blocks without inspecting their context. Adjacent local passes are applied
+  together, in the order in which they were added, in a single postorder
+  traversal of the computation by `tree_transformations._apply_transforms`,
+  rather than in a traversal each.
+
+  Local passes should only be fused if applying them node by node is
+  equivalent to applying them one after the other to the whole computation,
+  e.g. if they only rewrite `building_blocks.CompiledComputation`s.
+
+  Each global pass and each traversal applying local passes runs in a
+  `tracing.span` under the scope `PassManager`, whose trace options include the
+  `PassStats` of its passes as `pass_stats`; these are populated by the time
+  the span exits. The statistics of the last run are also available through
+  the `stats` property.
+  """
+
+  def __init__(self):
+    self._passes: List[Union[_GlobalPass, _LocalPass]] = []
+    self._stats: List[PassStats] = []
+
+  def add_global_pass(self, name: str,
+                      transform_fn: TransformFnType) -> 'PassManager':
+    """Adds a pass transforming the whole computation.
+
+    Args:
+      name: The name of the pass, used in its statistics.
+      transform_fn: A function accepting a
+        `building_blocks.ComputationBuildingBlock` and returning a tuple of the
+        transformed building block and whether it was modified.
+
+    Returns:
+      This `PassManager`, so that calls can be chained.
+    """
+    py_typecheck.check_type(name, str)
+    py_typecheck.check_callable(transform_fn)
+    self._passes.append(_GlobalPass(name, transform_fn))
+    return self
+
+  def add_local_pass(
+      self, name: str,
+      transform_spec: transformation_utils.TransformSpec) -> 'PassManager':
+    """Adds a pass rewriting individual building blocks.
+
+    Args:
+      name: The name of the pass, used in its statistics.
+      transform_spec: A `transformation_utils.TransformSpec` whose `transform`
+        rewrites a single building block.
+
+    Returns:
+      This `PassManager`, so that calls can be chained.
+
+    Raises:
+      ValueError: If `transform_spec` is a global transform.
+    """
+    py_typecheck.check_type(name, str)
+    py_typecheck.check_type(transform_spec, transformation_utils.TransformSpec)
+    if transform_spec.global_transform:
+      raise ValueError('Expected a local transform for the pass {}; use '
+                       '`add_global_pass` instead.'.format(name))
+    self._passes.append(_LocalPass(name, transform_spec))
+    return self
+
+  @property
+  def stats(self) -> List[PassStats]:
+    """The `PassStats` of the passes of the last call to `run`."""
+    return list(self._stats)
+
+  def _run_global_pass(self, comp, global_pass):
+    stats = PassStats(name=global_pass.name)
+    with tracing.span(
+        'PassManager', global_pass.name, span=True, pass_stats=[stats]):
+      start_time = time.perf_counter()
+      comp, modified = global_pass.transform_fn(comp)
+      stats.wall_time_seconds = time.perf_counter() - start_time
+      stats.modified = modified
+    return comp, modified, [stats]
+
+  def _run_local_passes(self, comp, local_passes):
+    all_stats = [
+        PassStats(name=p.name, num_nodes_modified=0) for p in local_passes
+    ]
+    node_counter = _NodeCountingTransformSpec()
+    transforms = [node_counter] + [
+        _InstrumentedTransformSpec(p.transform_spec, s)
+        for p, s in zip(local_passes, all_stats)
+    ]
+    sub_scope = '+'.join(p.name for p in local_passes)
+    with tracing.span(
+        'PassManager', sub_scope, span=True, pass_stats=all_stats):
+      comp, modified = tree_transformations._apply_transforms(  # pylint: disable=protected-access
+          comp, transforms)
+      for stats in all_stats:
+        stats.num_nodes_visited = node_counter.num_nodes_visited
+        stats.modified = stats.num_nodes_modified > 0
+    return comp, modified, all_stats
+
+  def run(
+      self, comp: building_blocks.ComputationBuildingBlock
+  ) -> transformation_utils.TransformReturnType:
+    """Runs the passes over `comp`.
+
+    Args:
+      comp: The `building_blocks.ComputationBuildingBlock` to transform.
+
+    Returns:
+      A tuple of the transformed building block and whether any pass modified
+      it.
+    """
+    py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+    self._stats = []
+    modified = False
+    index = 0
+    while index < len(self._passes):
+      if isinstance(self._passes[index], _GlobalPass):
+        comp, pass_modified, stats = self._run_global_pass(
+            comp, self._passes[index])
+        index += 1
+      else:
+        end = index
+        while (end < len(self._passes) and
+               isinstance(self._passes[end], _LocalPass)):
+          end += 1
+        comp, pass_modified, stats = self._run_local_passes(
+            comp, self._passes[index:end])
+        index = end
+      modified = modified or pass_modified
+      self._stats.extend(stats)
+    for stats in self._stats:
+      logging.debug('Pass %s took %f seconds; modified: %s.', stats.name,
+                    stats.wall_time_seconds, stats.modified)
+    return comp, modified
@@ -0,0 +1,154 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import pass_manager
+from tensorflow_federated.python.core.impl.compiler import transformation_utils
+
+
+class _RenameData(transformation_utils.TransformSpec):
+
+  def __init__(self, old_uri, new_uri, global_transform=False):
+    super().__init__(global_transform=global_transform)
+    self._old_uri = old_uri
+    self._new_uri = new_uri
+
+  def should_transform(self, comp):
+    return comp.is_data() and comp.uri == self._old_uri
+
+  def transform(self, comp):
+    if not self.should_transform(comp):
+      return comp, False
+    return building_blocks.Data(self._new_uri, comp.type_signature), True
+
+
+class _SpanRecordingTracingProvider(tracing.TracingProvider):
+
+  def __init__(self):
+    self.sub_scopes = []
+    self.pass_stats = []
+
+  def span(self, scope, sub_scope, nonce, parent_span_yield, fn_args, fn_kwargs,
+           trace_opts):
+    del nonce, parent_span_yield, fn_args, fn_kwargs
+    yield None
+    if scope == 'PassManager':
+      self.sub_scopes.append(sub_scope)
+      self.pass_stats.append(trace_opts['pass_stats'])
+
+
+def _struct_of_data(*uris):
+  return building_blocks.Struct(
+      [building_blocks.Data(uri, tf.int32) for uri in uris])
+
+
+class PassManagerTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._tracing_provider = _SpanRecordingTracingProvider()
+    tracing.set_tracing_providers([self._tracing_provider])
+
+  def tearDown(self):
+    tracing.set_tracing_providers([tracing.LoggingTracingProvider()])
+    super().tearDown()
+
+  def test_applies_fused_local_passes_in_order(self):
+    passes = pass_manager.PassManager()
+    passes.add_local_pass('a_to_b', _RenameData('a', 'b'))
+    passes.add_local_pass('b_to_c', _RenameData('b', 'c'))
+
+    comp, modified = passes.run(_struct_of_data('a', 'b', 'd'))
+
+    self.assertTrue(modified)
+    self.assertEqual(comp.compact_representation(), '<c,c,d>')
+
+  def test_fuses_adjacent_local_passes_into_one_traversal(self):
+    passes = pass_manager.PassManager()
+    passes.add_local_pass('a_to_b', _RenameData('a', 'b'))
+    passes.add_local_pass('b_to_c', _RenameData('b', 'c'))
+
+    passes.run(_struct_of_data('a', 'b', 'd'))
+
+    self.assertEqual(self._tracing_provider.sub_scopes, ['a_to_b+b_to_c'])
+    a_to_b_stats, b_to_c_stats = passes.stats
+    self.assertEqual(a_to_b_stats.name, 'a_to_b')
+    self.assertEqual(a_to_b_stats.num_nodes_visited, 4)
+    self.assertEqual(a_to_b_stats.num_nodes_modified, 1)
+    self.assertTrue(a_to_b_stats.modified)
+    self.assertEqual(b_to_c_stats.name, 'b_to_c')
+    self.assertEqual(b_to_c_stats.num_nodes_visited, 4)
+    self.assertEqual(b_to_c_stats.num_nodes_modified, 2)
+    self.assertTrue(b_to_c_stats.modified)
+
+  def test_global_pass_separates_local_passes(self):
+    global_pass_inputs = []
+
+    def _global_pass(comp):
+      global_pass_inputs.append(comp.compact_representation())
+      return comp, False
+
+    passes = pass_manager.PassManager()
+    passes.add_local_pass('a_to_b', _RenameData('a', 'b'))
+    passes.add_global_pass('record', _global_pass)
+    passes.add_local_pass('b_to_c', _RenameData('b', 'c'))
+
+    comp, modified = passes.run(_struct_of_data('a'))
+
+    self.assertTrue(modified)
+    self.assertEqual(comp.compact_representation(), '<c>')
+    self.assertEqual(global_pass_inputs, ['<b>'])
+    self.assertEqual(self._tracing_provider.sub_scopes,
+                     ['a_to_b', 'record', 'b_to_c'])
+    global_pass_stats = passes.stats[1]
+    self.assertEqual(global_pass_stats.name, 'record')
+    self.assertFalse(global_pass_stats.modified)
+    self.assertIsNone(global_pass_stats.num_nodes_visited)
+    self.assertIsNone(global_pass_stats.num_nodes_modified)
+
+  def test_exposes_populated_stats_through_tracing(self):
+    passes = pass_manager.PassManager()
+    passes.add_local_pass('a_to_b', _RenameData('a', 'b'))
+
+    passes.run(_struct_of_data('a'))
+
+    (traced_stats,) = self._tracing_provider.pass_stats
+    self.assertEqual(traced_stats, passes.stats)
+    self.assertEqual(traced_stats[0].num_nodes_visited, 2)
+    self.assertGreaterEqual(traced_stats[0].wall_time_seconds, 0.0)
+
+  def test_returns_unmodified_comp(self):
+    passes = pass_manager.PassManager()
+    passes.add_local_pass('a_to_b', _RenameData('a', 'b'))
+    comp = _struct_of_data('c')
+
+    transformed_comp, modified = passes.run(comp)
+
+    self.assertFalse(modified)
+    self.assertIs(transformed_comp, comp)
+    self.assertFalse(passes.stats[0].modified)
+
+  def test_add_local_pass_raises_with_global_transform(self):
+    passes = pass_manager.PassManager()
+    with self.assertRaises(ValueError):
+      passes.add_local_pass('a_to_b',
+                            _RenameData('a', 'b', global_transform=True))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -45,9 +45,22 @@ from tensorflow_federated.python.core.impl.utils import tensorflow_utils
 ComputationProtoAndType = local_computation_factory_base.ComputationProtoAndType
 
 
+def _with_cache_key_id(
+    proto_and_type: ComputationProtoAndType) -> ComputationProtoAndType:
+  """Populates the `cache_key` of the computation in `proto_and_type`."""
+  proto, type_signature = proto_and_type
+  proto.tensorflow.cache_key.id = tensorflow_utils.compute_cache_key_id(proto)
+  return proto, type_signature
+
+
 class TensorFlowComputationFactory(
     local_computation_factory_base.LocalComputationFactory):
-  """An implementation of local computation factory for TF computations."""
+  """An implementation of local computation factory for TF computations.
+
+  The computations returned by this factory carry a content-derived
+  `cache_key`, so that executors can reuse the functions constructed for
+  identical computations without hashing the entire graph.
+  """
 
   def __init__(self):
     pass
@@ -55,7 +68,7 @@ class TensorFlowComputationFactory(
   def create_constant_from_scalar(
       self, value,
       type_spec: computation_types.Type) -> ComputationProtoAndType:
-    return create_constant(value, type_spec)
+    return _with_cache_key_id(create_constant(value, type_spec))
 
   def create_plus_operator(
       self, type_spec: computation_types.Type) -> ComputationProtoAndType:
@@ -63,7 +76,7 @@ class TensorFlowComputationFactory(
     def plus(a, b):
       return structure.map_structure(tf.add, a, b)
 
-    return create_binary_operator(plus, type_spec)
+    return _with_cache_key_id(create_binary_operator(plus, type_spec))
 
   def create_multiply_operator(
       self, type_spec: computation_types.Type) -> ComputationProtoAndType:
@@ -71,21 +84,23 @@ class TensorFlowComputationFactory(
     def multiply(a, b):
       return structure.map_structure(tf.multiply, a, b)
 
-    return create_binary_operator(multiply, type_spec)
+    return _with_cache_key_id(create_binary_operator(multiply, type_spec))
 
   def create_scalar_multiply_operator(
       self, operand_type: computation_types.Type,
       scalar_type: computation_types.TensorType) -> ComputationProtoAndType:
-    return create_binary_operator_with_upcast(
-        computation_types.StructType([(None, operand_type),
-                                      (None, scalar_type)]), tf.multiply)
+    return _with_cache_key_id(
+        create_binary_operator_with_upcast(
+            computation_types.StructType([(None, operand_type),
+                                          (None, scalar_type)]), tf.multiply))
 
   def create_indexing_operator(
       self,
       operand_type: computation_types.TensorType,
       index_type: computation_types.TensorType,
   ) -> ComputationProtoAndType:
-    return create_indexing_operator(operand_type, index_type)
+    return _with_cache_key_id(
+        create_indexing_operator(operand_type, index_type))
 
 
 def _tensorflow_comp(
@@ -30,8 +30,83 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 
 
+def _get_children(comp):
+  """Returns the building blocks `comp` is parameterized by, in order."""
+  if (comp.is_compiled_computation() or comp.is_data() or comp.is_intrinsic() or
+      comp.is_placement() or comp.is_reference()):
+    return ()
+  elif comp.is_selection():
+    return (comp.source,)
+  elif comp.is_struct():
+    return tuple(value for _, value in structure.iter_elements(comp))
+  elif comp.is_call():
+    if comp.argument is not None:
+      return (comp.function, comp.argument)
+    return (comp.function,)
+  elif comp.is_lambda():
+    return (comp.result,)
+  elif comp.is_block():
+    return tuple(value for _, value in comp.locals) + (comp.result,)
+  else:
+    raise NotImplementedError(
+        'Unrecognized computation building block: {}'.format(str(comp)))
+
+
+def _replace_children(comp, children, preserve_container_type=True):
+  """Returns a copy of `comp` parameterized by `children` instead."""
+  if comp.is_selection():
+    return building_blocks.Selection(children[0], comp.name, comp.index)
+  elif comp.is_struct():
+    elements = [(name, value) for (name, _), value in zip(
+        structure.iter_elements(comp), children)]
+    if preserve_container_type:
+      return building_blocks.Struct(
+          elements, container_type=comp.type_signature.python_container)
+    return building_blocks.Struct(elements)
+  elif comp.is_call():
+    argument = children[1] if len(children) > 1 else None
+    return building_blocks.Call(children[0], argument)
+  elif comp.is_lambda():
+    return building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
+                                  children[0])
+  elif comp.is_block():
+    variables = [
+        (name, value) for (name, _), value in zip(comp.locals, children)
+    ]
+    return building_blocks.Block(variables, children[-1])
+  else:
+    raise NotImplementedError(
+        'Unrecognized computation building block: {}'.format(str(comp)))
+
+
+class _TraversalFrame(object):
+  """A building block on the explicit stack of a traversal.
+
+  Traversals keep an explicit stack of frames rather than recursing, so that
+  deeply nested computations do not exceed Python's recursion limit.
+  """
+
+  __slots__ = ('comp', 'children', 'transformed_children', 'children_modified')
+
+  def __init__(self, comp):
+    self.comp = comp
+    self.children = _get_children(comp)
+    self.transformed_children = []
+    self.children_modified = False
+
+  def has_next_child(self):
+    return len(self.transformed_children) < len(self.children)
+
+  def next_child(self):
+    return self.children[len(self.transformed_children)]
+
+  def add_transformed_child(self, child, modified):
+    self.transformed_children.append(child)
+    self.children_modified = self.children_modified or modified
+
+
 def transform_postorder(comp, transform):
-  """Traverses `comp` recursively postorder and replaces its constituents.
+  """Traverses `comp` postorder and replaces its constituents.
 
   For each element of `comp` viewed as an expression tree, the transformation
   `transform` is applied first to building blocks it is parameterized by, then
@@ -69,59 +144,21 @@ def transform_postorder(comp, transform):
       that is currently not recognized.
   """
   py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
-  if (comp.is_compiled_computation() or comp.is_data() or comp.is_intrinsic() or
-      comp.is_placement() or comp.is_reference()):
-    return transform(comp)
-  elif comp.is_selection():
-    source, source_modified = transform_postorder(comp.source, transform)
-    if source_modified:
-      comp = building_blocks.Selection(source, comp.name, comp.index)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or source_modified
-  elif comp.is_struct():
-    elements = []
-    elements_modified = False
-    for key, value in structure.iter_elements(comp):
-      value, value_modified = transform_postorder(value, transform)
-      elements.append((key, value))
-      elements_modified = elements_modified or value_modified
-    if elements_modified:
-      comp = building_blocks.Struct(
-          elements, container_type=comp.type_signature.python_container)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or elements_modified
-  elif comp.is_call():
-    fn, fn_modified = transform_postorder(comp.function, transform)
-    if comp.argument is not None:
-      arg, arg_modified = transform_postorder(comp.argument, transform)
-    else:
-      arg, arg_modified = (None, False)
-    if fn_modified or arg_modified:
-      comp = building_blocks.Call(fn, arg)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or fn_modified or arg_modified
-  elif comp.is_lambda():
-    result, result_modified = transform_postorder(comp.result, transform)
-    if result_modified:
-      comp = building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
-                                    result)
+  stack = [_TraversalFrame(comp)]
+  while True:
+    frame = stack[-1]
+    if frame.has_next_child():
+      stack.append(_TraversalFrame(frame.next_child()))
+      continue
+    stack.pop()
+    comp = frame.comp
+    if frame.children_modified:
+      comp = _replace_children(comp, frame.transformed_children)
     comp, comp_modified = transform(comp)
-    return comp, comp_modified or result_modified
-  elif comp.is_block():
-    variables = []
-    variables_modified = False
-    for key, value in comp.locals:
-      value, value_modified = transform_postorder(value, transform)
-      variables.append((key, value))
-      variables_modified = variables_modified or value_modified
-    result, result_modified = transform_postorder(comp.result, transform)
-    if variables_modified or result_modified:
-      comp = building_blocks.Block(variables, result)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or variables_modified or result_modified
-  else:
-    raise NotImplementedError(
-        'Unrecognized computation building block: {}'.format(str(comp)))
+    modified = comp_modified or frame.children_modified
+    if not stack:
+      return comp, modified
+    stack[-1].add_transformed_child(comp, modified)
 
 
 TransformReturnType = Tuple[building_blocks.ComputationBuildingBlock, bool]
@@ -167,63 +204,28 @@ def transform_preorder(
   inner_comp, modified = transform(comp)
   if modified:
     return inner_comp, modified
-  if (inner_comp.is_compiled_computation() or inner_comp.is_data() or
-      inner_comp.is_intrinsic() or inner_comp.is_placement() or
-      inner_comp.is_reference()):
-    return inner_comp, modified
-  elif inner_comp.is_lambda():
-    transformed_result, result_modified = transform_preorder(
-        inner_comp.result, transform)
-    if not (modified or result_modified):
-      return inner_comp, False
-    return building_blocks.Lambda(inner_comp.parameter_name,
-                                  inner_comp.parameter_type,
-                                  transformed_result), True
-  elif inner_comp.is_struct():
-    elements_modified = False
-    elements = []
-    for name, val in structure.iter_elements(inner_comp):
-      result, result_modified = transform_preorder(val, transform)
-      elements_modified = elements_modified or result_modified
-      elements.append((name, result))
-    if not (modified or elements_modified):
-      return inner_comp, False
-    return building_blocks.Struct(elements), True
-  elif inner_comp.is_selection():
-    transformed_source, source_modified = transform_preorder(
-        inner_comp.source, transform)
-    if not (modified or source_modified):
-      return inner_comp, False
-    return building_blocks.Selection(transformed_source, inner_comp.name,
-                                     inner_comp.index), True
-  elif inner_comp.is_call():
-    transformed_fn, fn_modified = transform_preorder(inner_comp.function,
-                                                     transform)
-    if inner_comp.argument is not None:
-      transformed_arg, arg_modified = transform_preorder(
-          inner_comp.argument, transform)
+  stack = [_TraversalFrame(inner_comp)]
+  while True:
+    frame = stack[-1]
+    if frame.has_next_child():
+      inner_comp, modified = transform(frame.next_child())
+      if modified:
+        frame.add_transformed_child(inner_comp, modified)
+      else:
+        stack.append(_TraversalFrame(inner_comp))
+      continue
+    stack.pop()
+    if frame.children_modified:
+      comp = _replace_children(
+          frame.comp,
+          frame.transformed_children,
+          preserve_container_type=False)
+      modified = True
     else:
-      transformed_arg = None
-      arg_modified = False
-    if not (modified or fn_modified or arg_modified):
-      return inner_comp, False
-    return building_blocks.Call(transformed_fn, transformed_arg), True
-  elif inner_comp.is_block():
-    transformed_variables = []
-    values_modified = False
-    for key, value in inner_comp.locals:
-      transformed_value, value_modified = transform_preorder(value, transform)
-      transformed_variables.append((key, transformed_value))
-      values_modified = values_modified or value_modified
-    transformed_result, result_modified = transform_preorder(
-        inner_comp.result, transform)
-    if not (modified or values_modified or result_modified):
-      return inner_comp, False
-    return building_blocks.Block(transformed_variables,
-                                 transformed_result), True
-  else:
-    raise NotImplementedError(
-        'Unrecognized computation building block: {}'.format(str(inner_comp)))
+      comp, modified = frame.comp, False
+    if not stack:
+      return comp, modified
+    stack[-1].add_transformed_child(comp, modified)
 
 
 def transform_postorder_with_symbol_bindings(comp, transform, symbol_tree):
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
 from absl.testing import absltest
 from absl.testing import parameterized
 import tensorflow as tf
@@ -165,6 +167,22 @@ def _get_number_of_nodes_via_transform_preorder(comp, predicate=None):
   return count
 
 
+def _construct_deeply_nested_calls(depth):
+  """Returns `depth` nested calls of an identity function on a reference."""
+  identity = building_blocks.Lambda(
+      'y', tf.int32, building_blocks.Reference('y', tf.int32))
+  comp = building_blocks.Reference('x', tf.int32)
+  for _ in range(depth):
+    comp = building_blocks.Call(identity, comp)
+  return comp
+
+
+def _rename_x_to_z(comp):
+  if comp.is_reference() and comp.name == 'x':
+    return building_blocks.Reference('z', comp.type_signature), True
+  return comp, False
+
+
 class TransformationUtilsTest(parameterized.TestCase):
 
   def test_transform_postorder_fails_on_none_comp(self):
@@ -1500,6 +1518,24 @@ class TransformationUtilsTest(parameterized.TestCase):
     self.assertEqual(references, constructed_tree)
 
 
+  def test_transform_postorder_does_not_recurse_on_deeply_nested_comp(self):
+    depth = sys.getrecursionlimit() * 2
+    comp = _construct_deeply_nested_calls(depth)
+
+    transformed_comp, modified = transformation_utils.transform_postorder(
+        comp, _rename_x_to_z)
+
+    self.assertTrue(modified)
+    innermost_comp = transformed_comp
+    for _ in range(depth):
+      innermost_comp = innermost_comp.argument
+    self.assertEqual(innermost_comp.name, 'z')
+    # Each call has a lambda with a reference as its function.
+    self.assertEqual(
+        _get_number_of_nodes_via_transform_postorder(transformed_comp),
+        depth * 3 + 1)
+
+
 class TransformPreorderTest(parameterized.TestCase):
 
   def test_transform_preorder_fails_on_none_comp(self):
@@ -1687,6 +1723,23 @@ class TransformPreorderTest(parameterized.TestCase):
     self.assertIsInstance(data_replaced[0], building_blocks.Reference)
 
 
+  def test_transform_preorder_does_not_recurse_on_deeply_nested_comp(self):
+    depth = sys.getrecursionlimit() * 2
+    comp = _construct_deeply_nested_calls(depth)
+
+    transformed_comp, modified = transformation_utils.transform_preorder(
+        comp, _rename_x_to_z)
+
+    self.assertTrue(modified)
+    innermost_comp = transformed_comp
+    for _ in range(depth):
+      innermost_comp = innermost_comp.argument
+    self.assertEqual(innermost_comp.name, 'z')
+    self.assertEqual(
+        _get_number_of_nodes_via_transform_preorder(transformed_comp),
+        depth * 3 + 1)
+
+
 class GetUniqueNamesTest(absltest.TestCase):
 
   def test_raises_on_none(self):
@@ -39,7 +39,8 @@ def _apply_transforms(comp, transforms):
   capability to chain arbitrary transformations in this way, since the
   application of one transformation may cause the resulting AST to violate the
   assumptions of another. This function should be used quite selectively and
-  considered extensively in order to avoid such subtle issues.
+  considered extensively in order to avoid such subtle issues; it is used by
+  `pass_manager.PassManager` to fuse the local passes it is configured with.
 
   Args:
     comp: An instance of `building_blocks.ComputationBuildingBlock` to transform
@@ -399,17 +400,6 @@ def strip_placement(comp):
   return transformation_utils.transform_postorder(comp, _transform)
 
 
-def transform_tf_call_ops_to_disable_grappler(comp):
-  """Performs grappler disabling on TensorFlow subcomputations."""
-  return _apply_transforms(
-      comp, compiled_computation_transforms.DisableCallOpGrappler())
-
-
-def transform_tf_add_ids(comp):
-  """Adds unique IDs to each TensorFlow subcomputations."""
-  return _apply_transforms(comp, compiled_computation_transforms.AddUniqueIDs())
-
-
 def check_disallowed_ops(
     comp: building_blocks.ComputationBuildingBlock,
     disallowed_op_names: FrozenSet[str]) -> TransformReturnType:
@@ -22,6 +22,7 @@ import asyncio
 import contextlib
 from typing import Any
 from typing import Callable
+from typing import Mapping
 from typing import Optional
 
 import tensorflow as tf
@@ -32,14 +33,17 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.impl.context_stack import context_base
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.execution_contexts import compiler_pipeline
 from tensorflow_federated.python.core.impl.executors import cardinalities_utils
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
+from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_value_base
 from tensorflow_federated.python.core.impl.executors import executors_errors
 from tensorflow_federated.python.core.impl.executors import ingestable_base
 from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
 from tensorflow_federated.python.core.impl.types import type_conversions
 from tensorflow_federated.python.core.impl.types import typed_object
 
@@ -144,31 +148,71 @@ async def _invoke(executor, comp, arg, result_type: computation_types.Type):
   return type_conversions.type_to_py_container(result_val, result_type)
 
 
+def _get_hashable_key(cardinalities: executor_factory.CardinalitiesType):
+  return tuple(sorted((str(k), v) for k, v in cardinalities.items()))
+
+
 # TODO(b/223898183): If we implement support for multiple concurrent executors
 # in Python as well as C++, this locking context will have no use and can be
 # deleted.
 class SingleCardinalityAsyncContext(context_base.Context):
   """Implements shared logic to ensure instance-consistent cardinalities.
 
-  This context holds a stack which represents ongoing computations, as well as
-  an integer representing the cardinalities of these computations. An
-  asynchronous context manager is used to control access to the underlying
-  executor factory, ensuring that computations which are of the same
-  cardinalities can run concurrently, but computations of different
-  cardinalities must wait until all existing invocations are finished.
-  Therefore the concurrency mechanisms notify under two conditions: an
-  invocation has completed (so the invocation stack may be empty, and thus
-  computations with new cardinalities may be executed) or cardinalities have
-  changed (so that a computation which could not run before due to conflicting
-  cardinalities with the underway invocations may now run).
+  This context keeps track of the ongoing invocations, by the cardinalities of
+  the executors they run in. An asynchronous context manager is used to
+  control access to the underlying executor factory, ensuring that
+  computations which are of the same cardinalities can run concurrently, but
+  computations of new cardinalities must wait until they can be admitted.
+  Therefore the concurrency mechanisms notify when an invocation has completed,
+  as this may allow computations with new cardinalities to be executed.
+
+  By default, computations of different cardinalities never run concurrently;
+  a computation of new cardinalities waits until all existing invocations are
+  finished. Executor factories which can host executors of several
+  cardinalities at once, such as those returned by
+  `executor_stacks.local_executor_factory`, which keep an executor per
+  cardinalities, can allow up to `max_concurrent_cardinalities` distinct
+  cardinalities to run at once. The memory used by concurrent executors can
+  be bounded through `max_concurrent_clients`, the maximum total number of
+  clients across the distinct cardinalities running at once.
   """
 
-  def __init__(self):
+  def __init__(self,
+               max_concurrent_cardinalities: int = 1,
+               max_concurrent_clients: Optional[int] = None):
+    """Initializes the context.
+
+    Args:
+      max_concurrent_cardinalities: The maximum number of distinct
+        cardinalities of concurrently running invocations.
+      max_concurrent_clients: The optional maximum total number of clients of
+        the distinct cardinalities of concurrently running invocations. An
+        invocation is always admitted if no other invocation is running, even
+        if its cardinalities alone exceed this bound.
+
+    Raises:
+      ValueError: If `max_concurrent_cardinalities` or `max_concurrent_clients`
+        is not positive.
+    """
+    py_typecheck.check_type(max_concurrent_cardinalities, int)
+    if max_concurrent_cardinalities < 1:
+      raise ValueError('Expected a positive `max_concurrent_cardinalities`, '
+                       'found {}.'.format(max_concurrent_cardinalities))
+    if max_concurrent_clients is not None:
+      py_typecheck.check_type(max_concurrent_clients, int)
+      if max_concurrent_clients < 1:
+        raise ValueError('Expected a positive `max_concurrent_clients`, found '
+                         '{}.'.format(max_concurrent_clients))
+    self._max_concurrent_cardinalities = max_concurrent_cardinalities
+    self._max_concurrent_clients = max_concurrent_clients
     # Delay instantiation of the cardinalities condition to allow it to be
     # instantiated only when an event loop is set to running.
     self._cardinalities_condition = None
-    self._invocation_stack = []
-    self._current_cardinalities = None
+    # Maps the keys of the cardinalities of running invocations to the number
+    # of such invocations.
+    self._num_invocations_by_cardinalities = {}
+    self._num_clients_by_cardinalities = {}
+    self._clean_up_pending = False
 
   @property
   def cardinalities_condition(self):
@@ -176,46 +220,64 @@ class SingleCardinalityAsyncContext(context_base.Context):
       self._cardinalities_condition = asyncio.Condition()
     return self._cardinalities_condition
 
-  async def _acquire_and_set_cardinalities(self, cardinalities):
+  def _can_admit(self, key, num_clients):
+    if self._clean_up_pending:
+      return False
+    if not self._num_invocations_by_cardinalities:
+      return True
+    if key in self._num_invocations_by_cardinalities:
+      return True
+    if (len(self._num_invocations_by_cardinalities) >=
+        self._max_concurrent_cardinalities):
+      return False
+    if self._max_concurrent_clients is not None:
+      running_clients = sum(self._num_clients_by_cardinalities.values())
+      if running_clients + num_clients > self._max_concurrent_clients:
+        return False
+    return True
+
+  async def _acquire_cardinalities(self, cardinalities):
+    key = _get_hashable_key(cardinalities)
+    num_clients = cardinalities.get(placements.CLIENTS, 0)
     async with self.cardinalities_condition:
-      if self._current_cardinalities == cardinalities:
-        return
-      else:
-        # We need to change the cardinalities; wait until all the underway
-        # invocations are finished or the current_cardinalities value matches
-        # ours.
-
-        def _condition():
-          return (not self._invocation_stack or
-                  self._current_cardinalities == cardinalities)
-
-        await self.cardinalities_condition.wait_for(_condition)
-
-        if self._current_cardinalities == cardinalities:
-          # No need to update.
-          return
-        self._current_cardinalities = cardinalities
-        # Notify other waiting tasks that we have changed cardinalities, and
-        # they may be interested in waking back up.
-        self.cardinalities_condition.notify_all()
+      # Wait until the invocation can run alongside the underway invocations.
+      await self.cardinalities_condition.wait_for(
+          lambda: self._can_admit(key, num_clients))
+      self._num_invocations_by_cardinalities[key] = (
+          self._num_invocations_by_cardinalities.get(key, 0) + 1)
+      self._num_clients_by_cardinalities[key] = num_clients
+    return key
+
+  async def _release_cardinalities(self, key, ex_factory):
+    async with self.cardinalities_condition:
+      self._num_invocations_by_cardinalities[key] -= 1
+      if not self._num_invocations_by_cardinalities[key]:
+        del self._num_invocations_by_cardinalities[key]
+        del self._num_clients_by_cardinalities[key]
+      if self._clean_up_pending and not self._num_invocations_by_cardinalities:
+        ex_factory.clean_up_executors()
+        self._clean_up_pending = False
+      # Notify all the wait_fors that their conditions to execute might be
+      # True, since an invocation finished.
+      self.cardinalities_condition.notify_all()
 
   @contextlib.asynccontextmanager
   async def _reset_factory_on_error(self, ex_factory, cardinalities):
+    key = await self._acquire_cardinalities(cardinalities)
     try:
-      await self._acquire_and_set_cardinalities(cardinalities)
-      # There is now invocation underway; add to the stack.
-      self._invocation_stack.append(1)
       # We pass a copy down to prevent the caller from mutating.
       yield ex_factory.create_executor({**cardinalities})
     except Exception:
-      ex_factory.clean_up_executors()
+      if self._max_concurrent_cardinalities == 1:
+        ex_factory.clean_up_executors()
+      else:
+        # Invocations of other cardinalities may be running in executors of
+        # the same factory, so the factory is cleaned up once they finish, and
+        # no new invocations are admitted until then.
+        self._clean_up_pending = True
       raise
     finally:
-      self._invocation_stack.pop()
-      async with self.cardinalities_condition:
-        # Notify all the wait_fors that their conditions to execute might be
-        # True, since we popped from the invocation stack.
-        self.cardinalities_condition.notify_all()
+      await self._release_cardinalities(key, ex_factory)
 
 
 class AsyncExecutionContext(SingleCardinalityAsyncContext):
@@ -226,7 +288,8 @@ class AsyncExecutionContext(SingleCardinalityAsyncContext):
   executor.
 
   This context will support concurrent invocation of multiple computations if
-  their arguments have the same cardinalities.
+  their arguments have the same cardinalities, or of up to
+  `max_concurrent_cardinalities` distinct cardinalities.
   """
 
   def __init__(
@@ -236,7 +299,12 @@ class AsyncExecutionContext(SingleCardinalityAsyncContext):
                                      Any]] = None,
       *,
       cardinality_inference_fn: cardinalities_utils
-      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities):
+      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities,
+      compilation_cache: Optional[
+          compilation_cache_lib.PersistentCompilationCache] = None,
+      compiler_options: Optional[Mapping[str, Any]] = None,
+      max_concurrent_cardinalities: int = 1,
+      max_concurrent_clients: Optional[int] = None):
     """Initializes an execution context.
 
     Args:
@@ -246,13 +314,41 @@ class AsyncExecutionContext(SingleCardinalityAsyncContext):
         cardinalities from arguments (and their associated types). The value
         returned by this function will be passed to the `create_executor` method
         of `executor_fn` to construct a `tff.framework.Executor` instance.
+      compilation_cache: An optional
+        `compilation_cache.PersistentCompilationCache` in which to persist the
+        results of `compiler_fn`.
+      compiler_options: An optional mapping of option names to values which
+        affect the output of `compiler_fn`, used to key `compilation_cache`.
+      max_concurrent_cardinalities: The maximum number of distinct
+        cardinalities of concurrently running invocations. Values greater than
+        one require `executor_fn` to support executors of several cardinalities
+        at once.
+      max_concurrent_clients: The optional maximum total number of clients of
+        the distinct cardinalities of concurrently running invocations.
+
+    Raises:
+      ValueError: If `max_concurrent_cardinalities` is greater than one and
+        `executor_fn` is an
+        `executor_stacks.ReconstructOnChangeExecutorFactory`, which
+        reconstructs its executor whenever the cardinalities change.
     """
-    super().__init__()
+    super().__init__(
+        max_concurrent_cardinalities=max_concurrent_cardinalities,
+        max_concurrent_clients=max_concurrent_clients)
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
+    if (max_concurrent_cardinalities > 1 and isinstance(
+        executor_fn, executor_stacks.ReconstructOnChangeExecutorFactory)):
+      raise ValueError(
+          'Expected `max_concurrent_cardinalities` of 1 for a '
+          '`ReconstructOnChangeExecutorFactory`, found {}.'.format(
+              max_concurrent_cardinalities))
     self._executor_factory = executor_fn
     if compiler_fn is not None:
       py_typecheck.check_callable(compiler_fn)
-      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(compiler_fn)
+      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(
+          compiler_fn,
+          compilation_cache=compilation_cache,
+          compiler_options=compiler_options)
     else:
       self._compiler_pipeline = None
     py_typecheck.check_callable(cardinality_inference_fn)
@@ -19,6 +19,7 @@ import tensorflow as tf
 from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.impl.context_stack import get_context_stack
 from tensorflow_federated.python.core.impl.execution_contexts import async_execution_context
+from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executors_errors
 from tensorflow_federated.python.core.impl.types import computation_types
@@ -54,6 +55,102 @@ class UnwrapValueTest(tf.test.TestCase):
       self.assertEqual(result[x], x)
 
 
+class _CountingExecutorFactory(executor_factory.ExecutorFactory):
+
+  def __init__(self):
+    self.num_clean_ups = 0
+
+  def create_executor(self, cardinalities):
+    return cardinalities
+
+  def clean_up_executors(self):
+    self.num_clean_ups += 1
+
+
+class _TestContext(async_execution_context.SingleCardinalityAsyncContext):
+
+  def invoke(self, comp, arg):
+    raise NotImplementedError()
+
+
+class SingleCardinalityAsyncContextTest(tf.test.TestCase):
+
+  def test_runs_different_cardinalities_concurrently(self):
+    factory = _CountingExecutorFactory()
+    context = _TestContext(max_concurrent_cardinalities=2)
+
+    async def _invoke(cardinalities, started, other_started):
+      async with context._reset_factory_on_error(factory, cardinalities):
+        started.set()
+        # Only completes if the other invocation runs concurrently.
+        await other_started.wait()
+
+    async def _invoke_concurrently():
+      first_started = asyncio.Event()
+      second_started = asyncio.Event()
+      await asyncio.wait_for(
+          asyncio.gather(
+              _invoke({placements.CLIENTS: 1}, first_started, second_started),
+              _invoke({placements.CLIENTS: 2}, second_started, first_started)),
+          timeout=10)
+
+    asyncio.run(_invoke_concurrently())
+
+  def test_serializes_cardinalities_over_client_limit(self):
+    factory = _CountingExecutorFactory()
+    context = _TestContext(
+        max_concurrent_cardinalities=2, max_concurrent_clients=3)
+    events = []
+
+    async def _invoke(cardinalities):
+      async with context._reset_factory_on_error(factory, cardinalities):
+        num_clients = cardinalities[placements.CLIENTS]
+        events.append(('start', num_clients))
+        await asyncio.sleep(0.01)
+        events.append(('end', num_clients))
+
+    async def _invoke_concurrently():
+      await asyncio.gather(
+          _invoke({placements.CLIENTS: 2}), _invoke({placements.CLIENTS: 2}),
+          _invoke({placements.CLIENTS: 3}))
+
+    asyncio.run(_invoke_concurrently())
+    self.assertEqual(events, [('start', 2), ('start', 2), ('end', 2),
+                              ('end', 2), ('start', 3), ('end', 3)])
+
+  def test_cleans_up_on_error_after_concurrent_invocations_finish(self):
+    factory = _CountingExecutorFactory()
+    context = _TestContext(max_concurrent_cardinalities=2)
+    num_clean_ups_on_finish = []
+
+    async def _fail():
+      async with context._reset_factory_on_error(factory,
+                                                 {placements.CLIENTS: 1}):
+        raise ValueError()
+
+    async def _run(cardinalities):
+      async with context._reset_factory_on_error(factory, cardinalities):
+        await asyncio.sleep(0.01)
+        num_clean_ups_on_finish.append(factory.num_clean_ups)
+
+    async def _invoke_concurrently():
+      return await asyncio.gather(
+          _run({placements.CLIENTS: 2}), _fail(), return_exceptions=True)
+
+    results = asyncio.run(_invoke_concurrently())
+    self.assertIsInstance(results[1], ValueError)
+    self.assertEqual(num_clean_ups_on_finish, [0])
+    self.assertEqual(factory.num_clean_ups, 1)
+
+  def test_raises_with_nonpositive_max_concurrent_cardinalities(self):
+    with self.assertRaises(ValueError):
+      _TestContext(max_concurrent_cardinalities=0)
+
+  def test_raises_with_nonpositive_max_concurrent_clients(self):
+    with self.assertRaises(ValueError):
+      _TestContext(max_concurrent_clients=0)
+
+
 class AsyncContextInstallationTest(tf.test.TestCase):
 
   def test_install_and_execute_in_context(self):
@@ -128,6 +225,31 @@ class AsyncContextInstallationTest(tf.test.TestCase):
       with self.assertRaises(executors_errors.CardinalityError):
         asyncio.run(val_coro)
 
+  def test_install_and_execute_different_cardinalities_concurrently(self):
+    factory = executor_stacks.local_executor_factory()
+    context = async_execution_context.AsyncExecutionContext(
+        factory, max_concurrent_cardinalities=2)
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def repackage_arg(x):
+      return [x, x]
+
+    async def _invoke_concurrently():
+      return await asyncio.gather(repackage_arg([1]), repackage_arg([1, 2]))
+
+    with get_context_stack.get_context_stack().install(context):
+      self.assertEqual(
+          asyncio.run(_invoke_concurrently()),
+          [[[1], [1]], [[1, 2], [1, 2]]])
+
+  def test_raises_concurrent_cardinalities_with_reconstructing_factory(self):
+    factory = executor_stacks.ReconstructOnChangeExecutorFactory(
+        executor_stacks.local_executor_factory())
+    with self.assertRaises(ValueError):
+      async_execution_context.AsyncExecutionContext(
+          factory, max_concurrent_cardinalities=2)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -0,0 +1,231 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A persistent, content-addressed cache of compiled computations."""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Mapping, Optional
+
+from absl import logging
+import attr
+import tensorflow as tf
+
+from google.protobuf import message
+from tensorflow_federated import version
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
+
+DEFAULT_MAX_SIZE_BYTES = 1024**3
+
+# Bump this whenever the format of the cache entries, or the meaning of a cache
+# key, changes; this invalidates all existing entries.
+_CACHE_FORMAT_VERSION = b'1'
+# Entries written by other releases of TFF or TensorFlow are never reused, since
+# their compilers may produce different computations.
+_CACHE_KEY_PREFIX = b'\x00'.join([
+    _CACHE_FORMAT_VERSION,
+    version.__version__.encode('utf-8'),
+    tf.__version__.encode('utf-8'),
+])
+_ENTRY_SUFFIX = '.pb'
+
+
+@attr.s(frozen=True)
+class CompilationCacheStats(object):
+  """Counters of a `PersistentCompilationCache`.
+
+  Attributes:
+    hits: The number of compilations served from the cache.
+    misses: The number of compilations which invoked the compiler.
+    evictions: The number of entries removed to respect the size bound.
+    size_bytes: The size of the entries on disk, as of the last write.
+  """
+  hits = attr.ib(default=0)
+  misses = attr.ib(default=0)
+  evictions = attr.ib(default=0)
+  size_bytes = attr.ib(default=0)
+
+
+def _compute_key(proto: pb.Computation,
+                 compiler_options: Optional[Mapping[str, Any]]) -> str:
+  hasher = hashlib.sha256(_CACHE_KEY_PREFIX)
+  if compiler_options:
+    for name, value in sorted(compiler_options.items()):
+      hasher.update(repr((name, str(value))).encode('utf-8'))
+  hasher.update(b'\x00')
+  hasher.update(proto.SerializeToString(deterministic=True))
+  return hasher.hexdigest()
+
+
+class PersistentCompilationCache(object):
+  """A size-bounded on-disk cache of compiled computations.
+
+  Entries are keyed on a hash of the serialized `pb.Computation` to compile,
+  together with the options of the compiler, so that a cache directory can be
+  shared across processes and across compilers with different options. Only
+  compilers which return `computation_impl.ConcreteComputation`s can be cached;
+  other results are returned without being written to the cache.
+
+  When the entries exceed `max_size_bytes`, the least recently used entries are
+  evicted. Keys also include the versions of TFF and TensorFlow, so entries
+  written before an upgrade are not reused, and are eventually evicted.
+  """
+
+  def __init__(self,
+               root_dir: str,
+               max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES):
+    """Initializes a `PersistentCompilationCache`.
+
+    Args:
+      root_dir: The directory in which to store the compiled computations. It
+        is created if it does not exist.
+      max_size_bytes: The maximum total size of the entries in `root_dir`.
+
+    Raises:
+      ValueError: If `root_dir` is empty or `max_size_bytes` is not positive.
+    """
+    py_typecheck.check_type(root_dir, str)
+    py_typecheck.check_type(max_size_bytes, int)
+    if not root_dir:
+      raise ValueError('Expected a non-empty `root_dir`.')
+    if max_size_bytes <= 0:
+      raise ValueError('Expected a positive `max_size_bytes`, found '
+                       '{}.'.format(max_size_bytes))
+    os.makedirs(root_dir, exist_ok=True)
+    self._root_dir = root_dir
+    self._max_size_bytes = max_size_bytes
+    self._lock = threading.Lock()
+    self._stats = CompilationCacheStats()
+
+  @property
+  def stats(self) -> CompilationCacheStats:
+    """The `CompilationCacheStats` of this cache since its construction."""
+    with self._lock:
+      return self._stats
+
+  def _record(self, hits=0, misses=0, evictions=0, size_bytes=None):
+    with self._lock:
+      if size_bytes is None:
+        size_bytes = self._stats.size_bytes
+      self._stats = CompilationCacheStats(
+          hits=self._stats.hits + hits,
+          misses=self._stats.misses + misses,
+          evictions=self._stats.evictions + evictions,
+          size_bytes=size_bytes)
+
+  def _entry_path(self, key: str) -> str:
+    return os.path.join(self._root_dir, key + _ENTRY_SUFFIX)
+
+  def _read(self, key: str) -> Optional[pb.Computation]:
+    path = self._entry_path(key)
+    try:
+      with open(path, 'rb') as f:
+        proto = pb.Computation.FromString(f.read())
+    except FileNotFoundError:
+      return None
+    except (OSError, message.DecodeError) as e:
+      logging.warning('Discarding unreadable compilation cache entry %s: %s',
+                      path, e)
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+      return None
+    # Refresh the modification time, which orders entries for eviction.
+    try:
+      os.utime(path)
+    except OSError:
+      pass
+    return proto
+
+  def _write(self, key: str, proto: pb.Computation):
+    # Write to a temporary file first, so that concurrent readers in other
+    # processes never observe a partially written entry.
+    fd, tmp_path = tempfile.mkstemp(dir=self._root_dir, suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        f.write(proto.SerializeToString())
+      os.replace(tmp_path, self._entry_path(key))
+    except OSError as e:
+      logging.warning('Failed to write compilation cache entry: %s', e)
+      try:
+        os.remove(tmp_path)
+      except OSError:
+        pass
+      return
+    self._evict()
+
+  def _evict(self):
+    """Removes the least recently used entries beyond `max_size_bytes`."""
+    entries = []
+    for entry in os.scandir(self._root_dir):
+      if not entry.name.endswith(_ENTRY_SUFFIX):
+        continue
+      try:
+        stat = entry.stat()
+      except OSError:
+        continue
+      entries.append((stat.st_mtime, stat.st_size, entry.path))
+    size_bytes = sum(size for _, size, _ in entries)
+    num_evicted = 0
+    for _, size, path in sorted(entries):
+      if size_bytes <= self._max_size_bytes:
+        break
+      try:
+        os.remove(path)
+      except OSError:
+        continue
+      size_bytes -= size
+      num_evicted += 1
+    self._record(evictions=num_evicted, size_bytes=size_bytes)
+
+  def compile(self,
+              comp: computation_impl.ConcreteComputation,
+              compilation_fn: Callable[[computation_impl.ConcreteComputation],
+                                       Any],
+              compiler_options: Optional[Mapping[str, Any]] = None) -> Any:
+    """Returns `compilation_fn(comp)`, reusing a cached result if possible.
+
+    Args:
+      comp: The `computation_impl.ConcreteComputation` to compile.
+      compilation_fn: The compiler to invoke on a cache miss.
+      compiler_options: An optional mapping of option names to values which
+        affect the output of `compilation_fn`. The string representations of
+        the values are part of the cache key.
+
+    Returns:
+      The compiled computation.
+    """
+    py_typecheck.check_type(comp, computation_impl.ConcreteComputation)
+    key = _compute_key(
+        computation_impl.ConcreteComputation.get_proto(comp),
+        compiler_options)
+    proto = self._read(key)
+    if proto is not None:
+      self._record(hits=1)
+      # Compilation preserves the type signature, which may carry Python
+      # container annotations that are not part of the serialized proto.
+      return computation_impl.ConcreteComputation(
+          proto,
+          context_stack_impl.context_stack,
+          annotated_type=comp.type_signature)
+    self._record(misses=1)
+    compiled = compilation_fn(comp)
+    if isinstance(compiled, computation_impl.ConcreteComputation):
+      self._write(key, computation_impl.ConcreteComputation.get_proto(compiled))
+    return compiled
@@ -0,0 +1,171 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import mock
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
+
+
+@computations.tf_computation(tf.int32)
+def _add_one(x):
+  return x + 1
+
+
+@computations.tf_computation(tf.int32)
+def _add_two(x):
+  return x + 2
+
+
+class _CountingCompiler(object):
+
+  def __init__(self):
+    self.num_calls = 0
+
+  def __call__(self, comp):
+    self.num_calls += 1
+    return comp
+
+
+def _list_entries(root_dir):
+  return [f for f in os.listdir(root_dir) if f.endswith('.pb')]
+
+
+class PersistentCompilationCacheTest(absltest.TestCase):
+
+  def test_compile_invokes_compiler_on_miss(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+    compiler = _CountingCompiler()
+
+    compiled = cache.compile(_add_one, compiler)
+
+    self.assertIs(compiled, _add_one)
+    self.assertEqual(compiler.num_calls, 1)
+    self.assertEqual(cache.stats.misses, 1)
+    self.assertEqual(cache.stats.hits, 0)
+
+  def test_compile_returns_cached_computation_on_hit(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+    compiler = _CountingCompiler()
+
+    cache.compile(_add_one, compiler)
+    compiled = cache.compile(_add_one, compiler)
+
+    self.assertIsInstance(compiled, computation_impl.ConcreteComputation)
+    self.assertEqual(compiler.num_calls, 1)
+    self.assertEqual(
+        compilation_cache.CompilationCacheStats(
+            hits=1, misses=1, evictions=0, size_bytes=cache.stats.size_bytes),
+        cache.stats)
+    self.assertTrue(
+        compiled.type_signature.is_equivalent_to(_add_one.type_signature))
+    self.assertEqual(
+        computation_impl.ConcreteComputation.get_proto(compiled),
+        computation_impl.ConcreteComputation.get_proto(_add_one))
+
+  def test_entries_are_shared_across_cache_instances(self):
+    root_dir = self.create_tempdir().full_path
+    compiler = _CountingCompiler()
+
+    compilation_cache.PersistentCompilationCache(root_dir).compile(
+        _add_one, compiler)
+    cache = compilation_cache.PersistentCompilationCache(root_dir)
+    cache.compile(_add_one, compiler)
+
+    self.assertEqual(compiler.num_calls, 1)
+    self.assertEqual(cache.stats.hits, 1)
+
+  def test_compiler_options_are_part_of_key(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+    compiler = _CountingCompiler()
+
+    cache.compile(_add_one, compiler, compiler_options={'option': True})
+    cache.compile(_add_one, compiler, compiler_options={'option': False})
+    cache.compile(_add_one, compiler, compiler_options={'option': True})
+
+    self.assertEqual(compiler.num_calls, 2)
+    self.assertEqual(cache.stats.hits, 1)
+
+  def test_versions_are_part_of_key(self):
+    root_dir = self.create_tempdir().full_path
+    compiler = _CountingCompiler()
+
+    compilation_cache.PersistentCompilationCache(root_dir).compile(
+        _add_one, compiler)
+    with mock.patch.object(compilation_cache, '_CACHE_KEY_PREFIX',
+                           b'1\x000.0.0\x000.0.0'):
+      cache = compilation_cache.PersistentCompilationCache(root_dir)
+      cache.compile(_add_one, compiler)
+
+    self.assertEqual(compiler.num_calls, 2)
+    self.assertEqual(cache.stats.hits, 0)
+
+  def test_evicts_least_recently_used_entry(self):
+    root_dir = self.create_tempdir().full_path
+    cache = compilation_cache.PersistentCompilationCache(root_dir)
+    compiler = _CountingCompiler()
+    cache.compile(_add_one, compiler)
+    entry_path = os.path.join(root_dir, _list_entries(root_dir)[0])
+    # Make the first entry unambiguously the least recently used one.
+    os.utime(entry_path, (0, 0))
+    entry_size = os.path.getsize(entry_path)
+    cache = compilation_cache.PersistentCompilationCache(
+        root_dir, max_size_bytes=2 * entry_size - 1)
+
+    cache.compile(_add_two, compiler)
+
+    self.assertLen(_list_entries(root_dir), 1)
+    self.assertFalse(os.path.exists(entry_path))
+    self.assertEqual(cache.stats.evictions, 1)
+    cache.compile(_add_two, compiler)
+    self.assertEqual(cache.stats.hits, 1)
+
+  def test_discards_corrupted_entry(self):
+    root_dir = self.create_tempdir().full_path
+    cache = compilation_cache.PersistentCompilationCache(root_dir)
+    compiler = _CountingCompiler()
+    cache.compile(_add_one, compiler)
+    with open(os.path.join(root_dir, _list_entries(root_dir)[0]), 'wb') as f:
+      f.write(b'\xff\xff\xff')
+
+    cache.compile(_add_one, compiler)
+
+    self.assertEqual(compiler.num_calls, 2)
+    self.assertEqual(cache.stats.misses, 2)
+
+  def test_does_not_write_non_computation_results(self):
+    root_dir = self.create_tempdir().full_path
+    cache = compilation_cache.PersistentCompilationCache(root_dir)
+
+    result = cache.compile(_add_one, lambda comp: 'not a computation')
+
+    self.assertEqual(result, 'not a computation')
+    self.assertEmpty(_list_entries(root_dir))
+
+  def test_raises_with_nonpositive_max_size_bytes(self):
+    with self.assertRaises(ValueError):
+      compilation_cache.PersistentCompilationCache(
+          self.create_tempdir().full_path, max_size_bytes=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
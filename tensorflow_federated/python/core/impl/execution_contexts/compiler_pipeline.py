@@ -20,10 +20,12 @@
 
 import functools
 
-from typing import Callable, Any
+from typing import Any, Callable, Mapping, Optional
 
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 
 
 class CompilerPipeline(object):
@@ -40,16 +42,50 @@ class CompilerPipeline(object):
   backend takes the form of an instance of `tff.framework.Context`, which would
   be initialized with a `CompilerPipeline` whose `compilation_fn` accepts
   `tff.Computations` and returns MapReduceForms.
+
+  Artifacts are cached in memory for the lifetime of the pipeline. Optionally,
+  a `compilation_cache.PersistentCompilationCache` can be used to additionally
+  persist compiled `tff.framework.ConcreteComputation`s across processes.
   """
 
-  def __init__(self, compilation_fn: Callable[[computation_base.Computation],
-                                              Any]):
+  def __init__(
+      self,
+      compilation_fn: Callable[[computation_base.Computation], Any],
+      *,
+      compilation_cache: Optional[
+          compilation_cache_lib.PersistentCompilationCache] = None,
+      compiler_options: Optional[Mapping[str, Any]] = None):
+    """Initializes a `CompilerPipeline`.
+
+    Args:
+      compilation_fn: A Python function that will be used to compile a
+        computation.
+      compilation_cache: An optional
+        `compilation_cache.PersistentCompilationCache` to look up compiled
+        computations in before invoking `compilation_fn`.
+      compiler_options: An optional mapping of option names to values which
+        affect the output of `compilation_fn`, used to distinguish entries of
+        `compilation_cache` written by differently configured compilers.
+    """
     py_typecheck.check_callable(compilation_fn)
+    if compilation_cache is not None:
+      py_typecheck.check_type(compilation_cache,
+                              compilation_cache_lib.PersistentCompilationCache)
+    if compiler_options is not None:
+      py_typecheck.check_type(compiler_options, Mapping)
     self._compilation_fn = compilation_fn
+    self._compilation_cache = compilation_cache
+    self._compiler_options = compiler_options
 
   @functools.lru_cache()
   def compile(self, computation_to_compile: computation_base.Computation):
     """Generates executable for `computation_to_compile`."""
     py_typecheck.check_type(computation_to_compile,
                             computation_base.Computation)
+    if self._compilation_cache is not None and isinstance(
+        computation_to_compile, computation_impl.ConcreteComputation):
+      return self._compilation_cache.compile(
+          computation_to_compile,
+          self._compilation_fn,
+          compiler_options=self._compiler_options)
     return self._compilation_fn(computation_to_compile)
@@ -13,8 +13,11 @@
 # limitations under the License.
 
 from absl.testing import absltest
+import tensorflow as tf
 
+from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache
 from tensorflow_federated.python.core.impl.execution_contexts import compiler_pipeline
 
 
@@ -42,6 +45,30 @@ class CompilerPipelineTest(absltest.TestCase):
 
     # TODO(b/113123410): Expand the test with more structural invariants.
 
+  def test_compile_uses_compilation_cache_across_pipelines(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    num_compilations = 0
+
+    def compilation_fn(comp):
+      nonlocal num_compilations
+      num_compilations += 1
+      return comp
+
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+    for _ in range(2):
+      pipeline = compiler_pipeline.CompilerPipeline(
+          compilation_fn, compilation_cache=cache)
+      pipeline.compile(add_one)
+
+    self.assertEqual(num_compilations, 1)
+    self.assertEqual(cache.stats.hits, 1)
+    self.assertEqual(cache.stats.misses, 1)
+
 
 if __name__ == '__main__':
   absltest.main()
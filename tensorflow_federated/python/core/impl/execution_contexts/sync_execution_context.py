@@ -21,6 +21,7 @@
 import asyncio
 from typing import Any
 from typing import Callable
+from typing import Mapping
 from typing import Optional
 
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -28,6 +29,7 @@ from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.impl.context_stack import context_base
 from tensorflow_federated.python.core.impl.execution_contexts import async_execution_context
+from tensorflow_federated.python.core.impl.execution_contexts import compilation_cache as compilation_cache_lib
 from tensorflow_federated.python.core.impl.executors import cardinalities_utils
 from tensorflow_federated.python.core.impl.executors import executor_factory
 
@@ -42,7 +44,10 @@ class ExecutionContext(context_base.Context):
                                      Any]] = None,
       *,
       cardinality_inference_fn: cardinalities_utils
-      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities):
+      .CardinalityInferenceFnType = cardinalities_utils.infer_cardinalities,
+      compilation_cache: Optional[
+          compilation_cache_lib.PersistentCompilationCache] = None,
+      compiler_options: Optional[Mapping[str, Any]] = None):
     """Initializes a synchronous execution context which retries invocations.
 
     Args:
@@ -52,13 +57,20 @@ class ExecutionContext(context_base.Context):
         cardinalities from arguments (and their associated types). The value
         returned by this function will be passed to the `create_executor` method
         of `executor_fn` to construct a `tff.framework.Executor` instance.
+      compilation_cache: An optional
+        `compilation_cache.PersistentCompilationCache` in which to persist the
+        results of `compiler_fn`.
+      compiler_options: An optional mapping of option names to values which
+        affect the output of `compiler_fn`, used to key `compilation_cache`.
     """
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
     self._executor_factory = executor_fn
     self._async_context = async_execution_context.AsyncExecutionContext(
         executor_fn=executor_fn,
         compiler_fn=compiler_fn,
-        cardinality_inference_fn=cardinality_inference_fn)
+        cardinality_inference_fn=cardinality_inference_fn,
+        compilation_cache=compilation_cache,
+        compiler_options=compiler_options)
 
     self._event_loop = asyncio.new_event_loop()
     self._event_loop.set_task_factory(
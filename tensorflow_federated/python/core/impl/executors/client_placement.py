@@ -0,0 +1,219 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Policies placing clients across the workers of a remote executor stack."""
+
+import abc
+import heapq
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+from tensorflow_federated.python.common_libs import py_typecheck
+
+
+def _place_minimizing_makespan(
+    num_clients: int, seconds_per_client: Sequence[float]) -> List[int]:
+  """Returns the client counts minimizing the maximum expected worker time.
+
+  Clients are assigned one at a time to the worker which would finish them
+  earliest, which minimizes `max(counts[i] * seconds_per_client[i])` since all
+  clients are assumed to take the same time on a given worker.
+
+  Args:
+    num_clients: The number of clients to place.
+    seconds_per_client: The expected time each worker takes per client.
+
+  Returns:
+    A list of the number of clients placed on each worker.
+  """
+  counts = [0] * len(seconds_per_client)
+  heap = [(seconds, index) for index, seconds in enumerate(seconds_per_client)]
+  heapq.heapify(heap)
+  for _ in range(num_clients):
+    _, index = heapq.heappop(heap)
+    counts[index] += 1
+    heapq.heappush(
+        heap, ((counts[index] + 1) * seconds_per_client[index], index))
+  return counts
+
+
+def _makespan(counts: Sequence[int],
+              seconds_per_client: Sequence[float]) -> float:
+  return max(c * s for c, s in zip(counts, seconds_per_client))
+
+
+class ClientPlacementPolicy(metaclass=abc.ABCMeta):
+  """Interface deciding how many clients each remote worker hosts.
+
+  Workers are identified by their index in the list of stubs (or channels) of
+  the remote executor stack; only the indices of the workers which are ready
+  are passed to `place`. Executors on the workers report the latency of each
+  value they compute to `record_latency`, which policies may use to adapt the
+  placement of later rounds.
+  """
+
+  @abc.abstractmethod
+  def place(self, num_clients: int,
+            worker_indices: Sequence[int]) -> List[int]:
+    """Returns the number of clients to host on each of `worker_indices`.
+
+    Args:
+      num_clients: The total number of clients to place.
+      worker_indices: The indices of the workers which are ready.
+
+    Returns:
+      A list of nonnegative integers summing to `num_clients`, with the number
+      of clients to host on the corresponding worker of `worker_indices`.
+    """
+    raise NotImplementedError()
+
+  def record_latency(self, worker_index: int, num_clients: int,
+                     seconds: float):
+    """Records the time a worker took to compute a value.
+
+    Args:
+      worker_index: The index of the worker which computed the value.
+      num_clients: The number of clients hosted on the worker.
+      seconds: The time, in seconds, taken to compute the value.
+    """
+    del worker_index, num_clients, seconds  # Unused.
+
+
+class EvenClientPlacementPolicy(ClientPlacementPolicy):
+  """Places clients evenly across the workers."""
+
+  def place(self, num_clients: int,
+            worker_indices: Sequence[int]) -> List[int]:
+    counts = []
+    remaining_clients = num_clients
+    for position in range(len(worker_indices)):
+      remaining_workers = len(worker_indices) - position
+      count = remaining_clients // remaining_workers
+      remaining_clients -= count
+      counts.append(count)
+    return counts
+
+
+class WeightedClientPlacementPolicy(ClientPlacementPolicy):
+  """Places clients across the workers in proportion to fixed weights.
+
+  The weight of a worker is its expected throughput, e.g. its number of cores,
+  relative to the other workers. Clients are placed to minimize the expected
+  time of the slowest worker.
+  """
+
+  def __init__(self, weights: Sequence[float]):
+    """Initializes a `WeightedClientPlacementPolicy`.
+
+    Args:
+      weights: A sequence of positive weights, one for each worker.
+
+    Raises:
+      ValueError: If any weight is not positive.
+    """
+    py_typecheck.check_type(weights, (list, tuple))
+    if any(w <= 0 for w in weights):
+      raise ValueError('Expected positive weights, found {}.'.format(weights))
+    self._weights = tuple(float(w) for w in weights)
+
+  def place(self, num_clients: int,
+            worker_indices: Sequence[int]) -> List[int]:
+    if any(i >= len(self._weights) for i in worker_indices):
+      raise ValueError('Expected a weight for each of the workers {}, found '
+                       '{} weights.'.format(worker_indices, len(self._weights)))
+    return _place_minimizing_makespan(
+        num_clients, [1.0 / self._weights[i] for i in worker_indices])
+
+
+class LatencyAdaptiveClientPlacementPolicy(ClientPlacementPolicy):
+  """Places clients across the workers based on their observed latencies.
+
+  Each worker's time per client is estimated by an exponential moving average
+  of the latencies recorded for it, divided by the number of clients it hosted.
+  Clients are placed to minimize the expected time of the slowest worker.
+  Workers without recorded latencies are assumed to take the average time of
+  the other workers, or the same time when no latencies have been recorded.
+
+  Moving clients across workers reconstructs the executors of the stack, so a
+  new placement is only adopted if it reduces the expected time of the slowest
+  worker by at least `rebalance_threshold` relative to the current placement.
+  """
+
+  def __init__(self,
+               smoothing: float = 0.5,
+               rebalance_threshold: float = 0.1):
+    """Initializes a `LatencyAdaptiveClientPlacementPolicy`.
+
+    Args:
+      smoothing: The weight of a new latency in the moving average, in the
+        range `(0, 1]`.
+      rebalance_threshold: The minimum relative reduction of the expected time
+        of the slowest worker for which clients are moved, in the range
+        `[0, 1)`.
+
+    Raises:
+      ValueError: If `smoothing` or `rebalance_threshold` is out of range.
+    """
+    if not 0.0 < smoothing <= 1.0:
+      raise ValueError('Expected `smoothing` in the range (0, 1], found '
+                       '{}.'.format(smoothing))
+    if not 0.0 <= rebalance_threshold < 1.0:
+      raise ValueError('Expected `rebalance_threshold` in the range [0, 1), '
+                       'found {}.'.format(rebalance_threshold))
+    self._smoothing = smoothing
+    self._rebalance_threshold = rebalance_threshold
+    self._lock = threading.Lock()
+    self._seconds_per_client: Dict[int, float] = {}
+    self._placements: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+  def record_latency(self, worker_index: int, num_clients: int,
+                     seconds: float):
+    if num_clients < 1:
+      return
+    sample = seconds / num_clients
+    with self._lock:
+      estimate = self._seconds_per_client.get(worker_index)
+      if estimate is None:
+        self._seconds_per_client[worker_index] = sample
+      else:
+        self._seconds_per_client[worker_index] = (
+            self._smoothing * sample + (1.0 - self._smoothing) * estimate)
+
+  def _estimate_seconds_per_client(
+      self, worker_indices: Sequence[int]) -> List[float]:
+    known = [
+        self._seconds_per_client[i]
+        for i in worker_indices
+        if i in self._seconds_per_client
+    ]
+    default = sum(known) / len(known) if known else 1.0
+    # Guard against workers which reported no measurable time.
+    return [
+        max(self._seconds_per_client.get(i, default), 1e-9)
+        for i in worker_indices
+    ]
+
+  def place(self, num_clients: int,
+            worker_indices: Sequence[int]) -> List[int]:
+    key = (num_clients, tuple(worker_indices))
+    with self._lock:
+      seconds_per_client = self._estimate_seconds_per_client(worker_indices)
+      counts = _place_minimizing_makespan(num_clients, seconds_per_client)
+      previous_counts = self._placements.get(key)
+      if previous_counts is not None:
+        previous_makespan = _makespan(previous_counts, seconds_per_client)
+        if (_makespan(counts, seconds_per_client) >
+            (1.0 - self._rebalance_threshold) * previous_makespan):
+          return list(previous_counts)
+      self._placements[key] = counts
+      return list(counts)
@@ -0,0 +1,172 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `ClientPlacementPolicy`s with heterogeneous workers.
+
+Starts in-process `ExecutorService`s whose executors sleep in proportion to the
+number of clients they host on every call, one of them several times longer
+than the others, and measures the latency of rounds run across them with each
+placement policy. For the latency-adaptive policy, the latency of the last
+rounds, after the placement adapted, is reported as well.
+
+Run with:
+
+```
+bazel run :client_placement_benchmark -- --benchmarks=.
+```
+"""
+
+import asyncio
+import contextlib
+import time
+
+import grpc
+from grpc.framework.foundation import logging_pool
+import portpicker
+import tensorflow as tf
+
+from tensorflow_federated.proto.v0 import executor_pb2_grpc
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import client_placement
+from tensorflow_federated.python.core.impl.executors import executor_base
+from tensorflow_federated.python.core.impl.executors import executor_service
+from tensorflow_federated.python.core.impl.executors import executor_stacks
+from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+_NUM_CLIENTS = 64
+_NUM_ROUNDS = 10
+_NUM_ADAPTED_ROUNDS = 5
+# The time each worker takes per client on every call; the last worker is four
+# times slower than the others.
+_SECONDS_PER_CLIENT = (0.002, 0.002, 0.002, 0.008)
+_WORKER_WEIGHTS = [1.0 / s for s in _SECONDS_PER_CLIENT]
+
+
+class _DelayingExecutor(executor_base.Executor):
+  """Delegates to a target executor, sleeping before every call."""
+
+  def __init__(self, target: executor_base.Executor, delay_seconds: float):
+    self._target = target
+    self._delay_seconds = delay_seconds
+
+  async def create_value(self, value, type_spec=None):
+    return await self._target.create_value(value, type_spec)
+
+  async def create_call(self, comp, arg=None):
+    await asyncio.sleep(self._delay_seconds)
+    return await self._target.create_call(comp, arg)
+
+  async def create_struct(self, elements):
+    return await self._target.create_struct(elements)
+
+  async def create_selection(self, source, index):
+    return await self._target.create_selection(source, index)
+
+  def close(self):
+    self._target.close()
+
+
+def _delaying_executor_factory(seconds_per_client):
+  target_factory = executor_stacks.local_executor_factory()
+
+  def _stack_fn(cardinalities):
+    num_clients = cardinalities.get(placements.CLIENTS, 0)
+    return _DelayingExecutor(
+        target_factory.create_executor(cardinalities),
+        seconds_per_client * num_clients)
+
+  return executor_stacks.ResourceManagingExecutorFactory(
+      _stack_fn, ensure_closed_factories=[target_factory])
+
+
+@contextlib.contextmanager
+def _worker_channels():
+  servers = []
+  channels = []
+  try:
+    for seconds_per_client in _SECONDS_PER_CLIENT:
+      port = portpicker.pick_unused_port()
+      server = grpc.server(logging_pool.pool(max_workers=16))
+      server.add_insecure_port('[::]:{}'.format(port))
+      service = executor_service.ExecutorService(
+          _delaying_executor_factory(seconds_per_client))
+      executor_pb2_grpc.add_ExecutorGroupServicer_to_server(service, server)
+      server.start()
+      servers.append(server)
+      channel = grpc.insecure_channel('localhost:{}'.format(port))
+      grpc.channel_ready_future(channel).result(timeout=10)
+      channels.append(channel)
+    yield channels
+  finally:
+    for channel in channels:
+      channel.close()
+    for server in servers:
+      server.stop(None)
+
+
+@computations.tf_computation(tf.int32)
+def _add_one(x):
+  return x + 1
+
+
+@computations.federated_computation(computation_types.at_clients(tf.int32))
+def _round(x):
+  return intrinsics.federated_sum(intrinsics.federated_map(_add_one, x))
+
+
+class ClientPlacementBenchmark(tf.test.Benchmark):
+
+  def _benchmark_round_latency(self, name, placement_policy):
+    arg = list(range(_NUM_CLIENTS))
+    with _worker_channels() as channels:
+      factory = executor_stacks.remote_executor_factory(
+          channels, placement_policy=placement_policy)
+      wall_times = []
+      with executor_test_utils.install_executor(factory):
+        for _ in range(_NUM_ROUNDS):
+          start_time = time.time()
+          _round(arg)
+          wall_times.append(time.time() - start_time)
+      factory.clean_up_executors()
+    adapted_wall_times = wall_times[-_NUM_ADAPTED_ROUNDS:]
+    self.report_benchmark(
+        name='round_latency_{}_placement'.format(name),
+        iters=_NUM_ROUNDS,
+        wall_time=sum(wall_times) / _NUM_ROUNDS,
+        extras={
+            'num_clients': _NUM_CLIENTS,
+            'num_workers': len(_SECONDS_PER_CLIENT),
+            'last_rounds_mean_latency_in_seconds':
+                sum(adapted_wall_times) / len(adapted_wall_times),
+        })
+
+  def benchmark_round_latency_even_placement(self):
+    self._benchmark_round_latency(
+        'even', client_placement.EvenClientPlacementPolicy())
+
+  def benchmark_round_latency_weighted_placement(self):
+    self._benchmark_round_latency(
+        'weighted',
+        client_placement.WeightedClientPlacementPolicy(_WORKER_WEIGHTS))
+
+  def benchmark_round_latency_latency_adaptive_placement(self):
+    self._benchmark_round_latency(
+        'latency_adaptive',
+        client_placement.LatencyAdaptiveClientPlacementPolicy())
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,104 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+from tensorflow_federated.python.core.impl.executors import client_placement
+
+
+class EvenClientPlacementPolicyTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('divisible', 6, [0, 1, 2], [2, 2, 2]),
+      ('remainder_on_last_workers', 8, [0, 1, 2], [2, 3, 3]),
+      ('fewer_clients_than_workers', 1, [0, 1], [0, 1]),
+      ('no_clients', 0, [3, 5], [0, 0]),
+  )
+  def test_places_clients_evenly(self, num_clients, worker_indices,
+                                 expected_counts):
+    policy = client_placement.EvenClientPlacementPolicy()
+    self.assertEqual(
+        policy.place(num_clients, worker_indices), expected_counts)
+
+
+class WeightedClientPlacementPolicyTest(absltest.TestCase):
+
+  def test_places_clients_in_proportion_to_weights(self):
+    policy = client_placement.WeightedClientPlacementPolicy([1.0, 2.0, 5.0])
+    self.assertEqual(policy.place(16, [0, 1, 2]), [2, 4, 10])
+
+  def test_places_clients_on_subset_of_workers(self):
+    policy = client_placement.WeightedClientPlacementPolicy([1.0, 2.0, 3.0])
+    self.assertEqual(policy.place(8, [0, 2]), [2, 6])
+
+  def test_raises_with_nonpositive_weight(self):
+    with self.assertRaises(ValueError):
+      client_placement.WeightedClientPlacementPolicy([1.0, 0.0])
+
+  def test_raises_with_worker_without_weight(self):
+    policy = client_placement.WeightedClientPlacementPolicy([1.0, 2.0])
+    with self.assertRaises(ValueError):
+      policy.place(4, [0, 2])
+
+
+class LatencyAdaptiveClientPlacementPolicyTest(absltest.TestCase):
+
+  def test_places_clients_evenly_without_latencies(self):
+    policy = client_placement.LatencyAdaptiveClientPlacementPolicy()
+    self.assertEqual(policy.place(9, [0, 1, 2]), [3, 3, 3])
+
+  def test_moves_clients_from_slow_worker(self):
+    policy = client_placement.LatencyAdaptiveClientPlacementPolicy()
+    policy.place(8, [0, 1])
+    policy.record_latency(0, 4, 12.0)
+    policy.record_latency(1, 4, 4.0)
+    self.assertEqual(policy.place(8, [0, 1]), [2, 6])
+
+  def test_keeps_placement_below_rebalance_threshold(self):
+    policy = client_placement.LatencyAdaptiveClientPlacementPolicy(
+        rebalance_threshold=0.5)
+    policy.place(8, [0, 1])
+    policy.record_latency(0, 4, 5.0)
+    policy.record_latency(1, 4, 4.0)
+    self.assertEqual(policy.place(8, [0, 1]), [4, 4])
+
+  def test_smooths_latencies(self):
+    policy = client_placement.LatencyAdaptiveClientPlacementPolicy(
+        smoothing=0.5, rebalance_threshold=0.0)
+    policy.record_latency(0, 1, 1.0)
+    policy.record_latency(1, 1, 1.0)
+    # Worker 0 is estimated at 2 seconds per client after this latency.
+    policy.record_latency(0, 1, 3.0)
+    self.assertEqual(policy.place(3, [0, 1]), [1, 2])
+
+  def test_places_clients_on_worker_without_latencies(self):
+    policy = client_placement.LatencyAdaptiveClientPlacementPolicy()
+    policy.record_latency(0, 1, 1.0)
+    policy.record_latency(1, 1, 3.0)
+    # Worker 2 is assumed to take the average time of the other workers.
+    self.assertEqual(policy.place(7, [0, 1, 2]), [4, 1, 2])
+
+  def test_raises_with_smoothing_out_of_range(self):
+    with self.assertRaises(ValueError):
+      client_placement.LatencyAdaptiveClientPlacementPolicy(smoothing=0.0)
+
+  def test_raises_with_rebalance_threshold_out_of_range(self):
+    with self.assertRaises(ValueError):
+      client_placement.LatencyAdaptiveClientPlacementPolicy(
+          rebalance_threshold=1.0)
+
+
+if __name__ == '__main__':
+  absltest.main()
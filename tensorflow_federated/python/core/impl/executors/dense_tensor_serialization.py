@@ -0,0 +1,206 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reduced-copy serialization of large dense tensors.
+
+The functions in this module write and read the `tensorflow.TensorProto`
+packed in `executor_pb2.Value.tensor`, using the same wire format as the rest
+of the executor serialization. Instead of going through `tf.make_tensor_proto`
+and `tf.make_ndarray`, the contiguous buffer of a Numpy array is joined with a
+small serialized header into the bytes of the packed `TensorProto`, and the
+`tensor_content` field is located in those bytes without parsing the
+`TensorProto`.
+
+This saves some, but not all, copies of the tensor content: the content is
+still copied twice when serializing (see `serialize_ndarray`), and reading the
+packed bytes out of the message may copy them, depending on the protobuf
+implementation. By default, arrays returned by `deserialize_ndarray` are
+read-only `np.frombuffer` views of the packed bytes; `copy=True`, which the
+executor serialization uses so that executors receive writable arrays, adds one
+more copy.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow.core.framework import tensor_pb2
+from tensorflow.core.framework import tensor_shape_pb2
+from tensorflow_federated.proto.v0 import executor_pb2
+
+# Arrays smaller than this are cheap to copy, and are serialized using
+# `tf.make_tensor_proto` instead.
+DEFAULT_MIN_SIZE_BYTES = 64 * 1024
+
+_TENSOR_PROTO_TYPE_URL = 'type.googleapis.com/{}'.format(
+    tensor_pb2.TensorProto.DESCRIPTOR.full_name)
+
+# Field numbers and wire types of `tensorflow.TensorProto`, see
+# `tensorflow/core/framework/tensor.proto`.
+_DTYPE_FIELD_NUMBER = 1
+_TENSOR_SHAPE_FIELD_NUMBER = 2
+_VERSION_NUMBER_FIELD_NUMBER = 3
+_TENSOR_CONTENT_FIELD_NUMBER = 4
+_WIRETYPE_VARINT = 0
+_WIRETYPE_LENGTH_DELIMITED = 2
+
+
+def _encode_varint(value: int) -> bytes:
+  result = bytearray()
+  while value > 0x7F:
+    result.append((value & 0x7F) | 0x80)
+    value >>= 7
+  result.append(value)
+  return bytes(result)
+
+
+def _decode_varint(buffer: memoryview, pos: int) -> Tuple[int, int]:
+  result = 0
+  shift = 0
+  while True:
+    if pos >= len(buffer):
+      raise ValueError('Truncated varint.')
+    byte = buffer[pos]
+    pos += 1
+    result |= (byte & 0x7F) << shift
+    if not byte & 0x80:
+      return result, pos
+    shift += 7
+
+
+def is_supported_ndarray(value) -> bool:
+  """Returns `True` if `value` can be serialized by `serialize_ndarray`."""
+  if not isinstance(value, np.ndarray):
+    return False
+  try:
+    dtype = tf.dtypes.as_dtype(value.dtype)
+  except TypeError:
+    return False
+  return dtype != tf.string and dtype.is_numpy_compatible
+
+
+def serialize_ndarray(value: np.ndarray) -> executor_pb2.Value:
+  """Serializes a dense numeric `np.ndarray` into `executor_pb2.Value`.
+
+  The content of `value` is copied twice: once when it is joined with the
+  `TensorProto` header into a serialized message, and once more when that
+  message is assigned to the `Any` field of the returned `executor_pb2.Value`.
+
+  Args:
+    value: A numeric or boolean `np.ndarray`.
+
+  Returns:
+    An instance of `executor_pb2.Value` holding a packed `TensorProto`.
+
+  Raises:
+    TypeError: If `value` is not a supported `np.ndarray`.
+  """
+  if not is_supported_ndarray(value):
+    raise TypeError('Expected a numeric or boolean `np.ndarray`, found '
+                    '{!r}.'.format(type(value)))
+  header = tensor_pb2.TensorProto(
+      dtype=tf.dtypes.as_dtype(value.dtype).as_datatype_enum,
+      tensor_shape=tf.TensorShape(value.shape).as_proto()).SerializeToString()
+  content = memoryview(np.ascontiguousarray(value)).cast('B')
+  tag = _encode_varint((_TENSOR_CONTENT_FIELD_NUMBER << 3) |
+                       _WIRETYPE_LENGTH_DELIMITED)
+  serialized = b''.join(
+      [header, tag, _encode_varint(content.nbytes), content])
+  value_proto = executor_pb2.Value()
+  value_proto.tensor.type_url = _TENSOR_PROTO_TYPE_URL
+  value_proto.tensor.value = serialized
+  return value_proto
+
+
+def deserialize_ndarray(
+    value_proto: executor_pb2.Value,
+    min_size_bytes: int = DEFAULT_MIN_SIZE_BYTES,
+    copy: bool = False) -> Optional[np.ndarray]:
+  """Deserializes a tensor `executor_pb2.Value` into a Numpy array.
+
+  Only `TensorProto`s holding their values in `tensor_content` are supported;
+  this includes every message produced by `serialize_ndarray`, as well as most
+  non-scalar numeric tensors produced by `tf.make_tensor_proto`.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+    min_size_bytes: The minimum size of the `tensor_content` for which an
+      array is returned. Smaller tensors are cheap to copy, and are left to the
+      regular deserialization.
+    copy: Whether to copy the content of the tensor into a writable array,
+      instead of returning a read-only view into the bytes of `value_proto`.
+
+  Returns:
+    An `np.ndarray`, which is a read-only view backed by the bytes of
+    `value_proto` unless `copy` is `True`, or `None` if `value_proto` does not
+    hold a `TensorProto` with a dense `tensor_content` of at least
+    `min_size_bytes`, in which case callers should fall back to the regular
+    deserialization.
+  """
+  if (value_proto.WhichOneof('value') != 'tensor' or
+      value_proto.tensor.type_url != _TENSOR_PROTO_TYPE_URL):
+    return None
+  buffer = value_proto.tensor.value
+  view = memoryview(buffer)
+  dtype_enum = 0  # DT_INVALID
+  shape_proto = None
+  content_offset = None
+  content_length = 0
+  pos = 0
+  try:
+    while pos < len(view):
+      key, pos = _decode_varint(view, pos)
+      field_number, wire_type = key >> 3, key & 0x7
+      if wire_type == _WIRETYPE_VARINT:
+        field_value, pos = _decode_varint(view, pos)
+        if field_number == _DTYPE_FIELD_NUMBER:
+          dtype_enum = field_value
+        elif field_number != _VERSION_NUMBER_FIELD_NUMBER:
+          return None
+      elif wire_type == _WIRETYPE_LENGTH_DELIMITED:
+        length, pos = _decode_varint(view, pos)
+        if field_number == _TENSOR_SHAPE_FIELD_NUMBER:
+          shape_proto = tensor_shape_pb2.TensorShapeProto.FromString(
+              view[pos:pos + length].tobytes())
+        elif field_number == _TENSOR_CONTENT_FIELD_NUMBER:
+          content_offset = pos
+          content_length = length
+        else:
+          return None
+        pos += length
+      else:
+        return None
+    dtype = tf.dtypes.as_dtype(dtype_enum)
+  except (TypeError, ValueError):
+    return None
+  if (content_offset is None or dtype == tf.string or
+      not dtype.is_numpy_compatible):
+    return None
+  if shape_proto is None:
+    shape_proto = tensor_shape_pb2.TensorShapeProto()
+  shape = tf.TensorShape(shape_proto)
+  if not shape.is_fully_defined():
+    return None
+  np_dtype = np.dtype(dtype.as_numpy_dtype)
+  num_elements = shape.num_elements()
+  if (num_elements * np_dtype.itemsize != content_length or
+      content_length < min_size_bytes):
+    return None
+  if num_elements == 0:
+    return np.zeros(shape.as_list(), dtype=np_dtype)
+  value = np.frombuffer(
+      buffer, dtype=np_dtype, count=num_elements, offset=content_offset)
+  if copy:
+    value = value.copy()
+  return value.reshape(shape.as_list())
@@ -0,0 +1,122 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import numpy as np
+import tensorflow as tf
+
+from google.protobuf import any_pb2
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.core.impl.executors import dense_tensor_serialization
+
+
+def _value_from_tensor_proto(tensor_proto):
+  any_pb = any_pb2.Any()
+  any_pb.Pack(tensor_proto)
+  return executor_pb2.Value(tensor=any_pb)
+
+
+class DenseTensorSerializationTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('float32_scalar', np.array(1.5, np.float32)),
+      ('float32_matrix', np.arange(12, dtype=np.float32).reshape([3, 4])),
+      ('float64_vector', np.linspace(0.0, 1.0, 1000)),
+      ('int64_tensor', np.arange(60, dtype=np.int64).reshape([3, 4, 5])),
+      ('int8_vector', np.arange(-100, 100, dtype=np.int8)),
+      ('bool_vector', np.array([True, False, True])),
+      ('empty', np.zeros([0, 3], np.float32)),
+      ('non_contiguous', np.arange(20, dtype=np.int32).reshape([4, 5]).T),
+  )
+  def test_roundtrip(self, x):
+    value_proto = dense_tensor_serialization.serialize_ndarray(x)
+    y = dense_tensor_serialization.deserialize_ndarray(
+        value_proto, min_size_bytes=0)
+    self.assertIsNotNone(y)
+    self.assertEqual(y.dtype, x.dtype)
+    self.assertEqual(y.shape, x.shape)
+    np.testing.assert_array_equal(y, x)
+
+  def test_serialized_value_is_readable_by_make_ndarray(self):
+    x = np.arange(12, dtype=np.float32).reshape([3, 4])
+    value_proto = dense_tensor_serialization.serialize_ndarray(x)
+    tensor_proto = tf.make_tensor_proto(values=0)
+    self.assertTrue(value_proto.tensor.Unpack(tensor_proto))
+    np.testing.assert_array_equal(tf.make_ndarray(tensor_proto), x)
+
+  def test_deserializes_tensor_content_from_make_tensor_proto(self):
+    x = np.arange(12, dtype=np.int32).reshape([4, 3])
+    value_proto = _value_from_tensor_proto(tf.make_tensor_proto(x))
+    y = dense_tensor_serialization.deserialize_ndarray(
+        value_proto, min_size_bytes=0)
+    self.assertIsNotNone(y)
+    np.testing.assert_array_equal(y, x)
+
+  def test_deserialized_array_is_read_only_view(self):
+    x = np.ones([1024], np.float32)
+    value_proto = dense_tensor_serialization.serialize_ndarray(x)
+    y = dense_tensor_serialization.deserialize_ndarray(
+        value_proto, min_size_bytes=0)
+    self.assertFalse(y.flags.writeable)
+    self.assertFalse(y.flags.owndata)
+
+  def test_deserialized_array_is_writable_copy(self):
+    x = np.ones([1024], np.float32)
+    value_proto = dense_tensor_serialization.serialize_ndarray(x)
+    y = dense_tensor_serialization.deserialize_ndarray(
+        value_proto, min_size_bytes=0, copy=True)
+    self.assertTrue(y.flags.writeable)
+    y[0] = 2.0
+    np.testing.assert_array_equal(
+        dense_tensor_serialization.deserialize_ndarray(
+            value_proto, min_size_bytes=0), x)
+
+  def test_deserialize_returns_none_below_min_size(self):
+    x = np.ones([4], np.float32)
+    value_proto = dense_tensor_serialization.serialize_ndarray(x)
+    self.assertIsNone(
+        dense_tensor_serialization.deserialize_ndarray(
+            value_proto, min_size_bytes=x.nbytes + 1))
+
+  def test_deserialize_returns_none_for_typed_values(self):
+    # Scalars created by `tf.make_tensor_proto` use the `float_val` field.
+    value_proto = _value_from_tensor_proto(tf.make_tensor_proto(1.0))
+    self.assertIsNone(
+        dense_tensor_serialization.deserialize_ndarray(
+            value_proto, min_size_bytes=0))
+
+  def test_deserialize_returns_none_for_string_tensor(self):
+    value_proto = _value_from_tensor_proto(tf.make_tensor_proto(['a', 'b']))
+    self.assertIsNone(
+        dense_tensor_serialization.deserialize_ndarray(
+            value_proto, min_size_bytes=0))
+
+  def test_deserialize_returns_none_for_non_tensor_value(self):
+    value_proto = executor_pb2.Value(struct=executor_pb2.Value.Struct())
+    self.assertIsNone(
+        dense_tensor_serialization.deserialize_ndarray(
+            value_proto, min_size_bytes=0))
+
+  def test_serialize_raises_on_string_array(self):
+    with self.assertRaises(TypeError):
+      dense_tensor_serialization.serialize_ndarray(np.array(['a', 'b']))
+
+  def test_serialize_raises_on_non_ndarray(self):
+    with self.assertRaises(TypeError):
+      dense_tensor_serialization.serialize_ndarray([1.0, 2.0])
+
+
+if __name__ == '__main__':
+  absltest.main()
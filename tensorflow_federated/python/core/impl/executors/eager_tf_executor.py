@@ -18,12 +18,15 @@
 # information.
 """A simple executor that operates synchronously in eager TensorFlow mode."""
 
+import collections
+import hashlib
 import itertools
+import threading
 from typing import Any, Iterable, MutableMapping, Optional
 import uuid
 
 from absl import logging
-import cachetools
+import attr
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -47,6 +50,215 @@ from tensorflow_federated.python.core.impl.utils import tensorflow_utils
 _TF_FUNCTION_CACHE_SIZE = 100
 
 
+@attr.s(frozen=True)
+class FunctionCacheStats(object):
+  """Counters of a `FunctionCache`.
+
+  Attributes:
+    hits: The number of lookups which found a cached function.
+    misses: The number of lookups which did not find a cached function.
+    evictions: The number of functions evicted to respect the cache bounds.
+    num_entries: The number of functions currently cached.
+    size_bytes: The total size of the computations behind the cached functions.
+  """
+  hits = attr.ib(default=0)
+  misses = attr.ib(default=0)
+  evictions = attr.ib(default=0)
+  num_entries = attr.ib(default=0)
+  size_bytes = attr.ib(default=0)
+
+
+class FunctionCache(MutableMapping[Any, Any]):
+  """A thread-safe LRU cache of functions embedded by `EagerTFExecutor`.
+
+  A single instance can be shared by multiple executors, e.g. by all the leaf
+  executors of an executor stack, so that a TensorFlow computation invoked by
+  many clients is only imported once per device.
+
+  The cache is bounded both in number of entries and, optionally, in the total
+  size of the serialized computations the cached functions were constructed
+  from, which serves as a proxy for the memory they hold on to.
+  """
+
+  def __init__(self,
+               max_entries: int = _TF_FUNCTION_CACHE_SIZE,
+               max_size_bytes: Optional[int] = None):
+    """Initializes a `FunctionCache`.
+
+    Args:
+      max_entries: The maximum number of cached functions.
+      max_size_bytes: The optional maximum total size of the serialized
+        computations behind the cached functions.
+
+    Raises:
+      ValueError: If `max_entries` or `max_size_bytes` is not positive.
+    """
+    py_typecheck.check_type(max_entries, int)
+    if max_entries < 1:
+      raise ValueError('Expected a positive `max_entries`, found '
+                       '{}.'.format(max_entries))
+    if max_size_bytes is not None:
+      py_typecheck.check_type(max_size_bytes, int)
+      if max_size_bytes < 1:
+        raise ValueError('Expected a positive `max_size_bytes`, found '
+                         '{}.'.format(max_size_bytes))
+    self._max_entries = max_entries
+    self._max_size_bytes = max_size_bytes
+    self._lock = threading.Lock()
+    # Maps keys to `(value, size_bytes)`, from least to most recently used.
+    self._entries = collections.OrderedDict()
+    self._size_bytes = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  @property
+  def stats(self) -> FunctionCacheStats:
+    with self._lock:
+      return FunctionCacheStats(
+          hits=self._hits,
+          misses=self._misses,
+          evictions=self._evictions,
+          num_entries=len(self._entries),
+          size_bytes=self._size_bytes)
+
+  def __getitem__(self, key):
+    with self._lock:
+      try:
+        value, _ = self._entries[key]
+      except KeyError:
+        self._misses += 1
+        raise
+      self._entries.move_to_end(key)
+      self._hits += 1
+      return value
+
+  def __contains__(self, key):
+    with self._lock:
+      return key in self._entries
+
+  def __setitem__(self, key, value):
+    self.put(key, value)
+
+  def put(self, key, value, size_bytes: int = 0):
+    """Caches `value` under `key`, accounting it as `size_bytes`."""
+    with self._lock:
+      if key in self._entries:
+        _, old_size_bytes = self._entries.pop(key)
+        self._size_bytes -= old_size_bytes
+      self._entries[key] = (value, size_bytes)
+      self._size_bytes += size_bytes
+      # Always keep the most recent entry, even if it exceeds the bounds alone.
+      while len(self._entries) > 1 and (
+          len(self._entries) > self._max_entries or
+          (self._max_size_bytes is not None and
+           self._size_bytes > self._max_size_bytes)):
+        _, (_, evicted_size_bytes) = self._entries.popitem(last=False)
+        self._size_bytes -= evicted_size_bytes
+        self._evictions += 1
+
+  def __delitem__(self, key):
+    with self._lock:
+      _, size_bytes = self._entries.pop(key)
+      self._size_bytes -= size_bytes
+
+  def __iter__(self):
+    with self._lock:
+      return iter(list(self._entries))
+
+  def __len__(self):
+    with self._lock:
+      return len(self._entries)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+      self._size_bytes = 0
+
+
+# The `FunctionCache` shared by all users registered through
+# `acquire_shared_function_cache`, e.g. by the leaf executors of all the local
+# executor stacks of a process.
+_shared_function_cache = FunctionCache()
+_shared_function_cache_lock = threading.Lock()
+_num_shared_function_cache_users = 0
+
+
+def acquire_shared_function_cache() -> FunctionCache:
+  """Returns the process-wide `FunctionCache`, registering a user of it.
+
+  Executors constructed with the returned cache import each TensorFlow
+  computation once per device and process, rather than once per executor or
+  executor stack. Every call must be matched by a call to
+  `release_shared_function_cache` once the caller no longer constructs
+  executors with the cache, e.g. when an `ExecutorFactory` is closed.
+
+  Returns:
+    The process-wide `FunctionCache`.
+  """
+  global _num_shared_function_cache_users
+  with _shared_function_cache_lock:
+    _num_shared_function_cache_users += 1
+    return _shared_function_cache
+
+
+def release_shared_function_cache():
+  """Unregisters a user of the process-wide `FunctionCache`.
+
+  Once the last user is unregistered, the cached functions are dropped, which
+  releases the memory of the imported TensorFlow graphs not otherwise in use.
+
+  Raises:
+    RuntimeError: If there are no registered users of the cache.
+  """
+  global _num_shared_function_cache_users
+  with _shared_function_cache_lock:
+    if _num_shared_function_cache_users < 1:
+      raise RuntimeError('The shared function cache has no registered users.')
+    _num_shared_function_cache_users -= 1
+    if not _num_shared_function_cache_users:
+      _shared_function_cache.clear()
+
+
+# The types of ops creating the resources which `embed_tensorflow_computation`
+# destroys before or after every invocation of the embedded function.
+_PER_INVOCATION_RESOURCE_OP_TYPES = frozenset(['HashTableV2', 'VarHandleOp'])
+
+
+def _creates_per_invocation_resources(comp: pb.Computation) -> bool:
+  """Returns whether `comp` creates resources destroyed by every invocation."""
+  graph_def = serialization_utils.unpack_graph_def(comp.tensorflow.graph_def)
+  return any(
+      node.op in _PER_INVOCATION_RESOURCE_OP_TYPES for node in graph_def.node)
+
+
+class _ExecutorFunctionCache(object):
+  """The functions embedded by a single `EagerTFExecutor`.
+
+  The variables and hash tables of an embedded function are destroyed before or
+  after every invocation, so a function which creates any of them cannot be
+  invoked concurrently by several executors, e.g. by the clients of a stack.
+  Such functions are cached for the executor alone, while all other functions
+  are cached in a `FunctionCache` which may be shared with other executors.
+  """
+
+  def __init__(self, shared_cache: FunctionCache):
+    self._shared_cache = shared_cache
+    self._own_cache = FunctionCache()
+
+  def get(self, key):
+    fn = self._own_cache.get(key)
+    if fn is None:
+      fn = self._shared_cache.get(key)
+    return fn
+
+  def put(self, key, fn, size_bytes: int, creates_resources: bool):
+    if creates_resources:
+      self._own_cache.put(key, fn, size_bytes=size_bytes)
+    else:
+      self._shared_cache.put(key, fn, size_bytes=size_bytes)
+
+
 def _all_graph_def_nodes(
     graph_def: tf.compat.v1.GraphDef) -> Iterable[tf.compat.v1.NodeDef]:
   return itertools.chain(graph_def.node,
@@ -383,7 +595,7 @@ def embed_tensorflow_computation(comp, type_spec=None, device=None):
 
 @tracing.trace
 def _to_computation_internal_rep(*, value: pb.Computation,
-                                 tf_function_cache: MutableMapping[str, Any],
+                                 tf_function_cache: MutableMapping[Any, Any],
                                  type_spec: computation_types.StructType,
                                  device: tf.config.LogicalDevice):
   """Converts a `pb.Computation` to a `tf.function`."""
@@ -395,20 +607,31 @@ def _to_computation_internal_rep(*, value: pb.Computation,
                deterministic=True), device.name if device else None)
   else:
     logging.debug('Using hash of graph_def for cache key')
-    key = (value.SerializeToString(deterministic=True),
+    # Key on a digest rather than on the serialized computation itself, so
+    # that the cache does not hold on to a second copy of every graph.
+    key = (hashlib.sha256(value.SerializeToString(deterministic=True)).digest(),
            type_serialization.serialize_type(type_spec).SerializeToString(
                deterministic=True), device.name if device else None)
   cached_fn = tf_function_cache.get(key)
   if cached_fn is not None:
     return cached_fn
   embedded_fn = embed_tensorflow_computation(value, type_spec, device)
-  tf_function_cache[key] = embedded_fn
+  if isinstance(tf_function_cache, _ExecutorFunctionCache):
+    tf_function_cache.put(
+        key,
+        embedded_fn,
+        size_bytes=value.ByteSize(),
+        creates_resources=_creates_per_invocation_resources(value))
+  elif isinstance(tf_function_cache, FunctionCache):
+    tf_function_cache.put(key, embedded_fn, size_bytes=value.ByteSize())
+  else:
+    tf_function_cache[key] = embedded_fn
   return embedded_fn
 
 
 @tracing.trace
 def _to_struct_internal_rep(
-    *, value: Any, tf_function_cache: MutableMapping[str, Any],
+    *, value: Any, tf_function_cache: MutableMapping[Any, Any],
     type_spec: computation_types.StructType,
     device: tf.config.LogicalDevice) -> structure.Struct:
   """Converts a python container to internal representation for TF executor."""
@@ -472,7 +695,7 @@ def _to_sequence_internal_rep(
 @tracing.trace
 def to_representation_for_type(
     value: Any,
-    tf_function_cache: MutableMapping[str, Any],
+    tf_function_cache: MutableMapping[Any, Any],
     type_spec: Optional[computation_types.Type] = None,
     device: Optional[tf.config.LogicalDevice] = None) -> Any:
   """Verifies or converts the `value` to an eager object matching `type_spec`.
@@ -622,7 +845,9 @@ class EagerTFExecutor(executor_base.Executor):
   other methods this executor exposes.
   """
 
-  def __init__(self, device=None):
+  def __init__(self,
+               device=None,
+               tf_function_cache: Optional[FunctionCache] = None):
     """Creates a new instance of an eager executor.
 
     Args:
@@ -630,6 +855,11 @@ class EagerTFExecutor(executor_base.Executor):
         schedule all of its operations to run on. For example, the list of
         logical devices can be obtained using
         `tf.config.list_logical_devices()`.
+      tf_function_cache: An optional `FunctionCache` of embedded TensorFlow
+        functions. Executors sharing a cache only import each TensorFlow
+        computation once per device, except for computations creating
+        variables or hash tables, which each executor imports for itself. If
+        `None`, a new cache is created.
 
     Raises:
       RuntimeError: If not executing eagerly.
@@ -643,7 +873,16 @@ class EagerTFExecutor(executor_base.Executor):
       self._device = device
     else:
       self._device = None
-    self._tf_function_cache = cachetools.LRUCache(_TF_FUNCTION_CACHE_SIZE)
+    if tf_function_cache is not None:
+      py_typecheck.check_type(tf_function_cache, FunctionCache)
+    else:
+      tf_function_cache = FunctionCache()
+    self._tf_function_cache = tf_function_cache
+    self._executor_function_cache = _ExecutorFunctionCache(tf_function_cache)
+
+  @property
+  def tf_function_cache(self) -> FunctionCache:
+    return self._tf_function_cache
 
   @tracing.trace(span=True)
   async def create_value(self, value, type_spec=None):
@@ -679,9 +918,8 @@ class EagerTFExecutor(executor_base.Executor):
     else:
       type_spec = computation_types.to_type(type_spec)
       py_typecheck.check_type(type_spec, computation_types.Type)
-    normalized_value = to_representation_for_type(value,
-                                                  self._tf_function_cache,
-                                                  type_spec, self._device)
+    normalized_value = to_representation_for_type(
+        value, self._executor_function_cache, type_spec, self._device)
     return EagerValue(normalized_value, type_spec)
 
   @tracing.trace
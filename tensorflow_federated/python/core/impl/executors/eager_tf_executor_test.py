@@ -16,6 +16,7 @@ import asyncio
 import collections
 from typing import Optional
 
+from absl.testing import absltest
 from absl.testing import parameterized
 import numpy as np
 import tensorflow as tf
@@ -28,6 +29,7 @@ from tensorflow_federated.python.core.impl.computation import computation_impl
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.executors import thread_delegating_executor
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.tensorflow_libs import tensorflow_test_utils
 
@@ -764,5 +766,144 @@ class EagerTFExecutorTest(tf.test.TestCase, parameterized.TestCase):
                           [2, 5, 10])
 
 
+  def test_executors_sharing_function_cache_import_computation_once(self):
+
+    @computations.tf_computation(tf.int32)
+    def comp(x):
+      return x + 1
+
+    cache = eager_tf_executor.FunctionCache()
+    executors = [
+        eager_tf_executor.EagerTFExecutor(tf_function_cache=cache)
+        for _ in range(3)
+    ]
+
+    async def _invoke(ex):
+      fn = await ex.create_value(comp)
+      arg = await ex.create_value(10, tf.int32)
+      result = await ex.create_call(fn, arg)
+      return await result.compute()
+
+    for ex in executors:
+      self.assertEqual(asyncio.run(_invoke(ex)), 11)
+    stats = cache.stats
+    self.assertEqual(stats.num_entries, 1)
+    self.assertEqual(stats.misses, 1)
+    self.assertEqual(stats.hits, 2)
+
+  def test_executors_sharing_function_cache_run_variables_concurrently(self):
+
+    @computations.tf_computation(tf.int32)
+    def comp(x):
+      v = tf.Variable(0)
+
+      def body(i):
+        with tf.control_dependencies([v.assign_add(x)]):
+          return i + 1
+
+      loop = tf.while_loop(lambda i: i < 100, body, [0])
+      with tf.control_dependencies([loop]):
+        return v.read_value()
+
+    cache = eager_tf_executor.FunctionCache()
+    executors = [
+        thread_delegating_executor.ThreadDelegatingExecutor(
+            eager_tf_executor.EagerTFExecutor(tf_function_cache=cache))
+        for _ in range(8)
+    ]
+
+    async def _invoke(ex, x):
+      fn = await ex.create_value(comp)
+      results = []
+      for _ in range(5):
+        arg = await ex.create_value(x, tf.int32)
+        result = await ex.create_call(fn, arg)
+        results.append(await result.compute())
+      return results
+
+    async def _invoke_all():
+      return await asyncio.gather(
+          *[_invoke(ex, x) for x, ex in enumerate(executors)])
+
+    results = asyncio.run(_invoke_all())
+    self.assertEqual(results, [[x * 100] * 5 for x in range(len(executors))])
+    # Each executor imports the computation for itself.
+    self.assertEqual(cache.stats.num_entries, 0)
+    for ex in executors:
+      ex.close()
+
+  def test_executor_construction_raises_with_non_function_cache(self):
+    with self.assertRaises(TypeError):
+      eager_tf_executor.EagerTFExecutor(tf_function_cache={})
+
+
+class FunctionCacheTest(absltest.TestCase):
+
+  def test_counts_hits_and_misses(self):
+    cache = eager_tf_executor.FunctionCache()
+    self.assertIsNone(cache.get('a'))
+    cache.put('a', 1, size_bytes=10)
+    self.assertEqual(cache.get('a'), 1)
+    self.assertIn('a', cache)
+    self.assertEqual(
+        eager_tf_executor.FunctionCacheStats(
+            hits=1, misses=1, evictions=0, num_entries=1, size_bytes=10),
+        cache.stats)
+
+  def test_evicts_least_recently_used_entry_beyond_max_entries(self):
+    cache = eager_tf_executor.FunctionCache(max_entries=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    cache.get('a')
+    cache['c'] = 3
+    self.assertCountEqual(cache.keys(), ['a', 'c'])
+    self.assertEqual(cache.stats.evictions, 1)
+
+  def test_evicts_least_recently_used_entries_beyond_max_size_bytes(self):
+    cache = eager_tf_executor.FunctionCache(max_size_bytes=100)
+    cache.put('a', 1, size_bytes=40)
+    cache.put('b', 2, size_bytes=40)
+    cache.put('c', 3, size_bytes=80)
+    self.assertCountEqual(cache.keys(), ['c'])
+    self.assertEqual(cache.stats.evictions, 2)
+    self.assertEqual(cache.stats.size_bytes, 80)
+
+  def test_keeps_single_entry_larger_than_max_size_bytes(self):
+    cache = eager_tf_executor.FunctionCache(max_size_bytes=10)
+    cache.put('a', 1, size_bytes=20)
+    self.assertEqual(cache.get('a'), 1)
+
+  def test_replacing_entry_updates_size_bytes(self):
+    cache = eager_tf_executor.FunctionCache()
+    cache.put('a', 1, size_bytes=40)
+    cache.put('a', 2, size_bytes=10)
+    self.assertEqual(cache.stats.size_bytes, 10)
+    del cache['a']
+    self.assertEqual(cache.stats.size_bytes, 0)
+
+  def test_raises_with_nonpositive_bounds(self):
+    with self.assertRaises(ValueError):
+      eager_tf_executor.FunctionCache(max_entries=0)
+    with self.assertRaises(ValueError):
+      eager_tf_executor.FunctionCache(max_size_bytes=0)
+
+
+class SharedFunctionCacheTest(absltest.TestCase):
+
+  def test_clears_cache_after_last_release(self):
+    cache = eager_tf_executor.acquire_shared_function_cache()
+    self.assertIs(eager_tf_executor.acquire_shared_function_cache(), cache)
+    cache['a'] = 1
+
+    eager_tf_executor.release_shared_function_cache()
+    self.assertIn('a', cache)
+    eager_tf_executor.release_shared_function_cache()
+    self.assertNotIn('a', cache)
+
+  def test_release_raises_without_users(self):
+    with self.assertRaises(RuntimeError):
+      eager_tf_executor.release_shared_function_cache()
+
+
 if __name__ == '__main__':
   tf.test.main()
@@ -21,8 +21,9 @@
 import collections
 import os
 import os.path
+import itertools
 import tempfile
-from typing import Any, Collection, List, Mapping, Optional, Tuple, Union
+from typing import Any, Collection, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 import warnings
 import zipfile
 
@@ -36,6 +37,7 @@ from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.executors import dense_tensor_serialization
 from tensorflow_federated.python.core.impl.executors import executor_utils
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
@@ -54,6 +56,14 @@ _DeserializeReturnType = Tuple[Any, computation_types.Type]
 # variables from the graph.
 _DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES = 20 * (1024**2)  # 20 MB
 
+# The size of the chunks produced by `chunk_message` for the streaming methods
+# of the executor service.
+DEFAULT_CHUNK_SIZE_BYTES = 1024**2  # 1 MB
+
+# The wire type of length-delimited fields, see
+# https://developers.google.com/protocol-buffers/docs/encoding.
+_WIRETYPE_LENGTH_DELIMITED = 2
+
 
 class DatasetSerializationError(Exception):
   """Error raised during Dataset serialization or deserialization."""
@@ -93,6 +103,14 @@ def _serialize_tensor_value(
   """
   if isinstance(value, tf.Tensor):
     value = value.numpy()
+  if (dense_tensor_serialization.is_supported_ndarray(value) and
+      value.nbytes >= dense_tensor_serialization.DEFAULT_MIN_SIZE_BYTES and
+      value.dtype == type_spec.dtype.as_numpy_dtype):
+    # Large dense tensors are serialized with fewer copies of their content
+    # than `tf.make_tensor_proto` makes.
+    type_spec.check_assignable_from(
+        computation_types.TensorType(dtype=value.dtype, shape=value.shape))
+    return dense_tensor_serialization.serialize_ndarray(value), type_spec
   if isinstance(value, np.ndarray):
     tensor_proto = tf.make_tensor_proto(
         value, dtype=type_spec.dtype, verify_shape=False)
@@ -304,6 +322,15 @@ def _deserialize_tensor_value(
   if which_value != 'tensor':
     raise ValueError('Not a tensor value: {}'.format(which_value))
 
+  # Copied, so that callers receive writable arrays owning their data, as with
+  # the regular deserialization below.
+  tensor_value = dense_tensor_serialization.deserialize_ndarray(
+      value_proto, copy=True)
+  if tensor_value is not None:
+    value_type = computation_types.TensorType(
+        dtype=tensor_value.dtype, shape=tensor_value.shape)
+    return tensor_value, value_type
+
   # TODO(b/134543154): Find some way of creating the `TensorProto` using a
   # proper public interface rather than creating a whimsy value that we will
   # overwrite right away.
@@ -598,3 +625,315 @@ def deserialize_cardinalities(
         cardinality_spec.placement.uri)
     cardinalities_dict[literal] = cardinality_spec.cardinality
   return cardinalities_dict
+
+
+def _encode_varint(value: int) -> bytes:
+  result = bytearray()
+  while value > 0x7F:
+    result.append((value & 0x7F) | 0x80)
+    value >>= 7
+  result.append(value)
+  return bytes(result)
+
+
+def _length_delimited_key(field_number: int, length: int) -> bytes:
+  """Returns the key and length preceding a length-delimited field."""
+  return _encode_varint((field_number << 3) | _WIRETYPE_LENGTH_DELIMITED
+                       ) + _encode_varint(length)
+
+
+def _iter_serialized_value(value: executor_pb2.Value) -> Iterator[Any]:
+  """Yields bytes-like pieces whose concatenation serializes `value`.
+
+  The packed `TensorProto`s of tensors in `value`, and in its structs and
+  federated values, are yielded as views of their bytes in `value` rather than
+  serialized again, so that large tensors are split into chunks without
+  copying them into a serialization of the message holding them.
+
+  Args:
+    value: An instance of `executor_pb2.Value`.
+
+  Yields:
+    Instances of `bytes` or `memoryview`.
+  """
+  which_value = value.WhichOneof('value')
+  if which_value == 'tensor':
+    type_url = value.tensor.type_url.encode('utf-8')
+    payload = value.tensor.value
+    header = b''
+    if type_url:
+      header += _length_delimited_key(any_pb2.Any.TYPE_URL_FIELD_NUMBER,
+                                      len(type_url)) + type_url
+    if payload:
+      header += _length_delimited_key(any_pb2.Any.VALUE_FIELD_NUMBER,
+                                      len(payload))
+    yield _length_delimited_key(executor_pb2.Value.TENSOR_FIELD_NUMBER,
+                                len(header) + len(payload)) + header
+    if payload:
+      yield memoryview(payload)
+  elif which_value == 'struct':
+    yield _length_delimited_key(executor_pb2.Value.STRUCT_FIELD_NUMBER,
+                                value.struct.ByteSize())
+    for element in value.struct.element:
+      yield from _iter_serialized_struct_element(element)
+  elif which_value == 'federated':
+    yield _length_delimited_key(executor_pb2.Value.FEDERATED_FIELD_NUMBER,
+                                value.federated.ByteSize())
+    if value.federated.HasField('type'):
+      serialized_type = value.federated.type.SerializeToString()
+      yield _length_delimited_key(
+          executor_pb2.Value.Federated.TYPE_FIELD_NUMBER,
+          len(serialized_type)) + serialized_type
+    for constituent in value.federated.value:
+      yield _length_delimited_key(
+          executor_pb2.Value.Federated.VALUE_FIELD_NUMBER,
+          constituent.ByteSize())
+      yield from _iter_serialized_value(constituent)
+  else:
+    yield value.SerializeToString()
+
+
+def _iter_serialized_struct_element(
+    element: executor_pb2.Value.Struct.Element) -> Iterator[Any]:
+  """Yields the pieces serializing `element` as an element of a struct."""
+  yield _length_delimited_key(executor_pb2.Value.Struct.ELEMENT_FIELD_NUMBER,
+                              element.ByteSize())
+  if element.name:
+    name = element.name.encode('utf-8')
+    yield _length_delimited_key(
+        executor_pb2.Value.Struct.Element.NAME_FIELD_NUMBER, len(name)) + name
+  if element.HasField('value'):
+    yield _length_delimited_key(
+        executor_pb2.Value.Struct.Element.VALUE_FIELD_NUMBER,
+        element.value.ByteSize())
+    yield from _iter_serialized_value(element.value)
+
+
+def _iter_message_parts(header, value: Optional[executor_pb2.Value],
+                        value_field_number: int) -> Iterator[Iterator[Any]]:
+  """Yields the serialized parts of `header` with its `value` set to `value`.
+
+  A struct or federated `value` is split into a part holding the fields of
+  `header` and, for a federated value, its type, followed by one part for each
+  element of the struct, or each constituent of the federated value. Parsing
+  the concatenation of their serializations appends these to the repeated
+  fields of the first part, which reconstructs the message. Other messages are
+  serialized as a single part.
+
+  Args:
+    header: A protocol buffer message, whose `value` field is not set.
+    value: An optional `executor_pb2.Value` to serialize as the field numbered
+      `value_field_number` of `header`.
+    value_field_number: The number of the `value` field of `header`.
+
+  Yields:
+    For each part, an iterator of the bytes-like pieces of its serialization.
+  """
+  serialized_header = header.SerializeToString()
+  which_value = None if value is None else value.WhichOneof('value')
+  if which_value not in ('struct', 'federated'):
+    if value is None:
+      yield iter([serialized_header])
+    else:
+      yield itertools.chain([
+          serialized_header,
+          _length_delimited_key(value_field_number, value.ByteSize())
+      ], _iter_serialized_value(value))
+    return
+
+  first_part = executor_pb2.Value()
+  if which_value == 'struct':
+    first_part.struct.SetInParent()
+  else:
+    first_part.federated.type.CopyFrom(value.federated.type)
+  yield iter([
+      serialized_header,
+      _length_delimited_key(value_field_number, first_part.ByteSize()),
+      first_part.SerializeToString()
+  ])
+
+  def _part(value_oneof_field_number, element_field_number, element,
+            serialized_element):
+    element_size = element.ByteSize()
+    oneof_size = (
+        len(_length_delimited_key(element_field_number, element_size)) +
+        element_size)
+    value_size = (
+        len(_length_delimited_key(value_oneof_field_number, oneof_size)) +
+        oneof_size)
+    return itertools.chain([
+        _length_delimited_key(value_field_number, value_size),
+        _length_delimited_key(value_oneof_field_number, oneof_size)
+    ], serialized_element)
+
+  if which_value == 'struct':
+    for element in value.struct.element:
+      yield _part(executor_pb2.Value.STRUCT_FIELD_NUMBER,
+                  executor_pb2.Value.Struct.ELEMENT_FIELD_NUMBER, element,
+                  _iter_serialized_struct_element(element))
+  else:
+    for constituent in value.federated.value:
+      yield _part(
+          executor_pb2.Value.FEDERATED_FIELD_NUMBER,
+          executor_pb2.Value.Federated.VALUE_FIELD_NUMBER, constituent,
+          itertools.chain([
+              _length_delimited_key(
+                  executor_pb2.Value.Federated.VALUE_FIELD_NUMBER,
+                  constituent.ByteSize())
+          ], _iter_serialized_value(constituent)))
+
+
+def _iter_chunk_data(pieces: Iterable[Any],
+                     chunk_size_bytes: int) -> Iterator[bytes]:
+  """Yields the concatenation of `pieces` in at least one chunk of data."""
+  pending = []
+  pending_size = 0
+  yielded = False
+  for piece in pieces:
+    view = memoryview(piece)
+    start = 0
+    while start < len(view):
+      end = min(start + chunk_size_bytes - pending_size, len(view))
+      pending.append(view[start:end])
+      pending_size += end - start
+      start = end
+      if pending_size == chunk_size_bytes:
+        yield b''.join(pending)
+        yielded = True
+        pending = []
+        pending_size = 0
+  if pending or not yielded:
+    yield b''.join(pending)
+
+
+def _chunk_parts(parts: Iterator[Iterator[Any]],
+                 chunk_size_bytes: int) -> Iterator[executor_pb2.MessageChunk]:
+  for pieces in parts:
+    data_iter = _iter_chunk_data(pieces, chunk_size_bytes)
+    previous = next(data_iter)
+    for data in data_iter:
+      yield executor_pb2.MessageChunk(data=previous, continued=True)
+      previous = data
+    yield executor_pb2.MessageChunk(data=previous, continued=False)
+
+
+def chunk_value(
+    header,
+    value: Optional[executor_pb2.Value],
+    chunk_size_bytes: int = DEFAULT_CHUNK_SIZE_BYTES
+) -> Iterator[executor_pb2.MessageChunk]:
+  """Splits the serialization of `header` holding `value` into chunks.
+
+  Like `chunk_message`, but without copying `value` into `header`, which
+  avoids materializing the full message before it is streamed.
+
+  Args:
+    header: A protocol buffer message with an unset `value` field of type
+      `executor_pb2.Value`.
+    value: An optional `executor_pb2.Value` to send as the `value` of
+      `header`.
+    chunk_size_bytes: The maximum size of the `data` of each chunk.
+
+  Yields:
+    At least one `executor_pb2.MessageChunk`; the concatenation of their `data`
+    parses as `header` with its `value` field set to `value`.
+  """
+  py_typecheck.check_type(chunk_size_bytes, int)
+  if chunk_size_bytes <= 0:
+    raise ValueError('`chunk_size_bytes` must be positive, found '
+                     f'{chunk_size_bytes}.')
+  value_field_number = header.DESCRIPTOR.fields_by_name['value'].number
+  yield from _chunk_parts(
+      _iter_message_parts(header, value, value_field_number), chunk_size_bytes)
+
+
+def chunk_message(
+    message,
+    chunk_size_bytes: int = DEFAULT_CHUNK_SIZE_BYTES
+) -> Iterator[executor_pb2.MessageChunk]:
+  """Splits the serialization of `message` into `executor_pb2.MessageChunk`s.
+
+  The message is serialized lazily, one element of its struct or federated
+  value at a time, so that the serialization of the whole message is never held
+  in memory. The packed contents of tensors are sliced into the chunks without
+  being serialized again, so a large tensor is split across several chunks.
+  The chunks can be parsed as they arrive with a `MessageChunkParser`.
+
+  Args:
+    message: A protocol buffer message.
+    chunk_size_bytes: The maximum size of the `data` of each chunk.
+
+  Yields:
+    At least one `executor_pb2.MessageChunk`; the concatenation of their `data`
+    parses as `message`.
+  """
+  value = getattr(message, 'value', None)
+  if not isinstance(value, executor_pb2.Value):
+    py_typecheck.check_type(chunk_size_bytes, int)
+    if chunk_size_bytes <= 0:
+      raise ValueError('`chunk_size_bytes` must be positive, found '
+                       f'{chunk_size_bytes}.')
+    yield from _chunk_parts(
+        iter([iter([message.SerializeToString()])]), chunk_size_bytes)
+    return
+  header = type(message)()
+  for field, field_value in message.ListFields():
+    if field.name == 'value':
+      continue
+    elif field.label == field.LABEL_REPEATED:
+      getattr(header, field.name).extend(field_value)
+    elif field.message_type is not None:
+      getattr(header, field.name).CopyFrom(field_value)
+    else:
+      setattr(header, field.name, field_value)
+  if not message.HasField('value'):
+    value = None
+  yield from chunk_value(header, value, chunk_size_bytes)
+
+
+class MessageChunkParser(object):
+  """Parses a message from the `executor_pb2.MessageChunk`s of `chunk_message`.
+
+  Each part of the message is merged into the result as soon as its last chunk
+  arrives, so that only the parsed message and the serialization of a single
+  part are held in memory.
+  """
+
+  def __init__(self, message):
+    """Initializes a `MessageChunkParser`.
+
+    Args:
+      message: An empty protocol buffer message to parse the chunks into.
+    """
+    self._message = message
+    self._pending_data = []
+
+  def add(self, chunk: executor_pb2.MessageChunk):
+    """Adds the next `chunk` of the message."""
+    self._pending_data.append(chunk.data)
+    if not chunk.continued:
+      if len(self._pending_data) == 1:
+        data = self._pending_data[0]
+      else:
+        data = b''.join(self._pending_data)
+      self._pending_data = []
+      self._message.MergeFromString(data)
+
+  def result(self):
+    """Returns the parsed message.
+
+    Raises:
+      ValueError: If the last chunk added was continued by a missing chunk.
+    """
+    if self._pending_data:
+      raise ValueError('The stream of message chunks ended in a continued '
+                       'chunk.')
+    return self._message
+
+
+def parse_chunks(message, chunks: Iterable[executor_pb2.MessageChunk]):
+  """Parses the `chunks` produced by `chunk_message` into `message`."""
+  parser = MessageChunkParser(message)
+  for chunk in chunks:
+    parser.add(chunk)
+  return parser.result()
@@ -15,6 +15,7 @@
 import collections
 
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2
@@ -67,6 +68,27 @@ class ExecutorServiceUtilsTest(tf.test.TestCase, parameterized.TestCase):
         type_spec, computation_types.TensorType(tf.int32, [3]))
     self.assertAllEqual(x, y)
 
+  def test_serialize_deserialize_large_tensor_value(self):
+    x = tf.reshape(tf.range(128 * 256, dtype=tf.float32), [128, 256])
+    type_spec = computation_types.TensorType(tf.float32, [128, 256])
+    value_proto, value_type = executor_serialization.serialize_value(
+        x, type_spec)
+    self.assertIsInstance(value_proto, executor_pb2.Value)
+    type_test_utils.assert_types_identical(value_type, type_spec)
+    y, type_spec = executor_serialization.deserialize_value(value_proto)
+    type_test_utils.assert_types_identical(
+        type_spec, computation_types.TensorType(tf.float32, [128, 256]))
+    self.assertAllEqual(x, y)
+
+  def test_deserialized_large_tensor_value_is_writable(self):
+    x = np.ones([128, 256], np.float32)
+    value_proto, _ = executor_serialization.serialize_value(
+        x, computation_types.TensorType(tf.float32, [128, 256]))
+    y, _ = executor_serialization.deserialize_value(value_proto)
+    self.assertTrue(y.flags.writeable)
+    y[0, 0] = 2.0
+    self.assertEqual(y[0, 0], 2.0)
+
   def test_serialize_sequence_bad_element_type(self):
     x = tf.data.Dataset.range(5).map(lambda x: x * 2)
     with self.assertRaisesRegex(
@@ -474,5 +496,139 @@ class SerializeCardinalitiesTest(tf.test.TestCase):
     self.assertEqual(client_cardinalities, reconstructed_cardinalities)
 
 
+class ChunkMessageTest(tf.test.TestCase):
+
+  def test_chunk_and_parse_roundtrip(self):
+    value_proto, _ = executor_serialization.serialize_value(
+        tf.range(1000, dtype=tf.int32),
+        computation_types.TensorType(tf.int32, [1000]))
+    request = executor_pb2.CreateValueRequest(value=value_proto)
+    chunks = list(
+        executor_serialization.chunk_message(request, chunk_size_bytes=100))
+    self.assertLen(chunks, -(-request.ByteSize() // 100))
+    for chunk in chunks:
+      self.assertLessEqual(len(chunk.data), 100)
+    self.assertEqual([chunk.continued for chunk in chunks],
+                     [True] * (len(chunks) - 1) + [False])
+    parsed = executor_serialization.parse_chunks(
+        executor_pb2.CreateValueRequest(), chunks)
+    self.assertEqual(parsed, request)
+
+  def test_chunk_struct_value_splits_elements_into_parts(self):
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.int32, [100])),
+        ('b', computation_types.TensorType(tf.float32, [200])),
+    ])
+    value_proto, _ = executor_serialization.serialize_value(
+        collections.OrderedDict(
+            a=np.zeros([100], np.int32), b=np.ones([200], np.float32)),
+        type_spec)
+    request = executor_pb2.CreateValueRequest(
+        executor=executor_pb2.ExecutorId(id='id'), value=value_proto)
+    chunks = list(
+        executor_serialization.chunk_message(request, chunk_size_bytes=512))
+    # The executor id, then each element split into chunks of at most 512
+    # bytes.
+    self.assertFalse(chunks[0].continued)
+    self.assertEqual([chunk.continued for chunk in chunks[1:]],
+                     [False, True, False])
+    self.assertEqual(
+        executor_pb2.CreateValueRequest.FromString(b''.join(
+            chunk.data for chunk in chunks)), request)
+    parsed = executor_serialization.parse_chunks(
+        executor_pb2.CreateValueRequest(), chunks)
+    self.assertEqual(parsed, request)
+
+  def test_chunk_federated_value_roundtrip(self):
+    type_spec = computation_types.at_clients(
+        computation_types.TensorType(tf.int32, [100]))
+    value_proto, _ = executor_serialization.serialize_value(
+        [np.full([100], i, np.int32) for i in range(3)], type_spec)
+    response = executor_pb2.ComputeResponse(value=value_proto)
+    chunks = list(
+        executor_serialization.chunk_message(response, chunk_size_bytes=64))
+    parsed = executor_serialization.parse_chunks(
+        executor_pb2.ComputeResponse(), chunks)
+    self.assertEqual(parsed, response)
+
+  def test_chunk_splits_large_tensor_in_struct_into_chunks(self):
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.float32, [10000])),
+        ('b', computation_types.StructType([
+            ('c', computation_types.TensorType(tf.int32, [5000])),
+        ])),
+    ])
+    value_proto, _ = executor_serialization.serialize_value(
+        collections.OrderedDict(
+            a=np.arange(10000, dtype=np.float32),
+            b=collections.OrderedDict(c=np.arange(5000, dtype=np.int32))),
+        type_spec)
+    response = executor_pb2.ComputeResponse(value=value_proto)
+    chunks = list(
+        executor_serialization.chunk_message(response, chunk_size_bytes=1024))
+    for chunk in chunks:
+      self.assertLessEqual(len(chunk.data), 1024)
+    # The empty struct, then the two elements, each split across chunks.
+    self.assertLen([chunk for chunk in chunks if not chunk.continued], 3)
+    self.assertEqual(
+        executor_pb2.ComputeResponse.FromString(b''.join(
+            chunk.data for chunk in chunks)), response)
+    parsed = executor_serialization.parse_chunks(
+        executor_pb2.ComputeResponse(), chunks)
+    self.assertEqual(parsed, response)
+
+  def test_chunk_value_matches_chunk_message(self):
+    type_spec = computation_types.at_clients(
+        computation_types.TensorType(tf.int32, [100]))
+    value_proto, _ = executor_serialization.serialize_value(
+        [np.full([100], i, np.int32) for i in range(3)], type_spec)
+    executor_id = executor_pb2.ExecutorId(id='id')
+    chunks = list(
+        executor_serialization.chunk_value(
+            executor_pb2.CreateValueRequest(executor=executor_id),
+            value_proto,
+            chunk_size_bytes=64))
+    self.assertEqual(
+        chunks,
+        list(
+            executor_serialization.chunk_message(
+                executor_pb2.CreateValueRequest(
+                    executor=executor_id, value=value_proto),
+                chunk_size_bytes=64)))
+    parsed = executor_serialization.parse_chunks(
+        executor_pb2.CreateValueRequest(), chunks)
+    self.assertEqual(
+        parsed,
+        executor_pb2.CreateValueRequest(
+            executor=executor_id, value=value_proto))
+
+  def test_chunk_empty_message_yields_one_chunk(self):
+    chunks = list(
+        executor_serialization.chunk_message(executor_pb2.ComputeResponse()))
+    self.assertLen(chunks, 1)
+    self.assertEqual(
+        executor_serialization.parse_chunks(executor_pb2.ComputeResponse(),
+                                            chunks),
+        executor_pb2.ComputeResponse())
+
+  def test_parse_raises_on_truncated_stream(self):
+    value_proto, _ = executor_serialization.serialize_value(
+        tf.range(1000, dtype=tf.int32),
+        computation_types.TensorType(tf.int32, [1000]))
+    chunks = list(
+        executor_serialization.chunk_message(
+            executor_pb2.ComputeResponse(value=value_proto),
+            chunk_size_bytes=100))
+    with self.assertRaises(ValueError):
+      executor_serialization.parse_chunks(executor_pb2.ComputeResponse(),
+                                          chunks[:-1])
+
+  def test_chunk_raises_on_non_positive_chunk_size(self):
+    with self.assertRaises(ValueError):
+      list(
+          executor_serialization.chunk_message(
+              executor_pb2.ComputeResponse(), chunk_size_bytes=0))
+
+
 if __name__ == '__main__':
   tf.test.main()
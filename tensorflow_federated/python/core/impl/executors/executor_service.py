@@ -23,12 +23,14 @@ import collections
 import functools
 import threading
 import traceback
+from typing import Iterable, Iterator
 import uuid
 import weakref
 
 from absl import logging
 import grpc
 
+from google.protobuf import message
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.proto.v0 import executor_pb2_grpc
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -166,6 +168,21 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
       _set_invalid_arg_err(context, err)
       return executor_pb2.CreateValueResponse()
 
+  def CreateValueStreaming(
+      self,
+      request_iterator: Iterable[executor_pb2.MessageChunk],
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.CreateValueResponse:
+    """Creates a value embedded in the executor from a stream of chunks."""
+    try:
+      with tracing.span('ExecutorService.CreateValueStreaming', 'parse_chunks'):
+        request = executor_serialization.parse_chunks(
+            executor_pb2.CreateValueRequest(), request_iterator)
+    except (message.DecodeError, ValueError) as err:
+      _set_invalid_arg_err(context, err)
+      return executor_pb2.CreateValueResponse()
+    return self.CreateValue(request, context)
+
   def CreateCall(
       self,
       request: executor_pb2.CreateCallRequest,
@@ -265,6 +282,46 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     return self._run_coro_threadsafe_with_tracing(
         self._Compute(request, context)).result()
 
+  def ComputeStreaming(
+      self,
+      request: executor_pb2.ComputeRequest,
+      context: grpc.ServicerContext,
+  ) -> Iterator[executor_pb2.MessageChunk]:
+    """Computes a value embedded in the executor, streaming the result.
+
+    If the computation fails, the error status is set on `context` and no
+    chunks are streamed.
+
+    Args:
+      request: An instance of `executor_pb2.ComputeRequest`.
+      context: The `grpc.ServicerContext` of the call.
+
+    Yields:
+      The `executor_pb2.MessageChunk`s of the `executor_pb2.ComputeResponse`.
+    """
+    py_typecheck.check_type(request, executor_pb2.ComputeRequest)
+    try:
+      value_proto = self._run_coro_threadsafe_with_tracing(
+          self._compute_value(request)).result()
+    except (ValueError, TypeError) as err:
+      _set_invalid_arg_err(context, err)
+      return
+    yield from executor_serialization.chunk_value(
+        executor_pb2.ComputeResponse(), value_proto)
+
+  async def _compute_value(
+      self, request: executor_pb2.ComputeRequest) -> executor_pb2.Value:
+    """Computes and serializes the value referenced by `request`."""
+    value_id = str(request.value_ref.id)
+    with self._lock:
+      future_val = asyncio.wrap_future(self._values[value_id])
+    val = await future_val
+    result_val = await val.compute()
+    val_type = val.type_signature
+    value_proto, _ = executor_serialization.serialize_value(
+        result_val, val_type)
+    return value_proto
+
   async def _Compute(
       self,
       request: executor_pb2.ComputeRequest,
@@ -273,14 +330,7 @@ class ExecutorService(executor_pb2_grpc.ExecutorGroupServicer):
     """Asynchronous implemention of `Compute`."""
     py_typecheck.check_type(request, executor_pb2.ComputeRequest)
     try:
-      value_id = str(request.value_ref.id)
-      with self._lock:
-        future_val = asyncio.wrap_future(self._values[value_id])
-      val = await future_val
-      result_val = await val.compute()
-      val_type = val.type_signature
-      value_proto, _ = executor_serialization.serialize_value(
-          result_val, val_type)
+      value_proto = await self._compute_value(request)
       return executor_pb2.ComputeResponse(value=value_proto)
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
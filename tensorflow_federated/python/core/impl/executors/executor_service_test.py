@@ -32,6 +32,7 @@ from tensorflow_federated.python.core.impl.executors import executor_serializati
 from tensorflow_federated.python.core.impl.executors import executor_service
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_value_base
+from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 
 
@@ -163,6 +164,59 @@ class ExecutorServiceTest(absltest.TestCase):
     self.assertEqual(value, 10.0)
     del env
 
+  def test_executor_service_create_and_compute_streaming(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = executor_serialization.serialize_value(
+        tf.range(1000, dtype=tf.int32).numpy(),
+        computation_types.TensorType(tf.int32, [1000]))
+    request = executor_pb2.CreateValueRequest(
+        executor=env.executor_pb, value=value_proto)
+    response = env.stub.CreateValueStreaming(
+        executor_serialization.chunk_message(request, chunk_size_bytes=512))
+    self.assertIsInstance(response, executor_pb2.CreateValueResponse)
+    chunks = list(
+        env.stub.ComputeStreaming(
+            executor_pb2.ComputeRequest(
+                executor=env.executor_pb, value_ref=response.value_ref)))
+    self.assertNotEmpty(chunks)
+    compute_response = executor_serialization.parse_chunks(
+        executor_pb2.ComputeResponse(), chunks)
+    value, _ = executor_serialization.deserialize_value(compute_response.value)
+    self.assertSequenceEqual(list(value), list(range(1000)))
+    del env
+
+  def test_compute_streaming_returns_error_without_chunks(self):
+
+    class FailingExecutorValue(executor_value_base.ExecutorValue):
+
+      @property
+      def type_signature(self):
+        return computation_types.TensorType(tf.int32)
+
+      async def compute(self):
+        raise ValueError('Compute failed.')
+
+    mock_executor = mock.create_autospec(executor_base.Executor, instance=True)
+    mock_executor.create_value.return_value = FailingExecutorValue()
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: mock_executor)
+    env = TestEnv(ex_factory)
+    value_proto, _ = executor_serialization.serialize_value(10, tf.int32)
+    response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(
+            executor=env.executor_pb, value=value_proto))
+    chunks = []
+    with self.assertRaises(grpc.RpcError) as cm:
+      for chunk in env.stub.ComputeStreaming(
+          executor_pb2.ComputeRequest(
+              executor=env.executor_pb, value_ref=response.value_ref)):
+        chunks.append(chunk)
+    self.assertEqual(cm.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+    self.assertEmpty(chunks)
+    del env
+
   def test_executor_service_create_no_arg_computation_value_and_call(self):
     ex_factory = executor_stacks.ResourceManagingExecutorFactory(
         lambda _: eager_tf_executor.EagerTFExecutor())
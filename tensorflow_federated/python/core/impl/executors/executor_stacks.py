@@ -19,9 +19,12 @@
 """A collection of constructors for basic types of executor stacks."""
 
 from concurrent import futures
+import functools
 import math
+import time
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 import warnings
+import weakref
 
 from absl import logging
 import attr
@@ -32,6 +35,7 @@ import tensorflow as tf
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.compiler import local_computation_factory_base
 from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
+from tensorflow_federated.python.core.impl.executors import client_placement
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
@@ -50,7 +54,10 @@ from tensorflow_federated.python.core.impl.types import placements
 
 # Place a limit on the maximum size of the executor caches managed by the
 # ExecutorFactories, to prevent unbounded thread and memory growth in the case
-# of rapidly-changing cross-round cardinalities.
+# of rapidly-changing cross-round cardinalities. Evicted executors are not
+# closed, since invocations of an `AsyncExecutionContext` admitting several
+# cardinalities at once may still be running in them; their resources are
+# released by their finalizers once no invocation references them.
 _EXECUTOR_CACHE_SIZE = 10
 
 
@@ -65,12 +72,24 @@ class ResourceManagingExecutorFactory(executor_factory.ExecutorFactory):
       self,
       executor_stack_fn: Callable[[executor_factory.CardinalitiesType],
                                   executor_base.Executor],
-      ensure_closed: Optional[Sequence[executor_base.Executor]] = None):
+      ensure_closed: Optional[Sequence[executor_base.Executor]] = None,
+      ensure_closed_factories: Optional[Sequence[
+          executor_factory.ExecutorFactory]] = None):
     """Initializes `ResourceManagingExecutorFactory`.
 
     `ResourceManagingExecutorFactory` manages a mapping from `cardinalities`
     to `executor_base.Executors`, closing and destroying the executors in this
-    mapping when asked.
+    mapping when asked. The mapping holds the executors of at most
+    `_EXECUTOR_CACHE_SIZE` cardinalities, evicting the least recently created
+    or reused one without closing it. An invocation of evicted cardinalities
+    which is still running keeps its executor, while later invocations get a
+    new one, so contexts running invocations of several cardinalities at once
+    should admit far fewer cardinalities than the mapping holds.
+
+    Calling `close` also closes `ensure_closed_factories`, releasing the
+    resources they hold across calls to `clean_up_executors`, such as the
+    process-wide `eager_tf_executor.FunctionCache`. No executors can be
+    created afterwards.
 
     Args:
       executor_stack_fn: Callable taking a mapping from
@@ -79,6 +98,10 @@ class ResourceManagingExecutorFactory(executor_factory.ExecutorFactory):
         handle these cardinalities.
       ensure_closed: Optional sequence of `executor_base.Excutors` which should
         always be closed on a `clean_up_executors` call. Defaults to empty.
+      ensure_closed_factories: Optional sequence of factories used by
+        `executor_stack_fn` and owned by this factory, such as
+        `UnplacedExecutorFactory`s, whose `close` method should be called on a
+        `close` call. Defaults to empty.
     """
 
     py_typecheck.check_callable(executor_stack_fn)
@@ -87,6 +110,9 @@ class ResourceManagingExecutorFactory(executor_factory.ExecutorFactory):
     if ensure_closed is None:
       ensure_closed = ()
     self._ensure_closed = ensure_closed
+    if ensure_closed_factories is None:
+      ensure_closed_factories = ()
+    self._ensure_closed_factories = ensure_closed_factories
 
   def create_executor(
       self, cardinalities: executor_factory.CardinalitiesType
@@ -130,6 +156,15 @@ class ResourceManagingExecutorFactory(executor_factory.ExecutorFactory):
       ex.close()
     self._executors = {}
 
+  def close(self):
+    """Cleans up the constructed executors and closes the owned factories.
+
+    After this method is called, `create_executor` must not be called anymore.
+    """
+    self.clean_up_executors()
+    for ex_factory in self._ensure_closed_factories:
+      ex_factory.close()
+
 
 @attr.s(auto_attribs=True, eq=False, order=False, frozen=True)
 class SizeInfo(object):
@@ -158,15 +193,19 @@ class SizingExecutorFactory(ResourceManagingExecutorFactory):
       self,
       executor_stack_fn: Callable[[executor_factory.CardinalitiesType],
                                   Tuple[executor_base.Executor,
-                                        List[sizing_executor.SizingExecutor]]]):
+                                        List[sizing_executor.SizingExecutor]]],
+      ensure_closed_factories: Optional[Sequence[
+          executor_factory.ExecutorFactory]] = None):
     """Initializes `SizingExecutorFactory`.
 
     Args:
       executor_stack_fn: Similar to base class but the second return value of
         the callable is used to expose the SizingExecutors.
+      ensure_closed_factories: See base class.
     """
 
-    super().__init__(executor_stack_fn)
+    super().__init__(
+        executor_stack_fn, ensure_closed_factories=ensure_closed_factories)
     # Sizing executors are intended to record the entire history of execution,
     # and therefore we don't want to be silently clearing them. So we leave
     # sizing_executors as a proper dict.
@@ -279,6 +318,18 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
   This factory constructs executors which represent "local execution": work
   that happens at the clients, at the server, or without placements. As such,
   this executor manages the placement of work on local executors.
+
+  When the leaf executors are `eager_tf_executor.EagerTFExecutor`s, all of the
+  executors constructed by this factory share a single
+  `eager_tf_executor.FunctionCache`, so that a TensorFlow computation invoked
+  at many clients is only imported once per device. By default, this is the
+  process-wide cache of `eager_tf_executor.acquire_shared_function_cache`,
+  which is shared with the executors of all other such factories. The factory
+  holds on to the cache until `close` is called or the factory is garbage
+  collected, so that `clean_up_executors` does not drop the imported functions.
+  The factories returned by `local_executor_factory`,
+  `thread_debugging_executor_factory` and `sizing_executor_factory` close their
+  `UnplacedExecutorFactory` when they are closed.
   """
 
   def __init__(self,
@@ -287,13 +338,33 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
                can_resolve_references: bool = True,
                server_device: Optional[tf.config.LogicalDevice] = None,
                client_devices: Optional[Sequence[tf.config.LogicalDevice]] = (),
-               leaf_executor_fn=eager_tf_executor.EagerTFExecutor):
+               leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
+               use_shared_function_cache: bool = True):
     self._support_sequence_ops = support_sequence_ops
     self._can_resolve_references = can_resolve_references
     self._server_device = server_device
     self._client_devices = client_devices
     self._client_device_index = 0
+    self._release_function_cache = None
+    if leaf_executor_fn is eager_tf_executor.EagerTFExecutor:
+      if use_shared_function_cache:
+        self._tf_function_cache = (
+            eager_tf_executor.acquire_shared_function_cache())
+        self._release_function_cache = weakref.finalize(
+            self, eager_tf_executor.release_shared_function_cache)
+      else:
+        self._tf_function_cache = eager_tf_executor.FunctionCache()
+      leaf_executor_fn = functools.partial(
+          leaf_executor_fn, tf_function_cache=self._tf_function_cache)
+    else:
+      self._tf_function_cache = None
     self._leaf_executor_fn = leaf_executor_fn
+    self._closed = False
+
+  @property
+  def tf_function_cache(self) -> Optional[eager_tf_executor.FunctionCache]:
+    """The `FunctionCache` shared by the leaf executors, if any."""
+    return self._tf_function_cache
 
   def _get_next_client_device(self) -> Optional[tf.config.LogicalDevice]:
     if not self._client_devices:
@@ -319,6 +390,9 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
       device = self._server_device
     else:
       device = None
+    if self._closed:
+      raise RuntimeError('Cannot create executors after the factory has been '
+                         'closed.')
     leaf_ex = self._leaf_executor_fn(device=device)
     return _wrap_executor_in_threading_stack(
         leaf_ex,
@@ -326,9 +400,16 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
         can_resolve_references=self._can_resolve_references)
 
   def clean_up_executors(self):
-    # Does not hold any executors internally, so nothing to clean up.
+    # Does not hold any executors internally, so nothing to clean up. The
+    # functions they imported are kept for the executors created afterwards.
     pass
 
+  def close(self):
+    """Releases the process-wide `FunctionCache` held by this factory."""
+    self._closed = True
+    if self._release_function_cache is not None:
+      self._release_function_cache()
+
 
 class FederatingExecutorFactory(executor_factory.ExecutorFactory):
   """Executor factory for stacks which delegate placed computations.
@@ -536,8 +617,8 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
     return self._aggregate_stacks(executors)
 
   def clean_up_executors(self):
-    """Holds no executors internally, so passes on cleanup."""
-    pass
+    """Holds no executors internally, so cleans up `unplaced_ex_factory`."""
+    self._unplaced_ex_factory.clean_up_executors()
 
   def _create_composing_stack(
       self, *, target_executors: Sequence[executor_base.Executor]
@@ -617,6 +698,7 @@ def local_executor_factory(
     leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
     local_computation_factory=tensorflow_computation_factory
     .TensorFlowComputationFactory(),
+    reduction_concurrency=1,
 ) -> executor_factory.ExecutorFactory:
   """Constructs an executor factory to execute computations locally.
 
@@ -652,21 +734,31 @@ def local_executor_factory(
       to construct local computations used as parameters in certain federated
       operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
       computation factory that generates TensorFlow code.
+    reduction_concurrency: Integer maximum number of groups of client values
+      that are accumulated concurrently on the server by
+      `tff.federated_aggregate` and `tff.federated_sum`, before being merged
+      pairwise. The default of `1` folds client values one at a time; larger
+      values reduce the aggregation latency for large numbers of clients, at
+      the cost of a different order of floating point operations.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
     executor construction logic specified above.
 
   Raises:
-    ValueError: If the number of clients is specified and not one or larger.
+    ValueError: If the number of clients is specified and not one or larger,
+      or if `reduction_concurrency` is not one or larger.
   """
   if server_tf_device is not None:
     py_typecheck.check_type(server_tf_device, tf.config.LogicalDevice)
   py_typecheck.check_type(client_tf_devices, (tuple, list))
   py_typecheck.check_type(max_fanout, int)
   py_typecheck.check_type(clients_per_thread, int)
+  py_typecheck.check_type(reduction_concurrency, int)
   if max_fanout < 2:
     raise ValueError('Max fanout must be greater than 1.')
+  if reduction_concurrency < 1:
+    raise ValueError('Reduction concurrency must be at least 1.')
   unplaced_ex_factory = UnplacedExecutorFactory(
       support_sequence_ops=support_sequence_ops,
       can_resolve_references=reference_resolving_clients,
@@ -678,7 +770,10 @@ def local_executor_factory(
       unplaced_ex_factory=unplaced_ex_factory,
       default_num_clients=default_num_clients,
       use_sizing=False,
-      local_computation_factory=local_computation_factory)
+      local_computation_factory=local_computation_factory,
+      federated_strategy_factory=functools.partial(
+          federated_resolving_strategy.FederatedResolvingStrategy.factory,
+          reduction_concurrency=reduction_concurrency))
   flat_stack_fn = create_minimal_length_flat_stack_fn(
       max_fanout, federating_executor_factory)
   full_stack_factory = ComposingExecutorFactory(
@@ -692,7 +787,8 @@ def local_executor_factory(
       return federating_executor_factory.create_executor(cardinalities)
     return full_stack_factory.create_executor(cardinalities)
 
-  return ResourceManagingExecutorFactory(_factory_fn)
+  return ResourceManagingExecutorFactory(
+      _factory_fn, ensure_closed_factories=[unplaced_ex_factory])
 
 
 def thread_debugging_executor_factory(
@@ -760,7 +856,8 @@ def thread_debugging_executor_factory(
       use_sizing=False)
 
   return ResourceManagingExecutorFactory(
-      federating_executor_factory.create_executor)
+      federating_executor_factory.create_executor,
+      ensure_closed_factories=[unplaced_ex_factory])
 
 
 def sizing_executor_factory(
@@ -823,7 +920,8 @@ def sizing_executor_factory(
     sizing_executor_list = federating_executor_factory.sizing_executors
     return executor, sizing_executor_list
 
-  return SizingExecutorFactory(_factory_fn)
+  return SizingExecutorFactory(
+      _factory_fn, ensure_closed_factories=[unplaced_ex_factory])
 
 
 class ReconstructOnChangeExecutorFactory(executor_factory.ExecutorFactory):
@@ -832,6 +930,12 @@ class ReconstructOnChangeExecutorFactory(executor_factory.ExecutorFactory):
   When the initialization parameter `change_query` returns `True`,
   ReconstructOnChangeExecutorFactory` constructs a new executor, bypassing
   any previously constructed executors.
+
+  Since a `change_query` such as `_CardinalitiesOrReadyListChanged` returns
+  `True` whenever the cardinalities differ from the previous call, invocations
+  of distinct cardinalities interleaved in an `AsyncExecutionContext` would
+  reconstruct the executor on every call; such contexts must therefore admit
+  invocations of one set of cardinalities at a time.
   """
 
   def __init__(self,
@@ -889,13 +993,23 @@ class _CardinalitiesOrReadyListChanged():
 
   Note: the contents of the provided list are expected to change over time.
   Elements of the list must offer an `is_ready` property which will be checked
-  each time.
+  each time. If `placement_fn` is provided, changes to the placement it
+  returns for the cardinalities and the indices of the ready elements are
+  checked as well, and the last placement is available from `placement_for`,
+  so that executors constructed after the check need not compute it again.
   """
 
-  def __init__(self, maybe_ready_list):
+  def __init__(self,
+               maybe_ready_list,
+               placement_fn: Optional[Callable[
+                   [executor_factory.CardinalitiesType, Sequence[int]],
+                   Sequence[int]]] = None):
     self._previous_cardinalities = None
     self._previous_ready_list = ()
+    self._previous_ready_indices = None
+    self._previous_placement = None
     self._maybe_ready_list = maybe_ready_list
+    self._placement_fn = placement_fn
 
   def __call__(self, cardinalities: executor_factory.CardinalitiesType) -> bool:
     cardinalities_changed = self._previous_cardinalities != cardinalities
@@ -903,29 +1017,109 @@ class _CardinalitiesOrReadyListChanged():
     ready_list_changed = ready_list != self._previous_ready_list
     self._previous_cardinalities = cardinalities
     self._previous_ready_list = ready_list
-    return cardinalities_changed or ready_list_changed
+    placement_changed = False
+    if self._placement_fn is not None:
+      ready_indices = [
+          i for i, x in enumerate(self._maybe_ready_list) if x in ready_list
+      ]
+      placement = tuple(self._placement_fn(cardinalities, ready_indices))
+      placement_changed = placement != self._previous_placement
+      self._previous_ready_indices = ready_indices
+      self._previous_placement = placement
+    return cardinalities_changed or ready_list_changed or placement_changed
 
+  def placement_for(
+      self, cardinalities: executor_factory.CardinalitiesType
+  ) -> Optional[Tuple[Sequence[int], Sequence[int]]]:
+    """Returns the last placement computed for `cardinalities`, if any.
 
-def _configure_remote_workers(default_num_clients, stubs, thread_pool_executor,
-                              dispose_batch_size, executors_to_close):
-  """"Configures `default_num_clients` across `remote_executors`."""
-  available_stubs = [stub for stub in stubs if stub.is_ready]
+    Args:
+      cardinalities: A mapping from placement literals to ints.
+
+    Returns:
+      A tuple of the indices of the ready elements and the placement returned
+      by `placement_fn` for them on the last call, or `None` if that call was
+      for other cardinalities or no `placement_fn` was provided.
+    """
+    if (self._previous_placement is None or
+        self._previous_cardinalities != cardinalities):
+      return None
+    return self._previous_ready_indices, self._previous_placement
+
+
+class _LatencyRecordingRemoteExecutor(remote_executor.RemoteExecutor):
+  """A `RemoteExecutor` reporting the latency of each computed value."""
+
+  def __init__(self, *args, record_latency_fn: Callable[[float], None],
+               **kwargs):
+    super().__init__(*args, **kwargs)
+    self._record_latency_fn = record_latency_fn
+
+  async def _compute(self, value_ref, type_spec=None):
+    start_time = time.monotonic()
+    result = await super()._compute(value_ref, type_spec)
+    self._record_latency_fn(time.monotonic() - start_time)
+    return result
+
+
+def _configure_remote_workers(
+    default_num_clients,
+    stubs,
+    thread_pool_executor,
+    dispose_batch_size,
+    executors_to_close,
+    placement_policy: client_placement.ClientPlacementPolicy,
+    placement: Optional[Tuple[Sequence[int], Sequence[int]]] = None):
+  """Configures `default_num_clients` across `remote_executors`.
+
+  Args:
+    default_num_clients: The number of clients to place across the workers.
+    stubs: The stubs of all the workers.
+    thread_pool_executor: Passed to the `RemoteExecutor` of each worker.
+    dispose_batch_size: Passed to the `RemoteExecutor` of each worker.
+    executors_to_close: A list to which the constructed remote executors are
+      appended.
+    placement_policy: The `client_placement.ClientPlacementPolicy` to place the
+      clients with, and to record latencies to.
+    placement: An optional tuple of the indices of the ready workers and the
+      number of clients to host on each, already computed by
+      `placement_policy`. If `None`, the ready workers are found and the
+      clients are placed across them.
+
+  Returns:
+    A list of the executors of the workers hosting clients.
+  """
+  if placement is None:
+    available_indices = [i for i, stub in enumerate(stubs) if stub.is_ready]
+  else:
+    available_indices, num_clients_to_host = placement
   logging.info('%s TFF workers available out of a total of %s.',
-               len(available_stubs), len(stubs))
-  if not available_stubs:
+               len(available_indices), len(stubs))
+  if not available_indices:
     raise executors_errors.RetryableError(
         'No workers are ready; try again to reconnect.')
-  remaining_clients = default_num_clients
+  if placement is None:
+    num_clients_to_host = placement_policy.place(default_num_clients,
+                                                 available_indices)
+  if (len(num_clients_to_host) != len(available_indices) or
+      sum(num_clients_to_host) != default_num_clients or
+      any(n < 0 for n in num_clients_to_host)):
+    raise ValueError(
+        'Expected the placement policy to place {} clients across {} workers, '
+        'found the placement {}.'.format(default_num_clients,
+                                         len(available_indices),
+                                         num_clients_to_host))
   live_workers = []
-  for stub_idx, stub in enumerate(available_stubs):
-    remaining_stubs = len(available_stubs) - stub_idx
-    default_num_clients_to_host = remaining_clients // remaining_stubs
-    remaining_clients -= default_num_clients_to_host
-    if default_num_clients_to_host > 0:
-      ex = remote_executor.RemoteExecutor(stub, thread_pool_executor,
-                                          dispose_batch_size)
+  for stub_idx, num_clients in zip(available_indices, num_clients_to_host):
+    if num_clients > 0:
+      ex = _LatencyRecordingRemoteExecutor(
+          stubs[stub_idx],
+          thread_pool_executor,
+          dispose_batch_size,
+          record_latency_fn=functools.partial(placement_policy.record_latency,
+                                              stub_idx, num_clients))
       executors_to_close.append(ex)
-      ex.set_cardinalities({placements.CLIENTS: default_num_clients_to_host})
+      ex.set_cardinalities({placements.CLIENTS: num_clients})
       live_workers.append(ex)
   return [
       _wrap_executor_in_threading_stack(e, can_resolve_references=False)
@@ -934,17 +1128,20 @@ def _configure_remote_workers(default_num_clients, stubs, thread_pool_executor,
 
 
 def remote_executor_factory(
-    channels: List[grpc.Channel],
+    channels: Union[List[grpc.Channel], List[str]],
     thread_pool_executor: Optional[futures.Executor] = None,
     dispose_batch_size: int = 20,
     max_fanout: int = 100,
     default_num_clients: int = 0,
+    placement_policy: Optional[client_placement.ClientPlacementPolicy] = None,
+    use_aio_stub: bool = False,
 ) -> executor_factory.ExecutorFactory:
   """Create an executor backed by remote workers.
 
   Args:
     channels: A list of `grpc.Channels` hosting services which can execute TFF
-      work.
+      work or, if `use_aio_stub` is `True`, a list of the target addresses of
+      these services, e.g. `'localhost:8000'`.
     thread_pool_executor: Optional concurrent.futures.Executor used to wait for
       the reply to a streaming RPC message. Uses the default Executor if not
       specified.
@@ -962,6 +1159,15 @@ def remote_executor_factory(
       client-placed values. However, when this inference isn't possible (such as
       in the case of a no-argument or non-federated computation) this default
       will be used instead.
+    placement_policy: An optional `client_placement.ClientPlacementPolicy`
+      deciding how many clients each worker hosts. Defaults to placing clients
+      evenly across the workers which are ready.
+    use_aio_stub: Whether to connect to the workers with
+      `remote_executor_grpc_stub.RemoteExecutorAioGrpcStub`s, which keep many
+      requests in flight over a single insecure `grpc.aio` channel per worker,
+      instead of blocking on each unary call. Since `grpc.aio` channels are
+      bound to the event loop of their stub, the stubs create them from the
+      target addresses passed as `channels`.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -975,14 +1181,24 @@ def remote_executor_factory(
   py_typecheck.check_type(dispose_batch_size, int)
   py_typecheck.check_type(max_fanout, int)
   py_typecheck.check_type(default_num_clients, int)
-
-  stubs = [
-      remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
-      for channel in channels
-  ]
+  py_typecheck.check_type(use_aio_stub, bool)
+
+  if use_aio_stub:
+    for target in channels:
+      py_typecheck.check_type(target, str)
+    stubs = [
+        remote_executor_grpc_stub.RemoteExecutorAioGrpcStub(target)
+        for target in channels
+    ]
+  else:
+    stubs = [
+        remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
+        for channel in channels
+    ]
   return remote_executor_factory_from_stubs(stubs, thread_pool_executor,
                                             dispose_batch_size, max_fanout,
-                                            default_num_clients)
+                                            default_num_clients,
+                                            placement_policy)
 
 
 def remote_executor_factory_from_stubs(
@@ -992,6 +1208,7 @@ def remote_executor_factory_from_stubs(
     dispose_batch_size: int = 20,
     max_fanout: int = 100,
     default_num_clients: int = 0,
+    placement_policy: Optional[client_placement.ClientPlacementPolicy] = None,
 ) -> executor_factory.ExecutorFactory:
   """Create an executor backed by remote workers.
 
@@ -1014,6 +1231,9 @@ def remote_executor_factory_from_stubs(
       client-placed values. However, when this inference isn't possible (such as
       in the case of a no-argument or non-federated computation) this default
       will be used instead.
+    placement_policy: An optional `client_placement.ClientPlacementPolicy`
+      deciding how many clients each worker hosts. Defaults to placing clients
+      evenly across the workers which are ready.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -1027,13 +1247,32 @@ def remote_executor_factory_from_stubs(
   py_typecheck.check_type(dispose_batch_size, int)
   py_typecheck.check_type(max_fanout, int)
   py_typecheck.check_type(default_num_clients, int)
+  if placement_policy is None:
+    placement_policy = client_placement.EvenClientPlacementPolicy()
+  py_typecheck.check_type(placement_policy,
+                          client_placement.ClientPlacementPolicy)
 
   executors_to_close = []
 
+  def _placement_fn(cardinalities, worker_indices):
+    num_clients = cardinalities.get(placements.CLIENTS, default_num_clients)
+    return placement_policy.place(num_clients, worker_indices)
+
+  change_query = _CardinalitiesOrReadyListChanged(
+      maybe_ready_list=stubs, placement_fn=_placement_fn)
+
   def _flat_stack_fn(cardinalities):
     num_clients = cardinalities.get(placements.CLIENTS, default_num_clients)
-    return _configure_remote_workers(num_clients, stubs, thread_pool_executor,
-                                     dispose_batch_size, executors_to_close)
+    # Reuses the placement computed when checking for changes, since the policy
+    # may be costly or, if adaptive, may place the clients differently again.
+    return _configure_remote_workers(
+        num_clients,
+        stubs,
+        thread_pool_executor,
+        dispose_batch_size,
+        executors_to_close,
+        placement_policy,
+        placement=change_query.placement_for(cardinalities))
 
   unplaced_ex_factory = UnplacedExecutorFactory()
   composing_executor_factory = ComposingExecutorFactory(
@@ -1045,4 +1284,4 @@ def remote_executor_factory_from_stubs(
   return ReconstructOnChangeExecutorFactory(
       underlying_stack=composing_executor_factory,
       ensure_closed=executors_to_close,
-      change_query=_CardinalitiesOrReadyListChanged(maybe_ready_list=stubs))
+      change_query=change_query)
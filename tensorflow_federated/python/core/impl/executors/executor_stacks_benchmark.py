@@ -0,0 +1,119 @@
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the function cache of local executor stacks.
+
+Measures the latency of the first round of a computation mapped at many
+clients on a local executor stack, and the increase of the peak resident set
+size (RSS) of the process, when the leaf executors share the process-wide
+`FunctionCache`, and when every leaf executor has a cache of its own.
+
+The peak RSS of a process never decreases, so for accurate RSS measurements run
+each benchmark in a separate process:
+
+```
+bazel run :executor_stacks_benchmark -- --benchmarks=shared
+bazel run :executor_stacks_benchmark -- --benchmarks=per_executor
+```
+"""
+
+import asyncio
+import functools
+import resource
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import executor_stacks
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+_NUM_CLIENTS = (100, 1000)
+_NUM_LAYERS = 20
+_VALUE_SIZE = 64
+_NUM_ROUNDS = 3
+
+_VALUE_TYPE = computation_types.TensorType(tf.float32, [_VALUE_SIZE])
+
+
+@computations.tf_computation(_VALUE_TYPE)
+def _client_work(x):
+  # Many small ops, so that importing the graph is costly compared to running
+  # it.
+  for i in range(_NUM_LAYERS):
+    weights = tf.random.stateless_normal([_VALUE_SIZE, _VALUE_SIZE], [i, 0])
+    x = tf.nn.relu(tf.linalg.matvec(weights, x))
+  return x
+
+
+@computations.federated_computation(computation_types.at_clients(_VALUE_TYPE))
+def _map_at_clients(x):
+  return intrinsics.federated_map(_client_work, x)
+
+
+async def _run_round(executor, value, num_clients):
+  comp = await executor.create_value(_map_at_clients)
+  arg = await executor.create_value([value] * num_clients,
+                                    computation_types.at_clients(_VALUE_TYPE))
+  result = await executor.create_call(comp, arg)
+  return await result.compute()
+
+
+def _max_rss_in_kilobytes():
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class ExecutorStacksBenchmark(tf.test.Benchmark):
+
+  def _benchmark_rounds(self, name, leaf_executor_fn):
+    value = np.ones([_VALUE_SIZE], np.float32)
+    for num_clients in _NUM_CLIENTS:
+      factory = executor_stacks.local_executor_factory(
+          max_fanout=num_clients + 1, leaf_executor_fn=leaf_executor_fn)
+      executor = factory.create_executor({placements.CLIENTS: num_clients})
+      initial_max_rss = _max_rss_in_kilobytes()
+      start_time = time.time()
+      asyncio.run(_run_round(executor, value, num_clients))
+      first_round_time = time.time() - start_time
+      start_time = time.time()
+      for _ in range(_NUM_ROUNDS):
+        asyncio.run(_run_round(executor, value, num_clients))
+      wall_time = (time.time() - start_time) / _NUM_ROUNDS
+      self.report_benchmark(
+          name='{}_{}_clients'.format(name, num_clients),
+          iters=_NUM_ROUNDS,
+          wall_time=wall_time,
+          extras={
+              'first_round_time_in_seconds': first_round_time,
+              'max_rss_increase_in_kilobytes':
+                  _max_rss_in_kilobytes() - initial_max_rss,
+          })
+      # Releases the process-wide cache, so that the next iteration imports the
+      # computation again.
+      factory.close()
+
+  def benchmark_shared_function_cache(self):
+    self._benchmark_rounds('shared', eager_tf_executor.EagerTFExecutor)
+
+  def benchmark_per_executor_function_cache(self):
+    # Wrapping the executor class disables the shared cache of the stack.
+    self._benchmark_rounds(
+        'per_executor', functools.partial(eager_tf_executor.EagerTFExecutor))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import asyncio
+import gc
 import math
 from unittest import mock
 
@@ -23,6 +24,7 @@ import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import client_placement
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
@@ -121,6 +123,36 @@ class ResourceManagingExecutorFactoryTest(absltest.TestCase):
     resource_manager.clean_up_executors()
     mock_ex.close.assert_called_once()
 
+  def test_close_closes_executors_and_owned_factories(self):
+    executor = mock.create_autospec(executor_base.Executor, instance=True)
+    owned_factory = mock.create_autospec(
+        executor_stacks.UnplacedExecutorFactory, instance=True)
+    resource_manager = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: executor, ensure_closed_factories=[owned_factory])
+    resource_manager.create_executor({placements.CLIENTS: 1})
+
+    resource_manager.clean_up_executors()
+    owned_factory.close.assert_not_called()
+    resource_manager.create_executor({placements.CLIENTS: 1})
+    resource_manager.close()
+
+    self.assertEqual(executor.close.call_count, 2)
+    owned_factory.close.assert_called_once()
+
+  @mock.patch.object(
+      eager_tf_executor,
+      'release_shared_function_cache',
+      wraps=eager_tf_executor.release_shared_function_cache)
+  def test_close_local_executor_factory_releases_shared_function_cache(
+      self, mock_release):
+    factory = executor_stacks.local_executor_factory()
+    factory.create_executor({placements.CLIENTS: 1})
+    factory.clean_up_executors()
+    mock_release.assert_not_called()
+
+    factory.close()
+    mock_release.assert_called_once()
+
 
 class ConcreteExecutorFactoryTest(parameterized.TestCase):
 
@@ -329,6 +361,29 @@ class ExecutorStacksTest(parameterized.TestCase):
 
     self.assertEqual(result, 55)
 
+  @parameterized.named_parameters(
+      ('sequential', 1, 100),
+      ('concurrent', 4, 100),
+      ('concurrent_larger_than_fanout', 4, 3),
+  )
+  def test_execution_with_reduction_concurrency(self, reduction_concurrency,
+                                                max_fanout):
+
+    @computations.federated_computation(computation_types.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_sum(x)
+
+    executor = executor_stacks.local_executor_factory(
+        max_fanout=max_fanout, reduction_concurrency=reduction_concurrency)
+    with executor_test_utils.install_executor(executor):
+      result = foo([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    self.assertEqual(result, 55)
+
+  def test_construction_raises_with_reduction_concurrency_zero(self):
+    with self.assertRaises(ValueError):
+      executor_stacks.local_executor_factory(reduction_concurrency=0)
+
   @parameterized.named_parameters(
       ('local_executor_none_clients', executor_stacks.local_executor_factory()),
       ('sizing_executor_none_clients',
@@ -387,6 +442,66 @@ class UnplacedExecutorFactoryTest(parameterized.TestCase):
     unplaced_executor = unplaced_factory.create_executor(cardinalities={})
     self.assertIsInstance(unplaced_executor, executor_base.Executor)
 
+  def test_eager_executors_share_function_cache(self):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory()
+    self.assertIsInstance(unplaced_factory.tf_function_cache,
+                          eager_tf_executor.FunctionCache)
+
+  def test_factories_share_process_wide_function_cache(self):
+    unplaced_factory_1 = executor_stacks.UnplacedExecutorFactory()
+    unplaced_factory_2 = executor_stacks.UnplacedExecutorFactory()
+    self.assertIs(unplaced_factory_1.tf_function_cache,
+                  unplaced_factory_2.tf_function_cache)
+    unplaced_factory_1.close()
+    unplaced_factory_2.close()
+
+  def test_factories_without_shared_function_cache_do_not_share_cache(self):
+    unplaced_factory_1 = executor_stacks.UnplacedExecutorFactory(
+        use_shared_function_cache=False)
+    unplaced_factory_2 = executor_stacks.UnplacedExecutorFactory()
+    self.assertIsNot(unplaced_factory_1.tf_function_cache,
+                     unplaced_factory_2.tf_function_cache)
+    unplaced_factory_2.close()
+
+  @mock.patch.object(
+      eager_tf_executor,
+      'release_shared_function_cache',
+      wraps=eager_tf_executor.release_shared_function_cache)
+  def test_clean_up_executors_keeps_shared_function_cache(self, mock_release):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory()
+    unplaced_factory.tf_function_cache['a'] = 1
+    unplaced_factory.clean_up_executors()
+    unplaced_factory.create_executor(placement=placements.CLIENTS)
+    unplaced_factory.clean_up_executors()
+    mock_release.assert_not_called()
+    self.assertIn('a', unplaced_factory.tf_function_cache)
+
+    unplaced_factory.close()
+    unplaced_factory.close()
+    mock_release.assert_called_once()
+
+  @mock.patch.object(
+      eager_tf_executor,
+      'release_shared_function_cache',
+      wraps=eager_tf_executor.release_shared_function_cache)
+  def test_garbage_collection_releases_shared_function_cache(
+      self, mock_release):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory()
+    del unplaced_factory
+    gc.collect()
+    mock_release.assert_called_once()
+
+  def test_create_executor_raises_after_close(self):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory()
+    unplaced_factory.close()
+    with self.assertRaises(RuntimeError):
+      unplaced_factory.create_executor(placement=placements.CLIENTS)
+
+  def test_custom_leaf_executors_have_no_shared_function_cache(self):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory(
+        leaf_executor_fn=lambda device: eager_tf_executor.EagerTFExecutor())
+    self.assertIsNone(unplaced_factory.tf_function_cache)
+
   def test_create_executor_raises_with_nonempty_cardinalitites(self):
     unplaced_factory = executor_stacks.UnplacedExecutorFactory()
     with self.assertRaises(ValueError):
@@ -612,11 +727,43 @@ class ComposingExecutorFactoryTest(absltest.TestCase):
     self.assertLen(args_list, 6)
 
 
-def _construct_remote_ex_from_stubs(channels):
+class RemoteExecutorFactoryAioStubTest(absltest.TestCase):
+
+  def test_use_aio_stub_creates_aio_stubs_from_targets(self):
+    with mock.patch.object(executor_stacks,
+                           'remote_executor_factory_from_stubs') as mock_obj:
+      executor_stacks.remote_executor_factory(['localhost:1', 'localhost:2'],
+                                              use_aio_stub=True)
+    stubs = mock_obj.call_args[0][0]
+    self.assertLen(stubs, 2)
+    for stub in stubs:
+      self.addCleanup(stub.close)
+      self.assertIsInstance(stub,
+                            remote_executor_grpc_stub.RemoteExecutorAioGrpcStub)
+
+  @mock.patch.object(
+      remote_executor_grpc_stub.RemoteExecutorAioGrpcStub,
+      'is_ready',
+      new=lambda _: True)
+  @mock.patch.object(remote_executor.RemoteExecutor, 'set_cardinalities')
+  def test_use_aio_stub_creates_executor(self, mock_obj):
+    factory = executor_stacks.remote_executor_factory(
+        ['localhost:1', 'localhost:2'], use_aio_stub=True)
+    factory.create_executor({placements.CLIENTS: 1})
+    mock_obj.assert_called_once_with({placements.CLIENTS: 1})
+
+  def test_use_aio_stub_raises_on_grpc_channels(self):
+    with self.assertRaises(TypeError):
+      executor_stacks.remote_executor_factory(
+          [grpc.insecure_channel('localhost:1')], use_aio_stub=True)
+
+
+def _construct_remote_ex_from_stubs(channels, **kwargs):
   stubs = [
       remote_executor_grpc_stub.RemoteExecutorGrpcStub(ch) for ch in channels
   ]
-  return executor_stacks.remote_executor_factory_from_stubs(stubs=stubs)
+  return executor_stacks.remote_executor_factory_from_stubs(
+      stubs=stubs, **kwargs)
 
 
 @parameterized.named_parameters(
@@ -689,6 +836,60 @@ class RemoteExecutorFactoryTest(parameterized.TestCase):
     remote_ex_factory.create_executor({placements.CLIENTS: 10})
     mock_obj.assert_called_once()
 
+  def test_weighted_placement_policy_places_clients_by_weight(
+      self, remote_ex_fn):
+    channels = [
+        grpc.insecure_channel('localhost:1'),
+        grpc.insecure_channel('localhost:2')
+    ]
+    remote_ex_factory = remote_ex_fn(
+        channels,
+        placement_policy=client_placement.WeightedClientPlacementPolicy([1, 3]))
+    remote_ex_factory.create_executor({placements.CLIENTS: 4})
+    self.assertEqual(self.coro_mock.call_args_list, [
+        mock.call({placements.CLIENTS: 1}),
+        mock.call({placements.CLIENTS: 3})
+    ])
+
+  def test_latency_adaptive_placement_policy_reconstructs_on_new_placement(
+      self, remote_ex_fn):
+    channels = [
+        grpc.insecure_channel('localhost:1'),
+        grpc.insecure_channel('localhost:2')
+    ]
+    policy = client_placement.LatencyAdaptiveClientPlacementPolicy()
+    remote_ex_factory = remote_ex_fn(channels, placement_policy=policy)
+    remote_ex_factory.create_executor({placements.CLIENTS: 4})
+    remote_ex_factory.create_executor({placements.CLIENTS: 4})
+    self.assertEqual(self.coro_mock.call_args_list, [
+        mock.call({placements.CLIENTS: 2}),
+        mock.call({placements.CLIENTS: 2})
+    ])
+
+    policy.record_latency(0, 2, 3.0)
+    policy.record_latency(1, 2, 1.0)
+    remote_ex_factory.create_executor({placements.CLIENTS: 4})
+    self.assertEqual(self.coro_mock.call_args_list[2:], [
+        mock.call({placements.CLIENTS: 1}),
+        mock.call({placements.CLIENTS: 3})
+    ])
+
+  def test_placement_computed_once_per_reconstruction(self, remote_ex_fn):
+    channels = [
+        grpc.insecure_channel('localhost:1'),
+        grpc.insecure_channel('localhost:2')
+    ]
+    policy = client_placement.EvenClientPlacementPolicy()
+    with mock.patch.object(policy, 'place', wraps=policy.place) as mock_place:
+      remote_ex_factory = remote_ex_fn(channels, placement_policy=policy)
+      remote_ex_factory.create_executor({placements.CLIENTS: 4})
+
+    mock_place.assert_called_once_with(4, [0, 1])
+    self.assertEqual(self.coro_mock.call_args_list, [
+        mock.call({placements.CLIENTS: 2}),
+        mock.call({placements.CLIENTS: 2})
+    ])
+
   def test_configuration_succeeds_while_event_loop_is_running(
       self, remote_ex_fn):
     channels = [
@@ -47,9 +47,11 @@
 """
 
 import asyncio
-from typing import Any, Dict, List
+import itertools
+from typing import Any, Dict, List, Optional
 
 from absl import logging
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -142,7 +144,10 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
   * `tff.CLIENTS`
 
   Note that this strategy does not have a built-in concept of intermediate
-  aggregation, partitioning placements, clustering clients, etc.
+  aggregation, partitioning placements, clustering clients, etc. However, the
+  reduction of client values on the server in `tff.federated_aggregate` and
+  `tff.federated_sum` can be split into concurrently accumulated groups that
+  are then merged pairwise, see `reduction_concurrency` below.
   """
 
   @classmethod
@@ -150,12 +155,14 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
               target_executors: Dict[str, executor_base.Executor],
               local_computation_factory: local_computation_factory_base
               .LocalComputationFactory = tensorflow_computation_factory
-              .TensorFlowComputationFactory()):
+              .TensorFlowComputationFactory(),
+              reduction_concurrency: int = 1):
     # pylint:disable=g-long-lambda
     return lambda executor: cls(
         executor,
         target_executors,
-        local_computation_factory=local_computation_factory)
+        local_computation_factory=local_computation_factory,
+        reduction_concurrency=reduction_concurrency)
     # pylint:enable=g-long-lambda
 
   def __init__(self,
@@ -163,7 +170,8 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
                target_executors: Dict[str, executor_base.Executor],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               reduction_concurrency: int = 1):
     """Creates a `FederatedResolvingStrategy`.
 
     Args:
@@ -178,6 +186,15 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         to construct local computations used as parameters in certain federated
         operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
         computation factory that generates TensorFlow code.
+      reduction_concurrency: The maximum number of groups of client values that
+        are accumulated concurrently on the server when reducing. With the
+        default of `1`, client values are folded into a single accumulator one
+        at a time. Otherwise, each group is accumulated starting from its own
+        copy of the zero, and the partial results are then merged pairwise in a
+        tree of depth `log2(reduction_concurrency)`. Note that this changes the
+        order in which values are combined, and is only equivalent to the
+        sequential reduction if the merge operator is associative and the zero
+        is its identity, as is required of `tff.federated_aggregate`.
 
     Raises:
       TypeError: If `target_executors` is not a `dict`, where each key is a
@@ -185,15 +202,21 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         `executor_base.Executor` or a list of `executor_base.Executor`s.
       ValueError: If `target_executors` contains a
         `placements.PlacementLiteral` key that is not a kind supported
-        by the `FederatedResolvingStrategy`.
+        by the `FederatedResolvingStrategy`, or if `reduction_concurrency` is
+        smaller than `1`.
     """
     super().__init__(executor)
     py_typecheck.check_type(target_executors, dict)
     py_typecheck.check_type(
         local_computation_factory,
         local_computation_factory_base.LocalComputationFactory)
+    py_typecheck.check_type(reduction_concurrency, int)
+    if reduction_concurrency < 1:
+      raise ValueError('Reduction concurrency must be positive, found '
+                       '{}.'.format(reduction_concurrency))
     self._target_executors = {}
     self._local_computation_factory = local_computation_factory
+    self._reduction_concurrency = reduction_concurrency
     for k, v in target_executors.items():
       if k is not None:
         py_typecheck.check_type(k, placements.PlacementLiteral)
@@ -395,21 +418,23 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     val_type, zero_type, accumulate_type, merge_type, report_type = (
         executor_utils.parse_federated_aggregate_argument_types(
             arg.type_signature))
-    del val_type, merge_type
+    del val_type
     py_typecheck.check_type(arg.internal_representation, structure.Struct)
     py_typecheck.check_len(arg.internal_representation, 5)
     val, zero, accumulate, merge, report = arg.internal_representation
 
-    # Discard `merge`. Since all aggregation happens on a single executor,
-    # there's no need for this additional layer.
-    del merge
-
     # Re-wrap `zero` in a `FederatingResolvingStrategyValue` to ensure that it
     # is an `ExecutorValue` rather than a `Struct` (since the internal
     # representation can include embedded values, lists of embedded values
     # (in the case of federated values), or `Struct`s.
     zero = FederatedResolvingStrategyValue(zero, zero_type)
-    pre_report = await self.reduce(val, zero, accumulate, accumulate_type)
+    pre_report = await self.reduce(
+        val,
+        zero,
+        accumulate,
+        accumulate_type,
+        merge_op=merge,
+        merge_op_type=merge_type)
 
     py_typecheck.check_type(pre_report.type_signature,
                             computation_types.FederatedType)
@@ -497,23 +522,75 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
       zero: executor_value_base.ExecutorValue,
       op: pb.Computation,
       op_type: computation_types.FunctionType,
+      merge_op: Optional[pb.Computation] = None,
+      merge_op_type: Optional[computation_types.FunctionType] = None,
   ) -> FederatedResolvingStrategyValue:
+    """Reduces the client values `val` on the server.
+
+    Args:
+      val: A list of client values to reduce.
+      zero: The initial value of the accumulator.
+      op: A computation which accumulates a single client value into an
+        accumulator.
+      op_type: The type signature of `op`.
+      merge_op: An optional computation which merges two accumulators. If
+        specified, and this strategy was constructed with a
+        `reduction_concurrency` larger than `1`, the client values are
+        accumulated in concurrent groups that are merged pairwise using
+        `merge_op`. Otherwise, all values are folded one at a time.
+      merge_op_type: The type signature of `merge_op`, required if `merge_op`
+        is specified.
+
+    Returns:
+      A `FederatedResolvingStrategyValue` holding the result at the server.
+    """
     server = self._target_executors[placements.SERVER][0]
 
     async def _move(v):
       return await server.create_value(await v.compute(), v.type_signature)
 
-    item_futures = asyncio.as_completed([_move(v) for v in val])
+    num_groups = min(self._reduction_concurrency, len(val))
+    if merge_op is None or num_groups < 2:
+      num_groups = 1
+    item_futures = [
+        asyncio.as_completed([_move(v) for v in val[i::num_groups]])
+        for i in range(num_groups)
+    ]
     zero_at_server = await server.create_value(await zero.compute(),
                                                zero.type_signature)
     op_at_server = await server.create_value(op, op_type)
 
-    result = zero_at_server
-    for item_future in item_futures:
-      item = await item_future
-      result = await server.create_call(
-          op_at_server, await server.create_struct(
-              structure.Struct([(None, result), (None, item)])))
+    async def _accumulate(group_item_futures):
+      result = zero_at_server
+      for item_future in group_item_futures:
+        item = await item_future
+        result = await server.create_call(
+            op_at_server, await server.create_struct(
+                structure.Struct([(None, result), (None, item)])))
+      return result
+
+    if num_groups == 1:
+      result = await _accumulate(item_futures[0])
+    else:
+      py_typecheck.check_type(merge_op_type, computation_types.FunctionType)
+      results, merge_op_at_server = await asyncio.gather(
+          asyncio.gather(*[_accumulate(f) for f in item_futures]),
+          server.create_value(merge_op, merge_op_type))
+
+      async def _merge(first, second):
+        return await server.create_call(
+            merge_op_at_server, await server.create_struct(
+                structure.Struct([(None, first), (None, second)])))
+
+      # Merge adjacent partial results, preserving their order, until a single
+      # result remains.
+      while len(results) > 1:
+        merged = await asyncio.gather(
+            *[_merge(x, y) for x, y in zip(results[0::2], results[1::2])])
+        if len(results) % 2:
+          merged.append(results[-1])
+        results = merged
+      result = results[0]
     return FederatedResolvingStrategyValue([result],
                                            computation_types.FederatedType(
                                                result.type_signature,
@@ -566,41 +643,40 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     if (client_keys_type.member.dtype != tf.int32 or
         client_keys_type.member.shape.rank != 1):
       raise TypeError(f'Unexpected `client_keys_type`: {client_keys_type}')
-    num_keys_per_client: int = client_keys_type.member.shape.dims[0].value
     unplaced_result_type = computation_types.SequenceType(select_fn_type.result)
     select_fn_at_server = await server.create_value(select_fn, select_fn_type)
-    index_fn_at_server = await executor_utils.embed_indexing_operator(
-        server, client_keys_type.member, single_key_type)
 
-    async def select_single_key(keys_at_server, key_index):
-      # Grab the `key_index`th key from the keys tensor.
-      index_arg = await server.create_struct(
-          structure.Struct([
-              (None, keys_at_server),
-              (None, await server.create_value(key_index, single_key_type)),
-          ]))
-      key_at_server = await server.create_call(index_fn_at_server, index_arg)
+    # Materialize the keys of all clients up front, so that `select_fn` is
+    # invoked once per distinct key rather than once per key of every client.
+    # This also avoids embedding and calling an indexing operator on the
+    # server for every key.
+    keys_per_client = [
+        np.asarray(keys).tolist()
+        for keys in await asyncio.gather(*[k.compute() for k in client_keys])
+    ]
+    unique_keys = sorted(set(itertools.chain.from_iterable(keys_per_client)))
+
+    async def select_single_key(key):
       select_fn_arg = await server.create_struct(
           structure.Struct([
               (None, server_val_at_server),
-              (None, key_at_server),
+              (None, await server.create_value(key, single_key_type)),
           ]))
       selected = await server.create_call(select_fn_at_server, select_fn_arg)
       return await selected.compute()
 
-    async def select_single_client(client, keys_at_client):
-      keys_at_server = await server.create_value(await keys_at_client.compute(),
-                                                 client_keys_type.member)
-      unplaced_values = await asyncio.gather(*[
-          select_single_key(keys_at_server, i)
-          for i in range(num_keys_per_client)
-      ])
+    selected_values = await asyncio.gather(
+        *[select_single_key(k) for k in unique_keys])
+    selected_value_by_key = dict(zip(unique_keys, selected_values))
+
+    async def select_single_client(client, keys):
+      unplaced_values = [selected_value_by_key[k] for k in keys]
       return await client.create_value(unplaced_values, unplaced_result_type)
 
     return FederatedResolvingStrategyValue(
         list(await asyncio.gather(*[
-            select_single_client(client, keys_at_client)
-            for client, keys_at_client in zip(clients, client_keys)
+            select_single_client(client, keys)
+            for client, keys in zip(clients, keys_per_client)
         ])), computation_types.at_clients(unplaced_result_type))
 
   @tracing.trace
@@ -618,8 +694,13 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
             self._executor,
             arg.type_signature.member,
             local_computation_factory=self._local_computation_factory))
-    return await self.reduce(arg.internal_representation, zero,
-                             plus.internal_representation, plus.type_signature)
+    return await self.reduce(
+        arg.internal_representation,
+        zero,
+        plus.internal_representation,
+        plus.type_signature,
+        merge_op=plus.internal_representation,
+        merge_op_type=plus.type_signature)
 
   @tracing.trace
   async def compute_federated_value_at_clients(
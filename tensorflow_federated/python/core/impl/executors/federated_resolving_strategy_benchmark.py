@@ -0,0 +1,179 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `FederatedResolvingStrategy`.
+
+Measures, on a local executor stack:
+
+*   the latency of `tff.federated_aggregate` as a function of the number of
+    clients and of the `reduction_concurrency` used to reduce client values on
+    the server.
+*   the latency of `tff.federated_select` as a function of the number of
+    clients and of the number of keys per client, with keys drawn from a shared
+    vocabulary so that clients select overlapping rows.
+
+Run with:
+
+```
+bazel run :federated_resolving_strategy_benchmark -- --benchmarks=.
+```
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import executor_stacks
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+_NUM_CLIENTS = (10, 100, 1000)
+_REDUCTION_CONCURRENCY = (1, 4, 16, 64)
+_VALUE_SIZE = 10000
+_NUM_ITERS = 3
+
+_SELECT_NUM_CLIENTS = (10, 100)
+_SELECT_KEYS_PER_CLIENT = (10, 100, 1000)
+_SELECT_VOCABULARY_SIZE = 2000
+_SELECT_ROW_SIZE = 16
+
+_VALUE_TYPE = computation_types.TensorType(tf.float32, [_VALUE_SIZE])
+
+
+@computations.tf_computation(_VALUE_TYPE, _VALUE_TYPE)
+def _add(x, y):
+  return x + y
+
+
+@computations.tf_computation(_VALUE_TYPE)
+def _identity(x):
+  return x
+
+
+@computations.federated_computation(computation_types.at_clients(_VALUE_TYPE))
+def _aggregate(x):
+  zero = computations.tf_computation(
+      lambda: tf.zeros([_VALUE_SIZE], tf.float32))()
+  return intrinsics.federated_aggregate(x, zero, _add, _add, _identity)
+
+
+_TABLE_TYPE = computation_types.TensorType(
+    tf.float32, [_SELECT_VOCABULARY_SIZE, _SELECT_ROW_SIZE])
+
+
+@computations.tf_computation(_TABLE_TYPE, tf.int32)
+def _select_row(table, key):
+  return tf.gather(table, key)
+
+
+def _create_select_comp(keys_per_client):
+
+  @computations.federated_computation(
+      computation_types.at_clients(
+          computation_types.TensorType(tf.int32, [keys_per_client])),
+      computation_types.at_server(_TABLE_TYPE))
+  def select(client_keys, table):
+    max_key = intrinsics.federated_value(_SELECT_VOCABULARY_SIZE,
+                                         placements.SERVER)
+    return intrinsics.federated_select(client_keys, max_key, table,
+                                       _select_row)
+
+  return select
+
+
+async def _run_select(executor, comp, client_keys, table):
+  comp_type = comp.type_signature
+  comp = await executor.create_value(comp)
+  client_keys, table = await asyncio.gather(
+      executor.create_value(client_keys, comp_type.parameter[0]),
+      executor.create_value(table, comp_type.parameter[1]))
+  arg = await executor.create_struct([client_keys, table])
+  result = await executor.create_call(comp, arg)
+  return await result.compute()
+
+
+async def _run_aggregation(executor, value, num_clients):
+  comp = await executor.create_value(_aggregate)
+  arg = await executor.create_value([value] * num_clients,
+                                    computation_types.at_clients(_VALUE_TYPE))
+  result = await executor.create_call(comp, arg)
+  return await result.compute()
+
+
+class FederatedResolvingStrategyBenchmark(tf.test.Benchmark):
+
+  def benchmark_aggregation_latency(self):
+    value = np.ones([_VALUE_SIZE], np.float32)
+    for reduction_concurrency in _REDUCTION_CONCURRENCY:
+      # Use a fanout larger than the number of clients, so that all client
+      # values are reduced by a single strategy.
+      factory = executor_stacks.local_executor_factory(
+          max_fanout=max(_NUM_CLIENTS) + 1,
+          reduction_concurrency=reduction_concurrency)
+      for num_clients in _NUM_CLIENTS:
+        executor = factory.create_executor({placements.CLIENTS: num_clients})
+        wall_times = []
+        for _ in range(_NUM_ITERS):
+          start_time = time.time()
+          asyncio.run(_run_aggregation(executor, value, num_clients))
+          wall_times.append(time.time() - start_time)
+        self.report_benchmark(
+            name='aggregation_latency_{}_concurrency_{}_clients'.format(
+                reduction_concurrency, num_clients),
+            iters=_NUM_ITERS,
+            wall_time=sum(wall_times) / _NUM_ITERS,
+            extras={
+                'num_clients': num_clients,
+                'reduction_concurrency': reduction_concurrency,
+            })
+      factory.clean_up_executors()
+
+  def benchmark_select_latency(self):
+    random_state = np.random.RandomState(0)
+    table = random_state.uniform(
+        size=[_SELECT_VOCABULARY_SIZE, _SELECT_ROW_SIZE]).astype(np.float32)
+    factory = executor_stacks.local_executor_factory(
+        max_fanout=max(_SELECT_NUM_CLIENTS) + 1)
+    for keys_per_client in _SELECT_KEYS_PER_CLIENT:
+      comp = _create_select_comp(keys_per_client)
+      for num_clients in _SELECT_NUM_CLIENTS:
+        client_keys = [
+            random_state.randint(
+                _SELECT_VOCABULARY_SIZE, size=[keys_per_client],
+                dtype=np.int32) for _ in range(num_clients)
+        ]
+        executor = factory.create_executor({placements.CLIENTS: num_clients})
+        wall_times = []
+        for _ in range(_NUM_ITERS):
+          start_time = time.time()
+          asyncio.run(_run_select(executor, comp, client_keys, table))
+          wall_times.append(time.time() - start_time)
+        self.report_benchmark(
+            name='select_latency_{}_keys_{}_clients'.format(
+                keys_per_client, num_clients),
+            iters=_NUM_ITERS,
+            wall_time=sum(wall_times) / _NUM_ITERS,
+            extras={
+                'num_clients': num_clients,
+                'keys_per_client': keys_per_client,
+                'num_unique_keys': len(np.unique(np.stack(client_keys))),
+            })
+    factory.clean_up_executors()
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -40,19 +40,22 @@ def all_isinstance(objs: Iterable[Any], classinfo: Type[Any]) -> bool:
 
 
 def create_test_executor(
-    number_of_clients: int = 3) -> federating_executor.FederatingExecutor:
+    number_of_clients: int = 3,
+    reduction_concurrency: int = 1) -> federating_executor.FederatingExecutor:
 
   def create_bottom_stack():
     executor = eager_tf_executor.EagerTFExecutor()
     return reference_resolving_executor.ReferenceResolvingExecutor(executor)
 
-  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory({
-      placements.SERVER:
-          create_bottom_stack(),
-      placements.CLIENTS: [
-          create_bottom_stack() for _ in range(number_of_clients)
-      ],
-  })
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+      {
+          placements.SERVER:
+              create_bottom_stack(),
+          placements.CLIENTS: [
+              create_bottom_stack() for _ in range(number_of_clients)
+          ],
+      },
+      reduction_concurrency=reduction_concurrency)
   return federating_executor.FederatingExecutor(factory, create_bottom_stack())
 
 
@@ -436,6 +439,80 @@ class FederatingExecutorCreateCallTest(executor_test_utils.AsyncTestCase,
     else:
       self.assertEqual(actual_result, expected_result)
 
+  @parameterized.named_parameters(
+      ('sequential', 1),
+      ('two_groups', 2),
+      ('uneven_groups', 3),
+      ('one_group_per_client', 5),
+      ('more_groups_than_clients', 10),
+  )
+  def test_returns_value_with_intrinsic_def_federated_sum_and_reduction_concurrency(
+      self, reduction_concurrency):
+    executor = create_test_executor(
+        number_of_clients=5, reduction_concurrency=reduction_concurrency)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_sum(
+    )
+
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    arg = self.run_sync(
+        executor.create_value([1.0, 2.0, 3.0, 4.0, 5.0],
+                              computation_types.at_clients(tf.float32)))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    self.assertEqual(self.run_sync(result.compute()), 15.0)
+
+  @parameterized.named_parameters(
+      ('sequential', 1),
+      ('two_groups', 2),
+      ('uneven_groups', 3),
+      ('one_group_per_client', 5),
+  )
+  def test_returns_value_with_intrinsic_def_federated_aggregate_and_reduction_concurrency(
+      self, reduction_concurrency):
+    executor = create_test_executor(
+        number_of_clients=5, reduction_concurrency=reduction_concurrency)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_aggregate(
+    )
+    args = [
+        ([1.0, 2.0, 3.0, 4.0, 5.0], computation_types.at_clients(tf.float32)),
+        (0.0, computation_types.TensorType(tf.float32)),
+        executor_test_utils.create_whimsy_computation_tensorflow_add(),
+        executor_test_utils.create_whimsy_computation_tensorflow_add(),
+        executor_test_utils.create_whimsy_computation_tensorflow_identity(),
+    ]
+
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    elements = [self.run_sync(executor.create_value(*x)) for x in args]
+    arg = self.run_sync(executor.create_struct(elements))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    self.assertEqual(self.run_sync(result.compute()), 15.0)
+
+  def test_returns_value_with_intrinsic_def_federated_select_and_shared_keys(
+      self):
+    executor = create_test_executor(number_of_clients=3)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_select(
+    )
+    client_keys = [[0, 1, 2], [2, 2, 0], [1, 1, 1]]
+    args = executor_test_utils.create_whimsy_federated_select_args()
+    _, client_keys_type = args[0]
+    args[0] = (client_keys, client_keys_type)
+
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    elements = [self.run_sync(executor.create_value(*x)) for x in args]
+    arg = self.run_sync(executor.create_struct(elements))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    actual_result = self.run_sync(result.compute())
+    self.assertLen(actual_result, len(client_keys))
+    for dataset, keys in zip(actual_result, client_keys):
+      self.assertEqual(
+          list(dataset.as_numpy_iterator()), [(b'abc', k) for k in keys])
+
+  def test_raises_value_error_with_nonpositive_reduction_concurrency(self):
+    with self.assertRaises(ValueError):
+      create_test_executor(reduction_concurrency=0)
+
   def test_returns_value_with_intrinsic_def_federated_eval_at_clients_and_random(
       self):
     executor = create_test_executor(number_of_clients=3)
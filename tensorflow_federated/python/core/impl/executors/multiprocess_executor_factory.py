@@ -0,0 +1,236 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An executor factory running local workers in separate processes."""
+
+from concurrent import futures
+import multiprocessing
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+import weakref
+
+from absl import logging
+import grpc
+
+from tensorflow_federated.proto.v0 import executor_pb2_grpc
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.core.impl.executors import executor_base
+from tensorflow_federated.python.core.impl.executors import executor_factory
+from tensorflow_federated.python.core.impl.executors import executor_service
+from tensorflow_federated.python.core.impl.executors import executor_stacks
+
+# The interval at which workers check whether the process which started them
+# is still running, so that orphaned workers exit.
+_PARENT_POLL_INTERVAL_SECONDS = 1.0
+
+
+def _serve_worker(socket_path: str, parent_pid: int, clients_per_thread: int,
+                  num_threads: int):
+  """Serves a local executor stack on `socket_path` until orphaned."""
+  ex_factory = executor_stacks.local_executor_factory(
+      clients_per_thread=clients_per_thread)
+  service = executor_service.ExecutorService(ex_factory)
+  server = grpc.server(futures.ThreadPoolExecutor(max_workers=num_threads))
+  server.add_insecure_port('unix:{}'.format(socket_path))
+  executor_pb2_grpc.add_ExecutorGroupServicer_to_server(service, server)
+  server.start()
+  try:
+    while server.wait_for_termination(timeout=_PARENT_POLL_INTERVAL_SECONDS):
+      if os.getppid() != parent_pid:
+        logging.info('Parent process exited; shutting down worker.')
+        break
+  finally:
+    server.stop(None)
+    ex_factory.clean_up_executors()
+
+
+def _shut_down_workers(processes: List[multiprocessing.Process],
+                       channels: List[grpc.Channel], socket_dir: str):
+  """Terminates the worker `processes` and releases their resources."""
+  for channel in channels:
+    channel.close()
+  for process in processes:
+    if process.is_alive():
+      process.terminate()
+  for process in processes:
+    process.join(timeout=10)
+    if process.is_alive():
+      process.kill()
+      process.join()
+  shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+class MultiprocessExecutorFactory(executor_factory.ExecutorFactory):
+  """Runs the clients of a local simulation in several worker processes.
+
+  The executors constructed by `executor_stacks.local_executor_factory` run
+  all clients in threads of the calling process, so Python-heavy client work
+  (e.g. dataset preprocessing or `tf.py_function`s) is bound to a single core
+  by the global interpreter lock. This factory instead starts `num_workers`
+  subprocesses, each hosting a `tff.framework.ExecutorService` over a local
+  executor stack, connects to them through gRPC over Unix domain sockets and
+  distributes the clients across them, as
+  `executor_stacks.remote_executor_factory` does for remote workers.
+
+  Workers which exit unexpectedly are restarted the next time an executor is
+  created. The workers are shut down by `close`, when the factory is used as a
+  context manager and exits, when the factory is garbage collected, or when the
+  calling process exits:
+
+  ```python
+  with MultiprocessExecutorFactory(num_workers=4) as factory:
+    context = tff.framework.ExecutionContext(factory)
+    ...
+  ```
+  """
+
+  def __init__(self,
+               num_workers: Optional[int] = None,
+               *,
+               default_num_clients: int = 0,
+               max_fanout: int = 100,
+               clients_per_thread: int = 1,
+               num_server_threads: int = 16,
+               dispose_batch_size: int = 20,
+               startup_timeout_seconds: float = 60.0):
+    """Initializes a `MultiprocessExecutorFactory`, starting its workers.
+
+    Args:
+      num_workers: The number of worker processes to start. Defaults to the
+        number of CPUs of the machine.
+      default_num_clients: The number of clients to use for simulations where
+        the number of clients cannot be inferred.
+      max_fanout: The maximum fanout at any point in the aggregation hierarchy
+        across workers.
+      clients_per_thread: The number of clients each thread of a worker
+        executes, as in `executor_stacks.local_executor_factory`.
+      num_server_threads: The number of threads of each worker handling gRPC
+        calls.
+      dispose_batch_size: The batch size for requests to dispose of values on
+        the workers.
+      startup_timeout_seconds: The number of seconds to wait for a started
+        worker to accept connections.
+
+    Raises:
+      ValueError: If `num_workers` or `num_server_threads` is not positive.
+      TimeoutError: If a worker did not accept connections within
+        `startup_timeout_seconds`.
+    """
+    if num_workers is None:
+      num_workers = os.cpu_count() or 1
+    py_typecheck.check_type(num_workers, int)
+    if num_workers < 1:
+      raise ValueError('Expected a positive `num_workers`, found '
+                       '{}.'.format(num_workers))
+    py_typecheck.check_type(clients_per_thread, int)
+    py_typecheck.check_type(num_server_threads, int)
+    if num_server_threads < 1:
+      raise ValueError('Expected a positive `num_server_threads`, found '
+                       '{}.'.format(num_server_threads))
+    self._clients_per_thread = clients_per_thread
+    self._num_server_threads = num_server_threads
+    self._startup_timeout_seconds = startup_timeout_seconds
+    # Workers are started with the `spawn` method, since TensorFlow does not
+    # support being used from a forked process.
+    self._mp_context = multiprocessing.get_context('spawn')
+    self._socket_dir = tempfile.mkdtemp(prefix='tff_workers_')
+    self._socket_paths = [
+        os.path.join(self._socket_dir, 'worker_{}.sock'.format(i))
+        for i in range(num_workers)
+    ]
+    self._processes = []
+    self._channels = []
+    self._finalizer = weakref.finalize(self, _shut_down_workers,
+                                       self._processes, self._channels,
+                                       self._socket_dir)
+    try:
+      for socket_path in self._socket_paths:
+        self._processes.append(self._start_worker(socket_path))
+        self._channels.append(
+            grpc.insecure_channel('unix:{}'.format(socket_path)))
+      for channel in self._channels:
+        self._wait_until_ready(channel)
+    except Exception:
+      self._finalizer()
+      raise
+    self._underlying_factory = executor_stacks.remote_executor_factory(
+        self._channels,
+        dispose_batch_size=dispose_batch_size,
+        max_fanout=max_fanout,
+        default_num_clients=default_num_clients)
+
+  def _start_worker(self, socket_path: str) -> multiprocessing.Process:
+    if os.path.exists(socket_path):
+      os.remove(socket_path)
+    process = self._mp_context.Process(
+        target=_serve_worker,
+        args=(socket_path, os.getpid(), self._clients_per_thread,
+              self._num_server_threads),
+        name='tff_worker_{}'.format(os.path.basename(socket_path)),
+        daemon=True)
+    process.start()
+    return process
+
+  def _wait_until_ready(self, channel: grpc.Channel):
+    try:
+      grpc.channel_ready_future(channel).result(
+          timeout=self._startup_timeout_seconds)
+    except grpc.FutureTimeoutError as e:
+      raise TimeoutError(
+          'A worker did not accept connections within {} seconds.'.format(
+              self._startup_timeout_seconds)) from e
+
+  def _restart_exited_workers(self):
+    restarted = False
+    for index, process in enumerate(self._processes):
+      if process.is_alive():
+        continue
+      logging.warning('Worker %s exited with code %s; restarting it.', index,
+                      process.exitcode)
+      self._processes[index] = self._start_worker(self._socket_paths[index])
+      self._wait_until_ready(self._channels[index])
+      restarted = True
+    if restarted:
+      # Executors configured on the exited workers lost their state, so they
+      # are reconstructed.
+      self._underlying_factory.clean_up_executors()
+
+  @property
+  def num_workers(self) -> int:
+    return len(self._processes)
+
+  def create_executor(
+      self, cardinalities: executor_factory.CardinalitiesType
+  ) -> executor_base.Executor:
+    if not self._finalizer.alive:
+      raise RuntimeError('Cannot create executors after the factory has been '
+                         'closed.')
+    self._restart_exited_workers()
+    return self._underlying_factory.create_executor(cardinalities)
+
+  def clean_up_executors(self):
+    self._underlying_factory.clean_up_executors()
+
+  def close(self):
+    """Cleans up the executors and shuts down the worker processes."""
+    if self._finalizer.alive:
+      self._underlying_factory.clean_up_executors()
+      self._finalizer()
+
+  def __enter__(self) -> 'MultiprocessExecutorFactory':
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
@@ -0,0 +1,101 @@
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `MultiprocessExecutorFactory`.
+
+Measures the latency of a round in which many clients each run a small
+computation, so that the Python overhead of the executors, which is bound by
+the global interpreter lock of a single process, dominates. The round is run
+with `executor_stacks.local_executor_factory` as a baseline, and across an
+increasing number of worker processes, up to the number of CPUs.
+
+Run with:
+
+```
+bazel run :multiprocess_executor_factory_benchmark -- --benchmarks=.
+```
+"""
+
+import os
+import time
+
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import executor_stacks
+from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.executors import multiprocess_executor_factory
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.types import computation_types
+
+_NUM_CLIENTS = 1000
+_NUM_ITERS = 3
+
+
+@computations.tf_computation(tf.int32)
+def _client_work(x):
+  dataset = tf.data.Dataset.range(100).map(lambda y: tf.cast(y, tf.int32) + x)
+  return dataset.reduce(tf.constant(0, tf.int32), lambda a, b: a + b)
+
+
+@computations.federated_computation(computation_types.at_clients(tf.int32))
+def _round(x):
+  return intrinsics.federated_sum(intrinsics.federated_map(_client_work, x))
+
+
+def _num_workers_to_benchmark():
+  num_cpus = os.cpu_count() or 1
+  num_workers = [1]
+  while num_workers[-1] * 2 < num_cpus:
+    num_workers.append(num_workers[-1] * 2)
+  if num_cpus > 1:
+    num_workers.append(num_cpus)
+  return num_workers
+
+
+class MultiprocessExecutorFactoryBenchmark(tf.test.Benchmark):
+
+  def _measure_round_latency(self, factory):
+    arg = list(range(_NUM_CLIENTS))
+    with executor_test_utils.install_executor(factory):
+      # The first round also traces and compiles the computations.
+      _round(arg)
+      start_time = time.time()
+      for _ in range(_NUM_ITERS):
+        _round(arg)
+    return (time.time() - start_time) / _NUM_ITERS
+
+  def _report_round_latency(self, name, wall_time, extras):
+    self.report_benchmark(
+        name=name,
+        iters=_NUM_ITERS,
+        wall_time=wall_time,
+        extras=dict(extras, num_clients=_NUM_CLIENTS))
+
+  def benchmark_round_latency_scaling(self):
+    baseline_wall_time = self._measure_round_latency(
+        executor_stacks.local_executor_factory())
+    self._report_round_latency('round_latency_single_process',
+                               baseline_wall_time, {})
+    for num_workers in _num_workers_to_benchmark():
+      with multiprocess_executor_factory.MultiprocessExecutorFactory(
+          num_workers=num_workers) as factory:
+        wall_time = self._measure_round_latency(factory)
+      self._report_round_latency(
+          'round_latency_{}_workers'.format(num_workers), wall_time, {
+              'num_workers': num_workers,
+              'speedup_over_single_process': baseline_wall_time / wall_time,
+          })
+
+if __name__ == '__main__':
+  tf.test.main()
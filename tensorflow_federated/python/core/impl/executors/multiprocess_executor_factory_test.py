@@ -0,0 +1,78 @@
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.executors import multiprocess_executor_factory
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.types import computation_types
+from tensorflow_federated.python.core.impl.types import placements
+
+
+@computations.federated_computation(computation_types.at_clients(tf.int32))
+def _sum(x):
+  return intrinsics.federated_sum(x)
+
+
+class MultiprocessExecutorFactoryTest(absltest.TestCase):
+
+  def test_executes_clients_across_workers(self):
+    with multiprocess_executor_factory.MultiprocessExecutorFactory(
+        num_workers=2) as factory:
+      with executor_test_utils.install_executor(factory):
+        result = _sum([1, 2, 3, 4, 5])
+
+    self.assertEqual(result, 15)
+
+  def test_executes_with_fewer_clients_than_workers(self):
+    with multiprocess_executor_factory.MultiprocessExecutorFactory(
+        num_workers=3) as factory:
+      with executor_test_utils.install_executor(factory):
+        result = _sum([1])
+
+    self.assertEqual(result, 1)
+
+  def test_restarts_exited_worker(self):
+    with multiprocess_executor_factory.MultiprocessExecutorFactory(
+        num_workers=2) as factory:
+      with executor_test_utils.install_executor(factory):
+        self.assertEqual(_sum([1, 2]), 3)
+        process = factory._processes[0]  # pylint: disable=protected-access
+        process.kill()
+        process.join()
+        self.assertEqual(_sum([1, 2, 3]), 6)
+
+      self.assertEqual(factory.num_workers, 2)
+
+  def test_close_shuts_down_workers(self):
+    factory = multiprocess_executor_factory.MultiprocessExecutorFactory(
+        num_workers=2)
+    processes = list(factory._processes)  # pylint: disable=protected-access
+    factory.close()
+
+    for process in processes:
+      self.assertFalse(process.is_alive())
+    with self.assertRaises(RuntimeError):
+      factory.create_executor({placements.CLIENTS: 1})
+
+  def test_raises_with_nonpositive_num_workers(self):
+    with self.assertRaises(ValueError):
+      multiprocess_executor_factory.MultiprocessExecutorFactory(num_workers=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
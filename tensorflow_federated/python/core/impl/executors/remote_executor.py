@@ -18,11 +18,13 @@
 # information.
 """A local proxy for a remote executor service hosted on a separate machine."""
 
-from typing import Mapping
+import inspect
+from typing import Mapping, Optional
 import weakref
 
 from absl import logging
 import grpc
+import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -39,6 +41,50 @@ from tensorflow_federated.python.core.impl.types import placements
 _STREAM_CLOSE_WAIT_SECONDS = 10
 
 
+# Values whose serialization is larger than this are transferred using the
+# streaming methods of the executor service.
+_DEFAULT_STREAMING_THRESHOLD_BYTES = (
+    2 * executor_serialization.DEFAULT_CHUNK_SIZE_BYTES)
+
+
+async def _await_if_needed(response):
+  """Awaits `response` if the stub returned an awaitable."""
+  if inspect.isawaitable(response):
+    return await response
+  return response
+
+
+def _is_unimplemented_error(error: Exception) -> bool:
+  return isinstance(error, NotImplementedError) or (
+      isinstance(error, grpc.RpcError) and
+      error.code() == grpc.StatusCode.UNIMPLEMENTED)
+
+
+def _estimate_size_bytes(
+    type_spec: computation_types.Type,
+    cardinalities: Mapping[placements.PlacementLiteral, int]) -> Optional[int]:
+  """Estimates the size of a value of `type_spec`, or `None` if unknown."""
+  if type_spec.is_tensor():
+    num_elements = type_spec.shape.num_elements()
+    if num_elements is None or type_spec.dtype == tf.string:
+      return None
+    return num_elements * type_spec.dtype.size
+  elif type_spec.is_struct():
+    total_size = 0
+    for element_type in structure.iter_elements(type_spec):
+      element_size = _estimate_size_bytes(element_type[1], cardinalities)
+      if element_size is None:
+        return None
+      total_size += element_size
+    return total_size
+  elif type_spec.is_federated():
+    member_size = _estimate_size_bytes(type_spec.member, cardinalities)
+    if member_size is None or type_spec.all_equal:
+      return member_size
+    return member_size * cardinalities.get(type_spec.placement, 1)
+  return None
+
+
 class RemoteValue(executor_value_base.ExecutorValue):
   """A reference to a value embedded in a remotely deployed executor service."""
 
@@ -72,7 +118,8 @@ class RemoteValue(executor_value_base.ExecutorValue):
 
   @tracing.trace(span=True)
   async def compute(self):
-    return await self._executor._compute(self._value_ref)  # pylint: disable=protected-access
+    return await self._executor._compute(  # pylint: disable=protected-access
+        self._value_ref, self._type_signature)
 
   @property
   def value_ref(self):
@@ -80,15 +127,25 @@ class RemoteValue(executor_value_base.ExecutorValue):
 
 
 class RemoteExecutor(executor_base.Executor):
-  """The remote executor is a local proxy for a remote executor instance."""
-
-  # TODO(b/134543154): Switch to using an asynchronous gRPC client so we don't
-  # have to block on all those calls.
-
-  def __init__(self,
-               stub: remote_executor_stub.RemoteExecutorStub,
-               thread_pool_executor=None,
-               dispose_batch_size=20):
+  """The remote executor is a local proxy for a remote executor instance.
+
+  If the `create_*` and `compute` methods of the stub are coroutines (as is the
+  case for `RemoteExecutorAioGrpcStub`), they are awaited, which allows many
+  requests to be in flight concurrently. Otherwise the stub calls block.
+
+  Values larger than `streaming_threshold_bytes` are sent to, and computed
+  results expected to be larger than it are received from, the service in
+  chunks using the streaming methods of the stub. If the stub or the service
+  does not implement streaming, the executor falls back to the unary methods.
+  """
+
+  def __init__(
+      self,
+      stub: remote_executor_stub.RemoteExecutorStub,
+      thread_pool_executor=None,
+      dispose_batch_size=20,
+      streaming_threshold_bytes: Optional[
+          int] = _DEFAULT_STREAMING_THRESHOLD_BYTES):
     """Creates a remote executor.
 
     Args:
@@ -101,9 +158,14 @@ class RemoteExecutor(executor_base.Executor):
         worker values. Lower values will result in more requests to the remote
         worker, but will result in values being cleaned up sooner and therefore
         may result in lower memory usage on the remote worker.
+      streaming_threshold_bytes: The size above which values are transferred
+        in chunks rather than in a single message, or `None` to never use the
+        streaming methods of the stub.
     """
 
     py_typecheck.check_type(dispose_batch_size, int)
+    if streaming_threshold_bytes is not None:
+      py_typecheck.check_type(streaming_threshold_bytes, int)
 
     logging.debug('Creating new ExecutorStub')
 
@@ -111,8 +173,10 @@ class RemoteExecutor(executor_base.Executor):
     # object from being GC'ed and the callback above from no-op'ing.
     self._stub = stub
     self._executor_id = None
+    self._cardinalities = {}
     self._dispose_request = None
     self._dispose_batch_size = dispose_batch_size
+    self._streaming_threshold_bytes = streaming_threshold_bytes
 
   def close(self):
     logging.debug('Clearing executor state on server.')
@@ -150,6 +214,7 @@ class RemoteExecutor(executor_base.Executor):
     request = executor_pb2.GetExecutorRequest(
         cardinalities=serialized_cardinalities)
     self._executor_id = self._stub.get_executor(request).executor
+    self._cardinalities = dict(cardinalities)
     self._dispose_request = executor_pb2.DisposeRequest(
         executor=self._executor_id)
 
@@ -177,12 +242,50 @@ class RemoteExecutor(executor_base.Executor):
       return executor_serialization.serialize_value(value, type_spec)
 
     value_proto, type_spec = serialize_value()
-    create_value_request = executor_pb2.CreateValueRequest(
-        executor=self._executor_id, value=value_proto)
-    response = self._stub.create_value(create_value_request)
+    size_bytes = _estimate_size_bytes(type_spec, self._cardinalities)
+    if size_bytes is None:
+      size_bytes = value_proto.ByteSize()
+    if self._should_stream(size_bytes):
+      response = await self._create_value_streaming(value_proto)
+    else:
+      create_value_request = executor_pb2.CreateValueRequest(
+          executor=self._executor_id, value=value_proto)
+      response = await _await_if_needed(
+          self._stub.create_value(create_value_request))
     py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
     return RemoteValue(response.value_ref, type_spec, self)
 
+  def _should_stream(self, size_bytes: Optional[int]) -> bool:
+    return (self._streaming_threshold_bytes is not None and
+            size_bytes is not None and
+            size_bytes > self._streaming_threshold_bytes)
+
+  def _disable_streaming(self, error: Exception):
+    logging.info(
+        'Streaming is not supported by the remote executor service, falling '
+        'back to unary requests: %s', error)
+    self._streaming_threshold_bytes = None
+
+  @tracing.trace(span=True)
+  async def _create_value_streaming(
+      self, value_proto: executor_pb2.Value
+  ) -> executor_pb2.CreateValueResponse:
+    # The chunks are serialized as they are sent, without materializing the
+    # request.
+    chunks = executor_serialization.chunk_value(
+        executor_pb2.CreateValueRequest(executor=self._executor_id),
+        value_proto)
+    try:
+      return await _await_if_needed(self._stub.create_value_streaming(chunks))
+    except (grpc.RpcError, NotImplementedError) as e:
+      if not _is_unimplemented_error(e):
+        raise
+      self._disable_streaming(e)
+    return await _await_if_needed(
+        self._stub.create_value(
+            executor_pb2.CreateValueRequest(
+                executor=self._executor_id, value=value_proto)))
+
   @tracing.trace(span=True)
   async def create_call(self, comp, arg=None):
     self._check_has_executor_id()
@@ -194,7 +297,8 @@ class RemoteExecutor(executor_base.Executor):
         executor=self._executor_id,
         function_ref=comp.value_ref,
         argument_ref=(arg.value_ref if arg is not None else None))
-    response = self._stub.create_call(create_call_request)
+    response = await _await_if_needed(
+        self._stub.create_call(create_call_request))
     py_typecheck.check_type(response, executor_pb2.CreateCallResponse)
     return RemoteValue(response.value_ref, comp.type_signature.result, self)
 
@@ -213,7 +317,7 @@ class RemoteExecutor(executor_base.Executor):
     result_type = computation_types.StructType(type_elem)
     request = executor_pb2.CreateStructRequest(
         executor=self._executor_id, element=proto_elem)
-    response = self._stub.create_struct(request)
+    response = await _await_if_needed(self._stub.create_struct(request))
     py_typecheck.check_type(response, executor_pb2.CreateStructResponse)
     return RemoteValue(response.value_ref, result_type, self)
 
@@ -226,17 +330,33 @@ class RemoteExecutor(executor_base.Executor):
     result_type = source.type_signature[index]
     request = executor_pb2.CreateSelectionRequest(
         executor=self._executor_id, source_ref=source.value_ref, index=index)
-    response = self._stub.create_selection(request)
+    response = await _await_if_needed(self._stub.create_selection(request))
     py_typecheck.check_type(response, executor_pb2.CreateSelectionResponse)
     return RemoteValue(response.value_ref, result_type, self)
 
   @tracing.trace(span=True)
-  async def _compute(self, value_ref):
+  async def _compute_streaming(
+      self,
+      request: executor_pb2.ComputeRequest) -> executor_pb2.ComputeResponse:
+    try:
+      return await _await_if_needed(self._stub.compute_streaming(request))
+    except (grpc.RpcError, NotImplementedError) as e:
+      if not _is_unimplemented_error(e):
+        raise
+      self._disable_streaming(e)
+    return await _await_if_needed(self._stub.compute(request))
+
+  @tracing.trace(span=True)
+  async def _compute(self, value_ref, type_spec=None):
     self._check_has_executor_id()
     py_typecheck.check_type(value_ref, executor_pb2.ValueRef)
     request = executor_pb2.ComputeRequest(
         executor=self._executor_id, value_ref=value_ref)
-    response = self._stub.compute(request)
+    if type_spec is not None and self._should_stream(
+        _estimate_size_bytes(type_spec, self._cardinalities)):
+      response = await self._compute_streaming(request)
+    else:
+      response = await _await_if_needed(self._stub.compute(request))
     py_typecheck.check_type(response, executor_pb2.ComputeResponse)
     value, _ = executor_serialization.deserialize_value(response.value)
     return value
@@ -0,0 +1,127 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `RemoteExecutor` with blocking and asyncio gRPC stubs.
+
+Each benchmark starts an in-process `ExecutorService` and measures the latency
+of a simulated round in which every client creates a value, calls a
+computation on it and computes the result, with all clients in flight
+concurrently.
+
+Run with:
+
+```
+bazel run :remote_executor_benchmark -- --benchmarks=.
+```
+"""
+
+import asyncio
+import contextlib
+import time
+
+import grpc
+from grpc.framework.foundation import logging_pool
+import portpicker
+import tensorflow as tf
+
+from tensorflow_federated.proto.v0 import executor_pb2_grpc
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import executor_service
+from tensorflow_federated.python.core.impl.executors import executor_stacks
+from tensorflow_federated.python.core.impl.executors import remote_executor
+from tensorflow_federated.python.core.impl.executors import remote_executor_grpc_stub
+from tensorflow_federated.python.core.impl.types import placements
+
+_NUM_CLIENTS = (1, 10, 100, 1000)
+_NUM_ITERS = 3
+
+
+@contextlib.contextmanager
+def _executor_service_port():
+  port = portpicker.pick_unused_port()
+  server = grpc.server(logging_pool.pool(max_workers=16))
+  server.add_insecure_port('[::]:{}'.format(port))
+  service = executor_service.ExecutorService(
+      executor_stacks.local_executor_factory())
+  executor_pb2_grpc.add_ExecutorGroupServicer_to_server(service, server)
+  server.start()
+  try:
+    yield port
+  finally:
+    server.stop(None)
+
+
+@contextlib.contextmanager
+def _stub(port, use_aio_stub):
+  target = 'localhost:{}'.format(port)
+  if use_aio_stub:
+    stub = remote_executor_grpc_stub.RemoteExecutorAioGrpcStub(target)
+    try:
+      yield stub
+    finally:
+      stub.close()
+  else:
+    channel = grpc.insecure_channel(target)
+    try:
+      yield remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
+    finally:
+      channel.close()
+
+
+@computations.tf_computation(tf.int32)
+def _add_one(x):
+  return x + 1
+
+
+async def _run_round(executor, num_clients):
+  comp = await executor.create_value(_add_one)
+
+  async def client_work(client_index):
+    arg = await executor.create_value(client_index, tf.int32)
+    result = await executor.create_call(comp, arg)
+    return await result.compute()
+
+  return await asyncio.gather(
+      *[client_work(i) for i in range(num_clients)])
+
+
+class RemoteExecutorBenchmark(tf.test.Benchmark):
+
+  def _benchmark_round_latency(self, use_aio_stub):
+    stub_name = 'aio' if use_aio_stub else 'blocking'
+    with _executor_service_port() as port, _stub(port, use_aio_stub) as stub:
+      for num_clients in _NUM_CLIENTS:
+        executor = remote_executor.RemoteExecutor(stub)
+        executor.set_cardinalities({placements.CLIENTS: num_clients})
+        wall_times = []
+        for _ in range(_NUM_ITERS):
+          start_time = time.time()
+          asyncio.run(_run_round(executor, num_clients))
+          wall_times.append(time.time() - start_time)
+        executor.close()
+        self.report_benchmark(
+            name='round_latency_{}_stub_{}_clients'.format(
+                stub_name, num_clients),
+            iters=_NUM_ITERS,
+            wall_time=sum(wall_times) / _NUM_ITERS,
+            extras={'num_clients': num_clients})
+
+  def benchmark_round_latency_blocking_stub(self):
+    self._benchmark_round_latency(use_aio_stub=False)
+
+  def benchmark_round_latency_aio_stub(self):
+    self._benchmark_round_latency(use_aio_stub=True)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -16,7 +16,14 @@
 # This modules disables the Pytype analyzer, see
 # https://github.com/tensorflow/federated/blob/main/docs/pytype.md for more
 # information.
-"""A stub connects to a remote executor over gRPC."""
+"""Stubs connecting to a remote executor over gRPC."""
+
+import asyncio
+from concurrent import futures
+import functools
+import threading
+from typing import Iterable, Optional, Sequence, Tuple
+import weakref
 
 from absl import logging
 import grpc
@@ -24,6 +31,7 @@ import grpc
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.proto.v0 import executor_pb2_grpc
 from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.executors import executor_serialization
 from tensorflow_federated.python.core.impl.executors import executors_errors
 from tensorflow_federated.python.core.impl.executors import remote_executor_stub
 
@@ -61,6 +69,43 @@ def _request(rpc_func, request):
         raise
 
 
+@tracing.trace(span=True)
+async def _request_async(rpc_func, request):
+  """Asynchronous version of `_request` for `grpc.aio` stubs."""
+  with tracing.wrap_rpc_in_trace_context():
+    try:
+      return await rpc_func(request)
+    except grpc.RpcError as e:
+      if _is_retryable_grpc_error(e):
+        logging.info("Received retryable gRPC error: %s", e)
+        raise executors_errors.RetryableError(e)
+      else:
+        raise
+
+
+async def _iter_off_loop(iterable):
+  """Yields the elements of `iterable`, each produced on the default executor.
+
+  Producing the chunks of a streaming request serializes the message, which
+  would otherwise block the event loop of the stub, and all the RPCs in flight
+  on it, for the duration of the serialization.
+
+  Args:
+    iterable: An iterable, whose iterator may block.
+
+  Yields:
+    The elements of `iterable`.
+  """
+  loop = asyncio.get_running_loop()
+  iterator = iter(iterable)
+  exhausted = object()
+  while True:
+    element = await loop.run_in_executor(None, next, iterator, exhausted)
+    if element is exhausted:
+      return
+    yield element
+
+
 class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
   """A stub connects to a remote executor service over gRPC."""
 
@@ -94,6 +139,12 @@ class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
     """Dispatches a CreateValue gRPC."""
     return _request(self._stub.CreateValue, request)
 
+  def create_value_streaming(
+      self, request_chunks: Iterable[executor_pb2.MessageChunk]
+  ) -> executor_pb2.CreateValueResponse:
+    """Dispatches a CreateValueStreaming gRPC."""
+    return _request(self._stub.CreateValueStreaming, iter(request_chunks))
+
   def create_struct(
       self, request: executor_pb2.CreateStructRequest
   ) -> executor_pb2.CreateStructResponse:
@@ -118,6 +169,17 @@ class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
     """Dispatches a Compute gRPC."""
     return _request(self._stub.Compute, request)
 
+  def compute_streaming(
+      self,
+      request: executor_pb2.ComputeRequest) -> executor_pb2.ComputeResponse:
+    """Dispatches a ComputeStreaming gRPC, parsing chunks as they arrive."""
+
+    def parse_response(request):
+      return executor_serialization.parse_chunks(
+          executor_pb2.ComputeResponse(), self._stub.ComputeStreaming(request))
+
+    return _request(parse_response, request)
+
   def dispose(
       self,
       request: executor_pb2.DisposeRequest) -> executor_pb2.DisposeResponse:
@@ -133,3 +195,186 @@ class RemoteExecutorGrpcStub(remote_executor_stub.RemoteExecutorStub):
   def is_ready(self) -> bool:
     """True if the gRPC connection is ready."""
     return self._channel_status == grpc.ChannelConnectivity.READY
+
+
+async def _watch_connectivity(channel: grpc.aio.Channel, stub_ref):
+  """Keeps the connectivity status of the stub at `stub_ref` up to date."""
+  state = channel.get_state(try_to_connect=True)
+  while True:
+    stub = stub_ref()
+    if stub is None:
+      return
+    stub._channel_status = state  # pylint: disable=protected-access
+    del stub
+    await channel.wait_for_state_change(state)
+    state = channel.get_state(try_to_connect=True)
+
+
+async def _log_dispose_error(coro):
+  try:
+    await coro
+  except (grpc.RpcError, executors_errors.RetryableError) as e:
+    logging.debug("Error disposing of remote values: %s", e)
+
+
+class RemoteExecutorAioGrpcStub(remote_executor_stub.RemoteExecutorStub):
+  """A stub connects to a remote executor service over asyncio gRPC.
+
+  Unlike `RemoteExecutorGrpcStub`, the methods `create_value`, `create_call`,
+  `create_struct`, `create_selection` and `compute` of this stub are coroutines,
+  so a `RemoteExecutor` can keep many requests in flight over a single channel
+  instead of blocking its event loop on each unary call.
+
+  The underlying `grpc.aio.Channel` is bound to an event loop running on a
+  dedicated thread owned by this stub, which allows the stub to be awaited from
+  any event loop (e.g. the one of a `ThreadDelegatingExecutor`). The methods
+  `get_executor` and `dispose_executor` block until the RPC completes, while
+  `dispose` is dispatched without waiting for a response.
+  """
+
+  def __init__(self,
+               target: str,
+               credentials: Optional[grpc.ChannelCredentials] = None,
+               options: Optional[Sequence[Tuple[str, str]]] = None):
+    """Initialize the stub by establishing the connection.
+
+    Args:
+      target: The target address of the remote executor service, e.g.
+        `'localhost:8000'`.
+      credentials: Optional `grpc.ChannelCredentials`. If specified, a secure
+        channel is created, otherwise an insecure one.
+      options: Optional sequence of key-value pairs configuring the channel.
+    """
+    self._event_loop = asyncio.new_event_loop()
+    self._event_loop.set_task_factory(
+        tracing.propagate_trace_context_task_factory)
+
+    def run_loop(loop):
+      loop.run_forever()
+      loop.close()
+
+    self._thread = threading.Thread(
+        target=functools.partial(run_loop, self._event_loop), daemon=True)
+    self._thread.start()
+
+    async def create_channel():
+      if credentials is None:
+        return grpc.aio.insecure_channel(target, options=options)
+      return grpc.aio.secure_channel(target, credentials, options=options)
+
+    self._channel_status = False
+    self._channel = asyncio.run_coroutine_threadsafe(
+        create_channel(), self._event_loop).result()
+    self._stub = executor_pb2_grpc.ExecutorGroupStub(self._channel)
+    asyncio.run_coroutine_threadsafe(
+        _watch_connectivity(self._channel, weakref.ref(self)),
+        self._event_loop)
+
+    def finalizer(loop, thread, channel):
+      logging.debug("Finalizing, closing channel and joining thread.")
+      try:
+        asyncio.run_coroutine_threadsafe(channel.close(), loop).result()
+      except RuntimeError:
+        pass  # The event loop is already closed.
+      loop.call_soon_threadsafe(loop.stop)
+      thread.join()
+
+    self._finalizer = weakref.finalize(self, finalizer, self._event_loop,
+                                       self._thread, self._channel)
+
+  def close(self):
+    """Closes the channel and stops the thread owned by this stub."""
+    self._finalizer()
+
+  def _submit(self, coro) -> futures.Future:
+    coro_with_trace_ctx = tracing.wrap_coroutine_in_current_trace_context(coro)
+    return asyncio.run_coroutine_threadsafe(coro_with_trace_ctx,
+                                            self._event_loop)
+
+  async def _request(self, rpc_func, request):
+    return await asyncio.wrap_future(
+        self._submit(_request_async(rpc_func, request)))
+
+  def _request_blocking(self, rpc_func, request):
+    if threading.current_thread() is self._thread:
+      raise RuntimeError(
+          "Blocking RPCs cannot be issued from the event loop of the stub.")
+    return self._submit(_request_async(rpc_func, request)).result()
+
+  def get_executor(
+      self, request: executor_pb2.GetExecutorRequest
+  ) -> executor_pb2.GetExecutorResponse:
+    """Dispatches a GetExecutor gRPC and blocks until it completes."""
+    return self._request_blocking(self._stub.GetExecutor, request)
+
+  async def create_value(
+      self, request: executor_pb2.CreateValueRequest
+  ) -> executor_pb2.CreateValueResponse:
+    """Dispatches a CreateValue gRPC."""
+    return await self._request(self._stub.CreateValue, request)
+
+  async def create_value_streaming(
+      self, request_chunks: Iterable[executor_pb2.MessageChunk]
+  ) -> executor_pb2.CreateValueResponse:
+    """Dispatches a CreateValueStreaming gRPC, serializing chunks off-loop."""
+    return await self._request(self._stub.CreateValueStreaming,
+                               _iter_off_loop(request_chunks))
+
+  async def create_struct(
+      self, request: executor_pb2.CreateStructRequest
+  ) -> executor_pb2.CreateStructResponse:
+    """Dispatches a CreateStruct gRPC."""
+    return await self._request(self._stub.CreateStruct, request)
+
+  async def create_call(
+      self, request: executor_pb2.CreateCallRequest
+  ) -> executor_pb2.CreateCallResponse:
+    """Dispatches a CreateCall gRPC."""
+    return await self._request(self._stub.CreateCall, request)
+
+  async def create_selection(
+      self, request: executor_pb2.CreateSelectionRequest
+  ) -> executor_pb2.CreateSelectionResponse:
+    """Dispatches a CreateSelection gRPC."""
+    return await self._request(self._stub.CreateSelection, request)
+
+  async def compute(
+      self,
+      request: executor_pb2.ComputeRequest) -> executor_pb2.ComputeResponse:
+    """Dispatches a Compute gRPC."""
+    return await self._request(self._stub.Compute, request)
+
+  async def compute_streaming(
+      self,
+      request: executor_pb2.ComputeRequest) -> executor_pb2.ComputeResponse:
+    """Dispatches a ComputeStreaming gRPC, parsing chunks as they arrive."""
+
+    async def parse_response(request):
+      parser = executor_serialization.MessageChunkParser(
+          executor_pb2.ComputeResponse())
+      loop = asyncio.get_running_loop()
+      async for chunk in self._stub.ComputeStreaming(request):
+        if chunk.continued:
+          parser.add(chunk)
+        else:
+          # Parsing the completed part may take long; keep it off the loop.
+          await loop.run_in_executor(None, parser.add, chunk)
+      return parser.result()
+
+    return await self._request(parse_response, request)
+
+  def dispose(self, request: executor_pb2.DisposeRequest):
+    """Dispatches a Dispose gRPC without waiting for the response."""
+    self._submit(_log_dispose_error(_request_async(self._stub.Dispose,
+                                                   request)))
+
+  def dispose_executor(
+      self, request: executor_pb2.DisposeExecutorRequest
+  ) -> executor_pb2.DisposeExecutorResponse:
+    """Dispatches a DisposeExecutor gRPC and blocks until it completes."""
+    return self._request_blocking(self._stub.DisposeExecutor, request)
+
+  @property
+  def is_ready(self) -> bool:
+    """True if the gRPC connection is ready."""
+    return self._channel_status == grpc.ChannelConnectivity.READY
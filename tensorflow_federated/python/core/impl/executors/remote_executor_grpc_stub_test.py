@@ -13,6 +13,7 @@
 # limitations under the License.
 """Tests for remote_executor_grpc_stub."""
 
+import asyncio
 from unittest import mock
 
 from absl.testing import absltest
@@ -34,6 +35,12 @@ def create_stub():
   return remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
 
 
+def create_aio_stub():
+  port = portpicker.pick_unused_port()
+  return remote_executor_grpc_stub.RemoteExecutorAioGrpcStub(
+      'localhost:{}'.format(port))
+
+
 def _raise_grpc_error_unavailable(*args):
   del args  # Unused
   error = grpc.RpcError()
@@ -269,5 +276,115 @@ class RemoteExecutorGrpcStubTest(absltest.TestCase):
       stub.create_selection(request=executor_pb2.CreateSelectionRequest())
 
 
+@mock.patch.object(executor_pb2_grpc, 'ExecutorGroupStub')
+class RemoteExecutorAioGrpcStubTest(absltest.TestCase):
+
+  def test_compute_returns_result(self, mock_executor_grpc_stub):
+    tensor_proto = tf.make_tensor_proto(1)
+    any_pb = any_pb2.Any()
+    any_pb.Pack(tensor_proto)
+    value = executor_pb2.Value(tensor=any_pb)
+    response = executor_pb2.ComputeResponse(value=value)
+    instance = mock_executor_grpc_stub.return_value
+    instance.Compute = mock.AsyncMock(side_effect=[response])
+
+    request = executor_pb2.ComputeRequest(
+        executor=executor_pb2.ExecutorId(), value_ref=executor_pb2.ValueRef())
+
+    stub = create_aio_stub()
+    self.addCleanup(stub.close)
+    result = asyncio.run(stub.compute(request))
+
+    instance.Compute.assert_called_once()
+
+    value, _ = executor_serialization.deserialize_value(result.value)
+    self.assertEqual(value, 1)
+
+  def test_compute_raises_retryable_error_on_grpc_error_unavailable(
+      self, mock_executor_grpc_stub):
+    instance = mock_executor_grpc_stub.return_value
+    instance.Compute = mock.AsyncMock(side_effect=_raise_grpc_error_unavailable)
+    stub = create_aio_stub()
+    self.addCleanup(stub.close)
+
+    with self.assertRaises(executors_errors.RetryableError):
+      asyncio.run(
+          stub.compute(
+              executor_pb2.ComputeRequest(value_ref=executor_pb2.ValueRef())))
+
+  def test_compute_reraises_grpc_error(self, mock_executor_grpc_stub):
+    instance = mock_executor_grpc_stub.return_value
+    instance.Compute = mock.AsyncMock(
+        side_effect=_raise_non_retryable_grpc_error)
+    stub = create_aio_stub()
+    self.addCleanup(stub.close)
+
+    with self.assertRaises(grpc.RpcError) as context:
+      asyncio.run(stub.compute(executor_pb2.ComputeRequest()))
+
+    self.assertEqual(context.exception.code(), grpc.StatusCode.ABORTED)
+
+  def test_get_executor_blocks_until_response(self, mock_executor_grpc_stub):
+    response = executor_pb2.GetExecutorResponse(
+        executor=executor_pb2.ExecutorId(id='id'))
+    instance = mock_executor_grpc_stub.return_value
+    instance.GetExecutor = mock.AsyncMock(side_effect=[response])
+    stub = create_aio_stub()
+    self.addCleanup(stub.close)
+    result = stub.get_executor(request=executor_pb2.GetExecutorRequest())
+    self.assertEqual(result, response)
+
+  def test_create_value_returns_value(self, mock_executor_grpc_stub):
+    response = executor_pb2.CreateValueResponse()
+    instance = mock_executor_grpc_stub.return_value
+    instance.CreateValue = mock.AsyncMock(side_effect=[response])
+    stub = create_aio_stub()
+    self.addCleanup(stub.close)
+    result = asyncio.run(
+        stub.create_value(request=executor_pb2.CreateValueRequest()))
+    self.assertEqual(result, response)
+
+  def test_create_call_requests_overlap(self, mock_executor_grpc_stub):
+    num_requests = 10
+    in_flight = []
+    max_in_flight = []
+
+    async def create_call(request):
+      del request  # Unused.
+      in_flight.append(None)
+      max_in_flight.append(len(in_flight))
+      await asyncio.sleep(0.05)
+      in_flight.pop()
+      return executor_pb2.CreateCallResponse()
+
+    instance = mock_executor_grpc_stub.return_value
+    instance.CreateCall = create_call
+    stub = create_aio_stub()
+    self.addCleanup(stub.close)
+
+    async def run_requests():
+      return await asyncio.gather(*[
+          stub.create_call(request=executor_pb2.CreateCallRequest())
+          for _ in range(num_requests)
+      ])
+
+    results = asyncio.run(run_requests())
+
+    self.assertLen(results, num_requests)
+    self.assertEqual(max(max_in_flight), num_requests)
+
+  def test_dispose_does_not_raise_on_grpc_error(self, mock_executor_grpc_stub):
+    instance = mock_executor_grpc_stub.return_value
+    instance.Dispose = mock.AsyncMock(
+        side_effect=_raise_non_retryable_grpc_error)
+    stub = create_aio_stub()
+    self.addCleanup(stub.close)
+
+    stub.dispose(executor_pb2.DisposeRequest())
+    stub.close()
+
+    instance.Dispose.assert_called_once()
+
+
 if __name__ == '__main__':
   absltest.main()
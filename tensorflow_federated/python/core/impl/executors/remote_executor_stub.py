@@ -19,6 +19,7 @@
 """A base Python interface for all stubs handles remote executions."""
 
 import abc
+from typing import Iterable
 
 from tensorflow_federated.proto.v0 import executor_pb2
 
@@ -47,6 +48,22 @@ class RemoteExecutorStub(abc.ABC):
     """
     raise NotImplementedError
 
+  def create_value_streaming(
+      self, request_chunks: Iterable[executor_pb2.MessageChunk]
+  ) -> executor_pb2.CreateValueResponse:
+    """Invokes CreateValueStreaming remotely.
+
+    Stubs which do not support streaming need not implement this method.
+
+    Args:
+      request_chunks: An iterable of `MessageChunk`s of a serialized
+        `CreateValueRequest`.
+
+    Returns:
+      CreateValueResponse.
+    """
+    raise NotImplementedError
+
   @abc.abstractmethod
   def create_struct(
       self, request: executor_pb2.CreateStructRequest
@@ -103,6 +120,22 @@ class RemoteExecutorStub(abc.ABC):
     """
     raise NotImplementedError
 
+  def compute_streaming(
+      self,
+      request: executor_pb2.ComputeRequest) -> executor_pb2.ComputeResponse:
+    """Invokes ComputeStreaming remotely.
+
+    The response is parsed from the streamed `MessageChunk`s as they arrive.
+    Stubs which do not support streaming need not implement this method.
+
+    Args:
+      request: ComputeRequest.
+
+    Returns:
+      ComputeResponse.
+    """
+    raise NotImplementedError
+
   @abc.abstractmethod
   def dispose(
       self,
@@ -28,6 +28,7 @@ from google.protobuf import any_pb2
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.proto.v0 import executor_pb2_grpc
 from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import executor_serialization
 from tensorflow_federated.python.core.impl.executors import executor_service
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
@@ -41,7 +42,7 @@ from tensorflow_federated.python.core.impl.types import placements
 
 
 @contextlib.contextmanager
-def test_context():
+def test_context(use_aio_stub=False, streaming_threshold_bytes=None):
   port = portpicker.pick_unused_port()
   server_pool = logging_pool.pool(max_workers=1)
   server = grpc.server(server_pool)
@@ -60,10 +61,15 @@ def test_context():
   executor_pb2_grpc.add_ExecutorGroupServicer_to_server(service, server)
   server.start()
 
-  channel = grpc.insecure_channel('localhost:{}'.format(port))
-
-  stub = remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
-  remote_exec = remote_executor.RemoteExecutor(stub)
+  if use_aio_stub:
+    channel = None
+    stub = remote_executor_grpc_stub.RemoteExecutorAioGrpcStub(
+        'localhost:{}'.format(port))
+  else:
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    stub = remote_executor_grpc_stub.RemoteExecutorGrpcStub(channel)
+  remote_exec = remote_executor.RemoteExecutor(
+      stub, streaming_threshold_bytes=streaming_threshold_bytes)
   remote_exec.set_cardinalities({placements.CLIENTS: 3})
   executor = reference_resolving_executor.ReferenceResolvingExecutor(
       remote_exec)
@@ -74,7 +80,10 @@ def test_context():
     for tracer in tracers:
       tracer.close()
     try:
-      channel.close()
+      if use_aio_stub:
+        stub.close()
+      else:
+        channel.close()
     except AttributeError:
       pass  # Public gRPC channel doesn't support close()
     finally:
@@ -180,6 +189,87 @@ class RemoteExecutorTest(absltest.TestCase):
     mock_stub.create_value.assert_called_once()
     self.assertIsInstance(result, remote_executor.RemoteValue)
 
+  def test_create_value_awaits_async_stub(self, mock_stub):
+    mock_stub.create_value = mock.AsyncMock(
+        return_value=executor_pb2.CreateValueResponse())
+    executor = remote_executor.RemoteExecutor(mock_stub)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    result = asyncio.run(executor.create_value(1, tf.int32))
+
+    mock_stub.create_value.assert_awaited_once()
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+
+  def test_create_value_streams_large_value(self, mock_stub):
+    mock_stub.create_value_streaming.return_value = (
+        executor_pb2.CreateValueResponse())
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, streaming_threshold_bytes=1024)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    result = asyncio.run(
+        executor.create_value(
+            tf.zeros([1024], tf.float32),
+            computation_types.TensorType(tf.float32, [1024])))
+
+    mock_stub.create_value_streaming.assert_called_once()
+    mock_stub.create_value.assert_not_called()
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+
+  def test_create_value_does_not_stream_small_value(self, mock_stub):
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, streaming_threshold_bytes=1024)
+    _set_cardinalities_with_mock(executor, mock_stub)
+
+    asyncio.run(executor.create_value(1, tf.int32))
+
+    mock_stub.create_value.assert_called_once()
+    mock_stub.create_value_streaming.assert_not_called()
+
+  def test_create_value_falls_back_to_unary_if_streaming_unimplemented(
+      self, mock_stub):
+
+    def _raise_unimplemented(*args):
+      del args  # Unused
+      error = grpc.RpcError()
+      error.code = lambda: grpc.StatusCode.UNIMPLEMENTED
+      raise error
+
+    mock_stub.create_value_streaming = mock.Mock(
+        side_effect=_raise_unimplemented)
+    mock_stub.create_value.return_value = executor_pb2.CreateValueResponse()
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, streaming_threshold_bytes=1024)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    value = tf.zeros([1024], tf.float32)
+    type_spec = computation_types.TensorType(tf.float32, [1024])
+
+    asyncio.run(executor.create_value(value, type_spec))
+    asyncio.run(executor.create_value(value, type_spec))
+
+    mock_stub.create_value_streaming.assert_called_once()
+    self.assertEqual(mock_stub.create_value.call_count, 2)
+
+  def test_compute_streams_large_value(self, mock_stub):
+    value_proto, _ = executor_serialization.serialize_value(
+        tf.zeros([1024], tf.float32),
+        computation_types.TensorType(tf.float32, [1024]))
+    mock_stub.compute_streaming.return_value = executor_pb2.ComputeResponse(
+        value=value_proto)
+    executor = remote_executor.RemoteExecutor(
+        mock_stub, streaming_threshold_bytes=1024)
+    _set_cardinalities_with_mock(executor, mock_stub)
+    value = remote_executor.RemoteValue(
+        executor_pb2.ValueRef(),
+        computation_types.TensorType(tf.float32, [1024]), executor)
+
+    result = asyncio.run(value.compute())
+
+    mock_stub.compute_streaming.assert_called_once()
+    mock_stub.compute.assert_not_called()
+    self.assertSequenceEqual(list(result), [0.0] * 1024)
+
   def test_create_value_reraises_grpc_error(self, mock_stub):
     mock_stub.create_value = mock.Mock(
         side_effect=_raise_non_retryable_grpc_error)
@@ -380,6 +470,34 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
     ]
     self.assertLen(seletions, 2)
 
+  def test_two_arg_tf_computation_with_aio_stub(self):
+    with test_context(use_aio_stub=True) as context:
+
+      @computations.tf_computation(tf.int32, tf.int32)
+      def comp(x, y):
+        return x + y
+
+      result = _invoke(context.executor, comp, (10, 20))
+      self.assertEqual(result, 30)
+
+  def test_with_selection_with_aio_stub(self):
+    with test_context(use_aio_stub=True) as context:
+      self._test_with_selection(context)
+
+  @parameterized.named_parameters(('grpc_stub', False), ('aio_grpc_stub', True))
+  def test_with_federated_computations_streaming(self, use_aio_stub):
+    with test_context(
+        use_aio_stub=use_aio_stub, streaming_threshold_bytes=0) as context:
+
+      @computations.federated_computation(
+          computation_types.FederatedType(
+              computation_types.TensorType(tf.int32, [3]), placements.CLIENTS))
+      def foo(x):
+        return intrinsics.federated_sum(x)
+
+      result = _invoke(context.executor, foo, [[1, 2, 3]] * 3)
+      self.assertEqual(list(result), [3, 6, 9])
+
   def test_execution_of_tensorflow(self):
 
     @computations.tf_computation
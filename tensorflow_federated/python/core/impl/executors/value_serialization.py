@@ -35,6 +35,7 @@ from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.executors import dense_tensor_serialization
 from tensorflow_federated.python.core.impl.executors import executor_bindings
 from tensorflow_federated.python.core.impl.executors import executor_utils
 from tensorflow_federated.python.core.impl.types import computation_types
@@ -120,6 +121,11 @@ def _serialize_tensor_value(
       raise TypeError(
           f'Failed to serialize value of Python type {value_type_string} to '
           f'a tensor of type {type_spec}.\nValue: {original_value}') from te
+  if (dense_tensor_serialization.is_supported_ndarray(value) and
+      value.nbytes >= dense_tensor_serialization.DEFAULT_MIN_SIZE_BYTES):
+    # Large dense tensors are serialized with fewer copies of their content
+    # than `tf.make_tensor_proto` makes.
+    return dense_tensor_serialization.serialize_ndarray(value), type_spec
   return executor_bindings.serialize_tensor_value(value), type_spec
 
 
@@ -370,7 +376,12 @@ def _deserialize_tensor_value(
     TypeError: If the arguments are of the wrong types.
     ValueError: If the value is malformed.
   """
-  value = executor_bindings.deserialize_tensor_value(value_proto)
+  # Copied, so that callers receive writable arrays owning their data, as with
+  # the regular deserialization below.
+  value = dense_tensor_serialization.deserialize_ndarray(
+      value_proto, copy=True)
+  if value is None:
+    value = executor_bindings.deserialize_tensor_value(value_proto)
   value_type = computation_types.TensorType(
       dtype=value.dtype, shape=value.shape)
   if not value.shape:
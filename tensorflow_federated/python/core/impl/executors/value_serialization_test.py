@@ -37,6 +37,8 @@ TENSOR_SERIALIZATION_TEST_PARAMS = [
     ('python_scalar', 25.0, TensorType(tf.float32)),
     ('python_1d_list', [1.0, 2.0], TensorType(tf.float32, [2])),
     ('python_2d_list', [[1.0], [2.0]], TensorType(tf.float32, [2, 1])),
+    ('numpy_large_tensor', np.ones([128, 256], np.float32),
+     TensorType(tf.float32, [128, 256])),
 ]
 
 
@@ -54,6 +56,15 @@ class ValueSerializationtest(tf.test.TestCase, parameterized.TestCase):
     self.assertEqual(y.dtype, serialize_type_spec.dtype.as_numpy_dtype)
     self.assertAllEqual(x, y)
 
+  def test_deserialized_large_tensor_value_is_writable(self):
+    x = np.ones([128, 256], np.float32)
+    value_proto, _ = value_serialization.serialize_value(
+        x, TensorType(tf.float32, [128, 256]))
+    y, _ = value_serialization.deserialize_value(value_proto)
+    self.assertTrue(y.flags.writeable)
+    y[0, 0] = 2.0
+    self.assertEqual(y[0, 0], 2.0)
+
   @parameterized.named_parameters(TENSOR_SERIALIZATION_TEST_PARAMS)
   def test_serialize_deserialize_tensor_value_without_hint_graph_mode(
       self, x, serialize_type_spec):
@@ -23,8 +23,10 @@ import atexit
 import collections
 import difflib
 import enum
+import functools
+import threading
 import typing
-from typing import Any, Dict, Optional, Sequence, Type as TypingType, TypeVar, Union
+from typing import Any, Dict, Optional, Sequence, Tuple, Type as TypingType, TypeVar, Union
 import weakref
 
 import attr
@@ -311,6 +313,18 @@ class _ValueWithHash():
 _intern_pool: Dict[typing.Type[Any], Dict[Any, Any]] = (
     collections.defaultdict(lambda: {}))
 
+# A bounded memo of the results of `Type.is_assignable_from`, from the ids of
+# the target and source types to the types themselves and the result.
+#
+# Types are interned, so a relation is only computed once for each pair of
+# structurally different types. Entries keep references to the pair of types,
+# so that their ids are not reused while the entry exists. Once the memo is
+# full, the oldest entries are evicted first.
+_MAX_ASSIGNABILITY_MEMO_SIZE = 100000
+_assignability_memo: typing.OrderedDict[
+    Tuple[int, int], Tuple['Type', 'Type', bool]] = collections.OrderedDict()
+_assignability_memo_lock = threading.Lock()
+
 
 def clear_intern_pool():
   # We must clear our `WeakKeyValueDictionary`s at the end of the program to
@@ -322,11 +336,38 @@ def clear_intern_pool():
   # exceptions after main.
   global _intern_pool
   _intern_pool = None
+  # The memo refers to the interned types, so it is cleared alongside them.
+  global _assignability_memo
+  _assignability_memo = None
 
 
 atexit.register(clear_intern_pool)
 
 
+def _memoize_assignability(is_assignable_from_fn):
+  """Decorates an `is_assignable_from` method to memoize its results."""
+
+  @functools.wraps(is_assignable_from_fn)
+  def _is_assignable_from(self, source_type):
+    if self is source_type:
+      return True
+    memo = _assignability_memo
+    if memo is None:
+      return is_assignable_from_fn(self, source_type)
+    key = (id(self), id(source_type))
+    entry = memo.get(key)
+    if entry is not None and entry[0] is self and entry[1] is source_type:
+      return entry[2]
+    result = is_assignable_from_fn(self, source_type)
+    with _assignability_memo_lock:
+      while len(memo) >= _MAX_ASSIGNABILITY_MEMO_SIZE:
+        memo.popitem(last=False)
+      memo[key] = (self, source_type, result)
+    return result
+
+  return _is_assignable_from
+
+
 class _Intern(abc.ABCMeta):
   """A metaclass which interns instances.
 
@@ -492,6 +533,7 @@ class TensorType(Type, metaclass=_Intern):
             (isinstance(other, TensorType) and self._dtype == other.dtype and
              tensor_utils.same_shape(self._shape, other.shape)))
 
+  @_memoize_assignability
   def is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
@@ -616,6 +658,7 @@ class StructType(structure.Struct, Type, metaclass=_Intern):
     return (self is other) or (isinstance(other, StructType) and
                                structure.Struct.__eq__(self, other))
 
+  @_memoize_assignability
   def is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
@@ -714,6 +757,7 @@ class SequenceType(Type, metaclass=_Intern):
     return ((self is other) or (isinstance(other, SequenceType) and
                                 self._element == other.element))
 
+  @_memoize_assignability
   def is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
@@ -769,6 +813,7 @@ class FunctionType(Type, metaclass=_Intern):
                                 self._parameter == other.parameter and
                                 self._result == other.result))
 
+  @_memoize_assignability
   def is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
@@ -937,6 +982,7 @@ class FederatedType(Type, metaclass=_Intern):
                                 self._placement == other.placement and
                                 self._all_equal == other.all_equal))
 
+  @_memoize_assignability
   def is_assignable_from(self, source_type: 'Type') -> bool:
     if self is source_type:
       return True
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -497,6 +498,66 @@ class FederatedTypeTest(absltest.TestCase):
     self.assertEqual(actual_type, expected_type)
 
 
+class AssignabilityMemoTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    # pylint: disable=protected-access
+    computation_types._assignability_memo.clear()
+    self.addCleanup(computation_types._assignability_memo.clear)
+    # pylint: enable=protected-access
+
+  def test_memoized_results_match_both_directions(self):
+    struct_type = computation_types.StructType([('a', tf.int32)])
+    struct_with_python_type = computation_types.StructWithPythonType(
+        [('a', tf.int32)], collections.OrderedDict)
+    unnamed_type = computation_types.StructType([tf.int32])
+    for _ in range(2):
+      self.assertTrue(struct_type.is_assignable_from(struct_with_python_type))
+      self.assertTrue(struct_with_python_type.is_assignable_from(struct_type))
+      self.assertTrue(unnamed_type.is_assignable_from(struct_type))
+      self.assertFalse(struct_type.is_assignable_from(unnamed_type))
+      self.assertFalse(struct_type.is_equivalent_to(unnamed_type))
+
+  def test_returns_memoized_result(self):
+    target_type = computation_types.TensorType(tf.float32, [None])
+    source_type = computation_types.TensorType(tf.float32, [3])
+    self.assertTrue(target_type.is_assignable_from(source_type))
+    # pylint: disable=protected-access
+    memo = computation_types._assignability_memo
+    # pylint: enable=protected-access
+    key = (id(target_type), id(source_type))
+    self.assertEqual(memo[key], (target_type, source_type, True))
+    memo[key] = (target_type, source_type, False)
+    self.assertFalse(target_type.is_assignable_from(source_type))
+
+  def test_memo_size_is_bounded(self):
+    target_type = computation_types.TensorType(tf.int32, [None])
+    with mock.patch.object(computation_types, '_MAX_ASSIGNABILITY_MEMO_SIZE',
+                           3):
+      source_types = []
+      for size in range(10):
+        source_type = computation_types.TensorType(tf.int32, [size])
+        self.assertTrue(target_type.is_assignable_from(source_type))
+        source_types.append(source_type)
+      # pylint: disable=protected-access
+      memo = computation_types._assignability_memo
+      # pylint: enable=protected-access
+      self.assertLen(memo, 3)
+      # The oldest entries are evicted first.
+      self.assertEqual(
+          list(memo),
+          [(id(target_type), id(t)) for t in source_types[-3:]])
+
+  def test_results_do_not_depend_on_memo(self):
+    target_type = computation_types.FederatedType(tf.int32, placements.CLIENTS)
+    source_type = computation_types.FederatedType(
+        tf.int32, placements.CLIENTS, all_equal=True)
+    with mock.patch.object(computation_types, '_assignability_memo', None):
+      self.assertTrue(target_type.is_assignable_from(source_type))
+      self.assertFalse(source_type.is_assignable_from(target_type))
+
+
 class ToTypeTest(absltest.TestCase):
 
   def test_tensor_type(self):
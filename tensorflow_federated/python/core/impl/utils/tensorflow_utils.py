@@ -19,6 +19,7 @@
 """Utilities for interacting with and manipulating TensorFlow graphs."""
 
 import collections
+import hashlib
 import itertools
 import typing
 from typing import Any, Iterable, Optional, Tuple, Type
@@ -1070,6 +1071,44 @@ def coerce_dataset_elements_to_tff_type_spec(dataset, element_type):
   return dataset.map(_unwrap_args)
 
 
+def compute_cache_key_id(comp: pb.Computation) -> int:
+  """Returns a content-derived ID for the TensorFlow computation `comp`.
+
+  The ID depends on the type signature, graph and bindings of `comp`, but not
+  on an existing `cache_key`, and is stable across processes. It is suitable
+  for populating `comp.tensorflow.cache_key.id`, which executors use to reuse
+  the functions they construct from TensorFlow computations.
+
+  Args:
+    comp: A `pb.Computation` with the `tensorflow` field set.
+
+  Returns:
+    A nonzero unsigned 64-bit integer.
+
+  Raises:
+    ValueError: If `comp` is not a TensorFlow computation.
+  """
+  py_typecheck.check_type(comp, pb.Computation)
+  if comp.WhichOneof('computation') != 'tensorflow':
+    raise ValueError('Expected a TensorFlow computation, found {}.'.format(
+        comp.WhichOneof('computation')))
+  hasher = hashlib.sha256()
+  # Important: the type signature is hashed too, because TFF might produce
+  # (<> -> <>) or (<> -> <<>>) functions, which both could be represented as
+  # the same graph with a single NoOp node.
+  for part in (comp.type, comp.tensorflow.parameter, comp.tensorflow.result):
+    serialized_part = part.SerializeToString(deterministic=True)
+    hasher.update(len(serialized_part).to_bytes(8, 'little'))
+    hasher.update(serialized_part)
+  for name in (comp.tensorflow.initialize_op,
+               comp.tensorflow.session_token_tensor_name):
+    hasher.update(name.encode('utf-8'))
+    hasher.update(b'\x00')
+  hasher.update(comp.tensorflow.graph_def.value)
+  # Zero denotes an unset `cache_key.id`.
+  return int.from_bytes(hasher.digest()[:8], 'little') or 1
+
+
 def uniquify_shared_names_with_suffix(graph_def: tf.compat.v1.GraphDef,
                                       suffix: str) -> tf.compat.v1.GraphDef:
   """Appends unique identifier to any shared names present in `graph`."""
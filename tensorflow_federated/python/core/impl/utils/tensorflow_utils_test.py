@@ -1152,6 +1152,53 @@ class GraphUtilsTest(tf.test.TestCase):
     computation_types.to_type(y.element_spec).check_equivalent_to(element_type)
 
 
+def _create_identity_computation_proto(dtype):
+  with tf.Graph().as_default() as graph:
+    parameter_value, parameter_binding = tensorflow_utils.stamp_parameter_in_graph(
+        'x', dtype, graph)
+    result = tf.identity(parameter_value)
+    result_type, result_binding = tensorflow_utils.capture_result_from_graph(
+        result, graph)
+  type_signature = computation_types.FunctionType(
+      computation_types.TensorType(dtype), result_type)
+  return pb.Computation(
+      type=type_serialization.serialize_type(type_signature),
+      tensorflow=pb.TensorFlow(
+          graph_def=serialization_utils.pack_graph_def(graph.as_graph_def()),
+          parameter=parameter_binding,
+          result=result_binding))
+
+
+class ComputeCacheKeyIdTest(tf.test.TestCase):
+
+  def test_returns_same_id_for_equal_computations(self):
+    comp = _create_identity_computation_proto(tf.int32)
+    other_comp = pb.Computation()
+    other_comp.CopyFrom(comp)
+    self.assertEqual(
+        tensorflow_utils.compute_cache_key_id(comp),
+        tensorflow_utils.compute_cache_key_id(other_comp))
+
+  def test_returns_different_ids_for_different_types(self):
+    self.assertNotEqual(
+        tensorflow_utils.compute_cache_key_id(
+            _create_identity_computation_proto(tf.int32)),
+        tensorflow_utils.compute_cache_key_id(
+            _create_identity_computation_proto(tf.float32)))
+
+  def test_ignores_existing_cache_key(self):
+    comp = _create_identity_computation_proto(tf.int32)
+    expected_id = tensorflow_utils.compute_cache_key_id(comp)
+    comp.tensorflow.cache_key.id = 5
+    self.assertEqual(tensorflow_utils.compute_cache_key_id(comp), expected_id)
+    self.assertNotEqual(expected_id, 0)
+
+  def test_raises_on_non_tensorflow_computation(self):
+    comp = pb.Computation(reference=pb.Reference(name='x'))
+    with self.assertRaises(ValueError):
+      tensorflow_utils.compute_cache_key_id(comp)
+
+
 class TensorFlowDeserializationTest(tf.test.TestCase):
 
   @tensorflow_test_utils.graph_mode_test
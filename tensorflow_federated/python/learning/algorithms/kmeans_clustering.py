@@ -47,6 +47,41 @@ _INDEX_DTYPE = tf.int32
 _POINT_DTYPE = tf.float32
 _WEIGHT_DTYPE = tf.int32
 _MILLIS_PER_SECOND = 100000.0
+# The number of points assigned to centroids at once, for unbatched datasets.
+_DEFAULT_BATCH_SIZE = 128
+
+
+def _find_closest_centroids(centroids: tf.Tensor, points: tf.Tensor):
+  """Find the centroids closest to a batch of points.
+
+  The squared distance between a point `x` and a centroid `c` is
+  `||x||^2 - 2 <x, c> + ||c||^2`. The first term does not depend on the
+  centroid, so the closest centroids are found by computing the inner products
+  of all points and centroids as a single matrix multiplication.
+
+  Args:
+    centroids: A tensor containing the k-means centroids, indexed by the first
+      axis.
+    points: A tensor of points indexed by the first axis, whose shape matches
+      `centroids.shape[1:]` on the remaining axes. Must have the same data type
+      as `centroids`.
+
+  Returns:
+    An integer tensor of shape `(points.shape[0],)` whose i-th component is the
+    row of `centroids` closest to `points[i]`.
+  """
+  num_centroids = tf.shape(centroids)[0]
+  num_points = tf.shape(points)[0]
+  num_features = tf.math.reduce_prod(tf.shape(centroids)[1:])
+  flat_centroids = tf.reshape(centroids, [num_centroids, num_features])
+  flat_points = tf.reshape(points, [num_points, num_features])
+  centroid_square_norms = tf.math.reduce_sum(
+      flat_centroids * flat_centroids, axis=1)
+  inner_products = tf.linalg.matmul(
+      flat_points, flat_centroids, transpose_b=True)
+  square_distances = (
+      tf.expand_dims(centroid_square_norms, axis=0) - 2 * inner_products)
+  return tf.math.argmin(square_distances, axis=1, output_type=_INDEX_DTYPE)
 
 
 @tf.function
@@ -64,12 +99,7 @@ def _find_closest_centroid(centroids: tf.Tensor, point: tf.Tensor):
   Returns:
      An integer representing the row of `centroids` closes to `point`.
   """
-  num_axes = tf.rank(centroids)
-  data_axes = tf.range(1, limit=num_axes)
-  shifted_centroids = centroids - point
-  square_distances = tf.math.reduce_sum(
-      shifted_centroids * shifted_centroids, axis=data_axes)
-  return tf.math.argmin(square_distances, axis=0, output_type=_INDEX_DTYPE)
+  return _find_closest_centroids(centroids, tf.expand_dims(point, axis=0))[0]
 
 
 @tf.function
@@ -85,27 +115,39 @@ def _compute_kmeans_step(centroids: tf.Tensor, data: tf.data.Dataset):
   component is the number of points closest to the i-th centroid. The
   `ClientResult.update_weight` attribute is left empty.
 
+  The points are processed a batch at a time. If the elements of `data` are
+  single points, they are batched into batches of `_DEFAULT_BATCH_SIZE`
+  points first.
+
   Args:
     centroids: A `tf.Tensor` of centroids, indexed by the first axis.
     data: A `tf.data.Dataset` of points, each of which has shape matching that
-      of `centroids.shape[1:]`.
+      of `centroids.shape[1:]`, or of batches of such points, each of which has
+      an additional leading batch axis.
 
   Returns:
    A `tff.learning.templates.ClientResult`.
   """
+  if data.element_spec.shape.rank == centroids.shape.rank - 1:
+    data = data.batch(_DEFAULT_BATCH_SIZE)
+  num_centroids = tf.shape(centroids)[0]
+  num_features = tf.math.reduce_prod(tf.shape(centroids)[1:])
   cluster_sums = tf.zeros_like(centroids)
   cluster_weights = tf.zeros(shape=(centroids.shape[0],), dtype=_WEIGHT_DTYPE)
   num_examples = tf.constant(0, dtype=_WEIGHT_DTYPE)
 
-  def reduce_fn(state, point):
+  def reduce_fn(state, points):
     cluster_sums, cluster_weights, num_examples = state
-    closest_centroid = _find_closest_centroid(centroids, point)
-    scatter_index = [[closest_centroid]]
-    cluster_sums = tf.tensor_scatter_nd_add(cluster_sums, scatter_index,
-                                            tf.expand_dims(point, axis=0))
-    cluster_weights = tf.tensor_scatter_nd_add(cluster_weights, scatter_index,
-                                               [1])
-    num_examples += 1
+    closest_centroids = _find_closest_centroids(centroids, points)
+    num_points = tf.shape(points)[0]
+    flat_points = tf.reshape(points, [num_points, num_features])
+    batch_sums = tf.math.unsorted_segment_sum(flat_points, closest_centroids,
+                                              num_centroids)
+    cluster_sums += tf.reshape(batch_sums, tf.shape(centroids))
+    cluster_weights += tf.math.unsorted_segment_sum(
+        tf.ones_like(closest_centroids, dtype=_WEIGHT_DTYPE),
+        closest_centroids, num_centroids)
+    num_examples += tf.cast(num_points, _WEIGHT_DTYPE)
     return cluster_sums, cluster_weights, num_examples
 
   cluster_sums, cluster_weights, num_examples = data.reduce(
@@ -232,6 +274,7 @@ def build_fed_kmeans(
     random_seed: Optional[Tuple[int, int]] = None,
     distributor: Optional[distributors.DistributionProcess] = None,
     sum_aggregator: Optional[factory.UnweightedAggregationFactory] = None,
+    data_is_batched: bool = False,
 ) -> learning_process.LearningProcess:
   """Builds a learning process for federated k-means clustering.
 
@@ -266,7 +309,10 @@ def build_fed_kmeans(
   Here, `S` is a `tff.learning.templates.LearningAlgorithmState`. The centroids
   `W` is a tensor representing the current centroids, and is of shape
   `(num_clusters,) + data_shape`. The datasets `{B*}` must have elements of
-  shape `data_shape`, and not employ batching.
+  shape `data_shape`, unless `data_is_batched` is `True`, in which case their
+  elements are batches of shape `(None,) + data_shape`. Client datasets are
+  processed a batch at a time either way, but pre-batched datasets let clients
+  control the batch size, and avoid rebatching points on every round.
 
   The centroids are updated at each round by assigning all clients' points to
   the nearest centroid, and then summing these points according to these
@@ -279,8 +325,8 @@ def build_fed_kmeans(
   Args:
     num_clusters: The number of clusters to use.
     data_shape: A tuple of integers specifying the shape of each data point.
-      Note that this data shape should be unbatched, as this algorithm does not
-      currently support batched data points.
+      Note that this data shape should be unbatched, even if `data_is_batched`
+      is `True`.
     random_seed: A tuple of two integers used to seed the initialization phase.
     distributor: An optional `tff.learning.tekmplates.DistributionProcess` that
       broadcasts the centroids on the server to the clients. If set to `None`,
@@ -289,6 +335,8 @@ def build_fed_kmeans(
     sum_aggregator: An optional `tff.aggregators.UnweightedAggregationFactory`
       used to sum updates across clients. If `None`, we use
       `tff.aggregators.SumFactory`.
+    data_is_batched: Whether the elements of the client datasets are batches of
+      data points, rather than single data points.
 
   Returns:
     A `LearningProcess`.
@@ -307,7 +355,11 @@ def build_fed_kmeans(
   centroids_type = computation_types.TensorType(_POINT_DTYPE, centroids_shape)
   weights_type = computation_types.TensorType(
       _WEIGHT_DTYPE, shape=(num_clusters,))
-  point_type = computation_types.TensorType(_POINT_DTYPE, shape=data_shape)
+  if data_is_batched:
+    point_type = computation_types.TensorType(
+        _POINT_DTYPE, shape=(None,) + data_shape)
+  else:
+    point_type = computation_types.TensorType(_POINT_DTYPE, shape=data_shape)
   data_type = computation_types.SequenceType(point_type)
 
   if distributor is None:
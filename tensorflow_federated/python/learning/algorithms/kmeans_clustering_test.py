@@ -60,6 +60,25 @@ class ClientWorkTest(tf.test.TestCase, parameterized.TestCase):
         centroids, point)
     self.assertEqual(closest_centroid, 1)
 
+  def test_find_closest_centroids_matches_pairwise_distances(self):
+    centroids = tf.random.stateless_normal((7, 3, 2), seed=(0, 0))
+    points = tf.random.stateless_normal((20, 3, 2), seed=(1, 0))
+    closest_centroids = kmeans_clustering._find_closest_centroids(
+        centroids, points)
+    differences = tf.expand_dims(points, axis=1) - tf.expand_dims(
+        centroids, axis=0)
+    square_distances = tf.math.reduce_sum(
+        differences * differences, axis=[2, 3])
+    expected_closest_centroids = tf.math.argmin(square_distances, axis=1)
+    self.assertAllEqual(closest_centroids, expected_closest_centroids)
+
+  def test_find_closest_centroids_breaks_ties_by_lowest_index(self):
+    centroids = tf.constant([[-1.0], [1.0], [1.0]])
+    points = tf.constant([[0.0], [2.0]])
+    closest_centroids = kmeans_clustering._find_closest_centroids(
+        centroids, points)
+    self.assertAllEqual(closest_centroids, [0, 1])
+
   @parameterized.named_parameters(
       ('shape1', (1,)),
       ('shape2', (2,)),
@@ -86,6 +105,41 @@ class ClientWorkTest(tf.test.TestCase, parameterized.TestCase):
     self.assertEmpty(actual_result.update_weight)
     self.assertDictEqual(actual_metrics, {'num_examples': 5})
 
+  @parameterized.named_parameters(
+      ('batch_size1', 1),
+      ('batch_size2', 2),
+      ('batch_size5', 5),
+  )
+  def test_kmeans_step_with_batched_data(self, batch_size):
+    shape = (2, 3)
+    centroid1 = tf.fill(shape, -1)
+    centroid2 = tf.fill(shape, 1)
+    centroids = tf.convert_to_tensor([centroid1, centroid2])
+    cluster_zero_points = [tf.fill(shape, -2) for _ in range(2)]
+    cluster_one_points = [tf.fill(shape, 2) for _ in range(3)]
+    data = tf.data.Dataset.from_tensor_slices(
+        cluster_zero_points + cluster_one_points).batch(batch_size)
+
+    actual_result, actual_metrics = kmeans_clustering._compute_kmeans_step(
+        centroids, data)
+    expected_result_update = (tf.convert_to_tensor(
+        [tf.fill(shape, -4), tf.fill(shape, 6)]), tf.constant([2, 3]))
+
+    self.assertAllEqual(actual_result.update[0], expected_result_update[0])
+    self.assertAllEqual(actual_result.update[1], expected_result_update[1])
+    self.assertDictEqual(actual_metrics, {'num_examples': 5})
+
+  def test_kmeans_step_with_empty_data(self):
+    centroids = tf.constant([[-1.0, 1.0], [1.0, -1.0]])
+    data = tf.data.Dataset.from_tensor_slices(tf.zeros((0, 2)))
+
+    actual_result, actual_metrics = kmeans_clustering._compute_kmeans_step(
+        centroids, data)
+
+    self.assertAllEqual(actual_result.update[0], tf.zeros((2, 2)))
+    self.assertAllEqual(actual_result.update[1], [0, 0])
+    self.assertDictEqual(actual_metrics, {'num_examples': 0})
+
   @parameterized.named_parameters(
       ('int32', tf.int32),
       ('int64', tf.int64),
@@ -353,6 +407,28 @@ class FederatedKmeansTest(tf.test.TestCase):
     self.assertAllClose(actual_centroids, expected_centroids)
     self.assertAllEqual(weights, [3])
 
+  def test_single_step_with_batched_data(self):
+    data_shape = (3, 2)
+    kmeans = kmeans_clustering.build_fed_kmeans(
+        num_clusters=1,
+        data_shape=data_shape,
+        random_seed=(0, 0),
+        data_is_batched=True)
+    point1 = tf.fill(data_shape, value=1.0)
+    point2 = tf.fill(data_shape, value=2.0)
+    dataset = tf.data.Dataset.from_tensor_slices([point1, point2]).batch(2)
+
+    state = kmeans.initialize()
+    initial_centroids = state.global_model_weights
+    output = kmeans.next(state, [dataset])
+    actual_centroids = output.state.global_model_weights
+    weights = output.state.finalizer
+    expected_centroids = (1 / 3) * (
+        initial_centroids + tf.expand_dims(point1 + point2, axis=0))
+
+    self.assertAllClose(actual_centroids, expected_centroids)
+    self.assertAllEqual(weights, [3])
+
   def test_two_steps_with_one_cluster(self):
     data_shape = (3, 2)
     kmeans = kmeans_clustering.build_fed_kmeans(
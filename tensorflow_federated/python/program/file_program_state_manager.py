@@ -21,11 +21,18 @@ means that this library:
 """
 
 import asyncio
+from concurrent import futures
+import functools
+import hashlib
+import io
+import json
 import os
 import os.path
-from typing import Any, List, Optional, Union
+import random
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
 
 from absl import logging
+import numpy as np
 import tensorflow as tf
 import tree
 
@@ -229,3 +236,359 @@ class FileProgramStateManager(program_state_manager.ProgramStateManager):
     flattened_state = tree.flatten(materialized_state)
     await file_utils.write_saved_model(flattened_state, path)
     await self._remove_old_program_state()
+
+
+_BLOBS_DIRNAME = 'blobs'
+_BLOB_SUFFIX = '.npy'
+_MANIFEST_FILENAME = 'manifest.json'
+_COMMIT_MARKER_FILENAME = 'COMMITTED'
+_MANIFEST_FORMAT_VERSION = 2
+# The dtype recorded in the manifest for leaves of strings, which are saved as
+# length-prefixed blobs, see `_encode_bytes_array`.
+_BYTES_DTYPE = np.dtype(object).str
+_LENGTH_DTYPE = np.dtype('<u8')
+
+
+def _to_ndarray(value: Any) -> np.ndarray:
+  """Converts a leaf of program state to a `numpy.ndarray`.
+
+  Strings are converted to object arrays of `bytes`, with `str`s encoded as
+  UTF-8, rather than to the fixed-width string dtypes of `numpy`, which strip
+  trailing NUL bytes.
+  """
+  if isinstance(value, (tf.Tensor, tf.Variable)):
+    value = value.numpy()
+  if isinstance(value, (bytes, str)):
+    array = np.empty([], dtype=object)
+    array[()] = value
+  else:
+    # Copies the value, so that later mutations by the caller are not saved.
+    array = np.array(value)
+  if array.dtype.kind in ('O', 'S', 'U'):
+    encoded = np.empty(array.shape, dtype=object)
+    for index, x in np.ndenumerate(array):
+      if isinstance(x, str):
+        encoded[index] = x.encode('utf-8')
+      elif isinstance(x, bytes):
+        encoded[index] = bytes(x)
+      else:
+        raise TypeError('Expected the program state to only contain values '
+                        'convertible to `numpy.ndarray`s, found '
+                        f'{type(value)}.')
+    return encoded
+  return np.ascontiguousarray(array)
+
+
+def _encode_bytes_array(array: np.ndarray) -> np.ndarray:
+  """Encodes an object array of `bytes` as a `uint8` array.
+
+  The encoded array holds the lengths of the elements of `array`, as
+  little-endian 64-bit integers, followed by the concatenated elements.
+
+  Args:
+    array: An object `numpy.ndarray` of `bytes`.
+
+  Returns:
+    A 1-D `uint8` `numpy.ndarray`.
+  """
+  elements = list(array.flat)
+  lengths = np.array([len(x) for x in elements], dtype=_LENGTH_DTYPE)
+  return np.concatenate([
+      lengths.view(np.uint8),
+      np.frombuffer(b''.join(elements), dtype=np.uint8),
+  ])
+
+
+def _decode_bytes_array(encoded: np.ndarray, shape: List[int]) -> np.ndarray:
+  """Decodes an array encoded by `_encode_bytes_array` of the given `shape`."""
+  buffer = encoded.tobytes()
+  num_elements = int(np.prod(shape, dtype=np.int64))
+  lengths = np.frombuffer(buffer, dtype=_LENGTH_DTYPE, count=num_elements)
+  array = np.empty([num_elements], dtype=object)
+  offset = lengths.nbytes
+  for i, length in enumerate(lengths.tolist()):
+    array[i] = buffer[offset:offset + length]
+    offset += length
+  return array.reshape(shape)
+
+
+def _compute_digest(array: np.ndarray) -> str:
+  hasher = hashlib.sha256()
+  hasher.update(array.dtype.str.encode('utf-8'))
+  hasher.update(repr(array.shape).encode('utf-8'))
+  hasher.update(b'\x00')
+  hasher.update(array.reshape(-1).view(np.uint8))
+  return hasher.hexdigest()
+
+
+def _write_file_atomically(path: str, write_fn: Callable[[Any], None]):
+  temp_path = f'{path}_temp{random.randint(1000, 9999)}'
+  with tf.io.gfile.GFile(temp_path, 'wb') as file:
+    write_fn(file)
+  tf.io.gfile.rename(temp_path, path, overwrite=True)
+
+
+class IncrementalFileProgramStateManager(FileProgramStateManager):
+  """A `tff.program.FileProgramStateManager` which deduplicates saved values.
+
+  Unlike `tff.program.FileProgramStateManager`, which saves each version of
+  the program state as a full SavedModel, this manager saves each leaf of the
+  flattened program state as a content-addressed `.npy` blob shared by all
+  versions, and each version as a small manifest referencing the blobs. Leaves
+  which do not change across versions, e.g. frozen layers or static
+  configuration, are therefore only written once. Blobs no longer referenced by
+  any kept version are removed.
+
+  Saving happens in a background thread: `save` returns once the program state
+  is materialized and snapshotted, and the next call to this manager waits for
+  the save to complete. A version is only visible once all of its blobs and its
+  manifest are written, as marked by a commit marker written last, so a
+  program interrupted while saving resumes from the previous version.
+
+  Loaded leaves are `numpy.ndarray`s. For program state on a local file
+  system, they are memory-mapped, so that they are only read when used. Strings
+  are loaded as object arrays of `bytes`, like the values of string tensors,
+  with `str`s encoded as UTF-8.
+
+  Note: Only program state whose leaves are `None` or convertible to
+  `numpy.ndarray`s (e.g. tensors, `numpy` values and Python scalars) can be
+  saved by this manager.
+  """
+
+  def __init__(self,
+               root_dir: Union[str, os.PathLike[str]],
+               prefix: str = 'program_state_',
+               keep_total: int = 5,
+               keep_first: bool = True,
+               save_in_background: bool = True):
+    """Returns an initialized `tff.program.IncrementalFileProgramStateManager`.
+
+    Args:
+      root_dir: A path on the file system to save program state. If this path
+        does not exist it will be created.
+      prefix: A string to use as the prefix for filenames.
+      keep_total: An integer representing the total number of program states to
+        keep. If the value is zero or smaller, all program states will be kept.
+      keep_first: A boolean indicating if the first program state should be
+        kept, irrespective of whether it is the oldest program state or not.
+      save_in_background: A boolean indicating if `save` should return before
+        the program state is written to the file system.
+
+    Raises:
+      ValueError: If `root_dir` is an empty string.
+    """
+    super().__init__(
+        root_dir=root_dir,
+        prefix=prefix,
+        keep_total=keep_total,
+        keep_first=keep_first)
+    py_typecheck.check_type(save_in_background, bool)
+    self._blobs_dir = os.path.join(os.fspath(root_dir), _BLOBS_DIRNAME)
+    if not tf.io.gfile.exists(self._blobs_dir):
+      tf.io.gfile.makedirs(self._blobs_dir)
+    self._save_in_background = save_in_background
+    self._thread_pool = futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix='program_state_manager')
+    self._pending_save: Optional[futures.Future] = None
+
+  async def wait_for_pending_save(self):
+    """Waits for a save running in the background, raising its errors."""
+    pending_save = self._pending_save
+    if pending_save is None:
+      return
+    try:
+      await asyncio.wrap_future(pending_save)
+    finally:
+      if self._pending_save is pending_save:
+        self._pending_save = None
+
+  def _is_committed(self, version: int) -> bool:
+    path = self._get_path_for_version(version)
+    return tf.io.gfile.exists(os.path.join(path, _COMMIT_MARKER_FILENAME))
+
+  async def get_versions(self) -> Optional[List[int]]:
+    """Returns a list of saved versions or `None`.
+
+    Versions whose save did not complete are ignored.
+
+    Returns:
+      A list of saved versions or `None` if there is no saved program state.
+    """
+    await self.wait_for_pending_save()
+    versions = await super().get_versions()
+    if versions is None:
+      return None
+    loop = asyncio.get_running_loop()
+    committed = await asyncio.gather(*[
+        loop.run_in_executor(None, self._is_committed, v) for v in versions
+    ])
+    versions = [v for v, c in zip(versions, committed) if c]
+    return versions or None
+
+  def _blob_path(self, digest: str) -> str:
+    return os.path.join(self._blobs_dir, f'{digest}{_BLOB_SUFFIX}')
+
+  def _read_manifest(self, version: int) -> Dict[str, Any]:
+    path = os.path.join(
+        self._get_path_for_version(version), _MANIFEST_FILENAME)
+    with tf.io.gfile.GFile(path, 'r') as file:
+      return json.load(file)
+
+  def _read_leaf(self, entry: Mapping[str, Any]) -> Any:
+    if entry['blob'] is None:
+      return None
+    path = self._blob_path(entry['blob'])
+    # Empty and scalar arrays cannot be memory-mapped.
+    if (os.path.exists(path) and entry['shape'] and
+        0 not in entry['shape']):
+      array = np.load(path, mmap_mode='r')
+    else:
+      with tf.io.gfile.GFile(path, 'rb') as file:
+        array = np.load(io.BytesIO(file.read()))
+    if entry['dtype'] == _BYTES_DTYPE:
+      array = _decode_bytes_array(array, entry['shape'])
+    if array.ndim == 0:
+      return array[()]
+    return array
+
+  async def load(self, version: int, structure: Any) -> Any:
+    """Returns the program state for the given `version`.
+
+    Args:
+      version: A integer representing the version of a saved program state.
+      structure: The nested structure of the saved program state for the given
+        `version` used to support serialization and deserailization of
+        user-defined classes in the structure.
+
+    Raises:
+      ProgramStateManagerStateNotFoundError: If there is no program state for
+        the given `version`.
+      ProgramStateManagerStructureError: If `structure` does not match the value
+        loaded for the given `version`.
+    """
+    py_typecheck.check_type(version, int)
+    await self.wait_for_pending_save()
+
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(None, self._is_committed, version):
+      raise program_state_manager.ProgramStateManagerStateNotFoundError(
+          f'No program state found for version: {version}')
+    manifest = await loop.run_in_executor(None, self._read_manifest, version)
+    flattened_state = await asyncio.gather(*[
+        loop.run_in_executor(None, self._read_leaf, entry)
+        for entry in manifest['leaves']
+    ])
+    try:
+      program_state = tree.unflatten_as(structure, flattened_state)
+    except ValueError as e:
+      raise program_state_manager.ProgramStateManagerStructureError(
+          f'The structure of type {type(structure)}:\n'
+          f'{structure}\n'
+          f'does not match the value of type {type(flattened_state)}:\n'
+          f'{flattened_state}\n') from e
+    logging.info('Program state loaded: %s',
+                 self._get_path_for_version(version))
+    return program_state
+
+  def _write_version(self, leaves: List[Optional[np.ndarray]], version: int):
+    """Writes the blobs and manifest of `version`, then commits it."""
+    path = self._get_path_for_version(version)
+    if tf.io.gfile.exists(path):
+      # Remove the leftovers of an interrupted save.
+      tf.io.gfile.rmtree(path)
+    tf.io.gfile.makedirs(path)
+
+    entries = []
+    num_written_bytes = 0
+    for array in leaves:
+      if array is None:
+        entries.append({'blob': None, 'dtype': None, 'shape': None})
+        continue
+      if array.dtype == object:
+        blob = _encode_bytes_array(array)
+      else:
+        blob = array
+      digest = _compute_digest(blob)
+      blob_path = self._blob_path(digest)
+      if not tf.io.gfile.exists(blob_path):
+        _write_file_atomically(
+            blob_path, functools.partial(np.save, arr=blob, allow_pickle=False))
+        num_written_bytes += blob.nbytes
+      entries.append({
+          'blob': digest,
+          'dtype': array.dtype.str,
+          'shape': list(array.shape),
+      })
+
+    manifest = {'format_version': _MANIFEST_FORMAT_VERSION, 'leaves': entries}
+    _write_file_atomically(
+        os.path.join(path, _MANIFEST_FILENAME),
+        lambda file: file.write(json.dumps(manifest).encode('utf-8')))
+    _write_file_atomically(
+        os.path.join(path, _COMMIT_MARKER_FILENAME), lambda file: None)
+    logging.info('Program state saved: %s (%d new bytes)', path,
+                 num_written_bytes)
+    self._remove_old_versions()
+
+  def _remove_old_versions(self):
+    """Removes old versions and the blobs no longer referenced."""
+    versions = []
+    for entry in tf.io.gfile.listdir(self._root_dir):
+      version = self._get_version_for_path(entry.rstrip('/'))
+      if version is not None and self._is_committed(version):
+        versions.append(version)
+    versions.sort()
+    if self._keep_total > 0 and len(versions) > self._keep_total:
+      start = 1 if self._keep_first else 0
+      stop = start - self._keep_total
+      for version in versions[start:stop]:
+        path = self._get_path_for_version(version)
+        tf.io.gfile.rmtree(path)
+        logging.info('Program state removed: %s', path)
+      versions = versions[:start] + versions[stop:]
+
+    referenced_blobs = set()
+    for version in versions:
+      for entry in self._read_manifest(version)['leaves']:
+        if entry['blob'] is not None:
+          referenced_blobs.add(f'{entry["blob"]}{_BLOB_SUFFIX}')
+    for blob in tf.io.gfile.listdir(self._blobs_dir):
+      if blob not in referenced_blobs:
+        tf.io.gfile.remove(os.path.join(self._blobs_dir, blob))
+
+  async def save(self, program_state: Any, version: int):
+    """Saves `program_state` for the given `version`.
+
+    If this manager saves in the background, this method returns once
+    `program_state` is materialized, and errors raised while writing it are
+    raised by the next call to this manager.
+
+    Args:
+      program_state: A materialized value, a value reference, or a structure of
+        materialized values and value references representing the program state
+        to save.
+      version: A strictly increasing integer representing the version of a saved
+        `program_state`.
+
+    Raises:
+      ProgramStateManagerStateAlreadyExistsError: If there is already program
+        state for the given `version`.
+    """
+    py_typecheck.check_type(version, int)
+    await self.wait_for_pending_save()
+
+    loop = asyncio.get_running_loop()
+    if await loop.run_in_executor(None, self._is_committed, version):
+      raise program_state_manager.ProgramStateManagerStateAlreadyExistsError(
+          f'Program state already exists for version: {version}')
+    materialized_state = await value_reference.materialize_value(program_state)
+    # Convert the leaves before returning, so that later mutations of the
+    # program state by the caller are not saved.
+    leaves = [
+        None if x is None else _to_ndarray(x)
+        for x in tree.flatten(materialized_state)
+    ]
+    self._pending_save = self._thread_pool.submit(self._write_version, leaves,
+                                                  version)
+    if not self._save_in_background:
+      await self.wait_for_pending_save()
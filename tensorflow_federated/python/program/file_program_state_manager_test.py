@@ -610,5 +610,172 @@ class FileProgramStateManagerSaveTest(parameterized.TestCase,
       await program_state_mngr.save('state', version)
 
 
+
+def _list_blobs(root_dir):
+  return os.listdir(os.path.join(root_dir, 'blobs'))
+
+
+class IncrementalFileProgramStateManagerTest(parameterized.TestCase,
+                                             unittest.IsolatedAsyncioTestCase,
+                                             tf.test.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('none', None, None),
+      ('bool', True, np.array(True)),
+      ('int', 1, np.array(1)),
+      ('str', 'a', b'a'),
+      ('tensor_str', tf.constant('a'), np.array(b'a')),
+      ('tensor_str_1d', tf.constant(['a', 'bc']), np.array([b'a', b'bc'])),
+      ('tensor_2d', tf.ones((2, 3)), np.ones((2, 3), np.float32)),
+      ('numpy_empty',
+       np.zeros((0, 3), np.float32), np.zeros((0, 3), np.float32)),
+      ('materializable_value_reference_tensor',
+       program_test_utils.TestMaterializableValueReference(1), np.array(1)),
+      ('list', [True, 1, 'a'], [np.array(True), np.array(1), b'a']),
+      ('dict_nested',
+       {'x': {'a': True,
+              'b': program_test_utils.TestMaterializableValueReference(1)},
+        'y': {'c': np.arange(4)}},
+       {'x': {'a': np.array(True), 'b': np.array(1)},
+        'y': {'c': np.arange(4)}}),
+      ('attr',
+       program_test_utils.TestAttrObject2(
+           True, program_test_utils.TestMaterializableValueReference(1)),
+       program_test_utils.TestAttrObject2(np.array(True), np.array(1))),
+  )
+  # pyformat: enable
+  async def test_load_returns_saved_program_state(self, program_state,
+                                                  expected_program_state):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+    await program_state_mngr.save(program_state, 1)
+    structure = program_state
+
+    actual_program_state = await program_state_mngr.load(1, structure)
+
+    self.assertAllEqual(actual_program_state, expected_program_state)
+
+  async def test_load_returns_saved_strings_unchanged(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+    program_state = {
+        'str': 'h\u00e9llo',
+        'bytes': b'a\x00\x00',
+        'tensor': tf.constant([['\u00fc', 'b\x00'], ['', 'c']]),
+    }
+    await program_state_mngr.save(program_state, 1)
+
+    actual_program_state = await program_state_mngr.load(1, program_state)
+
+    self.assertEqual(actual_program_state['str'], 'h\u00e9llo'.encode('utf-8'))
+    self.assertEqual(actual_program_state['bytes'], b'a\x00\x00')
+    self.assertEqual(actual_program_state['tensor'].dtype, object)
+    self.assertEqual(actual_program_state['tensor'].tolist(),
+                     [['\u00fc'.encode('utf-8'), b'b\x00'], [b'', b'c']])
+
+  async def test_saved_program_state_is_not_mutated(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+    program_state = [np.zeros([3])]
+    await program_state_mngr.save(program_state, 1)
+
+    program_state[0][:] = 1
+    actual_program_state = await program_state_mngr.load(1, [None])
+
+    self.assertAllEqual(actual_program_state, [np.zeros([3])])
+
+  async def test_unchanged_values_are_saved_once(self):
+    root_dir = self.create_tempdir().full_path
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_', keep_total=0))
+    frozen = np.ones([100], np.float32)
+
+    for version in range(3):
+      await program_state_mngr.save(
+          {'frozen': frozen, 'trained': np.full([100], version, np.float32)},
+          version)
+    await program_state_mngr.wait_for_pending_save()
+
+    self.assertLen(_list_blobs(root_dir), 4)
+    self.assertEqual(await program_state_mngr.get_versions(), [0, 1, 2])
+    structure = {'frozen': None, 'trained': None}
+    state = await program_state_mngr.load(1, structure)
+    self.assertAllEqual(state['trained'], np.full([100], 1, np.float32))
+
+  async def test_removes_unreferenced_blobs_of_old_versions(self):
+    root_dir = self.create_tempdir().full_path
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_', keep_total=2, keep_first=False))
+
+    for version in range(4):
+      await program_state_mngr.save([np.full([10], version)], version)
+    await program_state_mngr.wait_for_pending_save()
+
+    self.assertEqual(await program_state_mngr.get_versions(), [2, 3])
+    self.assertLen(_list_blobs(root_dir), 2)
+
+  async def test_ignores_uncommitted_version(self):
+    root_dir = self.create_tempdir().full_path
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+    await program_state_mngr.save([1], 1)
+    await program_state_mngr.save([2], 2)
+    await program_state_mngr.wait_for_pending_save()
+    os.remove(os.path.join(root_dir, 'a_2', 'COMMITTED'))
+
+    self.assertEqual(await program_state_mngr.get_versions(), [1])
+    state, version = await program_state_mngr.load_latest([0])
+    self.assertEqual(version, 1)
+    self.assertEqual(state, [1])
+    with self.assertRaises(
+        program_state_manager.ProgramStateManagerStateNotFoundError):
+      await program_state_mngr.load(2, [0])
+    # The leftovers of the interrupted save are replaced.
+    await program_state_mngr.save([3], 2)
+    self.assertEqual(await program_state_mngr.load(2, [0]), [3])
+
+  async def test_save_raises_version_already_exists_error(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+    await program_state_mngr.save([1], 1)
+
+    with self.assertRaises(
+        program_state_manager.ProgramStateManagerStateAlreadyExistsError):
+      await program_state_mngr.save([1], 1)
+
+  async def test_save_raises_type_error_with_dataset(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+
+    with self.assertRaises(TypeError):
+      await program_state_mngr.save(
+          tf.data.Dataset.from_tensor_slices([1, 2, 3]), 1)
+
+  async def test_background_save_errors_are_raised_by_next_call(self):
+    root_dir = self.create_tempdir()
+    program_state_mngr = (
+        file_program_state_manager.IncrementalFileProgramStateManager(
+            root_dir=root_dir, prefix='a_'))
+
+    with mock.patch.object(
+        program_state_mngr, '_write_version', side_effect=IOError('failed')):
+      await program_state_mngr.save([1], 1)
+      with self.assertRaisesRegex(IOError, 'failed'):
+        await program_state_mngr.get_versions()
+
 if __name__ == '__main__':
   absltest.main()
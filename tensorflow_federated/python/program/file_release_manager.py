@@ -51,9 +51,13 @@ class FileReleaseManagerPermissionDeniedError(Exception):
 @enum.unique
 class CSVSaveMode(enum.Enum):
   APPEND = 'append'
+  APPEND_ONLY = 'append_only'
   WRITE = 'write'
 
 
+_HEADER_FILE_SUFFIX = '.header'
+
+
 class CSVFileReleaseManager(release_manager.ReleaseManager):
   """A `tff.program.ReleaseManager` that releases values to a CSV file.
 
@@ -80,11 +84,25 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
     currently released values, so it may not be useful when values with
     different structures are being released frequently.
 
+  * In append-only mode, the fieldnames are stored in a separate header file,
+    at `file_path` suffixed with `.header`, and the CSV file only contains
+    rows. When a value is released, this manager appends the value to the CSV
+    file and, if the value has new fieldnames, rewrites the small header file;
+    rows released before a fieldname was added are shorter than the header.
+    The cost of releasing a value is independent of the number of values
+    released before, which makes this mode suitable for long-running programs
+    releasing many metrics. Like append mode, it is incompatible with
+    compressed files and encoded directories.
+
   * In write mode (or in append mode when releasing new structures), when a
     value is realeased, this manager reads the entire CSV file and overwrites
     the existing file with the additional values. This can be slower than append
     mode, but is compatible with compressed files (e.g. `.bz2` formats) and
     encoded directories.
+
+  In all modes, the released fieldnames and the latest released key are kept in
+  memory, and the file is only rewritten to remove values when a value is
+  released with a key less than or equal to the latest released key.
   """
 
   def __init__(self,
@@ -121,8 +139,10 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
     self._save_mode = save_mode
     self._key_fieldname = key_fieldname
 
+    self._fieldnames = []
     if tf.io.gfile.exists(self._file_path):
       fieldnames, values = self._read_values()
+      self._fieldnames = fieldnames
       if self._key_fieldname not in fieldnames:
         raise FileReleaseManagerIncompatibleFileError(
             f'The file \'{self._file_path}\' exists but does not contain a '
@@ -138,8 +158,23 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
       self._write_values([self._key_fieldname], [])
       self._latest_key = None
 
+  def _header_file_path(self) -> str:
+    return f'{os.fspath(self._file_path)}{_HEADER_FILE_SUFFIX}'
+
   def _read_values(self) -> Tuple[List[str], List[Dict[str, Any]]]:
     """Returns a tuple of fieldnames and values from the managed CSV."""
+    if self._save_mode == CSVSaveMode.APPEND_ONLY:
+      header_file_path = self._header_file_path()
+      if tf.io.gfile.exists(header_file_path):
+        with tf.io.gfile.GFile(header_file_path, 'r') as file:
+          fieldnames = next(csv.reader(file), [])
+      else:
+        fieldnames = []
+      with tf.io.gfile.GFile(self._file_path, 'r') as file:
+        reader = csv.DictReader(file, fieldnames=fieldnames, restval='')
+        values = list(reader)
+      return fieldnames, values
+
     with tf.io.gfile.GFile(self._file_path, 'r') as file:
       reader = csv.DictReader(file)
       if reader.fieldnames is not None:
@@ -149,10 +184,10 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
       values = list(reader)
     return fieldnames, values
 
-  def _write_values(self, fieldnames: Sequence[str],
-                    values: Iterable[Mapping[str, Any]]):
-    """Writes `fieldnames` and `values` to the managed CSV."""
-    path = os.fspath(self._file_path)
+  def _write_file(self, path: str, fieldnames: Sequence[str],
+                  values: Iterable[Mapping[str, Any]], write_header: bool):
+    """Atomically writes `fieldnames` and `values` to the CSV at `path`."""
+    path = os.fspath(path)
 
     # Create a temporary file.
     temp_path = f'{path}_temp{random.randint(1000, 9999)}'
@@ -162,11 +197,29 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
     # Write to the temporary file.
     with tf.io.gfile.GFile(temp_path, 'w') as file:
       writer = csv.DictWriter(file, fieldnames=fieldnames)
-      writer.writeheader()
+      if write_header:
+        writer.writeheader()
       writer.writerows(values)
 
     # Rename the temporary file to the final location atomically.
-    tf.io.gfile.rename(temp_path, self._file_path, overwrite=True)
+    tf.io.gfile.rename(temp_path, path, overwrite=True)
+
+  def _write_header_file(self, fieldnames: Sequence[str]):
+    """Writes `fieldnames` to the header file of the managed CSV."""
+    self._write_file(
+        self._header_file_path(), fieldnames, [], write_header=True)
+
+  def _write_values(self, fieldnames: Sequence[str],
+                    values: Iterable[Mapping[str, Any]]):
+    """Writes `fieldnames` and `values` to the managed CSV."""
+    if self._save_mode == CSVSaveMode.APPEND_ONLY:
+      # Write the rows before the header, so that a crash in between leaves a
+      # header describing at least all the columns of the rows.
+      self._write_file(self._file_path, fieldnames, values, write_header=False)
+      self._write_header_file(fieldnames)
+    else:
+      self._write_file(self._file_path, fieldnames, values, write_header=True)
+    self._fieldnames = list(fieldnames)
 
   async def _write_value(self, value: Mapping[str, Any]):
     """Writes `value` to the managed CSV."""
@@ -179,15 +232,6 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
   async def _append_value(self, value: Mapping[str, Any]):
     """Appends `value` to the managed CSV."""
 
-    def _read_fieldnames_only():
-      with tf.io.gfile.GFile(self._file_path, 'r') as file:
-        reader = csv.DictReader(file)
-        if reader.fieldnames is not None:
-          fieldnames = list(reader.fieldnames)
-        else:
-          fieldnames = []
-      return fieldnames
-
     def _append_value(fieldnames, value):
       try:
         with tf.io.gfile.GFile(self._file_path, 'a') as file:
@@ -201,8 +245,15 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
             'file using a `tff.program.CSVFileReleaseManager`.') from e
 
     loop = asyncio.get_running_loop()
-    fieldnames = await loop.run_in_executor(None, _read_fieldnames_only)
-    if all(key in fieldnames for key in value.keys()):
+    new_fieldnames = [x for x in value.keys() if x not in self._fieldnames]
+    if not new_fieldnames:
+      await loop.run_in_executor(None, _append_value, self._fieldnames, value)
+    elif self._save_mode == CSVSaveMode.APPEND_ONLY:
+      # New columns are appended to the header, so that the rows appended
+      # before remain valid.
+      fieldnames = self._fieldnames + new_fieldnames
+      await loop.run_in_executor(None, self._write_header_file, fieldnames)
+      self._fieldnames = fieldnames
       await loop.run_in_executor(None, _append_value, fieldnames, value)
     else:
       await self._write_value(value)
@@ -211,7 +262,7 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
     """Removes all values greater than `key` from the managed CSV."""
     py_typecheck.check_type(key, int)
 
-    if self._latest_key is None or key > self._latest_key:
+    if self._latest_key is None or key >= self._latest_key:
       return
 
     loop = asyncio.get_running_loop()
@@ -264,7 +315,7 @@ class CSVFileReleaseManager(release_manager.ReleaseManager):
     normalized_value = [(k, _normalize(v)) for k, v in flattened_value]
     normalized_value.insert(0, (self._key_fieldname, key))
     normalized_value = collections.OrderedDict(normalized_value)
-    if self._save_mode == CSVSaveMode.APPEND:
+    if self._save_mode in (CSVSaveMode.APPEND, CSVSaveMode.APPEND_ONLY):
       await self._append_value(normalized_value)
     elif self._save_mode == CSVSaveMode.WRITE:
       await self._write_value(normalized_value)
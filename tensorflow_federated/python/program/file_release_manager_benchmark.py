@@ -0,0 +1,97 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for `CSVFileReleaseManager`.
+
+Measures the latency of releasing metrics of a long-running program, for each
+`CSVSaveMode`. Every tenth release adds a new metric, so that the schema of the
+released values grows over the course of the program, as happens e.g. when
+evaluation metrics are only released every few rounds.
+
+Run with:
+
+```
+bazel run :file_release_manager_benchmark -- --benchmarks=.
+```
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+import tensorflow as tf
+
+from tensorflow_federated.python.program import file_release_manager
+
+_NUM_RELEASES = 10000
+# Releasing in write mode rewrites the whole file, so it is measured over fewer
+# releases.
+_NUM_WRITE_MODE_RELEASES = 1000
+_NUM_METRICS = 100
+_RELEASES_PER_NEW_METRIC = 10
+_NUM_NEW_METRICS = 20
+
+
+def _create_value(key):
+  value = {'metric_{}'.format(i): float(key) for i in range(_NUM_METRICS)}
+  num_new_metrics = min(key // _RELEASES_PER_NEW_METRIC, _NUM_NEW_METRICS)
+  for i in range(num_new_metrics):
+    value['new_metric_{}'.format(i)] = float(key)
+  return value
+
+
+async def _release_values(release_mngr, num_releases):
+  """Returns the latencies of releasing `num_releases` values, in seconds."""
+  latencies = []
+  for key in range(num_releases):
+    value = _create_value(key)
+    start_time = time.time()
+    await release_mngr.release(value, key)
+    latencies.append(time.time() - start_time)
+  return latencies
+
+
+class CSVFileReleaseManagerBenchmark(tf.test.Benchmark):
+
+  def _benchmark_release(self, save_mode, num_releases):
+    with tempfile.TemporaryDirectory() as root_dir:
+      release_mngr = file_release_manager.CSVFileReleaseManager(
+          file_path=os.path.join(root_dir, 'metrics.csv'), save_mode=save_mode)
+      latencies = asyncio.run(_release_values(release_mngr, num_releases))
+    last_latencies = latencies[-100:]
+    self.report_benchmark(
+        name='release_{}_{}_releases'.format(save_mode.value, num_releases),
+        iters=num_releases,
+        wall_time=sum(latencies) / num_releases,
+        extras={
+            'total_time_in_seconds': sum(latencies),
+            'last_100_mean_latency_in_seconds':
+                sum(last_latencies) / len(last_latencies),
+        })
+
+  def benchmark_release_append(self):
+    self._benchmark_release(file_release_manager.CSVSaveMode.APPEND,
+                            _NUM_RELEASES)
+
+  def benchmark_release_append_only(self):
+    self._benchmark_release(file_release_manager.CSVSaveMode.APPEND_ONLY,
+                            _NUM_RELEASES)
+
+  def benchmark_release_write(self):
+    self._benchmark_release(file_release_manager.CSVSaveMode.WRITE,
+                            _NUM_WRITE_MODE_RELEASES)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -710,6 +710,78 @@ class CSVFileReleaseManagerReleaseTest(parameterized.TestCase,
       await release_mngr.release({}, key)
 
 
+class CSVFileReleaseManagerAppendOnlyTest(parameterized.TestCase,
+                                          unittest.IsolatedAsyncioTestCase):
+
+  async def test_release_appends_rows_and_writes_header_file(self):
+    file_path = self.create_tempfile()
+    os.remove(file_path)
+    release_mngr = file_release_manager.CSVFileReleaseManager(
+        file_path=file_path,
+        save_mode=file_release_manager.CSVSaveMode.APPEND_ONLY)
+
+    await release_mngr.release({'a': 10}, 1)
+    await release_mngr.release({'a': 11, 'b': 21}, 2)
+    await release_mngr.release({'b': 22}, 3)
+
+    with tf.io.gfile.GFile(f'{file_path}.header', 'r') as file:
+      self.assertEqual(list(csv.reader(file)), [['key', 'a', 'b']])
+    with tf.io.gfile.GFile(file_path, 'r') as file:
+      self.assertEqual(
+          list(csv.reader(file)), [['1', '10'], ['2', '11', '21'],
+                                   ['3', '', '22']])
+    reloaded_release_mngr = file_release_manager.CSVFileReleaseManager(
+        file_path=file_path,
+        save_mode=file_release_manager.CSVSaveMode.APPEND_ONLY)
+    fieldnames, values = reloaded_release_mngr._read_values()
+    self.assertEqual(fieldnames, ['key', 'a', 'b'])
+    self.assertEqual(values, [
+        {'key': '1', 'a': '10', 'b': ''},
+        {'key': '2', 'a': '11', 'b': '21'},
+        {'key': '3', 'a': '', 'b': '22'},
+    ])
+    self.assertEqual(reloaded_release_mngr._latest_key, 3)
+
+  async def test_release_removes_values_on_rollback(self):
+    file_path = self.create_tempfile()
+    os.remove(file_path)
+    release_mngr = file_release_manager.CSVFileReleaseManager(
+        file_path=file_path,
+        save_mode=file_release_manager.CSVSaveMode.APPEND_ONLY)
+    for key in range(1, 4):
+      await release_mngr.release({'a': key * 10}, key)
+
+    await release_mngr.release({'a': 0}, 2)
+
+    _, values = release_mngr._read_values()
+    self.assertEqual(values, [
+        {'key': '1', 'a': '10'},
+        {'key': '2', 'a': '0'},
+    ])
+
+  @parameterized.named_parameters(
+      ('append', file_release_manager.CSVSaveMode.APPEND),
+      ('append_only', file_release_manager.CSVSaveMode.APPEND_ONLY),
+  )
+  async def test_release_does_not_rewrite_file_without_rollback(
+      self, save_mode):
+    file_path = self.create_tempfile()
+    os.remove(file_path)
+    release_mngr = file_release_manager.CSVFileReleaseManager(
+        file_path=file_path, save_mode=save_mode)
+    await release_mngr.release({'a': 10, 'b': 20}, 1)
+
+    with mock.patch.object(
+        release_mngr, '_write_values',
+        wraps=release_mngr._write_values) as mock_write_values:
+      for key in range(2, 10):
+        await release_mngr.release({'a': key, 'b': key}, key)
+
+      mock_write_values.assert_not_called()
+    _, values = release_mngr._read_values()
+    self.assertLen(values, 9)
+
+
 class SavedModelFileReleaseManagerInitTest(parameterized.TestCase):
 
   def test_creates_new_dir_with_root_dir_str(self):
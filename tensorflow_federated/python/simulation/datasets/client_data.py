@@ -146,6 +146,23 @@ class ClientData(object, metaclass=abc.ABCMeta):
               i=client_id))
     return self.serializable_dataset_fn(client_id)
 
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    """Creates the `tf.data.Dataset`s of several clients.
+
+    Subclasses may override this method to construct the datasets of many
+    clients more efficiently than one at a time.
+
+    Args:
+      client_ids: A sequence of string client ids.
+
+    Returns:
+      A list of `tf.data.Dataset` objects, ordered like `client_ids`.
+    """
+    return [
+        self.create_tf_dataset_for_client(client_id) for client_id in client_ids
+    ]
+
   @property
   def dataset_computation(self):
     """A `tff.Computation` accepting a client ID, returning a dataset.
@@ -394,6 +411,13 @@ class PreprocessClientData(ClientData):
     return self._preprocess_fn(
         self._underlying_client_data.create_tf_dataset_for_client(client_id))
 
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    return [
+        self._preprocess_fn(dataset) for dataset in
+        self._underlying_client_data.create_tf_datasets_for_clients(client_ids)
+    ]
+
   @property
   def element_type_structure(self):
     return self._element_type_structure
@@ -172,6 +172,13 @@ class ConcreteClientDataTest(tf.test.TestCase, parameterized.TestCase):
       client_dataset = client_data.create_tf_dataset_for_client(i)
       self.assertEqual(dataset_length(client_dataset), int(i))
 
+  def test_create_tf_datasets_for_clients(self):
+    client_data = create_concrete_client_data()
+    client_ids = list(reversed(client_data.client_ids))
+    client_datasets = client_data.create_tf_datasets_for_clients(client_ids)
+    self.assertEqual([dataset_length(d) for d in client_datasets],
+                     [int(i) for i in client_ids])
+
   def test_dataset_computation_lists_all_elements(self):
     client_data = create_concrete_client_data()
     for client_id in client_data.client_ids:
@@ -0,0 +1,175 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Builds the client datasets of upcoming rounds in the background."""
+
+import collections
+from concurrent import futures
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.simulation.datasets import client_data as client_data_lib
+
+
+class ClientDatasetPrefetcher(object):
+  """Constructs the client datasets of upcoming rounds in a thread pool.
+
+  A `ClientDatasetPrefetcher` is a callable accepting a round number and
+  returning the list of `tf.data.Dataset`s of the clients sampled for that
+  round, so it can be used as the `training_selection_fn` or
+  `evaluation_selection_fn` of `tff.simulation.run_training_process`:
+
+  ```python
+  sample_client_ids_fn = functools.partial(
+      tff.simulation.build_uniform_sampling_fn(
+          client_data.client_ids, random_seed=1),
+      size=10)
+  with tff.simulation.datasets.ClientDatasetPrefetcher(
+      client_data, sample_client_ids_fn) as prefetcher:
+    tff.simulation.run_training_process(
+        training_process, prefetcher, total_rounds=100)
+  ```
+
+  Calling `prefetch(round_num)` samples the client ids of `round_num` and
+  starts constructing their datasets in the background; a later call with the
+  same round number waits for, and returns, those datasets. The datasets of a
+  round are constructed by a single call to
+  `client_data.create_tf_datasets_for_clients`, which implementations such as
+  `tff.simulation.datasets.SqlClientData` override to read the examples of all
+  the clients into memory at once, so that the round does not wait for them to
+  be read. Rounds which were not prefetched are constructed on demand.
+  Prefetched rounds older than a requested round are dropped.
+  `tff.simulation.run_training_process` prefetches the next training round
+  while the current round runs; the caller keeps ownership of the prefetcher,
+  and should close it when done, e.g. by using it as a context manager.
+
+  Optionally, the most recently constructed datasets are cached by client id,
+  so that clients sampled in several rounds are only constructed once.
+  """
+
+  def __init__(self,
+               client_data: client_data_lib.ClientData,
+               sample_client_ids_fn: Callable[[int], Sequence[str]],
+               num_threads: Optional[int] = None,
+               max_cached_datasets: int = 0):
+    """Initializes a `ClientDatasetPrefetcher`.
+
+    Args:
+      client_data: The `tff.simulation.datasets.ClientData` to construct
+        client datasets from.
+      sample_client_ids_fn: A callable accepting a round number and returning
+        the ids of the clients sampled for that round.
+      num_threads: The optional number of threads constructing the client
+        datasets of rounds. Defaults to the default of
+        `concurrent.futures.ThreadPoolExecutor`.
+      max_cached_datasets: The maximum number of client datasets to cache
+        across rounds. Zero disables caching.
+
+    Raises:
+      ValueError: If `num_threads` is not positive or `max_cached_datasets` is
+        negative.
+    """
+    py_typecheck.check_type(client_data, client_data_lib.ClientData)
+    py_typecheck.check_callable(sample_client_ids_fn)
+    if num_threads is not None:
+      py_typecheck.check_type(num_threads, int)
+      if num_threads < 1:
+        raise ValueError('Expected a positive `num_threads`, found '
+                         '{}.'.format(num_threads))
+    py_typecheck.check_type(max_cached_datasets, int)
+    if max_cached_datasets < 0:
+      raise ValueError('Expected a nonnegative `max_cached_datasets`, found '
+                       '{}.'.format(max_cached_datasets))
+    self._client_data = client_data
+    self._sample_client_ids_fn = sample_client_ids_fn
+    self._max_cached_datasets = max_cached_datasets
+    self._thread_pool = futures.ThreadPoolExecutor(
+        max_workers=num_threads, thread_name_prefix='client_dataset_prefetcher')
+    self._lock = threading.Lock()
+    self._futures_by_round: Dict[int, futures.Future] = {}
+    self._cached_datasets = collections.OrderedDict()
+
+  def _create_datasets(self,
+                       client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    """Constructs the datasets of `client_ids`, reusing the cached ones."""
+    datasets_by_client = {}
+    with self._lock:
+      for client_id in client_ids:
+        dataset = self._cached_datasets.get(client_id)
+        if dataset is not None:
+          self._cached_datasets.move_to_end(client_id)
+          datasets_by_client[client_id] = dataset
+    missing_client_ids = [
+        client_id for client_id in dict.fromkeys(client_ids)
+        if client_id not in datasets_by_client
+    ]
+    if missing_client_ids:
+      missing_datasets = self._client_data.create_tf_datasets_for_clients(
+          missing_client_ids)
+      datasets_by_client.update(zip(missing_client_ids, missing_datasets))
+      if self._max_cached_datasets:
+        with self._lock:
+          for client_id in missing_client_ids:
+            self._cached_datasets[client_id] = datasets_by_client[client_id]
+          while len(self._cached_datasets) > self._max_cached_datasets:
+            self._cached_datasets.popitem(last=False)
+    return [datasets_by_client[client_id] for client_id in client_ids]
+
+  def prefetch(self, round_num: int):
+    """Starts constructing the client datasets of `round_num`, if needed."""
+    # Sampling and submitting under the lock ensures that a round is sampled
+    # and constructed at most once, even if prefetched from several threads.
+    with self._lock:
+      if round_num in self._futures_by_round:
+        return
+      client_ids = self._sample_client_ids_fn(round_num)
+      self._futures_by_round[round_num] = self._thread_pool.submit(
+          self._create_datasets, client_ids)
+
+  def __call__(self, round_num: int) -> List[tf.data.Dataset]:
+    """Returns the client datasets of `round_num`.
+
+    Args:
+      round_num: The round number to return the client datasets of.
+
+    Returns:
+      A list of `tf.data.Dataset`s, ordered like the client ids returned by
+      `sample_client_ids_fn(round_num)`.
+    """
+    self.prefetch(round_num)
+    with self._lock:
+      round_future = self._futures_by_round.pop(round_num)
+      stale_rounds = [r for r in self._futures_by_round if r < round_num]
+      stale_futures = [self._futures_by_round.pop(r) for r in stale_rounds]
+    for f in stale_futures:
+      f.cancel()
+    return round_future.result()
+
+  def close(self):
+    """Cancels pending prefetches and shuts down the thread pool."""
+    with self._lock:
+      pending_futures = list(self._futures_by_round.values())
+      self._futures_by_round.clear()
+      self._cached_datasets.clear()
+    for f in pending_futures:
+      f.cancel()
+    self._thread_pool.shutdown(wait=True)
+
+  def __enter__(self) -> 'ClientDatasetPrefetcher':
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
@@ -0,0 +1,176 @@
+# Copyright 2022, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+import time
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.simulation.datasets import client_dataset_prefetcher
+from tensorflow_federated.python.simulation.datasets import from_tensor_slices_client_data
+
+_TENSOR_SLICES_DICT = {
+    'a': [1, 2, 3],
+    'b': [4, 5],
+    'c': [6],
+}
+
+
+class _CountingClientData(from_tensor_slices_client_data.TestClientData):
+
+  def __init__(self, tensor_slices_dict):
+    super().__init__(tensor_slices_dict)
+    self.created_client_ids = collections.Counter()
+    self.batches = []
+
+  def create_tf_dataset_for_client(self, client_id):
+    self.created_client_ids[client_id] += 1
+    return super().create_tf_dataset_for_client(client_id)
+
+  def create_tf_datasets_for_clients(self, client_ids):
+    self.batches.append(list(client_ids))
+    return super().create_tf_datasets_for_clients(client_ids)
+
+
+def _sample_client_ids(round_num):
+  return [['a', 'b'], ['b', 'c'], ['c', 'a']][round_num % 3]
+
+
+def _as_lists(datasets):
+  return [[x.numpy() for x in dataset] for dataset in datasets]
+
+
+class ClientDatasetPrefetcherTest(tf.test.TestCase):
+
+  def test_returns_datasets_of_sampled_clients_in_order(self):
+    data = _CountingClientData(_TENSOR_SLICES_DICT)
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, _sample_client_ids) as prefetcher:
+      datasets = prefetcher(1)
+
+    self.assertEqual(_as_lists(datasets), [[4, 5], [6]])
+
+  def test_prefetched_round_is_constructed_once(self):
+    data = _CountingClientData(_TENSOR_SLICES_DICT)
+    sampled_rounds = []
+
+    def sample_client_ids(round_num):
+      sampled_rounds.append(round_num)
+      return _sample_client_ids(round_num)
+
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, sample_client_ids, num_threads=2) as prefetcher:
+      prefetcher.prefetch(0)
+      prefetcher.prefetch(0)
+      datasets = prefetcher(0)
+
+    self.assertEqual(_as_lists(datasets), [[1, 2, 3], [4, 5]])
+    self.assertEqual(sampled_rounds, [0])
+    self.assertEqual(data.created_client_ids, {'a': 1, 'b': 1})
+
+  def test_constructs_round_in_a_single_batch(self):
+    data = _CountingClientData(_TENSOR_SLICES_DICT)
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, lambda round_num: ['a', 'b', 'a']) as prefetcher:
+      datasets = prefetcher(0)
+
+    self.assertEqual(_as_lists(datasets), [[1, 2, 3], [4, 5], [1, 2, 3]])
+    self.assertEqual(data.batches, [['a', 'b']])
+
+  def test_concurrent_prefetches_sample_round_once(self):
+    data = _CountingClientData(_TENSOR_SLICES_DICT)
+    sampled_rounds = []
+
+    def sample_client_ids(round_num):
+      sampled_rounds.append(round_num)
+      # Gives the other threads time to prefetch the same round.
+      time.sleep(0.1)
+      return _sample_client_ids(round_num)
+
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, sample_client_ids) as prefetcher:
+      threads = [
+          threading.Thread(target=prefetcher.prefetch, args=(0,))
+          for _ in range(4)
+      ]
+      for thread in threads:
+        thread.start()
+      for thread in threads:
+        thread.join()
+      datasets = prefetcher(0)
+
+    self.assertEqual(_as_lists(datasets), [[1, 2, 3], [4, 5]])
+    self.assertEqual(sampled_rounds, [0])
+    self.assertEqual(data.created_client_ids, {'a': 1, 'b': 1})
+
+  def test_drops_stale_prefetched_rounds(self):
+    data = _CountingClientData(_TENSOR_SLICES_DICT)
+    sampled_rounds = []
+
+    def sample_client_ids(round_num):
+      sampled_rounds.append(round_num)
+      return _sample_client_ids(round_num)
+
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, sample_client_ids) as prefetcher:
+      prefetcher.prefetch(0)
+      prefetcher.prefetch(1)
+      prefetcher(1)
+      # Round 0 was dropped, so it is sampled again.
+      datasets = prefetcher(0)
+
+    self.assertEqual(_as_lists(datasets), [[1, 2, 3], [4, 5]])
+    self.assertEqual(sampled_rounds, [0, 1, 0])
+
+  def test_caches_datasets_across_rounds(self):
+    data = _CountingClientData(_TENSOR_SLICES_DICT)
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, _sample_client_ids, max_cached_datasets=3) as prefetcher:
+      for round_num in range(6):
+        prefetcher(round_num)
+
+    self.assertEqual(data.created_client_ids, {'a': 1, 'b': 1, 'c': 1})
+
+  def test_does_not_cache_datasets_by_default(self):
+    data = _CountingClientData(_TENSOR_SLICES_DICT)
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, _sample_client_ids) as prefetcher:
+      for round_num in range(3):
+        prefetcher(round_num)
+
+    self.assertEqual(data.created_client_ids, {'a': 2, 'b': 2, 'c': 2})
+
+  def test_raises_error_of_dataset_construction(self):
+    data = from_tensor_slices_client_data.TestClientData(_TENSOR_SLICES_DICT)
+    with client_dataset_prefetcher.ClientDatasetPrefetcher(
+        data, lambda round_num: ['unknown']) as prefetcher:
+      with self.assertRaises(ValueError):
+        prefetcher(0)
+
+  def test_raises_with_nonpositive_num_threads(self):
+    data = from_tensor_slices_client_data.TestClientData(_TENSOR_SLICES_DICT)
+    with self.assertRaises(ValueError):
+      client_dataset_prefetcher.ClientDatasetPrefetcher(
+          data, _sample_client_ids, num_threads=0)
+
+  def test_raises_with_non_client_data(self):
+    with self.assertRaises(TypeError):
+      client_dataset_prefetcher.ClientDatasetPrefetcher(
+          _TENSOR_SLICES_DICT, _sample_client_ids)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -13,8 +13,10 @@
 # limitations under the License.
 """Implementation of `ClientData` backed by an SQL database."""
 
+import collections
+import contextlib
 import sqlite3
-from typing import Iterator, Optional
+from typing import Dict, List, Mapping, Optional, Sequence
 
 from absl import logging
 import tensorflow as tf
@@ -31,6 +33,9 @@ REQUIRED_TABLES = frozenset(["examples", "client_metadata"])
 REQUIRED_EXAMPLES_COLUMNS = frozenset(
     ["split_name", "client_id", "serialized_example_proto"])
 
+# Below the default `SQLITE_MAX_VARIABLE_NUMBER` of older SQLite releases.
+_MAX_QUERY_PARAMETERS = 900
+
 
 def _check_database_format(database_filepath: str):
   """Validates the format of a SQLite database.
@@ -42,45 +47,86 @@ def _check_database_format(database_filepath: str):
     DatabaseFormatError: If the required tables or columns are missing from the
       database at `database_filepath`.
   """
-  connection = sqlite3.connect(database_filepath)
-  # Make sure `examples` and `client_metadata` tables exists.
-  result = connection.execute("SELECT name FROM sqlite_master;")
-  table_names = {r[0] for r in result}
-  missing_tables = REQUIRED_TABLES - table_names
-  if missing_tables:
-    raise DatabaseFormatError(
-        f"Database at [{database_filepath}] does not have the required "
-        f"{missing_tables} tables.")
-  column_names = set()
-  for r in connection.execute("PRAGMA table_info(examples);"):
-    column_names.add(r[1])
-  missing_required_columns = REQUIRED_EXAMPLES_COLUMNS - column_names
-  if missing_required_columns:
-    raise DatabaseFormatError(
-        "Database table `examples` must contain columns "
-        f"{REQUIRED_EXAMPLES_COLUMNS}, "
-        f"but is missing columns {missing_required_columns}.")
-
-
-def _fetch_client_ids(database_filepath: str,
-                      split_name: Optional[str] = None) -> Iterator[str]:
-  """Fetches the list of client_ids.
+  with contextlib.closing(sqlite3.connect(database_filepath)) as connection:
+    # Make sure `examples` and `client_metadata` tables exists.
+    result = connection.execute("SELECT name FROM sqlite_master;")
+    table_names = {r[0] for r in result}
+    missing_tables = REQUIRED_TABLES - table_names
+    if missing_tables:
+      raise DatabaseFormatError(
+          f"Database at [{database_filepath}] does not have the required "
+          f"{missing_tables} tables.")
+    column_names = set()
+    for r in connection.execute("PRAGMA table_info(examples);"):
+      column_names.add(r[1])
+    missing_required_columns = REQUIRED_EXAMPLES_COLUMNS - column_names
+    if missing_required_columns:
+      raise DatabaseFormatError(
+          "Database table `examples` must contain columns "
+          f"{REQUIRED_EXAMPLES_COLUMNS}, "
+          f"but is missing columns {missing_required_columns}.")
+    if not _has_client_id_index(connection):
+      logging.warning(
+          "Database at [%s] has no index on `examples.client_id`; reading a "
+          "client's examples scans the whole table. Use "
+          "`tff.simulation.datasets.save_to_sql_client_data` to build a "
+          "database with the required indices.", database_filepath)
+
+
+def _has_client_id_index(connection: sqlite3.Connection) -> bool:
+  """Returns whether an index of `examples` can be used to find a client."""
+  for index in connection.execute("PRAGMA index_list(examples);").fetchall():
+    index_name = index[1]
+    # `index_info` rows are `(rank, column id, column name)`. An index is
+    # usable to look up a client across splits only if `client_id` is its
+    # first column.
+    first_columns = [
+        r[2] for r in connection.execute(
+            f"PRAGMA index_info('{index_name}');") if r[0] == 0
+    ]
+    if first_columns == ["client_id"]:
+      return True
+  return False
+
+
+def create_indices(connection: sqlite3.Connection):
+  """Creates the indices used by `SqlClientData` to look up clients.
+
+  Creating the indices is a no-op if they already exist.
+
+  Args:
+    connection: A `sqlite3.Connection` to a database with `examples` and
+      `client_metadata` tables.
+  """
+  connection.execute("CREATE INDEX IF NOT EXISTS examples_client_id_split_name "
+                     "ON examples (client_id, split_name);")
+  connection.execute(
+      "CREATE INDEX IF NOT EXISTS client_metadata_split_name_client_id "
+      "ON client_metadata (split_name, client_id);")
+
+
+def _fetch_client_example_counts(
+    database_filepath: str,
+    split_name: Optional[str] = None) -> Dict[str, int]:
+  """Fetches the number of examples of each client.
 
   Args:
     database_filepath: A path to a SQL database.
-    split_name: An optional split name to filter on. If `None`, all client ids
-      are returned.
+    split_name: An optional split name to filter on. If `None`, all clients
+      are returned, with their examples counted across splits.
 
   Returns:
-    An iterator of string client ids.
+    A dictionary of string client ids to their number of examples.
   """
-  connection = sqlite3.connect(database_filepath)
-  query = "SELECT DISTINCT client_id FROM client_metadata"
+  query = "SELECT client_id, SUM(num_examples) FROM client_metadata"
+  parameters = ()
   if split_name is not None:
-    query += f" WHERE split_name = '{split_name}'"
-  query += ";"
-  result = connection.execute(query)
-  return map(lambda x: x[0], result)
+    query += " WHERE split_name = ?"
+    parameters = (split_name,)
+  query += " GROUP BY client_id;"
+  with contextlib.closing(sqlite3.connect(database_filepath)) as connection:
+    result = connection.execute(query, parameters)
+    return {client_id: num_examples for client_id, num_examples in result}
 
 
 class SqlClientData(client_data.ClientData):
@@ -107,6 +153,11 @@ class SqlClientData(client_data.ClientData):
          training examples.
      -   `num_examples`: `INTEGER` column containing the number of examples
          held by this client.
+
+  Looking up the examples of a client is only efficient if the `examples` table
+  has an index whose first column is `client_id`; a warning is logged
+  otherwise. The client ids and their number of examples are read from
+  `client_metadata` once, at construction.
   """
 
   def __init__(self, database_filepath: str, split_name: Optional[str] = None):
@@ -122,8 +173,9 @@ class SqlClientData(client_data.ClientData):
     _check_database_format(database_filepath)
     self._filepath = database_filepath
     self._split_name = split_name
-    self._client_ids = sorted(
-        list(_fetch_client_ids(database_filepath, split_name)))
+    self._num_examples_by_client = _fetch_client_example_counts(
+        database_filepath, split_name)
+    self._client_ids = sorted(self._num_examples_by_client)
     logging.info("Loaded %d client ids from SQL database.",
                  len(self._client_ids))
     # SQLite returns a single column of bytes which are serialized protocol
@@ -165,12 +217,66 @@ class SqlClientData(client_data.ClientData):
     Returns:
       A `tf.data.Dataset` object.
     """
-    if client_id not in self.client_ids:
+    self._check_client_id(client_id)
+    return self._create_dataset(client_id)
+
+  def _check_client_id(self, client_id: str):
+    if client_id not in self._num_examples_by_client:
       raise ValueError(
           "ID [{i}] is not a client in this ClientData. See "
           "property `client_ids` for the list of valid ids.".format(
               i=client_id))
-    return self._create_dataset(client_id)
+
+  @property
+  def num_examples_by_client(self) -> Mapping[str, int]:
+    """A mapping of client ids to their number of examples.
+
+    The counts are read from the `num_examples` column of the
+    `client_metadata` table, restricted to `split_name` if it was provided.
+    """
+    return self._num_examples_by_client
+
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    """Creates the `tf.data.Dataset`s of several clients in a single query.
+
+    Unlike `create_tf_dataset_for_client`, which returns datasets that query
+    the database when iterated, this method reads the examples of all
+    `client_ids` eagerly, in a single pass over the database, and returns
+    datasets of in-memory tensors.
+
+    Args:
+      client_ids: A sequence of string client ids, which may contain
+        duplicates.
+
+    Returns:
+      A list of `tf.data.Dataset` objects, ordered like `client_ids`.
+
+    Raises:
+      ValueError: If one of `client_ids` is not in `self.client_ids`.
+    """
+    for client_id in client_ids:
+      self._check_client_id(client_id)
+    unique_client_ids = list(dict.fromkeys(client_ids))
+    examples_by_client = collections.defaultdict(list)
+    with contextlib.closing(sqlite3.connect(self._filepath)) as connection:
+      # Bound the number of parameters of each query, since SQLite limits them.
+      for start in range(0, len(unique_client_ids), _MAX_QUERY_PARAMETERS):
+        batch = unique_client_ids[start:start + _MAX_QUERY_PARAMETERS]
+        query = ("SELECT client_id, serialized_example_proto FROM examples "
+                 f"WHERE client_id IN ({', '.join('?' * len(batch))})")
+        parameters = tuple(batch)
+        if self._split_name is not None:
+          query += " AND split_name = ?"
+          parameters += (self._split_name,)
+        for client_id, example in connection.execute(query + ";", parameters):
+          examples_by_client[client_id].append(example)
+    datasets_by_client = {
+        client_id: tf.data.Dataset.from_tensor_slices(
+            tf.constant(examples_by_client[client_id], dtype=tf.string))
+        for client_id in unique_client_ids
+    }
+    return [datasets_by_client[client_id] for client_id in client_ids]
 
   @property
   def element_type_structure(self):
@@ -15,6 +15,8 @@
 import os
 
 import sqlite3
+from unittest import mock
+
 from absl import flags
 import tensorflow as tf
 
@@ -127,6 +129,103 @@ class SqlClientDataTest(tf.test.TestCase):
       # The `test` split has no examples for client `test_a`.
       test_split('test', {'test_b': 1, 'test_c': 1})
 
+  def test_num_examples_by_client(self):
+    with self.subTest('no_split'):
+      client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+      self.assertEqual(client_data.num_examples_by_client, {
+          'test_a': 1,
+          'test_b': 2,
+          'test_c': 3
+      })
+    with self.subTest('test_split'):
+      client_data = sql_client_data.SqlClientData(
+          test_dataset_filepath(), split_name='test')
+      self.assertEqual(client_data.num_examples_by_client, {
+          'test_b': 1,
+          'test_c': 1
+      })
+
+  def test_create_datasets_for_clients(self):
+
+    def test_split(split_name, client_ids, expected_example_nums):
+      client_data = sql_client_data.SqlClientData(
+          test_dataset_filepath(), split_name=split_name)
+      datasets = client_data.create_tf_datasets_for_clients(client_ids)
+      self.assertLen(datasets, len(client_ids))
+      for client_id, dataset, expected in zip(client_ids, datasets,
+                                              expected_example_nums):
+        examples = [tf.train.Example.FromString(x.numpy()) for x in dataset]
+        self.assertCountEqual(
+            [e.features.feature['example_num'].int64_list.value[0]
+             for e in examples], expected, msg=client_id)
+        self.assertEqual(dataset.element_spec,
+                         client_data.element_type_structure)
+
+    with self.subTest('no_split'):
+      test_split(None, ['test_c', 'test_a', 'test_c'],
+                 [[0, 1, 2], [0], [0, 1, 2]])
+    with self.subTest('train_split'):
+      test_split('train', ['test_b', 'test_c'], [[0], [0, 2]])
+
+  def test_create_datasets_for_clients_raises_on_missing_client(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    with self.assertRaisesRegex(ValueError, 'not a client in this ClientData'):
+      client_data.create_tf_datasets_for_clients(
+          ['test_a', 'missing_client_id'])
+
+  def test_connection_closed_on_database_format_error(self):
+    database_filepath = os.path.join(self.get_temp_dir(), 'empty.sqlite')
+    connections = []
+    real_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+      connection = real_connect(*args, **kwargs)
+      connections.append(connection)
+      return connection
+
+    with mock.patch.object(sqlite3, 'connect', side_effect=connect):
+      with self.assertRaises(sql_client_data.DatabaseFormatError):
+        sql_client_data.SqlClientData(database_filepath)
+    self.assertNotEmpty(connections)
+    for connection in connections:
+      with self.assertRaises(sqlite3.ProgrammingError):
+        connection.execute('SELECT 1;')
+
+  def _create_examples_table(self, database_filepath, index_columns):
+    with sqlite3.connect(database_filepath) as connection:
+      connection.execute("""CREATE TABLE examples (
+                            split_name TEXT NOT NULL,
+                            client_id TEXT NOT NULL,
+                            serialized_example_proto BLOB NOT NULL);""")
+      connection.execute('CREATE INDEX idx ON examples ({});'.format(
+          ', '.join(index_columns)))
+      connection.execute("""CREATE TABLE client_metadata (
+                            client_id TEXT NOT NULL,
+                            split_name TEXT NOT NULL,
+                            num_examples INTEGER NOT NULL);""")
+    connection.close()
+
+  def test_no_warning_for_index_leading_with_client_id(self):
+    database_filepath = os.path.join(self.get_temp_dir(), 'client_id.sqlite')
+    self._create_examples_table(database_filepath, ['client_id', 'split_name'])
+    with mock.patch.object(sql_client_data.logging, 'warning') as warning:
+      sql_client_data.SqlClientData(database_filepath)
+    warning.assert_not_called()
+
+  def test_warns_for_index_not_leading_with_client_id(self):
+    database_filepath = os.path.join(self.get_temp_dir(), 'split_name.sqlite')
+    self._create_examples_table(database_filepath, ['split_name', 'client_id'])
+    with mock.patch.object(sql_client_data.logging, 'warning') as warning:
+      sql_client_data.SqlClientData(database_filepath)
+    warning.assert_called_once()
+
+  def test_create_datasets_for_clients_with_preprocess(self):
+    client_data = sql_client_data.SqlClientData(
+        test_dataset_filepath()).preprocess(lambda x: x.take(1))
+    datasets = client_data.create_tf_datasets_for_clients(['test_b', 'test_c'])
+    self.assertEqual([d.reduce(0, lambda s, x: s + 1) for d in datasets],
+                     [1, 1])
+
   def test_dataset_computation(self):
 
     def test_split(split_name, expected_examples):
@@ -14,6 +14,7 @@
 """Utilities for constructing, serializing and parsing SQL-backed ClientData."""
 
 import collections
+import contextlib
 import os
 import sqlite3
 import tempfile
@@ -141,6 +142,10 @@ def save_to_sql_client_data(
   Note: All the clients must share the same dataset.element_spec of type
   `Mapping[str, TensorSpec]`.
 
+  The `examples` and `client_metadata` tables of the database are indexed on
+  `client_id`, so that `SqlClientData` can look up clients without scanning
+  the tables.
+
   Args:
     client_ids: A list of string identifiers for clients in this dataset.
     dataset_fn: A callable that accepts a `str` as an argument and returns a
@@ -179,7 +184,9 @@ def save_to_sql_client_data(
 
   serializer = _build_serializer(example_element_spec)
 
-  with sqlite3.connect(tmp_database_filepath) as con:
+  # The connection commits on exiting the inner context, and is closed on
+  # exiting the outer one.
+  with contextlib.closing(sqlite3.connect(tmp_database_filepath)) as con, con:
     test_setup_queries = [
         """CREATE TABLE examples (
            split_name TEXT NOT NULL,
@@ -208,17 +215,19 @@ def save_to_sql_client_data(
             '{example_client_id}' which has element type {example_element_spec}.
             """)
 
-      num_elem = 0
-      for elem in local_ds:
-        num_elem += 1
-        con.execute(
-            'INSERT INTO examples '
-            '(split_name, client_id, serialized_example_proto) '
-            'VALUES (?, ?, ?);', ('N/A', client_id, serializer(elem)))
+      rows = [('N/A', client_id, serializer(elem)) for elem in local_ds]
+      con.executemany(
+          'INSERT INTO examples '
+          '(split_name, client_id, serialized_example_proto) '
+          'VALUES (?, ?, ?);', rows)
 
       con.execute(
           'INSERT INTO client_metadata (client_id, split_name, num_examples) '
-          'VALUES (?, ?, ?);', (client_id, 'N/A', num_elem))
+          'VALUES (?, ?, ?);', (client_id, 'N/A', len(rows)))
+
+    # Index after inserting all rows, which is faster than maintaining the
+    # indices during the inserts.
+    sql_client_data.create_indices(con)
 
   if tf.io.gfile.exists(database_filepath):
     tf.io.gfile.remove(database_filepath)
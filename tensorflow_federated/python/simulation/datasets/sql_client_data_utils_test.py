@@ -15,6 +15,7 @@
 
 import collections
 import os
+import sqlite3
 
 from absl.testing import parameterized
 import numpy as np
@@ -117,6 +118,27 @@ class SqlClientDataUtilsTest(tf.test.TestCase):
         for key in rebuilt_odict.keys():
           self.assertAllEqual(rebuilt_odict[key], original_odict[key])
 
+  def test_save_to_sql_client_data_indexes_client_ids(self):
+    test_ds = tf.data.Dataset.from_tensor_slices(
+        collections.OrderedDict(i=[1, 2, 3]))
+    database_filepath = os.path.join(self.get_temp_dir(), 'indexed_db')
+
+    sql_client_data_utils.save_to_sql_client_data(['foo', 'bar'],
+                                                  lambda cid: test_ds,
+                                                  database_filepath)
+
+    with sqlite3.connect(database_filepath) as connection:
+      examples_indices = connection.execute(
+          'PRAGMA index_list(examples);').fetchall()
+      metadata_indices = connection.execute(
+          'PRAGMA index_list(client_metadata);').fetchall()
+      self.assertNotEmpty(examples_indices)
+      self.assertNotEmpty(metadata_indices)
+      query_plan = connection.execute(
+          'EXPLAIN QUERY PLAN SELECT serialized_example_proto FROM examples '
+          "WHERE client_id = 'foo';").fetchall()
+    self.assertIn('USING INDEX', ' '.join(str(r[-1]) for r in query_plan))
+
   def test_save_to_sql_client_can_overwrite_if_enabled(self):
     test_ds1 = tf.data.Dataset.from_tensor_slices(
         collections.OrderedDict(
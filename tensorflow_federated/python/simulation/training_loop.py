@@ -15,16 +15,20 @@
 
 import asyncio
 import collections
+from concurrent import futures
+import functools
 import time
-from typing import Any, Callable, Iterable, Mapping, MutableMapping, Optional, Tuple
+from typing import Any, Callable, Deque, Iterable, Mapping, MutableMapping, Optional, Tuple
 
 from absl import logging
 
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.computation import computation_base
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.templates import iterative_process
 from tensorflow_federated.python.program import program_state_manager as program_state_manager_lib
 from tensorflow_federated.python.program import release_manager as release_manager_lib
+from tensorflow_federated.python.simulation.datasets import client_dataset_prefetcher
 
 MetricsType = MutableMapping[str, Any]
 
@@ -126,6 +130,58 @@ def _run_evaluation(evaluation_fn: Callable[[Any, Any], MetricsType],
   return {EVALUATION_METRICS_PREFIX + k: v for (k, v) in metrics.items()}
 
 
+class _BackgroundWorker(object):
+  """Runs functions one at a time, in submission order, in a background thread.
+
+  The functions may run coroutines on the event loop of the worker, via
+  `run_until_complete`. The context stack is thread-local, so each function runs
+  in the execution context that was current when it was submitted.
+  """
+
+  def __init__(self, max_pending: int):
+    self._max_pending = max_pending
+    self._thread_pool = futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix='training_loop_worker')
+    self._event_loop = asyncio.new_event_loop()
+    self._pending: Deque[futures.Future] = collections.deque()
+
+  def run_until_complete(self, coro):
+    return self._event_loop.run_until_complete(coro)
+
+  def submit(self, fn: Callable[[], None]):
+    """Submits `fn`, blocking while too many functions are pending.
+
+    Args:
+      fn: A no-arg callable to run in the background.
+
+    Raises:
+      Exception: Any exception raised by a previously submitted function.
+    """
+    context = context_stack_impl.context_stack.current
+
+    def run_in_context():
+      with context_stack_impl.context_stack.install(context):
+        fn()
+
+    self._pending.append(self._thread_pool.submit(run_in_context))
+    while len(self._pending) > self._max_pending:
+      self._pending.popleft().result()
+    # Surface the errors of completed functions early.
+    while self._pending and self._pending[0].done():
+      self._pending.popleft().result()
+
+  def close(self):
+    """Waits for all pending functions, raising the first of their errors."""
+    try:
+      while self._pending:
+        self._pending.popleft().result()
+    finally:
+      for f in self._pending:
+        f.cancel()
+      self._thread_pool.shutdown(wait=True)
+      self._event_loop.close()
+
+
 def run_training_process(
     training_process: iterative_process.IterativeProcess,
     training_selection_fn: Callable[[int], Any],
@@ -137,7 +193,10 @@ def run_training_process(
         program_state_manager_lib.ProgramStateManager] = None,
     rounds_per_saving_program_state: int = 1,
     metrics_managers: Optional[Iterable[
-        release_manager_lib.ReleaseManager]] = None):
+        release_manager_lib.ReleaseManager]] = None,
+    background_release: bool = False,
+    evaluate_concurrently: bool = False,
+    max_pending_rounds: int = 2):
   """Runs a federated `training_process`.
 
   The following `tff.Computation` types signaures are required:
@@ -157,6 +216,21 @@ def run_training_process(
   initial evaluation metrics and round 1 through total_rounds + 1 represent the
   training rounds.
 
+  If `training_selection_fn` is a
+  `tff.simulation.datasets.ClientDatasetPrefetcher`, the client datasets of the
+  next training round are constructed in the background while the current round
+  runs. The prefetcher is not closed by this function; the caller remains
+  responsible for closing it.
+
+  If `background_release` is `True`, the metrics of each round are released and
+  the program state is saved in a background thread, so that the next training
+  round does not wait for them. If `evaluate_concurrently` is also `True`, the
+  evaluation of the state of each round runs in the same background thread,
+  concurrently with the next training round. Releases and saves always happen in
+  round order, and at most `max_pending_rounds` rounds of background work can be
+  pending before the training loop waits for them. Errors raised in the
+  background are raised by this function, at the latest before it returns.
+
   In addition to the training metrics and evaluation metrics, this function adds
   the following performance metrics (key and descriptions):
 
@@ -185,10 +259,29 @@ def run_training_process(
       between saving program state.
     metrics_managers: An optional list of `tff.program.ReleaseManagers`s to use
       to save metrics.
+    background_release: Whether to release metrics and save program state in a
+      background thread. The `metrics_managers` and `program_state_manager`
+      must then tolerate being invoked from another thread.
+    evaluate_concurrently: Whether to run `evaluation_fn` in the background
+      thread, concurrently with the next training round. Requires
+      `background_release`. The `evaluation_fn` must then tolerate being
+      invoked concurrently with `training_process.next`, e.g. by using a
+      different execution context.
+    max_pending_rounds: The maximum number of rounds whose background work may
+      be pending when starting a training round.
 
   Returns:
     The `state` of the training process after training.
+
+  Raises:
+    ValueError: If `evaluate_concurrently` is `True` but `background_release`
+      is not, or if `max_pending_rounds` is not positive.
   """
+  if evaluate_concurrently and not background_release:
+    raise ValueError('`evaluate_concurrently` requires `background_release`.')
+  if max_pending_rounds < 1:
+    raise ValueError('Expected a positive `max_pending_rounds`, found '
+                     '{}.'.format(max_pending_rounds))
   loop = asyncio.get_event_loop()
 
   logging.info('Running training process')
@@ -219,28 +312,72 @@ def run_training_process(
     if program_state_manager is not None:
       loop.run_until_complete(program_state_manager.save(state, 0))
 
-  for round_num in range(start_round, total_rounds + 1):
-    logging.info('Starting round %d', round_num)
-    round_metrics = collections.OrderedDict()
-    state, training_metrics = _run_training(training_process.next,
-                                            training_selection_fn, state,
-                                            round_num)
-    round_metrics.update(training_metrics)
+  prefetch_training_data = isinstance(
+      training_selection_fn, client_dataset_prefetcher.ClientDatasetPrefetcher)
+  if background_release:
+    worker = _BackgroundWorker(max_pending_rounds)
+    run_until_complete = worker.run_until_complete
+  else:
+    worker = None
+    run_until_complete = loop.run_until_complete
 
-    if evaluation_fn is not None and evaluation_selection_fn is not None:
-      if round_num % rounds_per_evaluation == 0:
-        evaluation_metrics = _run_evaluation(evaluation_fn,
-                                             evaluation_selection_fn, state,
-                                             round_num)
-        round_metrics.update(evaluation_metrics)
+  def finish_round(state, round_metrics, round_num, evaluate):
+    if evaluate:
+      evaluation_metrics = _run_evaluation(evaluation_fn,
+                                           evaluation_selection_fn, state,
+                                           round_num)
+      round_metrics.update(evaluation_metrics)
 
     if metrics_managers is not None:
-      loop.run_until_complete(
+      run_until_complete(
           asyncio.gather(
               *[m.release(round_metrics, round_num) for m in metrics_managers]))
 
     if program_state_manager is not None:
       if round_num % rounds_per_saving_program_state == 0:
-        loop.run_until_complete(program_state_manager.save(state, round_num))
+        run_until_complete(program_state_manager.save(state, round_num))
+
+  try:
+    for round_num in range(start_round, total_rounds + 1):
+      logging.info('Starting round %d', round_num)
+      if prefetch_training_data:
+        training_selection_fn.prefetch(round_num)
+        if round_num < total_rounds:
+          training_selection_fn.prefetch(round_num + 1)
+      round_metrics = collections.OrderedDict()
+      state, training_metrics = _run_training(training_process.next,
+                                              training_selection_fn, state,
+                                              round_num)
+      round_metrics.update(training_metrics)
+
+      evaluate = (
+          evaluation_fn is not None and evaluation_selection_fn is not None and
+          round_num % rounds_per_evaluation == 0)
+      if evaluate and not evaluate_concurrently:
+        evaluation_metrics = _run_evaluation(evaluation_fn,
+                                             evaluation_selection_fn, state,
+                                             round_num)
+        round_metrics.update(evaluation_metrics)
+        evaluate = False
+
+      if worker is not None:
+        worker.submit(
+            functools.partial(finish_round, state, round_metrics, round_num,
+                              evaluate))
+      else:
+        finish_round(state, round_metrics, round_num, evaluate)
+  except BaseException:
+    if worker is not None:
+      # Waits for the pending rounds, without masking the error of the training
+      # loop with theirs.
+      try:
+        worker.close()
+      except Exception:  # pylint: disable=broad-except
+        logging.exception('Error in the background work of a failed training '
+                          'loop.')
+    raise
+  else:
+    if worker is not None:
+      worker.close()
 
   return state
@@ -14,15 +14,21 @@
 
 import asyncio
 import collections
+import threading
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
+import tensorflow as tf
 
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.backends.native import execution_contexts
 from tensorflow_federated.python.core.impl.computation import computation_base
 from tensorflow_federated.python.core.templates import iterative_process
+from tensorflow_federated.python.program import program_state_manager as program_state_manager_lib
 from tensorflow_federated.python.program import release_manager as release_manager_lib
 from tensorflow_federated.python.simulation import training_loop
+from tensorflow_federated.python.simulation.datasets import client_dataset_prefetcher
 
 
 class RunStatelessSimulationTest(absltest.TestCase):
@@ -168,6 +174,48 @@ class RunTrainingProcessTest(parameterized.TestCase):
       calls.append(call)
     self.assertEqual(training_process.next.call_args_list, calls)
 
+  @parameterized.named_parameters(
+      ('1', 1),
+      ('2', 2),
+      ('10', 10),
+  )
+  def test_training_data_prefetched_for_next_round(self, total_rounds):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 0})
+    training_selection_fn = mock.create_autospec(
+        client_dataset_prefetcher.ClientDatasetPrefetcher, instance=True)
+    training_selection_fn.return_value = [0]
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds)
+
+    self.assertEqual(training_selection_fn.call_args_list,
+                     [mock.call(r) for r in range(1, total_rounds + 1)])
+    prefetched_rounds = set(
+        c.args[0] for c in training_selection_fn.prefetch.call_args_list)
+    self.assertEqual(prefetched_rounds, set(range(1, total_rounds + 1)))
+    # The caller owns the prefetcher.
+    training_selection_fn.close.assert_not_called()
+
+  def test_prefetcher_not_closed_on_training_error(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.side_effect = ValueError('training failed')
+    training_selection_fn = mock.create_autospec(
+        client_dataset_prefetcher.ClientDatasetPrefetcher, instance=True)
+    training_selection_fn.return_value = [0]
+
+    with self.assertRaisesRegex(ValueError, 'training failed'):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=training_selection_fn,
+          total_rounds=3)
+
+    training_selection_fn.close.assert_not_called()
+
   @parameterized.named_parameters(
       ('0_1', 0, 1),
       ('1_1', 1, 1),
@@ -363,6 +411,149 @@ class RunTrainingProcessTest(parameterized.TestCase):
     self.assertEqual(metrics_manager_2.release.call_args_list, calls)
     self.assertEqual(metrics_manager_3.release.call_args_list, calls)
 
+  @parameterized.named_parameters(
+      ('sequential_evaluation', False, 1),
+      ('concurrent_evaluation', True, 1),
+      ('concurrent_evaluation_pending_3', True, 3),
+  )
+  def test_background_release_preserves_round_order(self,
+                                                    evaluate_concurrently,
+                                                    max_pending_rounds):
+    total_rounds = 5
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.side_effect = [
+        ('update_{}'.format(r), {'metric': r})
+        for r in range(1, total_rounds + 1)
+    ]
+    training_selection_fn = mock.MagicMock()
+    evaluation_fn = mock.MagicMock()
+    evaluation_fn.return_value = {'metric': 0}
+    evaluation_selection_fn = mock.MagicMock()
+    metrics_manager = mock.create_autospec(
+        release_manager_lib.ReleaseManager, instance=True)
+    metrics_manager.release = mock.AsyncMock()
+    program_state_manager = mock.create_autospec(
+        program_state_manager_lib.ProgramStateManager, instance=True)
+    program_state_manager.load_latest = mock.AsyncMock(return_value=(None, 0))
+    program_state_manager.save = mock.AsyncMock()
+
+    state = training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=training_selection_fn,
+        total_rounds=total_rounds,
+        evaluation_fn=evaluation_fn,
+        evaluation_selection_fn=evaluation_selection_fn,
+        program_state_manager=program_state_manager,
+        metrics_managers=[metrics_manager],
+        background_release=True,
+        evaluate_concurrently=evaluate_concurrently,
+        max_pending_rounds=max_pending_rounds)
+
+    self.assertEqual(state, 'update_{}'.format(total_rounds))
+    self.assertEqual(
+        [c.args[1] for c in metrics_manager.release.call_args_list],
+        list(range(total_rounds + 1)))
+    for round_num in range(1, total_rounds + 1):
+      released_metrics = metrics_manager.release.call_args_list[round_num][0][0]
+      self.assertEqual(released_metrics['metric'], round_num)
+      self.assertIn('evaluation/metric', released_metrics)
+    self.assertEqual(program_state_manager.save.call_args_list, [
+        mock.call('initialize', 0),
+    ] + [
+        mock.call('update_{}'.format(r), r) for r in range(1, total_rounds + 1)
+    ])
+    evaluated_states = [c.args[0] for c in evaluation_fn.call_args_list]
+    self.assertEqual(evaluated_states, ['initialize'] + [
+        'update_{}'.format(r) for r in range(1, total_rounds + 1)
+    ])
+
+  def test_background_release_raises_release_error(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.return_value = ('update', {'metric': 0})
+    metrics_manager = mock.create_autospec(
+        release_manager_lib.ReleaseManager, instance=True)
+    metrics_manager.release = mock.AsyncMock(side_effect=IOError('failed'))
+
+    with self.assertRaisesRegex(IOError, 'failed'):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=mock.MagicMock(),
+          total_rounds=3,
+          metrics_managers=[metrics_manager],
+          background_release=True)
+
+  def test_background_release_error_does_not_mask_training_error(self):
+    training_failed = threading.Event()
+    num_rounds_run = 0
+
+    def next_fn(state, client_data):
+      del state, client_data  # Unused.
+      nonlocal num_rounds_run
+      num_rounds_run += 1
+      if num_rounds_run > 1:
+        training_failed.set()
+        raise ValueError('training failed')
+      return ('update', {'metric': 0})
+
+    async def release(value, key):
+      del value, key  # Unused.
+      training_failed.wait()
+      raise IOError('release failed')
+
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 'initialize'
+    training_process.next.side_effect = next_fn
+    metrics_manager = mock.create_autospec(
+        release_manager_lib.ReleaseManager, instance=True)
+    metrics_manager.release = mock.AsyncMock(side_effect=release)
+
+    with self.assertRaisesRegex(ValueError, 'training failed'):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=mock.MagicMock(),
+          total_rounds=3,
+          metrics_managers=[metrics_manager],
+          background_release=True)
+
+  def test_concurrent_evaluation_runs_computation_in_caller_context(self):
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def evaluation_fn(state, evaluation_data):
+      return collections.OrderedDict(total=state + evaluation_data)
+
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    training_process.initialize.return_value = 0
+    training_process.next.side_effect = lambda state, data: (state + 1, {})
+    metrics_manager = mock.create_autospec(
+        release_manager_lib.ReleaseManager, instance=True)
+
+    training_loop.run_training_process(
+        training_process=training_process,
+        training_selection_fn=mock.MagicMock(),
+        total_rounds=3,
+        evaluation_fn=evaluation_fn,
+        evaluation_selection_fn=lambda round_num: 10,
+        metrics_managers=[metrics_manager],
+        background_release=True,
+        evaluate_concurrently=True)
+
+    evaluation_totals = [
+        c.args[0][training_loop.EVALUATION_METRICS_PREFIX + 'total']
+        for c in metrics_manager.release.call_args_list
+    ]
+    self.assertEqual(evaluation_totals, [10, 11, 12, 13])
+
+  def test_raises_with_concurrent_evaluation_without_background_release(self):
+    training_process = mock.create_autospec(iterative_process.IterativeProcess)
+    with self.assertRaises(ValueError):
+      training_loop.run_training_process(
+          training_process=training_process,
+          training_selection_fn=mock.MagicMock(),
+          total_rounds=1,
+          evaluate_concurrently=True)
+
   def test_performance_metrics_with_training_and_evaluation_time_10(self):
     loop = asyncio.get_event_loop()
     training_process = mock.create_autospec(iterative_process.IterativeProcess)
@@ -442,4 +633,5 @@ class RunTrainingProcessTest(parameterized.TestCase):
 
 
 if __name__ == '__main__':
+  execution_contexts.set_local_python_execution_context()
   absltest.main()